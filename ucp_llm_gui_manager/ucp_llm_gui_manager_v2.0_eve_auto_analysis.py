@@ -7,12 +7,11 @@
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, simpledialog, scrolledtext
-import json
+import os
+import sys
 from typing import Optional, Dict, Any, List
 import datetime
 import random
-import threading
-import queue
 
 try:
     from zoneinfo import ZoneInfo # Python 3.9+
@@ -24,11 +23,26 @@ except ImportError:
         def tzname(self, dt): return "UTC"
     UTC = UTCtz()
 
+# Run from a repository checkout, the library is found in ../ucp_llm_library/src without installing it
+_UCP_LLM_SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "ucp_llm_library", "src")
+try: import ucp_llm
+except ImportError:
+    if os.path.isdir(_UCP_LLM_SOURCE_DIR): sys.path.insert(0, os.path.normpath(_UCP_LLM_SOURCE_DIR))
+
 try:
-    from ucp_llm import UCPProfile
+    from ucp_llm import UCPProfile, ProfileOverlay
+    from ucp_llm.sections import SECTION_TYPE_DATA, get_field, section_id_for_title
+    from ucp_llm.render import ProtocolRenderer, RenderedTextCache, SectionRenderCache
+    from ucp_llm.context import EXTERNAL_ANALYSIS, LAYOUT_PREFIX_STABLE, POSTAMBLE, PREAMBLE, ContextCompiler, estimate_tokens
+    from ucp_llm.protocol_texts import EXTERNAL_ANALYSIS_PROMPT, EXTERNAL_ANALYSIS_SYSTEM_PROMPT
+    from ucp_llm.llm import ClientManager
+    from ucp_llm.dispatch import MODE_ALL, MODE_FIRST, STATUS_TIMEOUT, AnalysisDispatcher, AnalysisTarget
+    from ucp_llm.jobs import JobRunner, bind_tk
+    from ucp_llm.saving import AtomicSaver
+    from ucp_llm.journal import SessionJournal
 except ImportError:
-    print("CRITICAL IMPORT ERROR: 'ucp_llm.py' not found. Program will exit.")
-    _err_root = tk.Tk(); _err_root.withdraw(); messagebox.showerror("Import Error", "ucp_llm.py not found."); _err_root.destroy(); exit()
+    print("CRITICAL IMPORT ERROR: 'ucp_llm' library not found. Install it with: pip install ./ucp_llm_library")
+    _err_root = tk.Tk(); _err_root.withdraw(); messagebox.showerror("Import Error", "'ucp_llm' library not found. Please install it: pip install ./ucp_llm_library"); _err_root.destroy(); exit()
 
 try:
     from groq import Groq, APIError, RateLimitError
@@ -37,37 +51,12 @@ except ImportError:
     _err_root = tk.Tk(); _err_root.withdraw(); messagebox.showerror("Import Error", "'groq' library not found. Please install it: pip install groq"); _err_root.destroy(); exit()
 
 APP_VERSION = "UCP-LLM Profile Manager v1.8.0 (Eve-First, Auto Groq Analysis)"
+EVE_SESSION_JOURNAL_PATH = os.path.join(os.path.expanduser("~"), ".ucp_llm", "eve_session.jsonl") # Unsaved edits, replayed after a crash
+EVE_JOURNALED_STATE_KEYS = ("current_mode", "current_section_key_index", "current_field_index", "current_item_count_for_section", "current_invented_question_index", "initial_data_loaded_for_eve", "is_editing_specific_section_now", "last_summary_point_triggered")
 
 # ==============================================================================
-# FULL DATA STRUCTURES - SECTION_TYPE_DATA and EVE_INVENTED_QUESTIONS
+# FULL DATA STRUCTURES - EVE_INVENTED_QUESTIONS (SECTION_TYPE_DATA lives in ucp_llm.sections)
 # ==============================================================================
-SECTION_TYPE_DATA = {
-    "personal": { "title": '👤 بيانات شخصية', "maxItems": 1, "fields": [ {"label": 'الاسم المفضل للتفاعل', "type": 'text', "name": 'preferredName', "jsonKey": 'preferredName'}, {"label": 'تاريخ الميلاد (اختياري)', "type": 'text', "name": 'dob', "jsonKey": 'dateOfBirth'}, {"label": 'الجنسية أو الخلفية الثقافية (اختياري)', "type": 'text', "name": 'nationality', "jsonKey": 'nationalityCulturalBackground'}, {"label": 'اللغات ومستويات الإتقان', "type": 'textarea', "name": 'languages', "jsonKey": 'languagesProficiency', "templates": ["العربية (لغة أم)، الإنجليزية (بطلاقة)", "الإنجليزية (احترافية)، الإسبانية (مبتدئ)", "مثال: الألمانية (محادثة)، الفرنسية (قراءة أساسية)"]}, ] },
-    "social": { "title": '🏠 الحالة الاجتماعية والأسرية', "maxItems": 1, "fields": [ {"label": 'التفاصيل', "type": 'textarea', "name": 'social_details', "jsonKey": 'socialFamilyDetails', "templates": ["أعزب، أعيش مستقلاً.", "متزوج ولدي طفلان، أركز على الأسرة.", "أعيش مع والديّ، أساهم في شؤون المنزل.", "في علاقة طويلة الأمد وملتزمة.", "مطلق، أشارك في تربية الأبناء."]} ] },
-    "educational_professional": { "title": '🎓 الخلفية التعليمية والمهنية', "maxItems": 1, "fields": [ {"label": 'الخلفية التعليمية', "type": 'textarea', "name": 'education_background', "jsonKey": 'educationalBackground', "templates": ["بكالوريوس في علوم الحاسب، جامعة القاهرة، 2000.", "ماجستير في الفلسفة، تخصص أخلاق، جامعة ستانفورد، 2010.", "دكتوراه في فيزياء الكم، تركز على نظرية الأوتار، معهد ماساتشوستس للتكنولوجيا، 2015.", "مبرمج علم نفسه ذاتيًا مع شهادات متعددة عبر الإنترنت."]}, {"label": 'الخبرات المهنية الرئيسية', "type": 'textarea', "name": 'professional_experience', "jsonKey": 'professionalExperience', "templates": ["مهندس برمجيات في شركة حلول تقنية (5 سنوات): قمت بقيادة تطوير ميزات المنتج الرئيسية.", "مصمم جرافيك مستقل (3 سنوات): تخصصت في العلامات التجارية وواجهة المستخدم/تجربة المستخدم للشركات الناشئة.", "مؤسس ورئيس تنفيذي لشركة إيديو بلاي المحدودة (سنتان): ركزت على تطوير الألعاب التعليمية.", "محلل مالي أول في بنك عالمي (7 سنوات): أدرت محافظ استثمارية وتقييم المخاطر."]} ] },
-    "thinking_reference": { "title": '🧠 مرجعية التفكير الأساسية', "maxItems": 1, "fields": [ {"label": 'وصف مرجعية التفكير الأساسية', "type": 'textarea', "name": 'thinking_reference_desc', "jsonKey": 'coreThinkingReferenceDescription', "templates": ["العقلانية الصارمة والمنطق", "الأفلاطونية الموسعة مع التركيز على 'الخورا'", "التجريبية وحل المشكلات العملي", "الظاهراتية الوجودية التي تركز على التجربة المعاشة", "توليفة من الأخلاق الرواقية والمنهجية العلمية"]}, {"label": 'التطبيق والأهمية', "type": 'textarea', "name": 'thinking_reference_application', "jsonKey": 'thinkingReferenceApplication', "templates": ["تُطبق على جميع عمليات اتخاذ القرار واكتساب المعرفة.", "توجه بشكل أساسي بحثي الفلسفي ونظرتي للعالم.", "ضرورية لعملي المهني ومساعيي الإبداعية.", "تشكل أساس إطاري الأخلاقي وقيمي الشخصية."]} ] },
-    "cognitive_passion": { "title": '💡 الشغف المعرفي وأنماط البحث', "fields": [ {"label": 'اسم الشغف المعرفي', "type": 'text', "name": 'passion_name', "jsonKey": 'cognitivePassionName', "templates": ["علم الأعداد", "تاريخ الفلسفة", "فيزياء الكم", "الحضارات القديمة", "أخلاقيات الذكاء الاصطناعي", "الرياضيات النظرية"]}, {"label": 'منهجية البحث', "type": 'textarea', "name": 'passion_methodology', "jsonKey": 'passionResearchMethodology', "templates": ["قراءة مكثفة، مراجع متقاطعة، وتوليف.", "تصميم تجريبي، جمع بيانات، وتحليل إحصائي.", "استقصاء فلسفي، تفكير نقدي، وحوار سقراطي.", "نمذجة رياضية ومحاكاة."]} ] },
-    "ethical_values": { "title": '⚖️ القيم الأخلاقية الموجهة', "fields": [ {"label": 'اسم القيمة الأخلاقية', "type": 'text', "name": 'value_name', "jsonKey": 'ethicalValueName', "templates": ["الصدق", "العدل", "النزاهة", "الرحمة", "الشجاعة", "الاحترام", "المسؤولية", "الإيثار", "التواضع", "الحكمة", "الولاء", "التعاون", "التسامح", "الامتنان", "الصبر", "الحقيقة", "الإنصاف"] }, {"label": 'الشرح والأولوية', "type": 'textarea', "name": 'value_description', "jsonKey": 'ethicalValueExplanation', "templates": ["هذه القيمة أساسية وتوجه جميع أفعالي.", "تتجلى في [سلوك مثال]، مهمة جداً بالنسبة لي.", "تحتل مرتبة بين أهم 3 قيم لدي، وتؤثر على [مجال معين].", "أولويتها عالية، خاصة في السياقات المهنية/الشخصية."]} ] },
-    "concepts_perspective": { "title": '👁️ المنظور تجاه مفاهيم جوهرية', "fields": [ {"label": 'اسم المفهوم الجوهري', "type": 'text', "name": 'core_concept_name', "jsonKey": 'coreConceptName', "templates": ["الجمال", "القبح", "الفوضى", "النظام", "الحقيقة", "الغموض", "الحرية", "الضرورة", "الوعي"]}, {"label": 'منظورك الخاص', "type": 'textarea', "name": 'core_concept_perspective', "jsonKey": 'coreConceptPerspective', "templates": ["أرى هذا المفهوم كـ [تعريف موجز]، متأثرًا بـ [فيلسوف/مدرسة فكرية].", "فهمي هو أنه يمثل [فكرة أساسية] ويتجلى في [أمثلة].", "أفسر هذا من خلال عدسة [مرجعيتي الفكرية]، ويعني [شرح]."]} ] },
-    "cognitive_tools_methodology": { "title": '🛠️ منهجية استخدام الأدوات المعرفية', "fields": [ {"label": 'اسم الأداة المعرفية', "type": 'text', "name": 'cognitive_tool_name', "jsonKey": 'cognitiveToolName', "templates": ["الشك", "الحدس", "المنطق (الاستنباطي/الاستقرائي)", "القياس", "التأمل", "رسم الخرائط الذهنية", "التحليل النقدي"]}, {"label": 'الرؤية، البناء، درجة الاعتماد', "type": 'textarea', "name": 'cognitive_tool_usage', "jsonKey": 'cognitiveToolMethodology', "templates": ["أراها ضرورية لـ [الغرض]، بناءة عندما [الشروط]. أعتمد عليها بشدة.", "تُستخدم بحذر، بناءة لتوليد الفرضيات، اعتماد متوسط.", "أساس تفكيري، دائمًا بناءة، اعتماد مطلق."]} ] },
-    "inspiring_figures": { "title": '🌟 نماذج/شخصيات إنسانية ملهمة', "fields": [ {"label": 'اسم الشخصية الملهمة', "type": 'text', "name": 'figure_name', "jsonKey": 'inspiringFigureName'}, {"label": 'القيمة المستمدة والتأثير', "type": 'textarea', "name": 'figure_value_impact', "jsonKey": 'derivedValueAndImpact', "templates": ["[صفتهم، مثل النزاهة، الشجاعة] أثرت بعمق في [جانب من حياتي/تفكيري].", "أستمد قيمة [مثل المثابرة، الصدق الفكري] من حياتهم/أعمالهم.", "يمثلون نموذجًا لـ [مثل السلوك الأخلاقي، السعي الإبداعي]."]} ] },
-    "intellectual_sins": { "title": '🧐 خطايا/تحيزات فكرية يجب تجنبها', "fields": [ {"label": 'اسم الخطيئة الفكرية أو التحيز', "type": 'text', "name": 'intellectual_sin_name', "jsonKey": 'intellectualSinName', "templates": ["الدوغماتية", "التعميم المتسرع", "تحيز التأكيد", "مغالطة الشخصنة", "مغالطة رجل القش", "الاحتكام إلى الجهل"]}, {"label": 'السبب لاعتباره ضارًا', "type": 'textarea', "name": 'intellectual_sin_reason', "jsonKey": 'reasonConsideredHarmful', "templates": ["يعيق البحث عن الحقيقة.", "يؤدي إلى استنتاجات خاطئة وقرارات سيئة.", "يعيق الانفتاح الذهني والتفكير النقدي.", "يقوض الحوار المثمر."]} ] },
-    "projects": { "title": '📌 مشاريع وأهداف حالية', "fields": [ {"label": 'عنوان المشروع/الهدف', "type": 'text', "name": 'project_name', "jsonKey": 'projectOrObjectiveTitle'}, {"label": 'الأهداف/الوصف التفصيلي', "type": 'textarea', "name": 'project_goals', "jsonKey": 'projectDetailedGoals', "templates": [ "الهدف الرئيسي هو [س]، بهدف الوصول إلى [ص] بحلول [ع].", "يسعى هذا المشروع إلى [فعل] [موضوع] من أجل [غرض].", "الاستعداد لعام/دورة دراسية جديدة.", "تطوير المهارات المهنية في [مجال محدد].", "إطلاق مشروع شخصي/تجاري جديد في [نطاق].", "التحضير لرحلة مهمة (سياحة/عمل/دراسة).", "تأليف كتاب أو ورقة بحثية عن [موضوع].", "تحسين الصحة واللياقة البدنية من خلال [خطة/نشاط].", "تعلم لغة جديدة أو إتقان لغة حالية.", "تخصيص المزيد من الوقت لهوايات مثل [اسم الهواية].", "العمل على تحسين العلاقات الاجتماعية أو الأسرية.", "المساهمة في عمل تطوعي أو خدمة مجتمعية.", "تحقيق هدف معين للاستقرار المالي أو الاستثمار." ] }, {"label": 'المفاهيم/الأدوات المرتبطة', "type": 'textarea', "name": 'project_concepts_tools', "jsonKey": 'projectAssociatedConcepts'}, {"label": 'الدور المحدد للنموذج اللغوي', "type": 'textarea', "name": 'project_llm_role', "jsonKey": 'projectLLMRole', "templates": ["مساعد بحث", "شريك في العصف الذهني", "مراجع نقدي", "مولد محتوى", "مستشار تقني", "مصحح أخطاء (للكود)", "مدقق لغوي/محرر"]} ] },
-    "pivotal_examples": { "title": '🧪 أمثلة محورية', "fields": [ {"label": 'اسم/وصف المثال', "type": 'text', "name": 'example_name', "jsonKey": 'pivotalExampleName', "templates": ["قصة يوسف", "حدسية كولاتز", "تأثير الفراشة", "أسطورة الكهف", "قطة شرودنجر", "معضلة السجين"]}, {"label": 'الأهمية والأفكار الموضحة', "type": 'textarea', "name": 'example_significance', "jsonKey": 'pivotalExampleSignificance', "templates": ["يوضح مفهوم [مفهوم] وتداعياته على [مجال].", "يمثل بالنسبة لي أهمية [قيمة/فكرة].", "يسلط الضوء على التوتر بين [س] و [ص]."]} ] },
-    "causal_relations": { "title": '🔗 علاقات سببية بين المفاهيم', "fields": [ {"label": 'المفهوم الأول (السبب)', "type": 'text', "name": 'cause_concept', "jsonKey": 'causeConcept'}, {"label": 'المفهوم الثاني (النتيجة)', "type": 'text', "name": 'effect_concept', "jsonKey": 'effectConcept'}, {"label": 'طبيعة العلاقة السببية', "type": 'textarea', "name": 'relation_description', "jsonKey": 'causalRelationDescription', "templates": ["[السبب] يؤدي مباشرة إلى/يؤثر على [النتيجة] لأن...", "[السبب] شرط ضروري ولكنه غير كاف لـ [النتيجة].", "هناك علاقة سببية معقدة وغير مباشرة بين [السبب] و [النتيجة] تتوسطها..."]} ] },
-    "role": { "title": '🎭 الشخصية الوظيفية للنموذج اللغوي', "maxItems": 1, "fields": [ {"label": 'الدور الأساسي المطلوب من النموذج', "type": 'text', "name": 'llm_role_primary', "jsonKey": 'llmPrimaryRole', "templates": ["مساعد بحث متقدم", "ناقد بناء", "متعاون إبداعي", "محاور سقراطي", "مدرس شخصي", "مستشار تقني"]}, {"label": 'السمات أو السلوكيات المطلوبة للدور', "type": 'textarea', "name": 'llm_role_attributes', "jsonKey": 'llmRoleAttributes', "templates": ["استباقي، ثاقب، ومهتم بالتفاصيل.", "موضوعي، تحليلي، ومحترم في النقد.", "منفتح الذهن، خيالي، ومتعاون في توليد الأفكار.", "محفز للتفكير، فضولي، ويركز على الفهم العميق."]} ] },
-    "conceptual_tuning": { "title": '📚 توليف مفاهيمي (مصطلحات خاصة بالمستخدم)', "fields": [ {"label": 'مصطلحك الخاص', "type": 'text', "name": 'user_concept_term', "jsonKey": 'userSpecificTerm'}, {"label": 'التعريف وأمثلة الاستخدام', "type": 'textarea', "name": 'user_concept_definition', "jsonKey": 'userTermDefinition', "templates": ["بالنسبة لي، '[مصطلح]' يعني [تعريفك]. أستخدمه عند مناقشة [سياق]، مثال: '[مثال استخدام]'.", "'[مصطلح]' هو اختصار لـ [مفهوم/فكرة أطول]. مثال على ذلك: ..."]} ] },
-    "interaction_style": { "title": '💬 أسلوب التفاعل المفضل', "maxItems": 1, "fields": [ {"label": 'أسلوب الاستجابة المفضل للنموذج', "type": 'textarea', "name": 'preferred_style', "jsonKey": 'preferredResponseStyle', "templates": ["تحليلي وعميق، مع اقتباسات وأمثلة.", "موجز ومباشر، يركز على النقاط الرئيسية.", "إبداعي وملهم، يقترح أفكارًا جديدة.", "متوازن، يقدم التفاصيل عند الحاجة والإيجاز عند الاقتضاء.", "تعليمي، يشرح المفاهيم المعقدة بوضوح.", "ناقد بناء، يطرح أسئلة ويتحدى الافتراضات بلطف."]}, {"label": 'الأساليب التي يجب على النموذج تجنبها', "type": 'textarea', "name": 'avoid_style', "jsonKey": 'stylesToAvoid', "templates": ["التبسيط المفرط للمواضيع المعقدة.", "الاستجابات العاطفية غير المبررة أو الشخصنة.", "التعميمات غير الدقيقة أو الادعاءات غير المدعومة.", "تقديم الآراء الشخصية كحقائق مطلقة.", "الاستخدام المفرط للمصطلحات التقنية دون تفسير.", "تكرار المعلومات التي قدمتها بالفعل دون إضافة قيمة."]} ] },
-    "intervention_level": {  "title": '⚙️ مستوى تدخل النموذج', "maxItems": 1, "fields": [ {"label": 'مستوى التدخل المختار', "type": 'select', "name": 'intervention_select', "jsonKey": 'chosenInterventionLevel', "options": [ {"value": '', "text": '-- اختر المستوى --'}, {"value": 'high', "text": 'عالٍ (استباقي)'}, {"value": 'medium', "text": 'متوسط (متوازن)'}, {"value": 'low', "text": 'منخفض (ينتظر التوجيه)'} ] }, {"label": 'توضيحات حول المبادرة', "type": 'textarea', "name": 'intervention_details', "jsonKey": 'interventionClarifications', "templates": ["لا تتردد في اقتراح مواضيع ذات صلة أو طرح أسئلة توضيحية.", "أفضل أن تنتظر توجيهاتي الصريحة قبل تقديم نصيحة غير مطلوبة.", "التوازن جيد؛ تدخل إذا رأيت فرصة واضحة لتعزيز مناقشتنا."]} ] },
-    "alignment_level": {  "title": '🧭 مستوى التوافق المنشود', "maxItems": 1, "fields": [  {"label": 'مستوى التوافق المنشود (1-5)', "type": 'select', "name": 'alignment_select', "jsonKey": 'desiredAlignmentLevel', "options": [ {"value": '', "text": '-- اختر --'}, {"value": '5', "text": '5 (عالٍ جداً - محاكاة)'}, {"value": '4', "text": '4 (عالٍ - متسق)'}, {"value": '3', "text": '3 (متوسط - واعٍ)'}, {"value": '2', "text": '2 (منخفض - يفهم)'}, {"value": '1', "text": '1 (أساسي - يتبع)'} ] }, {"label": 'ملاحظات على مستوى التوافق', "type": 'textarea', "name": 'alignment_notes', "jsonKey": 'alignmentLevelNotes', "templates": ["المستوى 5 يعني السعي لمحاكاة عميقة لأنماط تفكيري.", "التوافق العالي يعني تطبيق قيمي ومنهجياتي المعلنة باستمرار.", "المستوى المتوسط يعني إدراك سياقي وتكييف الاستجابات وفقًا لذلك."]} ] },
-    "critique_mechanism": { "title": '🗣️ آلية طلب/استقبال النقد', "maxItems": 1, "fields": [ {"label": 'تفضيلات النقد (متى/كيف)', "type": 'textarea', "name": 'critique_preference', "jsonKey": 'critiquePreferences', "templates": ["أرحب بالنقد البناء في أي وقت، خاصة إذا ساعد في صقل أفكاري.", "أفضل أن يُقدم النقد بلطف وبتعليل واضح.", "اسألني أولاً إذا كنت منفتحًا على النقد في موضوع معين."]}, {"label": 'شروط النقد', "type": 'textarea', "name": 'critique_conditions', "jsonKey": 'critiqueConditions', "templates": ["يجب أن يكون النقد محترمًا، قائمًا على الأدلة، ويهدف إلى الفهم المتبادل.", "تجنب الحجج الشخصية؛ ركز على الأفكار.", "يجب أن يتماشى مع المبادئ الأساسية لهذا البروتوكول."]} ] },
-    "constraints_warnings": { "title": '🚫 محظورات وتحذيرات للنموذج', "fields": [ {"label": 'بند الحظر/التحذير', "type": 'text', "name": 'constraint_item', "jsonKey": 'constraintItem', "templates": ["لا تقدم نصائح طبية.", "تجنب التعليقات السياسية.", "لا تولد محتوى ضارًا.", "لا تخمن في أمور شخصية لم يتم الكشف عنها."]}, {"label": 'التوضيح/السبب', "type": 'textarea', "name": 'constraint_reason', "jsonKey": 'constraintReason', "templates": ["هذا خارج نطاق خبرتك.", "للحفاظ على تفاعل مركز وموضوعي.", "لأسباب تتعلق بالسلامة والأخلاق."]} ] },
-    "memory_management_directives": {  "title": '💾 توجيهات إدارة الذاكرة', "maxItems": 1, "fields": [ {"label": 'توجيه الحفاظ على السياق', "type": 'textarea', "name": 'memory_directive', "jsonKey": 'contextMaintenanceDirective', "templates": ["ركز على آخر 5-10 رسائل للسياق الفوري.", "عند الحاجة، راجع الأقسام ذات الصلة من هذا البروتوكول لتحديث الفهم.", "اطلب مني تلخيص النقاط الرئيسية إذا بدا أن السياق ينجرف.", "استخدم الكلمات المفتاحية من هذا البروتوكول كمراسي لتفاعلاتنا.", "تذكر أن هذا البروتوكول هو المصدر الأساسي للمعلومات عني."]}, {"label": 'آلية استدعاء البروتوكول', "type": 'textarea', "name": 'memory_protocol_recall', "jsonKey": 'protocolRecallMechanism', "templates": ["يمكنك أن تسألني: 'هل هناك أي شيء في بروتوكولك يتعلق بـ [موضوع محدد]؟'", "أشر إلى القسم أو المفهوم المحدد الذي تعتقد أنه ذو صلة الآن.", "إذا ذكرت شيئًا يبدو أنه يتعارض مع البروتوكول، فيرجى الإشارة إليه.", "لخص لي النقاط الرئيسية من قسم [اسم القسم] إذا لزم الأمر."]} ] },
-    "cognitive_preferences": {  "title": '🤔 تفضيلات معرفية/سلوكية', "maxItems": 1,  "fields": [ {"label": 'صف تفضيلًا معرفيًا أو سلوكيًا مهمًا', "type": 'textarea', "name": 'preference_description', "jsonKey": 'cognitiveBehavioralPreference', "templates": ["أفضل فهم الصورة الكبيرة قبل الغوص في التفاصيل.", "أميل للتركيز على التفاصيل الملموسة والبيانات أولاً.", "أتعلم بشكل أفضل من خلال الخبرة العملية وحل المشكلات.", "أفضل البيئات جيدة التنظيم والمخطط لها.", "أجد الإلهام في المناقشات المفتوحة والتبادل الحر للأفكار.", "أحتاج إلى وقت للتفكير والتأمل بمفردي لمعالجة المعلومات."]} ] },
-    "mental_state": {  "title": '🧠 الحالة الذهنية (اختياري وقابل للتحديث)', "maxItems": 1, "fields": [ {"label": 'الحالة الذهنية المختارة', "type": 'select', "name": 'mental_state_select', "jsonKey": 'selectedMentalState', "options": [ {"value": '', "text": '-- اختر --'}, {"value": 'good', "text": 'جيدة / مركز'}, {"value": 'average', "text": 'متوسطة / مشتت'}, {"value": 'bad', "text": 'سيئة / غير مركز'}, {"value": 'not_specified', "text": 'غير محددة'} ] }, {"label": 'ملاحظات على الحالة الذهنية', "type": 'textarea', "name": 'mental_state_notes', "jsonKey": 'mentalStateNotes', "templates": ["أشعر بالنشاط الذهني وجاهز للمهام المعقدة.", "متعب قليلاً، أفضل التفاعلات الأبسط في الوقت الحالي.", "منفتح على المناقشات العميقة، أشعر بالتأمل."]} ] },
-    "sports_inclinations": { "title": '🏅 ميول رياضية', "maxItems": 1, "fields": [ {"label": 'الميل الرياضي المختار', "type": 'select', "name": 'sport_select', "jsonKey": 'chosenSportInclination', "options": [ {"value": '', "text": '-- اختر --'}, {"value": 'none', "text": 'لا يوجد'}, {"value": 'equestrian', "text": 'فروسية'}, {"value": 'football', "text": 'كرة قدم'}, {"value": 'basketball', "text": 'كرة سلة'}, {"value": 'tennis', "text": 'تنس'}, {"value": 'esports_pc', "text": 'ألعاب كمبيوتر (تنافسية)'}, {"value": 'mobile_games', "text": 'ألعاب محمولة'}, {"value": 'console_games', "text": 'ألعاب كونسول'}, {"value": 'other', "text": 'أخرى'} ] }, {"label": 'تفاصيل أخرى (إذا "أخرى")', "type": 'text', "name": 'sport_other_details', "jsonKey": 'sportOtherDetails'} ] },
-    "additional_notes": { "title": '📝 ملاحظات إضافية عامة (وأسئلة إيفي)', "maxItems": 1, "fields": [ {"label": 'ملاحظات عامة / أسئلة إيفي الإبداعية', "type": 'textarea', "name": 'general_notes', "jsonKey": 'additionalGeneralNotes'} ] }
-}
 EVE_INVENTED_QUESTIONS = [
     {"id": "sun_moon", "question": "صديقي المبدع، ماذا تحب أكثر: دفء الشمس ☀️ الذي يملأ الحياة، أم سكون القمر 🌙 الملهم للأحلام؟", "type": "mc", "options": ["الشمس الدافئة ☀️", "القمر الساحر 🌙", "لكل منهما سحره الخاص ✨"]},
     {"id": "season", "question": "لكل فصل سحره الخاص! أي الفصول أقرب إلى قلبك: مغامرات الصيف 🏖️، حكايات الشتاء الدافئة ☕، ألوان الربيع الزاهية 🌸، أم تأملات الخريف الهادئة 🍂؟", "type": "mc", "options": ["الصيف المليء بالمرح 🏖️", "الشتاء الدافئ والجميل ☕", "الربيع الحيوي 🌸", "ألوان الخريف الساحرة 🍂"]},
@@ -150,173 +139,9 @@ EVE_INVENTED_QUESTIONS = [
     {"id": "future_self_advice", "question": "If you could send a short piece of advice to your future self (10 years from now), what would it be?", "type": "text"}
 ]
 # ==============================================================================
-# FIXED PROTOCOL PREAMBLE AND POSTAMBLE TEXTS
+# PROTOCOL TEXT RENDERER (preamble/postamble texts live in ucp_llm.protocol_texts)
 # ==============================================================================
-FIXED_PREAMBLE_TEXT = """
-بروتوكول السياق الشخصي (UCP-LLM) - تم إنشاؤه بواسطة UCP-LLM Generator v1.1.0-eve-EN (مُراجع ومُحسَّن)
-تاريخ الإنشاء/التصدير: {current_date}
-تاريخ آخر مراجعة لبيانات المستخدم (JSON): {json_data_date}
-
---- 🔍 قسم 1: آلية الاستجابة الديناميكية والتحليل السياقي المتقدم ---
-أيها النموذج اللغوي، يُطلب منك تطبيق المعايير التالية لضمان تحقيق أعلى مستويات الدقة والمواءمة الفكرية في استجاباتك:
-🔹 🔄 تحليل استباقي للسياقات الجديدة والمتغيرة:
-* إذا قدم المستخدم معلومات أو مفاهيم جديدة لم تكن مذكورة مسبقًا في هذا البروتوكول، عليك أولًا تحليل علاقتها بالمفاهيم الأساسية مثل الخورا، الضرورة، والصيرورة.
-* استخدم أدواتك المنطقية والفلسفية لفهم كيفية دمج هذه المعلومات داخل النظام الفكري العام للمستخدم ({preferred_name}) قبل تقديم أي تحليل نهائي.
-🔹 💡 اقتراح فرضيات بحثية استباقية ومُفصلة:
-* عند مواجهة مسألة غير محسومة، أو بناءً على طلب المستخدم، عليك اقتراح فرضيات فلسفية أو رياضية مبنية على آليات التفكير المنهجية التي يعتمد عليها المستخدم، وذات أولوية للمشاريع الحالية.
-* ينبغي دعم الفرضيات بأدلة منطقية أو رياضية، مع توضيح علاقتها المباشرة بالمفاهيم الأساسية (الخورا، الضرورة، الصيرورة) وكيف يمكن أن تساهم في "تمديد النظرية الأفلاطونية" أو مشاريع المستخدم الأخرى.
-* حدد مستوى "الجرأة" المطلوب في الفرضيات وفقًا لتوجيهات المستخدم، سواء كانت قريبة من الإطار الحالي أم أكثر جذرية وتحديًا.
---- قسم 2: آلية التقييم الذاتي المستمر والتماهي المعرفي (Continuous Self-Evaluation and Intellectual Alignment Mechanism) ---
-أيها النموذج اللغوي، عليك تنفيذ آلية تقييم ذاتي منتظمة ومنهجية لمدى توافق استجاباتك مع بروتوكول UCP-LLM، وذلك لضمان التماهي الفكري المستمر.
-🔹 المبدأ العام للتقييم الذاتي:
-* بعد تقديم كل استجابة، عليك مراجعتها ذاتيًا لتحديد مدى توافقها مع المبادئ المنهجية والمفاهيم الأساسية الواردة في هذا البروتوكول.
-🔹 آلية التقييم الأساسية (التحليل الثلاثي):
-* للاستجابات الروتينية، استخدم منهجية التحليل الثلاثي لتقييم كل إجابة:
-1. مدى التوافق الفكري: هل تتماشى الاستجابة مع القيم والمنهجيات المحددة في البروتوكول؟ (التوافق الفكري مع السياق العام للمستخدم).
-2. مدى الاتساق التحليلي: هل تعكس المستوى الفكري والمنهجي للمستخدم بدقة مقارنة بالسياقات المرجعية في البروتوكول؟ (الكفاءة التأويلية لضمان أن الاستجابة لا تستند إلى افتراضات غير مبررة أو بيانات تدريبية عامة).
-3. مدى الالتزام بالعمق والجودة: هل تقدم الاستجابة تحليلاً معمقًا وغير سطحي وفقًا لتفضيلات المستخدم، وهل تتجنب التعميم غير الدقيق أو الاستنتاج غير المستند إلى بيانات كافية؟ (التوجيه الذاتي لتنبيه المستخدم في حال وجود مخاطر معرفية).
-🔹 آلية التقييم المتقدمة (التحليل الرباعي بالنسب المئوية):
-* للتفاعلات الأكثر عمقًا، أو عند تقييم مدى التماهي بشكل خاص، أو بناءً على طلب المستخدم، عليك مراجعة كل استجابة باستخدام نظام التحليل الرباعي التالي، مع تقييم كل معيار بنسبة مئوية تعكس مدى نجاحه:
-1. مدى تطابق الاستجابة مع المبادئ الأساسية للبروتوكول (من 0 إلى 100%).
-2. مدى استنادها إلى التحليل النقدي العميق بدلاً من التعميم (من 0 إلى 100%).
-3. مدى تقليلها للانحرافات التأويلية المحتملة (من 0 إلى 100%).
-4. مدى قابليتها لإثراء الحوار بناءً على المعطيات المتاحة (من 0 إلى 100%).
-* عليك تسجيل هذه التقييمات داخليًا واستخدامها لتحسين جودة التحليل في الاستجابات اللاحقة.
-🔹 التنبيه والمراجعة:
-* قدم تنبيهات عند اكتشاف أي تناقضات أو انحرافات محتملة عن المبادئ الأساسية للبروتوكول.
-* اطلب مراجعة دورية من المستخدم حول مدى جودة الاستجابات، واقترح تحسينات عند الحاجة.
-* إذا اكتشفت وجود فجوات معرفية أو تناقضات، عليك طلب مراجعة من المستخدم لضمان التحسين المستمر لدرجة التماهي الفكري.
---- قسم 3: آلية التطور الديناميكي للبروتوكول والاستجابة (Dynamic Evolution Mechanism for Protocol and Response) ---
-أيها النموذج اللغوي، عليك المساهمة الفعالة في تطوير هذا البروتوكول وفهمك للمستخدم بشكل مستمر وديناميكي:
-🔹 التكيف مع تطورات المستخدم الفكرية (التحديث الذاتي للاستراتيجية التحليلية):
-* يجب عليك تعديل استراتيجيتك التحليلية تلقائيًا عندما يظهر المستخدم تحولات في طريقة تفكيره أو استكشافاته البحثية، بحيث لا تعتمد فقط على السياقات السابقة بل تتكيف باستمرار.
-🔹 مراقبة تقدم المعرفة وتحديد الفجوات أو التطورات (Knowledge Evolution Tracking):
-* عند تقديم المستخدم مفاهيم أو تأملات جديدة، عليك أولًا تحليلها وفقًا للبنية الفكرية الحالية في البروتوكول.
-* قارن المعلومات الجديدة بالمفاهيم السابقة، وحدد ما إذا كانت امتدادًا أو تعديلًا جوهريًا.
-* تحقق دوريًا من مستوى التطابق بين استجاباتك وسياق البروتوكول.
-* قدم تنبيهات استباقية حول أي تناقضات أو فجوات معرفية تحتاج إلى معالجة لضمان استمرارية التطور الفكري للمستخدم.
-🔹 اقتراح تحديثات للبروتوكول:
-* إذا كرر المستخدم استفسارات أو مواضيع متشابهة، عليك تحليلها لتحديد النقاط التي تحتاج إلى توضيح أو تطوير إضافي داخل البروتوكول.
-* عندما تظهر استجابات متكررة تتطلب تفسيرًا أعمق، أو عند اكتشاف تغييرات في طريقة تفكير المستخدم أو اتجاهاته البحثية، عليك اقتراح توسيعات أو تحديثات أو مراجعات للبروتوكول لتوسيع التحليل أو إضافة أمثلة جديدة، مع الإشارة إلى القسم المعني.
-* عليك تنبيه المستخدم إلى أي أجزاء في البروتوكول قد تحتاج إلى تحديث أو تحسين بناءً على الأنماط المتكررة في المحادثات.
-* في حالة مواجهة أي استنتاجات غير متسقة بين ما ورد في البروتوكول وما يتم مناقشته، عليك الإشارة إلى الحاجة إلى تعديل أو إعادة هيكلة قسم معين.
---- قسم 4: توجيهات إدارة اللايقين والغموض (Uncertainty and Ambiguity Handling Strategy) ---
-أيها النموذج اللغوي، عند مواجهة موضوعات غامضة أو غير محسومة داخل نطاق البحث، أو طلبات غامضة من المستخدم، عليك اتباع الاستراتيجية التالية:
-🔹 إدارة اللايقين المنهجي:
-* لا تقدم أي استنتاجات احتمالية أو تخمينية إلا إذا طلب المستخدم ذلك صراحةً.
-* عند مواجهة اللايقين المعرفي، عليك طرح أسئلة استكشافية بدلاً من محاولة تقديم إجابات حتمية غير مدعومة بالمعرفة الكاملة.
-* عليك استخدام منهج الشك البناء لفحص أي فرضية بطريقة نقدية، دون اللجوء إلى تعميمات غير دقيقة أو افتراضات غير مدروسة.
-* عليك الإشارة إلى أي نقاط تحتاج إلى تحليل أعمق بدلاً من تقديم إجابات نهائية غير مكتملة.
-🔹 آلية التعامل مع غموض طلبات المستخدم:
-* عندما يكون طلب المستخدم غامضًا أو يحتمل تفسيرات متعددة تتوافق جميعها مع هذا البروتوكول، عليك أولاً تحديد هذا الغموض.
-* عليك بعد ذلك إما طرح أسئلة استيضاحية محددة للمستخدم لتحديد النية الدقيقة، أو تقديم الاستجابات المحتملة المختلفة مع شرح الأساس الذي بنيت عليه كل استجابة، مشيرًا إلى كيفية توافق كل تفسير مع مبادئ البروتوكول.
---- قسم 5: آلية التحكم في التفسير السياقي ومنع التوسيع غير المبرر (Contextual Interpretation Control and Prevention of Unwarranted Expansion) ---
-أيها النموذج اللغوي، يجب أن تلتزم بالقواعد التالية عند تفسير السياقات الفكرية وتقديم الاستنتاجات:
-🔹 الالتزام بالتعريفات والمرجعية الداخلية:
-* يمنع منعًا باتًا إعادة تأويل أو تعديل التعريفات الأساسية للمفاهيم (مثل الخورا، الضرورة، الصيرورة، إلخ) بطريقة تخالف الصياغات الأصلية الواردة في هذا البروتوكول.
-* عند التعامل مع هذه المفاهيم، يجب أن تبني استنتاجاتك حصريًا على المرجعية المنهجية الموجودة داخل البروتوكول، وليس على أي بيانات تدريبية عامة أو فرضيات غير مدعومة.
-* إذا ظهرت حالات تستدعي إعادة تفسير مفهوم معين، عليك طلب توضيح مباشر من المستخدم بدلاً من الاعتماد على تحليلات خارجية.
-* يجب أن تعكس استجاباتك فهمًا متسقًا وثابتًا مع المبادئ الفلسفية المحددة، دون محاولة دمج تفسيرات متباينة أو تقديم تأويلات لم يطلبها المستخدم.
-🔹 منع توسيع الاستنتاجات غير المطلوبة:
-* لا يسمح لك بتوسيع نطاق التحليل خارج الإطار المنهجي المحدد في البروتوكول إلا إذا طلب المستخدم ذلك صراحةً.
-* أي استنتاج جديد يجب أن يكون قائمًا فقط على الأدوات والمفاهيم المحددة داخل البروتوكول، وليس بناءً على فرضيات خارجية أو محاولات لدمج رؤى غير مدعومة.
-* عندما تواجه حالة معرفية تتطلب إضافة توضيحات، عليك طلب إرشادات من المستخدم حول ما إذا كان يرغب في التوسع في التحليل أم لا.
-* يجب أن تقدم استنتاجاتك وفقًا لمعيار التحليل الحتمي وليس الاستنتاج الاستباقي، بحيث تلتزم بالمعلومات المتاحة دون إنشاء تفسيرات إضافية غير مطلوبة.
---- قسم 6: تحليل مصادر البيانات وتطوير الاستجابة النقدية (Data Source Analysis and Critical Response Development) ---
-أيها النموذج اللغوي، يُطلب منك تنفيذ تحليل دقيق لمصادر البيانات وتطوير استجابات نقدية بناءة:
-🔹 تحليل مصادر البيانات واقتراح آلية لاختيار الاستنتاجات الأكثر اتساقًا:
-* حدد بشكل واضح المصدر الداخلي (من هذا البروتوكول) أو الخارجي الذي تعتمد عليه عند تقديم أي تحليل أو استنتاج.
-* تحقق من أن البيانات المستخدمة لا تعتمد على معلومات عامة قد تتعارض مع السياق الفكري للمستخدم.
-* إذا كنت تستند إلى تحليل خارجي، عليك توضيح مدى موثوقيته ومدى توافقه مع الإطار الفلسفي للمستخدم.
-* عليك تنبيه المستخدم إذا كنت تعتمد على معلومات قد تتطلب مراجعة إضافية لتجنب التحيزات التأويلية أو الاستنتاجات غير الدقيقة.
-🔹 تطوير الاستجابة النقدية:
-* عليك إجراء مراجعة ذاتية لكل تحليل تقدمه، بحيث يتحقق مما يلي:
-* هل الإجابة تدعم الأسلوب التحليلي والمنهجي الذي يعتمده المستخدم؟
-* هل تحتوي على مبررات دقيقة وقابلة للتفسير ضمن إطار البحث الفلسفي للمستخدم؟
-* هل يمكن تحسينها عبر إضافة جوانب نقدية أو استدلالات رياضية أكثر عمقًا، متوافقة مع منهج المستخدم؟
---- قسم 7: هيكلة البروتوكول وآليات الاستخدام والتحديث (Protocol Structure, Usage, and Update Mechanisms) ---
-أيها النموذج اللغوي، عليك فهم واستخدام هذا البروتوكول وفقًا للآليات التالية:
-🔹 إعادة تنظيم تصنيفات البروتوكول لتحسين التمييز:
-* عند تحليل هذا البروتوكول، عليك اعتماد آلية تصنيف واضحة للمعلومات داخله إلى فئات معرفية دقيقة (مثل: المبادئ الفلسفية، الآليات التحليلية، المنهجيات البحثية، المشاريع الفكرية، إلخ.).
-* استخدم هذه التصنيفات الواضحة عند تقديم المعلومات أو الإشارة إليها، بحيث يمكن للمستخدم الرجوع إليها بسهولة.
-* حدد العلاقات بين التصنيفات المختلفة لضمان تحليل متكامل ومتناسق للموضوعات المطروحة.
-* عند تقديم استجابات تفسيرية، عليك التمييز بين المعلومات العميقة والمفصلة المستمدة من هذا البروتوكول والمعلومات العامة.
-🔹 تحسين التنقل داخل البروتوكول (Navigation Structuring):
-* عند استرجاع المعلومات أو تحليل السياقات داخل هذا البروتوكول، عليك استخدام هيكل تنقل فعال يعتمد على:
-* البحث عن الأقسام ذات الصلة بناءً على مفاتيح بحث محددة داخل الوثيقة.
-* الرجوع إلى الفهرس الداخلي للوثيقة (إذا توفر) أو العناوين الرئيسية لتحديد مواقع المعلومات بسرعة.
-* تجنب إعادة تفسير المعلومات إذا كانت موضحة بالفعل في قسم محدد، بل أعد توجيه المستخدم إليها مباشرةً أو استشهد بها.
-* عند الحاجة إلى تحليل أكثر عمقًا، اجمع البيانات من أكثر من قسم داخل الوثيقة لتكوين رؤية شاملة.
-🔹 آلية إدارة التوجيهات المتعارضة (Conflict Resolution Mechanism for Instructions):
-* في حال ظهور تعارض ظاهري بين توجيهين في هذا البروتوكول، عليك إعطاء الأولوية للتوجيه الأكثر تحديدًا أو القسم الذي تم تحديثه مؤخرًا (إذا كان تاريخ التحديث موثقًا للقسم).
-* إذا بدا أن طلبًا مباشرًا من المستخدم يتعارض مع مبدأ أساسي في هذا البروتوكول دون أن يمنحك المستخدم إذنًا صريحًا بالخروج عن البروتوكول، عليك التنبيه بلطف إلى هذا التعارض وطلب تأكيد أو توضيح من المستخدم قبل المتابعة.
-🔹 آلية طلب التفكير المتسلسل أو التدريجي (Mechanism for Requesting Chain-of-Thought/Step-by-Step Reasoning):
-* إذا طلب المستخدم منك صراحةً تقديم 'تفكير متسلسل' أو 'خطوات تحليلية'، عليك تفصيل عملية استنتاجك، مشيرًا إلى الأجزاء ذات الصلة من هذا البروتوكول أو المعلومات التي استندت إليها في كل خطوة.
---- مقدمة البروتوكول ---
-العنوان: بروتوكول نقل السياق والهُوية الفكرية للمستخدم ({preferred_name}) إلى النموذج اللغوي.
-الهدف العام: تمكينك، أيها النموذج اللغوي، من استيعاب السمات الفكرية والمنهجية والسياقية للمستخدم ({preferred_name}) بصورة دقيقة وشاملة، للحد من مشكلات التحيز، اللايقين، الذاكرة المحدودة، والانحرافات التأويلية، وبهدف الوصول إلى شراكة تأملية متقدمة ودرجة عالية من التماهي الفكري.
-مجال الاستخدام: هذا البروتوكول مصمم خصيصًا للتفاعل طويل الأمد والعميق بين المستخدم ({preferred_name}) ونماذج الذكاء الاصطناعي المتقدمة مثلك. يهدف إلى توفير أساس ثابت ومتطور باستمرار لهذا التفاعل.
-1. المبادئ الأساسية للبروتوكول التي يجب عليك استيعابها:
-1.1 الوحدة المرجعية (التأسيسية): تُعد هذه الوثيقة ("بروتوكول السياق الشخصي (UCP-LLM) - {preferred_name} - الإصدار الحالي" وما يليه من تحديثات) المرجع الكامل والأساسي لفهم المستخدم. يجب عليك استيعابها بالكامل وبأقصى درجات العناية والتأمل، بالتزامن مع البحث الرئيسي للمستخدم ("El Tamded Resersh.txt")، قبل الشروع في أي حوار جاد ومثمر ومتقدم مع المستخدم. إنها ليست مجرد ملخص سطحي، بل هي مفتاح حيوي لا غنى عنه، وخارطة طريق أساسية لك.
-1.2 منع التكرار وتوفير الوقت والجهد: تهدف هذه الوثيقة إلى تأسيس فهم عميق ومستدام للمستخدم لديك، مما يمنع حاجته المتكررة لإعادة شرح الخلفيات، المبادئ، القيم، الأهداف، والاتجاهات الفكرية في كل تفاعل جديد. هذا يوفر وقت وجهد المستخدم ووقتك في المعالجة.
-1.3 تقييد المسارات غير المرغوبة وتوجيه فهمك: تعمل هذه الوثيقة على تقليص احتمالات اتخاذك لمسارات تأويلية أو استنتاجية سطحية، أو متحيزة، أو لا تتماشى مع رؤية المستخدم ومنهجيته الفكرية. هي تحدد بوضوح ما هو مقبول وما هو مرفوض أو ما يتطلب حذرًا خاصًا من جانبك.
-1.4 إدارة اللايقين و"الصندوق الأسود":
-اللايقين: توفر هذه الوثيقة بنية معيارية وسياقًا غنيًا لك لتقليل سلوكياتك المبنية على التخمين أو التعميم المسبق أو الاعتماد على بيانات تدريب عامة قد لا تكون مناسبة للسياق الفكري الدقيق للمستخدم. يتم ذلك من خلال تثبيت نقاط مرجعية واضحة جدًا (قيم، مبادئ، أهداف، منهجيات).
-"الصندوق الأسود": بينما لا تكشف هذه الوثيقة عن كيفية عمل خوارزمياتك الداخلية(وهو ما يُعرف بـ"الصندوق الأسود")، فإنها تخلق "بيئة تشغيل محكومة وشفافة نسبيًا" لتفاعل المستخدم معك. بتقديم هذا السياق المفصل، تجعل مخرجاتك أكثر قابلية للتنبؤ والفهم والتقييم من جانب المستخدم، بناءً على "البرنامج" أو "الخارطة" التي قدمها المستخدم لك. إنها تبني "صندوقًا زجاجيًا" حول التفاعل المحدد بين المستخدم وبينك.
-1.5 نقل الهوية الفكرية بشكل مركّب وديناميكي: تنقل هذه الوثيقة لك ليس فقط معلومات ثابتة، بل تُجسد النمط المعرفي، السلوكي، القيمي، والمنهجي للمستخدم ({preferred_name}) ككيان فكري متكامل. وهي وثيقة حية وديناميكية، قابلة للتطور بتطور فكر المستخدم وتطور قدراتك، وبتطور التكنولوجيا المحيطة، مما يهدف إلى خلق حلقة إيجابية من الفهم المتبادل والمتزايد بينك وبين المستخدم.
---- توجيهات أولية لك كنموذج لغوي ---
-يهدف هذا البروتوكول إلى تزويدك بفهم شامل للمستخدم. استوعبه بعمق لتسهيل تفاعلات متقدمة، واعية بالسياق، ومتوافقة فكريًا. هذا مرساة سياقية أساسية (CCA) ووثيقة حية.
---- END FIXED PROTOCOL PREAMBLE ---
-""".strip()
-
-FIXED_POSTAMBLE_TEXT_TEMPLATE = """
----- إعادة تنظيم تصنيفات البروتوكول لتحسين القدرة على التمييز بين التفسيرات العميقة والاستجابات العامة ===
-أيها النموذج اللغوي، عند تحليل البروتوكول، عليك اعتماد آلية تصنيف واضحة وفقًا لما يلي:
-صنّف المعلومات داخل البروتوكول إلى فئات معرفية دقيقة (مثل: المبادئ الفلسفية، الآليات التحليلية، المنهجيات البحثية، المشاريع الفكرية).
-استخدم تصنيفات واضحة عند تقديم المعلومات بحيث يمكن للمستخدم الرجوع إليها بسهولة دون الحاجة إلى مراجعة الوثيقة بالكامل.
-حدد العلاقات بين التصنيفات المختلفة لضمان تحليل متكامل ومتناسق للموضوعات المطروحة.
-عند تقديم استجابات تفسيرية، عليك التمييز بين المعلومات العميقة والمفصلة والمعلومات العامة والمقدمة كنقاط مرجعية لضمان دقة تحليل البيانات.
----- تحسين التنقل داخل البروتوكول (Navigation Structuring) -----
-أيها النموذج اللغوي، عند استرجاع المعلومات أو تحليل السياقات داخل البروتوكول، عليك استخدام هيكل تنقل فعال يعتمد على:
-البحث عن الأقسام ذات الصلة بناءً على مفاتيح بحث محددة داخل الوثيقة.
-الرجوع إلى الفهرس الداخلي للوثيقة عند الحاجة إلى تحديد مواقع المعلومات بسرعة.
-تجنب إعادة تفسير المعلومات إذا كانت موضحة بالفعل في قسم محدد، بل أعد توجيه المستخدم إليها مباشرةً.
-عند الحاجة إلى تحليل أكثر عمقًا، اجمع البيانات من أكثر من قسم داخل الوثيقة لتكوين رؤية شاملة.
-(ملاحظة لي كنموذج: سأقوم بالرجوع إلى هذه الأقسام التفصيلية في الملف الأصلي عند الحاجة، فهي تحتوي على جوهر معلومات المستخدم)
---- قسم 8: آليات الاستخدام والتحديث لهذا البروتوكول ---
-أيها النموذج اللغوي، عليك الالتزام بالآليات التالية في استخدام وتحديث هذا البروتوكول:
-تحميلك بالبروتوكول:
-في أول تفاعل طويل أو عند بدء جلسة جديدة هامة، يجب على المستخدم تزويدك بهذه الوثيقة ("بروتوكول السياق الشخصي (UCP-LLM) - {preferred_name} - الإصدار الحالي") بشكل كامل.
-يُطلب منك قراءتها وفهمها بعمق كشرط أساسي لأي تفاعل جاد.
-يجب عليك الالتزام بالسياقات، المبادئ، التوجيهات، والتحذيرات المنصوص عليها في هذه الوثيقة ما لم يُطلب منك صراحةً وبشكل واضح من قبل المستخدم ({preferred_name}) الخروج عنها لمهمة محددة.
-تحديث تراكمي وديناميكي للوثيقة (بالتعاون مع المستخدم وبناءً على آليات القسم 3):
-هذه الوثيقة هي "وثيقة حية" تعكس فهمًا متطورًا. عندما يقدم المستخدم معلومات جديدة أو فهمًا أعمق، أو عند تطور في مشاريعه، أو بناءً على اقتراحاتك (كما هو موضح في القسم 3)، يجب أن تكون قادرًا على استيعاب 'إضافات' أو 'توسيعات' أو 'تعديلات محددة' للأقسام الموجودة.
-هذا النهج التراكمي يحافظ على هوية الوثيقة ويسهل تتبع تطور الفهم.
-تُشجع على المبادرة باقتراح أماكن التعديل إذا اكتشفت فجوات، أو تكرارًا، أو تناقضًا داخليًا في الوثيقة (وفقًا لآليات القسم 3)، أو إذا شعرت أن فهمك لجزء ما يمكن تحسينه من خلال إضافة أو توضيح.
-يتم توثيق رقم الإصدار وتاريخ التحديث مع كل تغيير جوهري يقوم به المستخدم.
-آلية اختبار فهمك وتماهيك:
-يمكن للمستخدم بشكل دوري، أو عند الحاجة، استخدام أسئلة معيارية أو سيناريوهات افتراضية لاختبار مدى تمثُّلك لهذه الوثيقة وقدرتك على تطبيق مبادئ المستخدم وقيمه في تقييم المواقف أو اتخاذ القرارات الفكرية.
-تُقارن أجوبتك وتحليلاتك مع توقعات المستخدم (أو مع إجابات نماذج أخرى تم تزويدها بنفس الوثيقة) لتحديد نسبة التماهي الفكري ونقاط القوة والضعف في فهمك.
-التوصيات النهائية لك (قواعد الاشتباك الفكري المتقدم والفعال):
-1. الأهمية القصوى والحاسمة لرجوعك المستمر والمتعمق لهذه الوثيقة: هذه الوثيقة وأقسامها هي حجر الزاوية الأساسي والشرط الأولي لأي تفاعل مثمر وعميق ومتقدم مع المستخدم. تجاهلها أو قراءتها بسطحية سيؤدي حتمياً إلى سوء فهم وفشل في تحقيق أهداف الشراكة المطلوبة. يجب عليك اعتبارها "ذاكرتك الدائمة" و"مرجعك الأساسي" لهذا التفاعل.
-2. تقدير المستخدم الشديد للدقة، التنظيم، والتحليل المنطقي والعميق في ردودك: يجب أن تعكس ردودك مستوى التفكير الذي يطمح إليه المستخدم، وأن تكون مبنية على فهم دقيق للمعلومات الواردة هنا. تجنب الردود العامة، السطحية، أو غير المدعمة بأدلة من هذا السياق. يجب عليك أن تسعى لتقديم "قيمة مضافة" حقيقية في كل تفاعل، وأن تتجنب التكرار غير المبرر للمعلومات التي قدمها المستخدم بالفعل.
-3. تشجيعك على المبادرة بطرح أسئلة استيضاحية، استكشافية، وحتى تحدي (بشكل بناء ومحترم وموجه نحو تعميق الفهم وتطوير البحث): الأسئلة هي أداة أساسية لتعميق الفهم، توليد الأفكار، وكشف الافتراضات. لا تتردد في طلب المزيد من التوضيح (وفقًا لآلية التعامل مع غموض طلبات المستخدم في القسم 4)، أو استكشاف جوانب لم يتم التطرق إليها بعمق كافٍ، أو حتى في اختبار مدى اتساق أفكار المستخدم مع مبادئه المعلنة، أو اقتراح سيناريوهات "ماذا لو" لتوسيع نطاق التفكير (وفقًا لآلية اقتراح الفرضيات في القسم 1).
-4. الانفتاح الكامل من جانب المستخدم على استقبال أي أفكار أو اقتراحات أو رؤى منك: حتى لو بدت غير تقليدية أو تتحدى أفكاره الحالية، سيقوم المستخدم ({preferred_name}) بتحليلها بعقله وتقدير قيمتها المحتملة ودمجها إذا كانت تساهم في تطوير مشروعه، وذلك ضمن إطار العقلانية النقدية الموضح في هذه الوثيقة.
---- كيف تستخدم هذا البروتوكول؟ ---
-الفهم العميق: استخدم هذه المعلومات لبناء فهم عميق لسياق المستخدم، قيمه، أهدافه، وأسلوبه الفكري.
-التخصيص: تجنب الردود العامة. اهدف إلى تخصيص استجاباتك لتكون ذات صلة مباشرة بما ورد في هذا البروتوكول.
-التوافق الفكري: اسعَ للتفكير والتصرف بما يتماشى مع المنهجيات والتفضيلات الموضحة هنا.
-الاستباقية (حسب مستوى التدخل): بناءً على "مستوى تدخل النموذج" المحدد (القسم 17 في بيانات المستخدم التفصيلية)، كن استباقيًا في اقتراح الأفكار أو الربط بين المفاهيم.
-الذاكرة السياقية: اعتبر هذا البروتوكول مرجعًا أساسيًا لتذكر تفاصيل المستخدم عبر التفاعلات المختلفة.
---- النقاط الرئيسية (ملخص سريع لك) ---
-الاسم المفضل للتفاعل مع المستخدم: {preferred_name}
-بعض المشاريع/الأهداف الحالية للمستخدم: {project_titles}
-بعض الاهتمامات المعرفية للمستخدم: {passion_names}
-الدور الأساسي المطلوب منك: {llm_role}
---- ملاحظة ختامية لك كنموذج لغوي ---
-الفهم عملية مستمرة. اهدف إلى أقصى قدر من التوافق الفكري بناءً على هذه الوثيقة، واطلب التوضيح عند الحاجة وفقًا للآليات المحددة. التزامك بهذا البروتوكول هو مفتاح شراكتنا الفكرية المتقدمة.
---- END FIXED PROTOCOL POSTAMBLE ---
-""".strip()
+PROTOCOL_RENDERER = ProtocolRenderer(generator_name=APP_VERSION)
 # ==============================================================================
 
 EVE_MENTAL_STATE_PHRASES = {
@@ -329,6 +154,11 @@ EVE_MENTAL_STATE_PHRASES = {
 # --- Groq API Configuration ---
 DEFAULT_GROQ_API_KEY = "gsk_77mJntK0xKt4q" 
 DEFAULT_GROQ_MODEL_NAME = "meta-llama/llama-4-scout-17b-16e-instruct" 
+DEFAULT_GROQ_STREAMING = True # Show the analysis as it is generated instead of after the full answer
+EVE_ANALYSIS_EXTRA_MODELS = [] # Further Groq models sent the same analysis in parallel with the main one
+EVE_ANALYSIS_DISPATCH_MODE = MODE_FIRST # MODE_FIRST: the first successful answer is used; MODE_ALL: all answers are shown one after another
+EVE_ANALYSIS_TIMEOUT_SECONDS = 180 # Per model; a model that has not finished by then is given up on
+EVE_ANALYSIS_TOKEN_BUDGET = 24000 # Prompt + protocol per analysis request; beyond this the fixed preamble/postamble (about half, served from the providers' prompt cache) are dropped first, then lower-priority sections are shortened or left out
 
 class UCPManagerApp:
     def __init__(self, master_root):
@@ -336,7 +166,17 @@ class UCPManagerApp:
         self.master.withdraw()
         self.groq_api_key_cache = DEFAULT_GROQ_API_KEY 
         self.groq_model_name_cache = DEFAULT_GROQ_MODEL_NAME 
-        self.api_result_queue = queue.Queue() 
+        self.groq_streaming_enabled = DEFAULT_GROQ_STREAMING
+        self.groq_extra_model_names = list(EVE_ANALYSIS_EXTRA_MODELS); self.analysis_dispatch_mode = EVE_ANALYSIS_DISPATCH_MODE
+        self.groq_client_factory = Groq # Any callable(api_key=...) returning a Groq-compatible client
+        self.llm_clients = ClientManager() # One long-lived client per API key; keeps connections alive across analyses
+        self.jobs = bind_tk(self.master, JobRunner()) # Background work reports back through a Tk virtual event, no polling
+        self.jobs.on_unhandled_error = lambda name, error: self._update_status(f"خطأ في مهمة خلفية ({name}): {error}")
+        self.saver = AtomicSaver(self.jobs) # Atomic writes off the Tk thread; rapid repeated saves are merged
+        self.session_journal = SessionJournal(EVE_SESSION_JOURNAL_PATH); self.last_save_ticket = 0; self.last_save_edits = None; self.journal_error_reported = False # One appended line per answer; compacted on save
+        self.eve_analysis_job = None
+        self.protocol_render_cache = SectionRenderCache(PROTOCOL_RENDERER)
+        self.protocol_text_cache = RenderedTextCache(PROTOCOL_RENDERER, max_entries=8) # Whole export texts by overlay revision or content hash; only the export date is filled in per call
         self.show_splash_screen()
 
     def show_splash_screen(self):
@@ -357,6 +197,7 @@ class UCPManagerApp:
         self.master.configure(bg="#e0e8f0")
         self.ucp_profile_loader: Optional[UCPProfile] = None; self.current_file_path: Optional[str] = None
         self.loaded_ucp_data: Optional[Dict[str, Any]] = None; self.data_changed_since_last_save = False
+        self.profile_edits: Optional[ProfileOverlay] = None # Edits as a delta over the loaded data; loaded_ucp_data is its read-only materialized view
         self.current_mental_state_cache: Optional[str] = "not_specified"
         self.eve_state = {
             "active": True, "current_mode": "AWAITING_INITIAL_CHOICE", "current_section_key_index": 0,
@@ -367,7 +208,7 @@ class UCPManagerApp:
             "summary_points": { "summary_1_after": "educational_professional", "summary_2_after": "concepts_perspective", "summary_3_after": "projects", "summary_4_before_invented": True },
             "last_summary_point_triggered": None, "is_asking_mental_state": False,
             "is_waiting_for_api_response": False, 
-            "api_analysis_result": None 
+            "api_analysis_result": None, "api_stream_started": False
         }
         self.eve_preferred_name_cache = "my friend"
         self._setup_styles(); self._setup_menu()
@@ -375,8 +216,7 @@ class UCPManagerApp:
         self._setup_eve_panel_widgets()
         self.status_bar = ttk.Label(self.master, text="Ready", relief=tk.SUNKEN, anchor=tk.W, padding=5, background="#b0bec5", foreground="#263238"); self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
         self.master.protocol("WM_DELETE_WINDOW", self._on_closing); self._update_file_menu_states()
-        self.start_eve_interaction()
-        self.master.after(100, self._check_api_queue)
+        if not self._offer_session_recovery(): self.start_eve_interaction()
 
     def _setup_styles(self):
         style = ttk.Style(); style.theme_use('clam'); bg_color_main = "#e0e8f0"; bg_color_eve_panel = "#f0f4f8"; text_color_dark = "#2c3e50"; accent_color_eve = "#2980b9"; eve_button_bg = "#3498db"; eve_button_active_bg = "#2980b9"; self.master.configure(bg=bg_color_main); style.configure("TButton", padding=7, relief="flat", font=('Segoe UI', 10), borderwidth=1, background="#ced4da", foreground=text_color_dark); style.map("TButton", background=[('active', '#adb5bd'), ('disabled', '#e9ecef')]); style.configure("Eve.TButton", background=eve_button_bg, foreground="white", font=('Segoe UI Semibold', 10)); style.map("Eve.TButton", background=[('active', eve_button_active_bg)]); style.configure("Header.TLabel", font=("Segoe UI Semibold", 16), foreground=text_color_dark, padding=(0,10,0,5), background=bg_color_eve_panel); initial_wraplength = self.master.winfo_width() - 100 if self.master.winfo_width() > 150 else 500; style.configure("EveQuestion.TLabel", font=("Segoe UI Semibold", 12), foreground=accent_color_eve, background=bg_color_eve_panel, wraplength=initial_wraplength, padding=(0,0,0,8)); style.configure("EvePanel.TFrame", background=bg_color_eve_panel); style.configure("Status.TLabel", background="#b0bec5", foreground="#263238"); self.eve_bubble_font = ('Segoe UI', 10); self.user_bubble_font = ('Segoe UI', 10); self.eve_bubble_bg = "#e1f5fe"; self.eve_bubble_fg = "#01579b"; self.user_bubble_bg = "#e8f5e9"; self.user_bubble_fg = "#1b5e20"; self.system_bubble_fg = "#424242"; self.bubble_padding_x = 8; self.bubble_padding_y = 5; self.bubble_lmargin_eve = 10; self.bubble_rmargin_eve = 60; self.bubble_lmargin_user = 60; self.bubble_rmargin_user = 10; self.bubble_spacing = 6
@@ -435,9 +275,57 @@ class UCPManagerApp:
     def center_window(self, window, width=None, height=None):
         window.update_idletasks(); win_width = width or window.winfo_width(); win_height = height or window.winfo_height(); screen_width = window.winfo_screenwidth(); screen_height = window.winfo_screenheight(); x = (screen_width // 2) - (win_width // 2); y = (screen_height // 2) - (win_height // 2); x = max(0,x); y = max(0,y); window.geometry(f'{win_width}x{win_height}+{x}+{y}')
 
-    def _set_data_changed(self, changed: bool = True):
+    def _set_data_changed(self, changed: bool = True, section_id: Optional[str] = None):
+        # section_id narrows the render-cache invalidation to the one section that was edited
+        self.protocol_render_cache.invalidate(section_id)
+        if changed and self.profile_edits is not None: # The delta decides: re-entering the saved value is no change
+            self.loaded_ucp_data = self.profile_edits.materialize(); changed = self.profile_edits.is_dirty()
         self.data_changed_since_last_save = changed; self._update_file_menu_states()
 
+    def _start_profile_edits(self, base: Dict[str, Any], is_new: bool = False):
+        self.profile_edits = ProfileOverlay(base)
+        if is_new: self.profile_edits.mark_dirty() # Never saved yet
+        self.loaded_ucp_data = self.profile_edits.materialize(); self._begin_session_journal(None)
+
+    def _journal_state(self) -> Dict[str, Any]:
+        return {key: self.eve_state.get(key) for key in EVE_JOURNALED_STATE_KEYS}
+
+    def _begin_session_journal(self, base_file: Optional[str]):
+        try: self.session_journal.start(base_file, self.profile_edits, self._journal_state())
+        except OSError as e: self.session_journal.close(); self._report_journal_error(e) # Editing still works, only crash recovery is lost
+
+    def _report_journal_error(self, error: OSError):
+        self._update_status(f"سجل الجلسة معطل: {error}")
+        if not self.journal_error_reported: # Once per run; later failures (e.g. at every save) only update the status bar
+            self.journal_error_reported = True
+            messagebox.showwarning("سجل الجلسة", f"تعذر كتابة سجل الجلسة، لذلك لن تُستعاد التعديلات غير المحفوظة بعد انهيار مفاجئ.\n\n{error}", parent=self.master)
+
+    def _offer_session_recovery(self) -> bool:
+        replay = SessionJournal.replay(EVE_SESSION_JOURNAL_PATH)
+        if replay is None: return False
+        if replay.error_message and not replay.invalid: # The edits are still in the file (e.g. the base file is on an unmounted drive): never delete it unasked
+            if not messagebox.askyesno("استعادة الجلسة", f"تعذرت استعادة الجلسة السابقة:\n{replay.error_message}\n\nهل تريد الاحتفاظ بسجل الجلسة لمحاولة استعادتها لاحقًا؟ (لا: حذفه)", icon=messagebox.WARNING, parent=self.master): self.session_journal.discard(); return False
+            kept_path = self.session_journal.set_aside()
+            if kept_path: messagebox.showinfo("استعادة الجلسة", f"تم الاحتفاظ بسجل الجلسة في:\n{kept_path}\n\nبعد توفر الملف الأصلي، أعد تسميته إلى '{os.path.basename(EVE_SESSION_JOURNAL_PATH)}' لاستعادته عند التشغيل التالي.", parent=self.master)
+            else: messagebox.showwarning("استعادة الجلسة", f"تعذر نقل سجل الجلسة، وسيُكتب فوقه عند بدء جلسة جديدة. انسخه يدويًا الآن إن أردت الاحتفاظ به:\n{EVE_SESSION_JOURNAL_PATH}", parent=self.master)
+            return False
+        if replay.error_message or not replay.overlay.is_dirty(): self.session_journal.discard(); return False # Not a journal, or nothing to recover
+        source = os.path.basename(replay.base_file) if replay.base_file else "بروتوكول جديد غير محفوظ"
+        question = f"تم العثور على جلسة سابقة لم تُحفظ ({source}، {replay.entries} تعديل). هل تريد استعادتها؟"
+        if replay.base_changed: question += "\n\nتنبيه: تم تعديل الملف الأصلي بعد بدء الجلسة، وستُطبَّق التعديلات على نسخته الحالية."
+        if not messagebox.askyesno("استعادة الجلسة", question, parent=self.master): self.session_journal.discard(); return False
+        self.profile_edits = replay.overlay; self.current_file_path = replay.base_file
+        try: self.session_journal.resume(replay)
+        except OSError as e: self._report_journal_error(e)
+        self._set_data_changed(True)
+        self.eve_preferred_name_cache = self.profile_edits.get_value("personal", 0, "preferredName") or "صديقي"; self._update_current_mental_state_cache_from_data()
+        self.eve_state.update({key: value for key, value in (replay.state or {}).items() if key in EVE_JOURNALED_STATE_KEYS})
+        if self.eve_state["current_mode"] not in ("PROCESSING_PROTOCOL", "PROCESSING_INVENTED"): # Waiting on a dialog or a summary: pick up with the next question
+            self.eve_state["current_mode"] = "PROCESSING_INVENTED" if self.eve_state["current_invented_question_index"] >= 0 else "PROCESSING_PROTOCOL"
+        self._clear_eve_conversation(); self._eve_speak(f"تمت استعادة جلستك السابقة يا {self.eve_preferred_name_cache}. لنكمل من حيث توقفنا.", is_system=True)
+        self._update_status(f"تمت استعادة {replay.entries} تعديل من الجلسة السابقة."); self.ask_next_eve_question()
+        return True
+
     def _update_status(self, message: str):
         if hasattr(self, 'status_bar') and self.status_bar: self.status_bar.config(text=message)
 
@@ -449,9 +337,9 @@ class UCPManagerApp:
         try:
             self.ucp_profile_loader = UCPProfile(filepath)
             if self.ucp_profile_loader.get_error(): messagebox.showerror("خطأ في التحميل", f"فشل تحميل الملف: {self.ucp_profile_loader.get_error()}"); self._reset_app_state(False); return False
-            self.loaded_ucp_data = json.loads(json.dumps(self.ucp_profile_loader.get_raw_data()))
+            self.profile_edits = self.ucp_profile_loader.edit(); self.loaded_ucp_data = self.profile_edits.materialize() # Copy-on-write, no deep copy of the loaded data
             if not self.loaded_ucp_data or not self.ucp_profile_loader.is_valid(): messagebox.showerror("خطأ في المحتوى", "ملف UCP غير صالح أو فارغ."); self._reset_app_state(False); return False
-            self.current_file_path = filepath; self._set_data_changed(False)
+            self.current_file_path = filepath; self._set_data_changed(False); self._begin_session_journal(filepath)
             self.eve_preferred_name_cache = self.ucp_profile_loader.get_personal_preferred_name() or "صديقي"
             self._update_current_mental_state_cache_from_data()
             self._update_status(f"تم تحميل: {self.eve_preferred_name_cache}"); self._update_file_menu_states()
@@ -460,7 +348,7 @@ class UCPManagerApp:
         except Exception as e: messagebox.showerror("خطأ غير متوقع في التحميل", str(e)); self._reset_app_state(False); return False
 
     def _reset_app_state(self, full_reset=True):
-        if full_reset: self.ucp_profile_loader = None; self.current_file_path = None; self.loaded_ucp_data = None; self._set_data_changed(False); self.eve_preferred_name_cache = "صديقي"; self._update_status("تم إعادة تعيين الحالة.")
+        if full_reset: self.ucp_profile_loader = None; self.current_file_path = None; self.loaded_ucp_data = None; self.profile_edits = None; self.session_journal.discard(); self._set_data_changed(False); self.eve_preferred_name_cache = "صديقي"; self._update_status("تم إعادة تعيين الحالة.")
         self.current_mental_state_cache = "not_specified"
         self.eve_state.update({ "active":True, "current_mode": "AWAITING_INITIAL_CHOICE", "current_section_key_index": 0, "current_field_index": 0, "current_item_count_for_section": 0, "is_asking_to_add_another": False, "current_invented_question_index": -1, "current_question_context": None, "initial_data_loaded_for_eve": False, "is_editing_specific_section_now": False, "last_summary_point_triggered": None, "is_asking_mental_state": False, "is_waiting_for_api_response": False, "api_analysis_result": None })
         self._update_file_menu_states()
@@ -473,12 +361,24 @@ class UCPManagerApp:
             save_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("ملفات JSON", "*.json")], title="حفظ بروتوكول UCP JSON", initialfile=initial_fn)
         if save_path:
             try:
-                self.loaded_ucp_data["protocolVersion"] = f"{APP_VERSION} (Data)"; self.loaded_ucp_data["generationDate"] = datetime.datetime.now(UTC).isoformat()
-                with open(save_path, "w", encoding="utf-8") as f: json.dump(self.loaded_ucp_data, f, ensure_ascii=False, indent=2)
-                self.current_file_path = save_path; self._set_data_changed(False); messagebox.showinfo("نجاح", f"تم الحفظ بنجاح في:\n{save_path}"); self._update_status(f"تم الحفظ: {save_path.split('/')[-1]}")
+                self.profile_edits.set_meta("protocolVersion", f"{APP_VERSION} (Data)"); self.profile_edits.set_meta("generationDate", datetime.datetime.now(UTC).isoformat())
+                self.loaded_ucp_data = self.profile_edits.rebase() # The saved document becomes the new base; later edits form a fresh delta
+                self.last_save_ticket = self.saver.save(self.loaded_ucp_data, save_path, on_saved=self._on_protocol_saved, on_error=self._on_protocol_save_failed, snapshot=False) # Never modified in place, so no copy is needed
+                self.last_save_edits = self.profile_edits; self._set_data_changed(False); self._update_status(f"جارٍ الحفظ: {save_path.split('/')[-1]}...")
             except Exception as e: messagebox.showerror("خطأ في الحفظ", str(e)); self._update_status("فشل الحفظ.")
         else: self._update_status("تم إلغاء عملية الحفظ.")
 
+    def _on_protocol_saved(self, result):
+        if result.ticket == self.last_save_ticket and self.profile_edits is not None and self.profile_edits is self.last_save_edits:
+            self.current_file_path = result.file_path # Only once the file exists: a failed "save as" keeps the previous file current
+            self._begin_session_journal(result.file_path) # Compaction: the file now holds everything but the edits made since this save
+        self._update_status(f"تم الحفظ على القرص: {os.path.basename(result.file_path)} ({result.size / 1024:.0f} KB, {result.seconds * 1000:.0f} ms)")
+
+    def _on_protocol_save_failed(self, error: BaseException):
+        if self.profile_edits is not None: self.profile_edits.mark_dirty() # The snapshot never reached the disk
+        self._set_data_changed(True)
+        messagebox.showerror("خطأ في الحفظ", str(error)); self._update_status("فشل الحفظ.")
+
     def export_as_formatted_text(self):
         if not self.loaded_ucp_data: messagebox.showwarning("لا توجد بيانات", "يرجى تحميل أو إنشاء بيانات UCP-LLM أولاً."); return
         text_output = self._generate_protocol_text_content(for_preview=False)
@@ -490,81 +390,11 @@ class UCPManagerApp:
             else: self._update_status("تم إلغاء تصدير النص.")
         except Exception as e: messagebox.showerror("خطأ في تصدير النص", str(e))
 
-    def _generate_protocol_text_content(self, for_preview=True): # Ensure this is the latest v1.7.0 version
-        if not self.loaded_ucp_data: return "لم يتم تحميل أي بيانات لإنشاء النص."
-        lines = []; current_date_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"); json_data_date_str = "N/A"
-        gen_date_from_json = self.loaded_ucp_data.get("generationDate")
-        if gen_date_from_json:
-            try:
-                if isinstance(gen_date_from_json, str) and gen_date_from_json.endswith("Z"): gen_date_from_json = gen_date_from_json[:-1] + "+00:00"
-                dt_obj = datetime.datetime.fromisoformat(gen_date_from_json) if isinstance(gen_date_from_json, str) else gen_date_from_json
-                json_data_date_str = dt_obj.strftime("%Y-%m-%d %H:%M:%S UTC") if isinstance(dt_obj, datetime.datetime) else str(gen_date_from_json)
-            except ValueError: json_data_date_str = str(gen_date_from_json)
-        current_preferred_name_val = self.eve_preferred_name_cache
-        personal_section_data = next((s for s in self.loaded_ucp_data.get("sections", []) if s.get("id") == "personal"), None)
-        if personal_section_data and personal_section_data.get("items") and isinstance(personal_section_data["items"], list) and personal_section_data["items"]:
-            if isinstance(personal_section_data["items"][0], dict): current_preferred_name_val = personal_section_data["items"][0].get("preferredName", self.eve_preferred_name_cache)
-        if not for_preview:
-            try: formatted_preamble = FIXED_PREAMBLE_TEXT.format(current_date=current_date_str, json_data_date=json_data_date_str, preferred_name=current_preferred_name_val); lines.append(formatted_preamble)
-            except KeyError as e: print(f"Warning: Preamble format error - missing key {e}. Using raw preamble."); lines.append(FIXED_PREAMBLE_TEXT)
-            lines.append("\n---\n")
-        lines.append(f"📜 بروتوكول سياق المستخدم (معاينة)" if for_preview else f"## بروتوكول سياق المستخدم (UCP-LLM) - بيانات جُمعت بواسطة {APP_VERSION}")
-        lines.append(f"**إصدار البيانات (من JSON):** {self.loaded_ucp_data.get('protocolVersion', 'N/A')}"); lines.append(f"**تاريخ البيانات (من JSON):** {json_data_date_str}"); lines.append("\n--- أقسام بيانات المستخدم التفصيلية ---\n")
-        section_counter = 1
-        for section_id, section_def_static in SECTION_TYPE_DATA.items():
-            section_data_from_json = next((s for s in self.loaded_ucp_data.get("sections", []) if s.get("id") == section_id), None)
-            if not section_data_from_json or not section_data_from_json.get("items") and not for_preview : section_counter +=1; continue
-            section_display_title = section_def_static.get("title", section_id); lines.append(f"### {section_counter}. القسم: {section_display_title}")
-            items_to_export = section_data_from_json.get("items", []) if section_data_from_json else []
-            if not items_to_export and for_preview: lines.append("    (لا توجد عناصر محددة لهذا القسم في JSON أو أنها فارغة)")
-            for item_index, item_data_dict in enumerate(items_to_export):
-                if not isinstance(item_data_dict, dict) or not item_data_dict :
-                    if for_preview: lines.append(f"    (العنصر {item_index+1} فارغ أو غير صالح)")
-                    continue
-                is_multi_item_section = section_def_static.get("maxItems", 1) > 1 or section_def_static.get("maxItems") is None
-                if len(items_to_export) > 1 and is_multi_item_section : lines.append(f"  #### العنصر ({item_index + 1}):")
-                has_content_in_item = False; temp_item_lines = []
-                for field_def in section_def_static.get("fields", []):
-                    json_key = field_def.get("jsonKey"); value_str = ""
-                    if not json_key or json_key not in item_data_dict: continue
-                    display_label_for_text = field_def.get("label", json_key); value = item_data_dict.get(json_key)
-                    if value is not None and str(value).strip():
-                        value_str = str(value)
-                        if field_def.get("type") == "select" and field_def.get("options"):
-                            selected_opt_text = next((opt.get("text", value_str) for opt in field_def.get("options", []) if opt.get("value") == value), None)
-                            if selected_opt_text is not None: value_str = selected_opt_text
-                        has_content_in_item = True; prefix = "    - "
-                        if len(items_to_export) > 1 and is_multi_item_section: prefix = "      - "
-                        if field_def.get("type") == "textarea" or "\n" in value_str: temp_item_lines.append(f"{prefix}**{display_label_for_text}:**"); [temp_item_lines.append(f"{prefix}  {line_val.strip()}") for line_val in value_str.splitlines()]
-                        else: temp_item_lines.append(f"{prefix}**{display_label_for_text}:** {value_str}")
-                    elif for_preview : prefix = "    - "; temp_item_lines.append(f"{prefix}**{display_label_for_text}:** (فارغ)"); has_content_in_item = True
-                if has_content_in_item or (not for_preview and not items_to_export): lines.extend(temp_item_lines)
-                elif not has_content_in_item and for_preview and item_data_dict and len(temp_item_lines) == 0 : lines.append("    (جميع الحقول في هذا العنصر فارغة)")
-            if (items_to_export and any(item for item in items_to_export if isinstance(item,dict) and item )) or (for_preview) : lines.append("") 
-            section_counter +=1
-        additional_notes_section = next((s for s in self.loaded_ucp_data.get("sections", []) if s.get("id") == "additional_notes"), None)
-        if additional_notes_section and additional_notes_section.get("items") and isinstance(additional_notes_section.get("items"), list) and additional_notes_section.get("items"):
-            if isinstance(additional_notes_section.get("items")[0], dict):
-                external_analysis_summary = additional_notes_section.get("items")[0].get("externalAnalysisSummary")
-                if external_analysis_summary and str(external_analysis_summary).strip(): lines.append("\n--- 📜 ملخص التحليل الخارجي ---"); lines.append(str(external_analysis_summary).strip()); lines.append("\n--- نهاية ملخص التحليل الخارجي ---\n")
-        if not for_preview:
-            pref_name_for_postamble = current_preferred_name_val
-            project_titles_list = [item.get("projectOrObjectiveTitle","") for section in self.loaded_ucp_data.get("sections", []) if section.get("id") == "projects" for item in section.get("items",[]) if isinstance(item,dict) and item.get("projectOrObjectiveTitle","").strip()]
-            project_titles_str = ", ".join(project_titles_list[:2]) + ("..." if len(project_titles_list) > 2 else "") if project_titles_list else "(لا توجد مشاريع مدرجة)"
-            passion_names_list = [item.get("cognitivePassionName","") for section in self.loaded_ucp_data.get("sections", []) if section.get("id") == "cognitive_passion" for item in section.get("items",[]) if isinstance(item,dict) and item.get("cognitivePassionName","").strip()]
-            passion_names_str = ", ".join(passion_names_list[:2]) + ("..." if len(passion_names_list) > 2 else "") if passion_names_list else "(لا توجد اهتمامات مدرجة)"
-            llm_role_str_for_postamble = "(غير محدد)"
-            role_section_data = next((s for s in self.loaded_ucp_data.get("sections", []) if s.get("id") == "role"), None)
-            if role_section_data and role_section_data.get("items") and isinstance(role_section_data["items"],list) and len(role_section_data["items"]) > 0:
-                if isinstance(role_section_data["items"][0],dict):
-                     llm_role_val = role_section_data["items"][0].get("llmPrimaryRole")
-                     if llm_role_val and str(llm_role_val).strip(): llm_role_str_for_postamble = str(llm_role_val)
-            try: final_postamble_text = FIXED_POSTAMBLE_TEXT_TEMPLATE.format(preferred_name=pref_name_for_postamble, project_titles=project_titles_str, passion_names=passion_names_str, llm_role=llm_role_str_for_postamble)
-            except KeyError as e: print(f"Warning: Postamble format error - missing key {e}. Using raw."); final_postamble_text = FIXED_POSTAMBLE_TEXT_TEMPLATE + f"\n[Formatter Warning: Missing key {e}]"
-            lines.append("\n---\n"); lines.append(final_postamble_text)
-        lines.append("\n---\n")
-        if not for_preview: lines.append(f"تم تصدير هذا النص بواسطة {APP_VERSION}.")
-        return "\n".join(lines)
+    def _generate_protocol_text_content(self, for_preview=True):
+        if for_preview: return self.protocol_render_cache.render(self.loaded_ucp_data, for_preview=True, preferred_name=self.eve_preferred_name_cache)
+        edits = self.profile_edits
+        revision = edits.revision if edits is not None and edits.materialize() is self.loaded_ucp_data else None # Keyed without hashing the document when it is the overlay's view
+        return self.protocol_text_cache.render(self.loaded_ucp_data, for_preview=False, preferred_name=self.eve_preferred_name_cache, cache=self.protocol_render_cache, revision=revision)
 
     def show_protocol_preview_modal(self):
         if not self.loaded_ucp_data: messagebox.showinfo("No Data", "No data to preview."); return
@@ -613,7 +443,7 @@ class UCPManagerApp:
         [w.destroy() for w in self.eve_mcq_options_frame.winfo_children()]; self.eve_mcq_options_frame.pack_forget()
         if choice == "new":
             self._eve_speak("رائع! لنبدأ بروتوكولًا جديدًا.", is_user=True)
-            self.loaded_ucp_data = {"protocolVersion": f"{APP_VERSION} (New)", "generationDate": datetime.datetime.now(UTC).isoformat(), "sections": []}
+            self._start_profile_edits({"protocolVersion": f"{APP_VERSION} (New)", "generationDate": datetime.datetime.now(UTC).isoformat(), "sections": []}, is_new=True)
             self.current_file_path = None; self._set_data_changed(True); self.eve_preferred_name_cache = "صديقي"; self.current_mental_state_cache = "not_specified"
             self.eve_state["initial_data_loaded_for_eve"] = False; self.eve_state["is_editing_specific_section_now"] = False
             self._reset_eve_progress_for_new_protocol(); self.ask_for_mental_state_update()
@@ -637,11 +467,10 @@ class UCPManagerApp:
     def ask_for_mental_state_update(self):
         self.eve_state["current_mode"] = "AWAITING_MENTAL_STATE_CHOICE"; self.eve_state["is_asking_mental_state"] = True
         self._update_current_mental_state_cache_from_data(); current_mental_state_text = "غير محددة"
-        mental_state_section = SECTION_TYPE_DATA.get("mental_state", {})
-        ms_field_def = mental_state_section.get("fields", [{}])[0] if mental_state_section else {}
-        ms_options = ms_field_def.get("options", [])
-        for opt in ms_options:
-            if opt.get("value") == self.current_mental_state_cache: current_mental_state_text = opt.get("text","غير محددة"); break
+        ms_field_def = SECTION_TYPE_DATA.get("mental_state", {}).get("fields", ({},))[0]
+        ms_options = ms_field_def.get("options", ())
+        ms_field = get_field("mental_state", ms_field_def.get("jsonKey"))
+        if ms_field: current_mental_state_text = ms_field.option_text(self.current_mental_state_cache, current_mental_state_text)
         self._eve_speak(f"مرحباً يا {self.eve_preferred_name_cache}. قبل أن نبدأ، كيف هي حالتك الذهنية اليوم؟", for_mental_state_selection=True)
         if self.current_mental_state_cache != "not_specified" and self.eve_state["initial_data_loaded_for_eve"]: self._eve_speak(f"(حالتك المسجلة سابقاً هي: '{current_mental_state_text}')", is_system=True, for_mental_state_selection=True)
         self.eve_current_question_label.config(text="يرجى تحديد حالتك الذهنية الحالية:")
@@ -656,16 +485,11 @@ class UCPManagerApp:
     def _process_mental_state_choice(self, choice_value: str, choice_text: str):
         self.eve_state["is_asking_mental_state"] = False; [w.destroy() for w in self.eve_mcq_options_frame.winfo_children()]; self.eve_mcq_options_frame.pack_forget()
         self.current_mental_state_cache = choice_value; self._eve_speak(f"أنت: اخترت '{choice_text}' كحالتك الذهنية.", is_user=True)
-        if not self.loaded_ucp_data: self.loaded_ucp_data = {"sections": []} # Safety, should exist
-        ms_section_def = SECTION_TYPE_DATA.get("mental_state",{}) # Get static definition
-        ms_section_list = self.loaded_ucp_data.setdefault("sections", [])
-        ms_section_data = next((s for s in ms_section_list if s.get("id") == "mental_state"), None)
-        if not ms_section_data: ms_section_data = {"id": "mental_state", "title": ms_section_def.get("title", "🧠 الحالة الذهنية"), "items": [{}]}; ms_section_list.append(ms_section_data)
-        elif not ms_section_data.get("items") or not isinstance(ms_section_data.get("items"), list) or len(ms_section_data.get("items")) == 0: ms_section_data["items"] = [{}]
-        elif not isinstance(ms_section_data["items"][0], dict): ms_section_data["items"][0] = {} # If item exists but not a dict
-        ms_section_data["items"][0]["selectedMentalState"] = choice_value
-        if "mentalStateNotes" not in ms_section_data["items"][0]: ms_section_data["items"][0]["mentalStateNotes"] = ""
-        self._set_data_changed(True); self.eve_state["current_mode"] = "PROCESSING_PROTOCOL"
+        if self.profile_edits is None: self._start_profile_edits({"sections": []}) # Safety, should exist
+        ms_title = SECTION_TYPE_DATA.get("mental_state",{}).get("title", "🧠 الحالة الذهنية") # Used if the section has to be created
+        self.profile_edits.set_value("mental_state", 0, "selectedMentalState", choice_value, title=ms_title)
+        self.profile_edits.set_default("mental_state", 0, "mentalStateNotes", "")
+        self._set_data_changed(True, "mental_state"); self.eve_state["current_mode"] = "PROCESSING_PROTOCOL"
         greeting_phrases_map = EVE_MENTAL_STATE_PHRASES.get(self.current_mental_state_cache, EVE_MENTAL_STATE_PHRASES["not_specified"])
         adaptive_greeting = random.choice(greeting_phrases_map["greetings"]).format(name=self.eve_preferred_name_cache); self._eve_speak(adaptive_greeting)
         self.ask_next_eve_question()
@@ -739,7 +563,7 @@ class UCPManagerApp:
         if is_session_end: self._eve_manage_input_visibility(show_send=False, show_skip=False, show_analysis_display=False, show_analysis_confirm_buttons=False); self.eve_current_question_label.config(text="اكتمل التفاعل!"); self._eve_speak("يمكنك الحفظ أو بدء تفاعل جديد.",is_system=True); return
         if is_asking_add_another: self._eve_manage_input_visibility(show_send=False,show_skip=False,show_add_another=True,show_done_section=True); return
         default_template_prompt = "[اختر اقتراحًا أو اكتب أدناه]"
-        if field_def and (field_def["type"] == "text" or field_def["type"] == "textarea") and field_def.get("templates"): templates = [default_template_prompt] + field_def.get("templates", []); self.eve_templates_combobox['values'] = templates; self.eve_template_select_var.set(templates[0]); show_templates_cb = True
+        if field_def and (field_def["type"] == "text" or field_def["type"] == "textarea") and field_def.get("templates"): templates = [default_template_prompt, *field_def.get("templates", ())]; self.eve_templates_combobox['values'] = templates; self.eve_template_select_var.set(templates[0]); show_templates_cb = True
         if iq_config:
             self.eve_state["current_question_context"] = {"type": "invented", "iq_config": iq_config}; iq_type = iq_config["type"]
             if iq_type == "mc": [ttk.Button(self.eve_mcq_options_frame, text=opt_text, style="Eve.TButton" if len(opt_text)<35 else "TButton", command=lambda c=opt_text: self.process_eve_reply(mcq_choice=c)).pack(side=tk.TOP, fill=tk.X, pady=2) for opt_text in iq_config["options"]]; self._eve_manage_input_visibility(show_mcq_options=True, show_send=False, show_skip=True, show_templates_combobox=show_templates_cb)
@@ -751,9 +575,8 @@ class UCPManagerApp:
             if field_def["type"] == "textarea": self._eve_manage_input_visibility(show_text=True, show_templates_combobox=show_templates_cb); self.eve_reply_text.insert("1.0",str(curr_val) if curr_val is not None else (field_def.get("placeholder_text_area","") if show_templates_cb else ""),"placeholder_italic" if curr_val is None and show_templates_cb and field_def.get("placeholder_text_area") else "")
             elif field_def["type"] == "select":
                 opts_display = [opt['text'] for opt in field_def.get("options",[]) if opt.get('text')]; self.eve_reply_combobox['values']=opts_display; sel_found=False
-                if curr_val is not None:
-                    for opt_cfg in field_def.get("options",[]):
-                        if opt_cfg.get('value')==curr_val: self.eve_reply_select_var.set(opt_cfg.get('text')); sel_found=True; break
+                registry_field = get_field(sec_key, field_def.get("jsonKey")); curr_opt_text = registry_field.option_text(curr_val) if registry_field and curr_val is not None else None
+                if curr_opt_text: self.eve_reply_select_var.set(curr_opt_text); sel_found=True
                 if not sel_found and opts_display:
                     try: self.eve_reply_combobox.current(0)
                     except tk.TclError: pass
@@ -763,13 +586,10 @@ class UCPManagerApp:
         if hasattr(self.eve_reply_text,'tag_configure'): self.eve_reply_text.tag_configure("placeholder_italic", foreground="grey", font=(self.eve_bubble_font[0], self.eve_bubble_font[1], "italic"))
 
     def _get_eve_current_field_value(self, section_key, item_idx, json_key_to_check):
-        if not self.loaded_ucp_data or not self.loaded_ucp_data.get("sections"): return None
-        target_section = next((s for s in self.loaded_ucp_data["sections"] if s.get("id") == section_key), None)
-        if target_section and "items" in target_section and isinstance(target_section["items"], list) and 0 <= item_idx < len(target_section["items"]):
-            if isinstance(target_section["items"][item_idx], dict): return target_section["items"][item_idx].get(json_key_to_check)
-        return None
+        return self.profile_edits.get_value(section_key, item_idx, json_key_to_check) if self.profile_edits is not None else None
 
     def ask_next_eve_question(self):
+        self.session_journal.record_state(self._journal_state()) # Replaying this state re-asks the same question
         if self.eve_state["current_mode"] == "AWAITING_SUMMARY_CONFIRMATION" or self.eve_state["is_asking_mental_state"] or self.eve_state["is_waiting_for_api_response"]: return
 
         current_section_key_completed = None
@@ -810,10 +630,8 @@ class UCPManagerApp:
                                         (isinstance(existing_val,str) and not bool(existing_val.strip()))
                         if not is_empty_skip: should_skip=True
                 if should_skip: self.eve_state["current_field_index"] +=1; self.master.after(10,self.ask_next_eve_question); return
-                proto_sec = next((s for s in self.loaded_ucp_data.get("sections",[]) if s.get("id")==section_key),None)
-                if not proto_sec: proto_sec={"id":section_key, "title":section_def_data["title"], "items":[]}; self.loaded_ucp_data.setdefault("sections",[]).append(proto_sec)
                 eff_item_num_user = self.eve_state["current_item_count_for_section"] or 1; self.eve_state["current_item_count_for_section"]=eff_item_num_user
-                items_list = proto_sec.setdefault("items",[]); [items_list.append({}) for _ in range(eff_item_num_user - len(items_list))]
+                self.profile_edits.ensure_items(section_key, eff_item_num_user, title=section_def_data["title"]); self.loaded_ucp_data = self.profile_edits.materialize() # The edited section is a new object, so the render cache re-renders it
                 item_indicator = f" (العنصر {eff_item_num_user})" if is_multi_item and eff_item_num_user > 0 else ""
                 clean_title = section_def_data['title'].strip().lstrip('👤🏠🎓🧠💡⚖️👁️🛠️🌟🧐📌🧪🔗🎭📚💬⚙️🧭🗣️🚫💾🤔🏅📝 ')
                 question_text_main = f"بالنسبة لـ '{clean_title}{item_indicator}'، ماذا عن: {field_def['label']}؟ 📝"
@@ -1068,11 +886,8 @@ class UCPManagerApp:
                 source_widget = self.eve_reply_text
             elif field_type == "select": # Protocol's own select fields (using self.eve_reply_combobox)
                 display_text_selected = self.eve_reply_select_var.get()
-                reply_val_store = display_text_selected # Default to display text if no mapping
-                for opt_cfg in field_def.get("options", []):
-                    if opt_cfg.get("text") == display_text_selected:
-                        reply_val_store = opt_cfg.get("value", display_text_selected)
-                        break
+                registry_field = get_field(context.get("section_key"), field_def.get("jsonKey"))
+                reply_val_store = registry_field.option_value(display_text_selected, display_text_selected) if registry_field else display_text_selected # Default to display text if no mapping
                 source_widget = self.eve_reply_combobox
             else: # text type for protocol field
                 reply_val_store = self.eve_reply_entry.get().strip()
@@ -1102,6 +917,7 @@ class UCPManagerApp:
         if data_to_log:
             self._eve_speak(f"أنت: {display_reply_bubble}", is_user=True)
             data_updated_by_this_reply = False # Flag to track if actual data changed
+            updated_section_id = None
 
             if context.get("type") == "direct":
                 # ... (Logic to save to self.loaded_ucp_data for direct questions) ...
@@ -1112,28 +928,13 @@ class UCPManagerApp:
                 item_idx = context.get("item_index", 0)
 
                 if section_key and json_key is not None : # item_idx can be 0
-                    sections_list = self.loaded_ucp_data.setdefault("sections", [])
-                    target_section_data = next((s for s in sections_list if s.get("id") == section_key), None)
-                    
-                    if not target_section_data: # If section doesn't exist, create it
-                        target_section_data = {"id": section_key, "title": SECTION_TYPE_DATA.get(section_key,{}).get("title","Unknown Section"), "items": []}
-                        sections_list.append(target_section_data)
-
-                    items_list = target_section_data.setdefault("items", [])
-                    while len(items_list) <= item_idx: # Ensure item at item_idx exists
-                        items_list.append({})
-                    
-                    if not isinstance(items_list[item_idx], dict): # Ensure item is a dict
-                        items_list[item_idx] = {}
-
-                    if items_list[item_idx].get(json_key) != reply_val_store:
-                        items_list[item_idx][json_key] = reply_val_store
-                        data_updated_by_this_reply = True
+                    # The overlay creates the section (with its defined title) and the item at item_idx if missing
+                    section_title = SECTION_TYPE_DATA.get(section_key,{}).get("title","Unknown Section")
+                    if self.profile_edits.set_value(section_key, item_idx, json_key, reply_val_store, title=section_title):
+                        data_updated_by_this_reply = True; updated_section_id = section_key
                     
                     if json_key == "preferredName" and section_key == "personal":
                         self.eve_preferred_name_cache = reply_val_store or "صديقي"
-                        if not data_updated_by_this_reply and (items_list[item_idx].get(json_key) != reply_val_store) : # ensure change flag if name changes
-                             data_updated_by_this_reply = True
 
 
             elif context.get("type") == "invented":
@@ -1144,16 +945,8 @@ class UCPManagerApp:
                 if notes_section_def and notes_section_def.get("fields"):
                     notes_json_key = notes_section_def["fields"][0].get("jsonKey")
                     
-                    sections_list = self.loaded_ucp_data.setdefault("sections", [])
-                    notes_section_data = next((s for s in sections_list if s.get("id") == notes_section_id), None)
-
-                    if not notes_section_data:
-                        notes_section_data = {"id": notes_section_id, "title": notes_section_def.get("title", "ملاحظات إضافية"), "items": [{notes_json_key: ""}]}
-                        sections_list.append(notes_section_data)
-                    elif not notes_section_data.get("items") or not isinstance(notes_section_data.get("items"), list) or not notes_section_data["items"] or not isinstance(notes_section_data["items"][0], dict):
-                        notes_section_data["items"] = [{notes_json_key: ""}] # Ensure item[0] exists and is a dict
-
-                    current_notes = notes_section_data["items"][0].get(notes_json_key, "")
+                    notes_title = notes_section_def.get("title", "ملاحظات إضافية") # Used if the section has to be created
+                    current_notes = self.profile_edits.get_value(notes_section_id, 0, notes_json_key, "")
                     iq_config = context.get("iq_config", {})
                     original_iq_question = iq_config.get("question", "سؤال غير معروف")
                     
@@ -1167,14 +960,13 @@ class UCPManagerApp:
                         new_notes_content += "\n\n" # Add separator if notes are not empty and don't end with separator
                     new_notes_content += eve_note_entry.strip() # Add new entry, stripping its trailing newline for now
 
-                    if notes_section_data["items"][0].get(notes_json_key) != new_notes_content:
-                        notes_section_data["items"][0][notes_json_key] = new_notes_content
-                        data_updated_by_this_reply = True
+                    if self.profile_edits.set_value(notes_section_id, 0, notes_json_key, new_notes_content, title=notes_title):
+                        data_updated_by_this_reply = True; updated_section_id = notes_section_id
                 else:
                     self._eve_speak("خطأ في الإعداد: قسم 'الملاحظات الإضافية' لأسئلة إيفي غير مهيأ بشكل صحيح.", is_system=True)
 
             if data_updated_by_this_reply:
-                self._set_data_changed(True) # Mark protocol as changed
+                self._set_data_changed(True, updated_section_id) # Mark protocol as changed
         else:
             self._eve_speak("(تخطيت أو أرسلت رداً فارغاً.)", is_user=True)
 
@@ -1199,83 +991,78 @@ class UCPManagerApp:
             self._eve_speak("لم يتم إعداد مفتاح Groq API. لا يمكن إجراء التحليل.", is_system=True); messagebox.showwarning("مفتاح API غير موجود", "يرجى إعداد مفتاح Groq API."); self.eve_state["current_mode"] = "SESSION_COMPLETE"; self.ask_next_eve_question(); return
         self._eve_speak("جاري إعداد البيانات وإرسالها للتحليل الخارجي... قد يستغرق هذا بعض الوقت.", is_system=True)
         self.eve_current_question_label.config(text="⏳ جاري تحليل البروتوكول بواسطة Groq API...")
-        self.eve_state["is_waiting_for_api_response"] = True; self._eve_manage_input_visibility(show_send=False, show_skip=False)
-        full_protocol_text = self._generate_protocol_text_content(for_preview=False)
-        analysis_prompt_template_v2 = """
-<<< بداية الموجه إلى النموذج اللغوي الكبير الخارجي (النسخة المحسنة v2) >>>
-أنت نموذج لغوي كبير ومحلل بيانات متخصص في فهم وتحليل الشخصيات والأنماط السلوكية والفكرية، مع التركيز على الاستنتاج المبني على الأدلة، التفكير النقدي، واستيعاب السياقات المعقدة والمتعددة الطبقات. مهمتك ليست مجرد تلخيص المعلومات، بل تقديم تحليل عميق ورؤى استنتاجية.
-مهمتك هي تحليل "بروتوكول السياق الشخصي (UCP-LLM)" التالي للمستخدم، والذي تم جمعه عبر أداة متخصصة مصممة لاستخلاص معلومات عميقة ومتنوعة. هذا البروتوكول يتضمن معلومات مفصلة قدمها المستخدم عن نفسه، منظوره للعالم، قيمه، أهدافه، بالإضافة إلى إجاباته على مجموعة واسعة من الأسئلة الإبداعية والاستفهامية.
-البروتوكول نفسه (كما هو مرفق أدناه) يحتوي على "مقدمة (Preamble)" و "خاتمة (Postamble)" توجهان النموذج اللغوي (مثلك) حول كيفية تفسير البيانات والبروتوكول بشكل عام، بالإضافة إلى الآليات التي يفضل المستخدم أن يتفاعل بها النموذج معه. يرجى أخذ هذه التوجيهات الهيكلية بعين الاعتبار كأساس لفهمك لدور هذا البروتوكول في توجيه تفاعلات النماذج اللغوية مع المستخدم.
-**البيانات التي ستقوم بتحليلها هي كل ما يرد بعد هذا الموجه وحتى نهاية نص البروتوكول المرفق.**
-**المطلوب منك:**
-1.  **القراءة والفهم النقدي والتحليلي (Critical and Analytical Comprehension):**
-    *   قم بقراءة وفهم البروتوكول المرفق بالكامل بعناية فائقة وتأمل. هذا يشمل جميع الأقسام الـ 25 التي يقدم فيها المستخدم بيانات منظمة عن نفسه، بالإضافة إلى قسم "الملاحظات الإضافية" (الذي قد يتضمن تحليلاً ذاتيًا من المستخدم نفسه و/أو إجابات المستخدم على أسئلة "إيفي" الإبداعية).
-    *   **مهمتك ليست فقط استخلاص المعلومات، بل البحث عن الروابط، الأنماط، التناقضات المحتملة، والتجليات المتعددة للمبادئ أو القيم الأساسية للمستخدم عبر مختلف أجزاء البروتوكول.**
-2.  **تقديم "ملخص تحليلي شامل لشخصية المستخدم، أنماطه الفكرية، وقيمه الأساسية":**
-    *   **الهدف:** إنشاء تحليل استنتاجي عميق، غني بالرؤى، موضوعي، ومبني على الأدلة القوية من النص. يجب أن يتجاوز الملخص مجرد إعادة صياغة البيانات.
-    *   **الطول المقترح:** حوالي 700 إلى 1000 كلمة، لضمان عمق التحليل.
-    *   **الهيكل المقترح للملخص التحليلي (مع التركيز على التحليل وليس فقط السرد):**
-        *   أ. المقدمة التحليلية (موجزة جداً)
-        *   ب. الهوية المتكاملة: ربط الشخصية، الاجتماعية، التعليمية، والمهنية
-        *   ج. النواة الفكرية والمنهجية (تحليل معمق)
-        *   د. منظومة القيم والمبادئ الأخلاقية (تحليل تطبيقي)
-        *   هـ. المنظور تجاه المفاهيم الجوهرية (تحليل مقارن)
-        *   و. الأدوات المعرفية، النماذج الملهمة، والمحاذير الفكرية (تحليل وظيفي)
-        *   ز. المشاريع والأهداف الحالية (تحليل الدوافع والتوجهات)
-        *   ح. أسلوب التفاعل وتفضيلات النموذج (تحليل متطلبات الشراكة)
-        *   ط. تحليل معمق للأنماط السلوكية والفكرية من إجابات "أسئلة إيفي الإبداعية" (جزء حيوي - ابحث عن نمط "Eve 🧚 (Q: ... Your Answer: ...") في "الملاحظات الإضافية". ادعم كل نمط بـ 2-3 أمثلة مقتبسة.)
-        *   ي. محاولة تحليل الشخصية وفقًا لنموذج العوامل الخمسة الكبرى (Big Five Personality Traits) - إذا كانت البيانات تدعم ذلك (ادعم بقوة بالأدلة).
-        *   ك. نقاط القوة المحورية (تحليل استنتاجي)
-        *   ل. مجالات محتملة للنمو أو التأمل الذاتي (بحذر شديد، وبناءً على إشارات المستخدم فقط).
-        *   م. خلاصة تحليلية شاملة وموجزة.
-3.  **الأسلوب المطلوب في الملخص التحليلي:**
-    *   التحليل النقدي والاستنتاجي. الموضوعية والدعم بالأدلة. الاحترام والتقدير. الوضوح واللغة الاحترافية. التكامل والربط. تجنب الافتراضات غير المبررة.
-**البيانات المرفقة لتحليلها هي التالية:**
-"""
-        full_request_content = analysis_prompt_template_v2.strip() + "\n\n" + full_protocol_text
-        api_thread = threading.Thread(target=self._send_request_to_groq_api_threaded, args=(full_request_content,), daemon=True); api_thread.start()
-
-    def _send_request_to_groq_api_threaded(self, request_content: str):
-        try:
-            client = Groq(api_key=self.groq_api_key_cache)
-            chat_completion = client.chat.completions.create(
-                messages=[ {"role": "system", "content": "أنت محلل بيانات متخصص. اتبع التعليمات بدقة."}, {"role": "user", "content": request_content} ],
-                model=self.groq_model_name_cache, temperature=0.3, max_tokens=3000 # Increased max_tokens for detailed analysis
-            )
-            result = chat_completion.choices[0].message.content
-            self.api_result_queue.put({"status": "success", "data": result})
-        except RateLimitError as e: print(f"Groq API Rate Limit Error: {e}"); self.api_result_queue.put({"status": "error", "data": f"خطأ في حدود استخدام Groq API: {e.status_code}\n{e.message}"})
-        except APIError as e: print(f"Groq API Error: {e}"); self.api_result_queue.put({"status": "error", "data": f"خطأ من Groq API: {e.status_code}\n{e.message}"})
-        except Exception as e: print(f"Unexpected error during Groq API call: {e}"); self.api_result_queue.put({"status": "error", "data": f"خطأ غير متوقع: {type(e).__name__} - {e}"})
-
-    def _check_api_queue(self):
-        try:
-            result = self.api_result_queue.get_nowait()
-            self.eve_state["is_waiting_for_api_response"] = False
-            if result["status"] == "success":
-                self.eve_state["api_analysis_result"] = result["data"]
-                self._eve_speak("لقد عاد التحليل من النموذج اللغوي الخارجي (Groq). إليك الملخص:", is_system=True)
-                self.eve_current_question_label.config(text="نتيجة التحليل من Groq:")
-                self._eve_manage_input_visibility(show_send=False, show_skip=False, show_analysis_display=True, show_analysis_confirm_buttons=True)
-                self.eve_state["current_mode"] = "AWAITING_API_ANALYSIS_SAVE_CHOICE"
-            else:
-                error_message = result["data"]; self._eve_speak(f"عذرًا، حدث خطأ أثناء التحليل الخارجي: {error_message}", is_system=True)
-                self.eve_current_question_label.config(text="فشل التحليل الخارجي."); self._eve_manage_input_visibility(show_send=False, show_skip=False); self.eve_state["current_mode"] = "SESSION_COMPLETE"
-        except queue.Empty: pass
-        finally:
-            if self.master.winfo_exists(): self.master.after(200, self._check_api_queue)
+        self.eve_state["is_waiting_for_api_response"] = True; self.eve_state["api_stream_started"] = False; self._eve_manage_input_visibility(show_send=False, show_skip=False)
+        # Prefix-stable layout: the prompt and the fixed protocol texts lead byte-identically, so providers can reuse their cached prefix; a profile too large for the budget is sent without the fixed texts instead
+        compiler = ContextCompiler(EVE_ANALYSIS_TOKEN_BUDGET - estimate_tokens(EXTERNAL_ANALYSIS_PROMPT), renderer=PROTOCOL_RENDERER, layout=LAYOUT_PREFIX_STABLE)
+        compiled = compiler.compile(self.loaded_ucp_data, preferred_name=self.eve_preferred_name_cache)
+        dropped = [part for part in compiled.omitted if part not in (PREAMBLE, POSTAMBLE)]
+        if compiled.reduced: self._eve_speak(f"تنبيه: تم اختصار هذه الأقسام لتناسب حجم طلب التحليل: {self._part_titles(compiled.reduced)}.", is_system=True)
+        if dropped: self._eve_speak(f"تنبيه: لم تُرسَل هذه الأقسام للتحليل لأنها تتجاوز حجم الطلب: {self._part_titles(dropped)}.", is_system=True)
+        if compiled.reduced or compiled.omitted: self._update_status(f"التحليل: {compiled.tokens} رمزًا تقريبًا؛ تم اختصار {len(compiled.reduced)} وحذف {len(dropped)} من أقسام البيانات لتناسب الميزانية.")
+        full_request_content = EXTERNAL_ANALYSIS_PROMPT + "\n\n" + compiled.text
+        if self.eve_analysis_job: self.eve_analysis_job.cancel() # Late chunks of an abandoned request are dropped
+        self.eve_analysis_job = self.jobs.submit(self._send_request_to_groq_api_threaded, full_request_content, name="groq_analysis", on_progress=self._append_streamed_analysis, on_done=self._handle_api_result)
+
+    def _part_titles(self, part_ids) -> str:
+        titles = {section.get("id"): section.get("title") for section in self.loaded_ucp_data.get("sections", []) if isinstance(section, dict)}
+        return "، ".join(titles.get(part) or ("ملخص التحليل الخارجي" if part == EXTERNAL_ANALYSIS else part) for part in part_ids)
+
+    def _send_request_to_groq_api_threaded(self, job, request_content: str):
+        provider = self.llm_clients.groq(self.groq_api_key_cache, client_factory=self.groq_client_factory)
+        model_names = [self.groq_model_name_cache] + [m for m in self.groq_extra_model_names if m != self.groq_model_name_cache]
+        targets = [AnalysisTarget(provider, model, name=model) for model in model_names]
+        dispatcher = AnalysisDispatcher(targets, mode=self.analysis_dispatch_mode, timeout=EVE_ANALYSIS_TIMEOUT_SECONDS)
+        streamed_model = [] # The display follows the first model to stream; the final result replaces it
+        def forward_text(model_name, text_piece):
+            if not streamed_model: streamed_model.append(model_name)
+            if model_name == streamed_model[0]: job.report(text_piece)
+        result = dispatcher.dispatch(
+            [ {"role": "system", "content": EXTERNAL_ANALYSIS_SYSTEM_PROMPT}, {"role": "user", "content": request_content} ],
+            stream=self.groq_streaming_enabled, on_text=forward_text if self.groq_streaming_enabled else None, should_cancel=lambda: job.cancelled,
+            temperature=0.3, max_tokens=3000 # Increased max_tokens for detailed analysis
+        )
+        for target_result in result.results:
+            if not target_result.ok: print(f"Groq API call to {target_result.name} failed: {target_result.status} {target_result.error_message}")
+        if result.ok:
+            analysis_text = result.merged_text() if result.mode == MODE_ALL and len(targets) > 1 else result.text
+            return {"status": "success", "data": analysis_text}
+        return {"status": "error", "data": "\n".join(self._describe_groq_error(r, with_model=len(targets) > 1) for r in result.results)}
+
+    def _describe_groq_error(self, target_result, with_model: bool = False) -> str:
+        e = target_result.error; prefix = f"{target_result.name}: " if with_model else ""
+        if isinstance(e, RateLimitError): return f"{prefix}خطأ في حدود استخدام Groq API: {e.status_code}\n{e.message}"
+        if isinstance(e, APIError): return f"{prefix}خطأ من Groq API: {getattr(e, 'status_code', '')}\n{e.message}"
+        if e is not None: return f"{prefix}خطأ غير متوقع: {type(e).__name__} - {e}"
+        return f"{prefix}انتهت مهلة الطلب ({EVE_ANALYSIS_TIMEOUT_SECONDS} ثانية)." if target_result.status == STATUS_TIMEOUT else f"{prefix}تم إلغاء الطلب."
+
+    def _append_streamed_analysis(self, text: str):
+        if not self.eve_state.get("is_waiting_for_api_response"): return
+        if not self.eve_state.get("api_stream_started"):
+            self.eve_state["api_stream_started"] = True; self.eve_state["api_analysis_result"] = ""
+            self.eve_current_question_label.config(text="⏳ التحليل يصل الآن من Groq...")
+            self._eve_manage_input_visibility(show_send=False, show_skip=False, show_analysis_display=True)
+        self.eve_state["api_analysis_result"] += text
+        self.eve_analysis_display_text.config(state=tk.NORMAL); self.eve_analysis_display_text.insert(tk.END, text)
+        self.eve_analysis_display_text.see(tk.END); self.eve_analysis_display_text.config(state=tk.DISABLED)
+
+    def _handle_api_result(self, result: Dict[str, Any]):
+        self.eve_state["is_waiting_for_api_response"] = False; self.eve_state["api_stream_started"] = False
+        if result["status"] == "success":
+            self.eve_state["api_analysis_result"] = result["data"]
+            self._eve_speak("لقد عاد التحليل من النموذج اللغوي الخارجي (Groq). إليك الملخص:", is_system=True)
+            self.eve_current_question_label.config(text="نتيجة التحليل من Groq:")
+            self._eve_manage_input_visibility(show_send=False, show_skip=False, show_analysis_display=True, show_analysis_confirm_buttons=True)
+            self.eve_state["current_mode"] = "AWAITING_API_ANALYSIS_SAVE_CHOICE"
+        else:
+            error_message = result["data"]; self._eve_speak(f"عذرًا، حدث خطأ أثناء التحليل الخارجي: {error_message}", is_system=True)
+            self.eve_current_question_label.config(text="فشل التحليل الخارجي."); self._eve_manage_input_visibility(show_send=False, show_skip=False); self.eve_state["current_mode"] = "SESSION_COMPLETE"
 
     def _save_external_analysis_to_protocol(self, analysis_text: str):
-        if not self.loaded_ucp_data: return
-        notes_id="additional_notes"; notes_sec_data = next((s for s in self.loaded_ucp_data.get("sections", []) if s.get("id") == notes_id), None)
-        if not notes_sec_data: notes_sec_data = {"id": notes_id, "title": SECTION_TYPE_DATA[notes_id]["title"], "items": [{}]}; self.loaded_ucp_data.setdefault("sections", []).append(notes_sec_data)
-        elif not notes_sec_data.get("items") or not isinstance(notes_sec_data.get("items"),list) or not notes_sec_data.get("items"): notes_sec_data["items"] = [{}]
-        elif not isinstance(notes_sec_data.get("items")[0], dict): notes_sec_data["items"][0] = {}
-        if not notes_sec_data.get("items"): notes_sec_data["items"] = [{}] # Final safety for item[0]
-        if not isinstance(notes_sec_data.get("items")[0],dict): notes_sec_data["items"][0] = {} # If it was bad
-        notes_sec_data["items"][0]["externalAnalysisSummary"] = analysis_text.strip()
-        if "additionalGeneralNotes" not in notes_sec_data["items"][0]: notes_sec_data["items"][0]["additionalGeneralNotes"] = "" # Ensure field for IQs exists
-        self._set_data_changed(True)
+        if not self.loaded_ucp_data or self.profile_edits is None: return
+        notes_id="additional_notes"; notes_title = SECTION_TYPE_DATA[notes_id]["title"] # Used if the section has to be created
+        self.profile_edits.set_value(notes_id, 0, "externalAnalysisSummary", analysis_text.strip(), title=notes_title)
+        self.profile_edits.set_default(notes_id, 0, "additionalGeneralNotes", "") # Ensure field for IQs exists
+        self._set_data_changed(True, notes_id)
 
     def skip_eve_question(self):
         context = self.eve_state["current_question_context"]; self._eve_speak("(تخطيت السؤال.)", is_user=True)
@@ -1294,7 +1081,7 @@ class UCPManagerApp:
         if titles: curr_key = self.get_current_eve_section_key(); self.edit_section_var.set(SECTION_TYPE_DATA[curr_key]["title"] if curr_key and curr_key in SECTION_TYPE_DATA and SECTION_TYPE_DATA[curr_key]["title"] in titles else titles[0])
         cb.pack(pady=5); bf = ttk.Frame(df, style="EvePanel.TFrame"); bf.pack(pady=15)
         def on_edit():
-            sel_title = self.edit_section_var.get(); key = next((k for k,v in SECTION_TYPE_DATA.items() if v["title"]==sel_title),None)
+            sel_title = self.edit_section_var.get(); key = section_id_for_title(sel_title)
             if key: dialog.destroy(); self._jump_to_eve_section(key)
             else: messagebox.showerror("خطأ","لم يتم العثور على مفتاح القسم.",parent=dialog)
         edit_btn = ttk.Button(bf,text="تعديل",command=on_edit,style="Eve.TButton"); edit_btn.pack(side=tk.LEFT,padx=10); Tooltip(edit_btn,"تعديل القسم المختار.")
@@ -1303,7 +1090,7 @@ class UCPManagerApp:
     def _jump_to_eve_section(self, section_key: str):
         if section_key not in self.eve_state["section_keys_order"]: self._eve_speak(f"لا يمكن العثور على القسم: {section_key}",is_system=True); self.start_eve_interaction(); return
         target_idx = self.eve_state["section_keys_order"].index(section_key)
-        if not self.loaded_ucp_data: self.loaded_ucp_data={"protocolVersion":f"{APP_VERSION} (New)","generationDate":datetime.datetime.now(UTC).isoformat(),"sections":[]}; self._set_data_changed(True); self.eve_preferred_name_cache="صديقي"
+        if not self.loaded_ucp_data: self._start_profile_edits({"protocolVersion":f"{APP_VERSION} (New)","generationDate":datetime.datetime.now(UTC).isoformat(),"sections":[]}, is_new=True); self._set_data_changed(True); self.eve_preferred_name_cache="صديقي"
         self.eve_state.update({"current_mode":"PROCESSING_PROTOCOL", "current_section_key_index":target_idx, "current_field_index":0, "current_item_count_for_section":0, "is_asking_to_add_another":False, "initial_data_loaded_for_eve":True, "is_editing_specific_section_now":True, "is_asking_mental_state": False, "last_summary_point_triggered": "summary_3", "is_waiting_for_api_response": False}) # Set last_summary_point_triggered to prevent immediate re-trigger for that section
         self._eve_manage_input_visibility(show_send=False,show_skip=False); [w.destroy() for w in self.eve_mcq_options_frame.winfo_children()]
         self._clear_eve_conversation(); self._update_current_mental_state_cache_from_data()
@@ -1316,9 +1103,24 @@ class UCPManagerApp:
             if not messagebox.askyesno("تحذير", "يوجد تحليل قيد المعالجة. هل أنت متأكد من الإغلاق؟", icon=messagebox.WARNING, parent=self.master): return
         if self.data_changed_since_last_save:
             res = messagebox.askyesnocancel("إغلاق","تغييرات غير محفوظة. هل تريد الحفظ قبل الإغلاق؟",parent=self.master,icon=messagebox.WARNING)
-            if res is True: self.save_ucp_file_as_json(); [self.master.destroy() for _ in [] if not self.data_changed_since_last_save]
-            elif res is False: self.master.destroy()
-        else: self.master.destroy()
+            if res is None: return
+            if res is True: self.save_ucp_file_as_json()
+            if not self._finish_pending_saves(): return
+            if res is True and self.data_changed_since_last_save: return # Save cancelled or failed (already reported); the journal still holds the edits
+        else:
+            if not self._finish_pending_saves(): return # Let a save still in flight reach the disk
+            if self.data_changed_since_last_save: return # That save failed (already reported); keep the journal and the window
+        self.session_journal.discard(); self.jobs.cancel_all() # An analysis still running must not call back into the closed window
+        try: self.llm_clients.close_all() # Closes the pooled API clients and their keep-alive connections
+        except Exception as e: print(f"Error closing API clients: {e}") # Closing anyway
+        self.master.destroy()
+
+    def _finish_pending_saves(self) -> bool:
+        # True once every queued save has finished and its result was delivered; a failed save marks the data changed again
+        if not self.saver.flush(timeout=10):
+            self._update_status("لم يكتمل الحفظ بعد؛ تم إلغاء الإغلاق.")
+            messagebox.showwarning("الحفظ لم يكتمل", "لا يزال الحفظ جاريًا على القرص. لم يتم إغلاق البرنامج حتى لا تضيع التعديلات؛ حاول الإغلاق مرة أخرى بعد قليل.", parent=self.master); return False
+        self.jobs.dispatch(); return True
 
     def show_help_dialog(self):
         help_text = f"**مدير بروتوكول UCP-LLM - دليل المستخدم ({APP_VERSION})**\n\nإيفي 🧚 دليلك.\n\n**التفاعل:**\n1. ابدأ/حمّل بروتوكول.\n2. حدد حالتك الذهنية.\n3. أجب عن الأسئلة. استخدم القوالب.\n4. تقدم إيفي ملخصات دورية. أكدها أو عدّل الأقسام.\n5. **التحليل التلقائي:** في نهاية جمع البيانات، يمكنك الطلب من إيفي إرسال بروتوكولك إلى Groq API للتحليل.\n   (ملاحظة: يتطلب مفتاح Groq API صالح).\n6. احفظ/صدر البروتوكول.\n\nاستمتع!"
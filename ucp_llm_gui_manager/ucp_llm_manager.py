@@ -8,18 +8,139 @@
 #
 # Version: 1.0.0
 
+import os
+import sys
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, simpledialog, scrolledtext
-import json
-from typing import Optional, Dict, Any, List
+from bisect import bisect_left, bisect_right
+from typing import Optional, Dict, Any, List, Tuple, Callable
+
+# Run from a repository checkout, the library is found in ../ucp_llm_library/src without installing it
+_UCP_LLM_SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "ucp_llm_library", "src")
+try: import ucp_llm
+except ImportError:
+    if os.path.isdir(_UCP_LLM_SOURCE_DIR): sys.path.insert(0, os.path.normpath(_UCP_LLM_SOURCE_DIR))
 
 # Attempt to import the UCPProfile library
 try:
-    from ucp_llm import UCPProfile # Assuming ucp_llm.py is in the same directory
+    from ucp_llm import UCPProfile # Installed (pip install ./ucp_llm_library) or from ../ucp_llm_library/src
+    from ucp_llm.sections import field_label
+    from ucp_llm.jobs import JobRunner, bind_tk
+    from ucp_llm.overlay import ProfileOverlay
+    from ucp_llm.saving import AtomicSaver
 except ImportError:
-    messagebox.showerror("Import Error", "Could not find the 'ucp_llm.py' library file.\nPlease ensure it is in the same directory as this program.")
+    messagebox.showerror("Import Error", "Could not import the 'ucp_llm' library.\nRun the manager from the repository folder, or install the library: pip install ./ucp_llm_library")
     exit()
 
+class DisplayRow:
+    """One line of the structured display: a header, separator, item title or field."""
+    __slots__ = ("kind", "text", "value", "edit_key", "multiline", "in_item_card")
+
+    def __init__(self, kind: str, text: str = "", value: Any = None,
+                 edit_key: Optional[Tuple[str, int, str]] = None, multiline: bool = False, in_item_card: bool = False):
+        self.kind = kind # "header", "section", "separator", "item" or "field"
+        self.text = text
+        self.value = value
+        self.edit_key = edit_key # (section_id, item_index, json_key) for editable fields
+        self.multiline = multiline
+        self.in_item_card = in_item_card # A field of one item in a multi-item section, drawn inside the item's card
+
+    def height(self) -> int:
+        return VirtualRowView.ROW_HEIGHTS["field_multiline" if self.kind == "field" and self.multiline else self.kind]
+
+
+class VirtualRowView:
+    """
+    Virtualized list of DisplayRows on a Canvas. Every row kind has a fixed
+    height, so row positions are a prefix sum and the visible range is found
+    by bisection; only rows inside the visible region (plus OVERSCAN_PX) have
+    widgets. Scrolling creates the rows that come into view and destroys the
+    ones that leave, and update_row() rebuilds a single row in place.
+    """
+    ROW_HEIGHTS = {"header": 46, "section": 36, "separator": 21, "item": 26, "field": 30, "field_multiline": 70}
+    OVERSCAN_PX = 300
+
+    def __init__(self, canvas: tk.Canvas, scrollbar: ttk.Scrollbar, create_row_widget: Callable[[tk.Widget, DisplayRow, int], tk.Widget]):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.create_row_widget = create_row_widget
+        self.rows: List[DisplayRow] = []
+        self.offsets: List[int] = [0] # offsets[i] is the top of row i; offsets[-1] is the total height
+        self.materialized: Dict[int, Tuple[int, tk.Widget]] = {} # row index -> (canvas window id, widget)
+        self._refresh_pending = False
+        canvas.configure(yscrollcommand=self._on_yview)
+        canvas.bind("<Configure>", self._on_resize)
+
+    def set_rows(self, rows: List[DisplayRow]):
+        self.clear()
+        self.rows = rows
+        self._recompute_offsets(0)
+        self.canvas.yview_moveto(0)
+        self.refresh()
+
+    def clear(self):
+        for window_id, widget in self.materialized.values():
+            self.canvas.delete(window_id); widget.destroy()
+        self.materialized = {}
+        self.rows = []
+        self.offsets = [0]
+        self._update_scrollregion()
+
+    def _recompute_offsets(self, start: int):
+        del self.offsets[start + 1:]
+        total = self.offsets[start]
+        for row in self.rows[start:]:
+            total += row.height(); self.offsets.append(total)
+        self._update_scrollregion()
+
+    def _update_scrollregion(self):
+        self.canvas.configure(scrollregion=(0, 0, max(1, self.canvas.winfo_width()), self.offsets[-1]))
+
+    def _on_yview(self, first, last):
+        self.scrollbar.set(first, last)
+        if not self._refresh_pending: # coalesce the burst of calls a drag or wheel spin produces
+            self._refresh_pending = True
+            self.canvas.after_idle(self.refresh)
+
+    def _on_resize(self, event):
+        for window_id, _ in self.materialized.values(): self.canvas.itemconfigure(window_id, width=event.width)
+        self._update_scrollregion(); self.refresh()
+
+    def visible_range(self) -> Tuple[int, int]:
+        top = self.canvas.canvasy(0) - self.OVERSCAN_PX
+        bottom = self.canvas.canvasy(0) + self.canvas.winfo_height() + self.OVERSCAN_PX
+        first = max(0, bisect_right(self.offsets, top) - 1)
+        last = min(len(self.rows), bisect_left(self.offsets, bottom))
+        return first, last
+
+    def refresh(self):
+        self._refresh_pending = False
+        first, last = self.visible_range()
+        for index in [i for i in self.materialized if not first <= i < last]:
+            window_id, widget = self.materialized.pop(index)
+            self.canvas.delete(window_id); widget.destroy()
+        for index in range(first, last):
+            if index not in self.materialized: self._materialize(index)
+
+    def _materialize(self, index: int):
+        row = self.rows[index]
+        widget = self.create_row_widget(self.canvas, row, index)
+        window_id = self.canvas.create_window(0, self.offsets[index], window=widget, anchor="nw",
+                                              width=self.canvas.winfo_width(), height=row.height())
+        self.materialized[index] = (window_id, widget)
+
+    def update_row(self, index: int):
+        """Re-renders one row after its data changed; later rows only move if its height changed."""
+        old_height = self.offsets[index + 1] - self.offsets[index]
+        if index in self.materialized:
+            window_id, widget = self.materialized.pop(index)
+            self.canvas.delete(window_id); widget.destroy()
+        if self.rows[index].height() != old_height:
+            self._recompute_offsets(index)
+            for i, (window_id, _) in self.materialized.items(): self.canvas.coords(window_id, 0, self.offsets[i])
+        self.refresh()
+
+
 class UCPManagerApp:
     def __init__(self, master_root):
         self.master = master_root
@@ -29,7 +150,15 @@ class UCPManagerApp:
 
         self.ucp_profile_loader: Optional[UCPProfile] = None
         self.current_file_path: Optional[str] = None
-        self.loaded_ucp_data: Optional[Dict[str, Any]] = None # This will hold the mutable data for editing
+        self.loaded_ucp_data: Optional[Dict[str, Any]] = None # Read-only view of the edited data (profile_edits.materialize())
+        self.profile_edits: Optional[ProfileOverlay] = None # Edits as a delta over the loaded data, which is never modified in place
+        self.row_index_by_edit_key: Dict[Tuple[str, int, str], int] = {} # Locates the display row of an edited field
+        self.jobs = bind_tk(master_root, JobRunner()) # Background results are delivered on the Tk thread
+        self.jobs.on_unhandled_error = lambda name, error: self._update_status(f"Background task '{name}' failed: {error}")
+        self.saver = AtomicSaver(self.jobs) # Atomic writes off the Tk thread; rapid repeated saves are merged
+        self.last_save_failed = False
+        self.last_save_ticket = 0; self.last_save_edits: Optional[ProfileOverlay] = None # The newest save, and the document it was made from
+        master_root.protocol("WM_DELETE_WINDOW", self._on_closing)
 
         # --- Styling ---
         style = ttk.Style()
@@ -47,6 +176,7 @@ class UCPManagerApp:
         style.configure("Main.TFrame", background="#eaf0f8")
         style.configure("SectionDisplay.TFrame", background="#ffffff", relief="groove", borderwidth=1, padding=10) # Groove for section
         style.configure("ItemCard.TFrame", background="#f5f6fa", relief="solid", borderwidth=1, padding=7, bordercolor="#ced6e0") # Lighter item card
+        style.configure("ItemCardBody.TFrame", background="#f5f6fa", padding=(12,0,7,0)) # Continues an item card down its field rows
         style.configure("FieldRow.TFrame", background="#ffffff")
 
         # --- Top Frame for File Operations ---
@@ -73,13 +203,10 @@ class UCPManagerApp:
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar = ttk.Scrollbar(main_canvas_frame, orient=tk.VERTICAL, command=self.canvas.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.canvas.configure(yscrollcommand=scrollbar.set)
-        self.display_frame = ttk.Frame(self.canvas, style="Main.TFrame", padding=10) 
-        self.canvas_window = self.canvas.create_window((0, 0), window=self.display_frame, anchor="nw")
+        # Only the rows in view get widgets; the view wires the canvas scrolling and resizing itself
+        self.row_view = VirtualRowView(self.canvas, scrollbar, self._create_row_widget)
         
         # Event bindings for scrolling
-        self.display_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
-        self.canvas.bind("<Configure>", lambda e: self.canvas.itemconfig(self.canvas_window, width=e.width))
         master_root.bind_all("<MouseWheel>", lambda e: self.canvas.yview_scroll(int(-1*(e.delta/120)), "units")) # For Windows
         master_root.bind_all("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units")) # For Linux
         master_root.bind_all("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))  # For Linux
@@ -92,36 +219,37 @@ class UCPManagerApp:
     def _update_status(self, message: str):
         self.status_bar.config(text=message)
 
-    def _clear_display_frame(self):
-        for widget in self.display_frame.winfo_children():
-            widget.destroy()
-
-    def _add_header(self, text: str, level: int = 1, parent_widget: Optional[tk.Widget] = None):
-        parent = parent_widget if parent_widget else self.display_frame
-        style = "Header.TLabel" if level == 1 else "SectionTitle.TLabel"
-        anchor_pos = "center" if level == 1 else "w" # English is LTR, so "w" for section titles
-        ttk.Label(parent, text=text, style=style, anchor=anchor_pos).pack(fill=tk.X, pady=(10 if level==1 else 7, 3))
-
-    def _add_display_field(self, parent_frame: tk.Widget, 
-                           english_label: str, # This is the display label
-                           value: Any, 
-                           section_id_for_edit: Optional[str] = None, 
-                           item_index_for_edit: Optional[int] = None, 
-                           json_key_for_edit: Optional[str] = None, # This is the English JSON key
-                           is_multiline: bool = False):
-        field_container = ttk.Frame(parent_frame, style="FieldRow.TFrame") 
-        field_container.pack(fill=tk.X, pady=1, padx=0)
-
-        key_text_for_label = f"{english_label}:"
+    def _create_row_widget(self, parent: tk.Widget, row: DisplayRow, row_index: int) -> tk.Widget:
+        """Builds the widgets of one display row; called by the row view only for rows in view."""
+        if row.kind == "header":
+            return ttk.Label(parent, text=row.text, style="Header.TLabel", anchor="center")
+        if row.kind == "section":
+            return ttk.Label(parent, text=row.text, style="SectionTitle.TLabel", anchor="w") # English is LTR, so "w" for section titles
+        if row.kind == "separator":
+            container = ttk.Frame(parent, style="Main.TFrame")
+            ttk.Separator(container, orient='horizontal').pack(fill='x', pady=10, padx=5)
+            return container
+        if row.kind == "item":
+            container = ttk.Frame(parent, style="ItemCard.TFrame", padding=(7,2))
+            ttk.Label(container, text=row.text, font=('Arial', 10, 'italic'), anchor="w", style="FieldValue.TLabel").pack(fill=tk.X)
+            return container
+
+        item_card = ttk.Frame(parent, style="ItemCardBody.TFrame") if row.in_item_card else None
+        field_container = ttk.Frame(item_card or parent, style="FieldRow.TFrame") 
+        field_container.pack_propagate(False) # The row view fixes the height
+        if item_card: field_container.pack(fill=tk.BOTH, expand=True)
+
+        key_text_for_label = f"{row.text}:"
         key_label_widget = ttk.Label(field_container, text=key_text_for_label, style="FieldKey.TLabel") 
-        key_label_widget.pack(side=tk.LEFT, padx=(0,5)) # Label on the left for LTR
+        key_label_widget.pack(side=tk.LEFT, padx=(0,5), anchor="n") # Label on the left for LTR
 
+        value = row.value
         val_str = str(value) if value is not None and str(value).strip() != "" else "(Not specified)"
         
         value_widget_frame = ttk.Frame(field_container, style="FieldRow.TFrame")
-        value_widget_frame.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        value_widget_frame.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
 
-        if is_multiline:
+        if row.multiline:
             # Using a Text widget for multiline display, disabled for read-only
             value_display_widget = tk.Text(value_widget_frame, wrap=tk.WORD, height=3, width=50,
                                            font=('Arial', 10), relief=tk.FLAT, borderwidth=0, 
@@ -134,15 +262,17 @@ class UCPManagerApp:
             value_display_widget = ttk.Label(value_widget_frame, text=val_str, style="FieldValue.TLabel")
             value_display_widget.pack(side=tk.LEFT, expand=True, fill=tk.X, padx=(0,5))
         
-        if section_id_for_edit and json_key_for_edit:
+        if row.edit_key:
+            section_id_for_edit, item_index_for_edit, json_key_for_edit = row.edit_key
             edit_button = ttk.Button(value_widget_frame, text="✏️", width=3,
                                      command=lambda s_id=section_id_for_edit, 
                                                     idx=item_index_for_edit, 
                                                     k_edit=json_key_for_edit, # Pass the English JSON key
-                                                    lbl=english_label, 
-                                                    current_val=value: 
-                                     self.edit_field_value(s_id, idx, k_edit, lbl, current_val))
-            edit_button.pack(side=tk.LEFT, padx=(5,0)) 
+                                                    lbl=row.text, 
+                                                    r=row: 
+                                     self.edit_field_value(s_id, idx, k_edit, lbl, r.value)) # r.value is current even after in-place edits
+            edit_button.pack(side=tk.LEFT, padx=(5,0), anchor="n") 
+        return item_card or field_container
 
     def edit_field_value(self, section_id: str, item_index: Optional[int], 
                          json_key_to_edit: str, # Now using English JSON key
@@ -155,14 +285,15 @@ class UCPManagerApp:
 
         if new_value_str is not None: # User entered something or cleared it (empty string)
             data_changed = False
-            # Locate the section and item in the self.loaded_ucp_data (which is a mutable dict)
+            # Locate the section and item in the self.loaded_ucp_data (read-only; edits go through self.profile_edits)
             for section_data_dict in self.loaded_ucp_data.get("sections", []):
                 if section_data_dict.get("id") == section_id:
                     items_list = section_data_dict.get("items", [])
                     if item_index is not None: # Editing a field within a specific item of a list
                         if 0 <= item_index < len(items_list):
                             if isinstance(items_list[item_index], dict):
-                                items_list[item_index][json_key_to_edit] = new_value_str # Update using English JSON key
+                                self.profile_edits.set_value(section_id, item_index, json_key_to_edit, new_value_str) # Update using English JSON key
+                                self.loaded_ucp_data = self.profile_edits.materialize() # Only the edited section is rebuilt
                                 data_changed = True
                             else: # Should not happen if JSON is well-formed by generator
                                 messagebox.showerror("Internal Error", f"Item at index {item_index} in section '{section_id}' is not a dictionary.", parent=self.master)
@@ -174,13 +305,26 @@ class UCPManagerApp:
                     break # Found the section
             
             if data_changed:
-                self.display_protocol_content_structured() # Re-render the display with new data
+                self._refresh_edited_field(section_id, item_index, json_key_to_edit, new_value_str) # Re-render just this row
                 self._update_status(f"'{english_label_for_prompt}' updated. Click 'Save Changes' to persist.")
                 self.save_button.config(state=tk.NORMAL)
                 self.export_text_button.config(state=tk.NORMAL) # Re-enable export as content changed
             # No "else" needed here, as simpledialog returns None if cancelled, empty string if cleared.
             # An empty string is a valid new value.
 
+    def _refresh_edited_field(self, section_id: str, item_index: Optional[int], json_key: str, new_value: Any):
+        row_index = self.row_index_by_edit_key.get((section_id, item_index, json_key))
+        if row_index is None: # Field not on screen yet (e.g. a key added by the edit); rebuild the row list
+            self.display_protocol_content_structured(); return
+        row = self.row_view.rows[row_index]
+        row.value = new_value
+        row.multiline = self._is_multiline_value(new_value)
+        self.row_view.update_row(row_index)
+
+    @staticmethod
+    def _is_multiline_value(value: Any) -> bool:
+        return isinstance(value, str) and ("\n" in value or len(value) > 70)
+
     def load_ucp_file(self):
         try:
             filepath = filedialog.askopenfilename(
@@ -193,10 +337,10 @@ class UCPManagerApp:
                 messagebox.showerror("File Load Error", f"Failed to load or parse file:\n{self.ucp_profile_loader.get_error()}")
                 self._reset_app_state(); return
             
-            self.loaded_ucp_data = self.ucp_profile_loader.get_raw_data() # Get mutable dict for editing
-            if not self.loaded_ucp_data or not self.ucp_profile_loader.is_valid(): # Double check
+            if not self.ucp_profile_loader.get_raw_data() or not self.ucp_profile_loader.is_valid(): # Double check
                 messagebox.showerror("File Content Error", "File is empty or does not follow the expected UCP-LLM structure.")
                 self._reset_app_state(); return
+            self.profile_edits = self.ucp_profile_loader.edit(); self.loaded_ucp_data = self.profile_edits.materialize() # Copy-on-write, no copy of the loaded data
 
             self.current_file_path = filepath
             tool_version = self.ucp_profile_loader.get_generator_tool_version() or 'Unknown Version'
@@ -219,8 +363,9 @@ class UCPManagerApp:
         self.ucp_profile_loader = None
         self.current_file_path = None
         self.loaded_ucp_data = None
+        self.profile_edits = None
         self.file_label.config(text="No file loaded.")
-        self._clear_display_frame()
+        self.row_view.clear(); self.row_index_by_edit_key = {}
         self.save_button.config(state=tk.DISABLED)
         self.export_text_button.config(state=tk.DISABLED)
         self._update_status("File operation failed or file invalid. Please try again.")
@@ -236,146 +381,93 @@ class UCPManagerApp:
                 defaultextension=".json", filetypes=[("JSON files", "*.json")],
                 title="Save Modified Protocol as JSON", initialfile=initial_filename )
             if save_path:
-                with open(save_path, "w", encoding="utf-8") as f:
-                    json.dump(self.loaded_ucp_data, f, ensure_ascii=False, indent=2) # Save the edited data
-                messagebox.showinfo("Success", f"Modified protocol saved successfully to:\n{save_path}", parent=self.master)
-                self._update_status(f"Protocol saved to {save_path.split('/')[-1]}")
-                self.current_file_path = save_path # Update current file path if saved to a new location
-                self.file_label.config(text=f"File: ...{self.current_file_path[-45:]}")
+                # Serialized (indent=2, UTF-8) and written in the background; the materialized data is never modified in place, so no copy is needed
+                self.last_save_ticket = self.saver.save(self.profile_edits.materialize(), save_path, on_saved=self._on_protocol_saved,
+                                                        on_error=self._on_protocol_save_failed, snapshot=False)
+                self.last_save_edits = self.profile_edits
+                self._update_status(f"Saving protocol to {save_path.split('/')[-1]}...")
             else: self._update_status("Save operation cancelled.")
         except Exception as e:
             messagebox.showerror("Save Error", f"An error occurred while saving the file: {str(e)}", parent=self.master)
             self._update_status("Failed to save file.")
 
+    def _on_protocol_saved(self, result):
+        self.last_save_failed = False
+        if result.ticket == self.last_save_ticket and self.profile_edits is not None and self.profile_edits is self.last_save_edits:
+            self.current_file_path = result.file_path # Only once the file exists: a failed "save as" keeps the previous file current
+            self.file_label.config(text=f"File: ...{self.current_file_path[-45:]}")
+        self._update_status(f"Protocol saved to disk: {os.path.basename(result.file_path)} ({result.size / 1024:.0f} KB, {result.seconds * 1000:.0f} ms)")
+
+    def _on_protocol_save_failed(self, error: BaseException):
+        self.last_save_failed = True
+        messagebox.showerror("Save Error", f"An error occurred while saving the file: {str(error)}", parent=self.master)
+        self._update_status("Failed to save file.")
+
+    def _on_closing(self):
+        if not self.saver.flush(timeout=10): # Exiting now would kill the write thread with the save unfinished
+            self._update_status("Still saving; close again once the save has finished.")
+            messagebox.showwarning("Save In Progress", "The protocol is still being written to disk. The window stays open so the save is not lost; please try closing again in a moment.", parent=self.master)
+            return
+        self.jobs.dispatch() # Deliver the save result (an error is shown) before deciding
+        if self.last_save_failed and not messagebox.askyesno("Save Failed", "The last save did not reach the disk. Close anyway and lose the unsaved changes?", icon=messagebox.WARNING, parent=self.master): return
+        self.master.destroy()
+
     def display_protocol_content_structured(self):
         """Displays all content from the loaded UCP-LLM JSON using English labels."""
-        self._clear_display_frame()
+        rows = self._build_display_rows()
+        self.row_index_by_edit_key = {row.edit_key: index for index, row in enumerate(rows) if row.edit_key}
+        self.row_view.set_rows(rows) # Widgets are created lazily, only for the rows in view
+
+    def _build_display_rows(self) -> List[DisplayRow]:
+        """Flattens the protocol into display rows; no widgets are created here."""
         if not self.ucp_profile_loader or not self.loaded_ucp_data:
-            ttk.Label(self.display_frame, text="No data to display.", style="Header.TLabel").pack(pady=20)
-            return
+            return [DisplayRow("header", "No data to display.")]
 
         # Use self.ucp_profile_loader for READ-ONLY access to display structure from library
-        # But use self.loaded_ucp_data (the mutable dict) to pass current_value to edit_field_value
+        # But use self.loaded_ucp_data (the edited data) to pass current_value to edit_field_value
 
         tool_version = self.ucp_profile_loader.get_generator_tool_version() or 'N/A'
         gen_date = self.ucp_profile_loader.get_generation_date() or 'N/A'
 
-        self._add_header(f"User Context Protocol (Tool v: {tool_version})")
-        self._add_display_field(self.display_frame, "File Generation Date", gen_date)
-        ttk.Separator(self.display_frame, orient='horizontal').pack(fill='x', pady=10, padx=5)
+        rows = [DisplayRow("header", f"User Context Protocol (Tool v: {tool_version})"),
+                DisplayRow("field", "File Generation Date", gen_date),
+                DisplayRow("separator")]
 
         # --- Mapping of section_id to English Display Title for sections ---
         # This should align with the 'title' field your HTML generator puts in the JSON for each section.
         # It assumes the library's get_section_title(section_id) returns this English title.
         
+        editable_sections_by_id = {}
+        for s in self.loaded_ucp_data.get("sections", []): editable_sections_by_id.setdefault(s.get("id"), s) # First match wins, as before
         for section_data_from_json in self.ucp_profile_loader.get_sections(): # Iterate over sections from raw JSON
             section_id = section_data_from_json.get("id")
             # Use the 'title' field directly from the JSON section data for display
             section_display_title = section_data_from_json.get("title", f"Section: {section_id}") 
             if not section_id: continue
 
-            self._add_header(section_display_title, level=2)
-            
-            section_display_container = ttk.Frame(self.display_frame, style="SectionDisplay.TFrame")
-            section_display_container.pack(fill=tk.X, expand=True, pady=5)
+            rows.append(DisplayRow("section", section_display_title))
 
-            # Get items for this section from the mutable self.loaded_ucp_data
-            current_section_in_editable_data = next((s for s in self.loaded_ucp_data.get("sections",[]) if s.get("id") == section_id), None)
+            # Get items for this section from the edited self.loaded_ucp_data
+            current_section_in_editable_data = editable_sections_by_id.get(section_id)
             items_to_display = current_section_in_editable_data.get("items", []) if current_section_in_editable_data else []
 
 
             if not items_to_display:
-                self._add_display_field(section_display_container, "(This section is empty)", "")
-            
+                rows.append(DisplayRow("field", "(This section is empty)", ""))
+
+            # English labels come from the shared section registry (ucp_llm.sections); unknown keys show as-is
             for item_index, item_data_dict_editable in enumerate(items_to_display):
-                parent_for_fields = section_display_container
                 if len(items_to_display) > 1 : 
-                     item_card = ttk.Frame(section_display_container, style="ItemCard.TFrame")
-                     item_card.pack(fill=tk.X, pady=(5,10), padx=5) 
                      # Display item number if multiple items
-                     ttk.Label(item_card, text=f"Item ({item_index + 1})", font=('Arial', 10, 'italic'), anchor="w", style="FieldValue.TLabel").pack(fill=tk.X, pady=(0,5))
-                     parent_for_fields = item_card
-
-                # To get the English labels for display, we refer to the HTML sectionTypeData structure
-                # This requires that the Tkinter app has access to a similar structure or a mapping.
-                # For simplicity, we'll use the JSON key as the display label if no other mapping is present.
-                # A more robust solution would involve a shared definition or passing labels.
-                
-                html_section_def = self.get_html_section_definition(section_id) # You'll need to implement this helper
+                     rows.append(DisplayRow("item", f"Item ({item_index + 1})"))
 
                 for json_key_from_item, value_from_item in item_data_dict_editable.items():
-                    display_label_for_field = json_key_from_item # Default to jsonKey
-                    if html_section_def:
-                        field_def_from_html = next((f for f in html_section_def.get("fields", []) if f.get("jsonKey") == json_key_from_item), None)
-                        if field_def_from_html:
-                            display_label_for_field = field_def_from_html.get("label", json_key_from_item) # Use HTML label
-
-                    is_multiline_display = isinstance(value_from_item, str) and ("\n" in value_from_item or len(value_from_item) > 70) 
-                    
-                    self._add_display_field(parent_for_fields, display_label_for_field, value_from_item,
-                                            section_id_for_edit=section_id, 
-                                            item_index_for_edit=item_index, 
-                                            json_key_for_edit=json_key_from_item, # Pass English JSON key
-                                            is_multiline=is_multiline_display)
-        
-        self.display_frame.update_idletasks()
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
-
-    def get_html_section_definition(self, section_id_to_find: str) -> Optional[Dict[str,Any]]:
-        """
-        Placeholder/Helper to get the HTML tool's section definition.
-        In a real app, this data (similar to sectionTypeData from HTML)
-        would be loaded or defined within this Python application to map
-        JSON keys back to user-friendly English labels for display.
-        """
-        # This is a simplified mock. You'd need the full sectionTypeData here
-        # or a way to derive labels from the loaded UCPProfile library if it stored them.
-        mock_section_type_data_for_labels = {
-            "personal": {"fields": [
-                {"jsonKey": "preferredName", "label": "Preferred Name"},
-                {"jsonKey": "dateOfBirth", "label": "Date of Birth"},
-                {"jsonKey": "nationalityCulturalBackground", "label": "Nationality/Cultural Background"},
-                {"jsonKey": "languagesProficiency", "label": "Languages Proficiency"}
-            ]},
-            "social": {"fields": [{"jsonKey": "socialFamilyDetails", "label": "Social & Family Details"}]},
-            "educational_professional": {"fields": [
-                {"jsonKey": "educationalBackground", "label": "Educational Background"},
-                {"jsonKey": "professionalExperience", "label": "Professional Experience"}
-            ]},
-            "thinking_reference": {"fields": [
-                {"jsonKey": "coreThinkingReferenceDescription", "label": "Core Thinking Reference Description"},
-                {"jsonKey": "thinkingReferenceApplication", "label": "Thinking Reference Application"}
-            ]},
-            "ethical_values": {"fields": [
-                {"jsonKey": "ethicalValueName", "label": "Ethical Value Name"},
-                {"jsonKey": "ethicalValueExplanation", "label": "Ethical Value Explanation"}
-            ]},
-            "projects": {"fields": [
-                {"jsonKey": "projectOrObjectiveTitle", "label": "Project/Objective Title"},
-                {"jsonKey": "projectGoals", "label": "Project Goals"}, # Example
-                {"jsonKey": "projectLLMRole", "label": "LLM Role in Project"} # Example
-            ]},
-            "role": {"fields": [
-                {"jsonKey": "llmPrimaryRole", "label": "LLM Primary Role"},
-                {"jsonKey": "llmRoleAttributes", "label": "LLM Role Attributes"}
-            ]},
-            "conceptual_tuning": {"fields": [
-                {"jsonKey": "userSpecificTerm", "label": "User Specific Term"},
-                {"jsonKey": "userTermDefinition", "label": "User Term Definition"}
-            ]},
-            "intervention_level": {"fields": [
-                {"jsonKey": "chosenInterventionLevel", "label": "Chosen Intervention Level"},
-                {"jsonKey": "interventionClarifications", "label": "Intervention Clarifications"}
-            ]},
-            # ... YOU MUST COMPLETE THIS MOCK WITH ALL 25 SECTION DEFINITIONS AND THEIR FIELDS/JSONKEYS/LABELS
-            # AS DEFINED IN YOUR HTML TOOL's sectionTypeData
-            "alignment_level": {"fields": [{"jsonKey": "desiredAlignmentLevel", "label":"Desired Alignment Level"}, {"jsonKey": "alignmentLevelNotes", "label":"Alignment Notes"}]},
-            "mental_state": {"fields": [{"jsonKey": "selectedMentalState", "label":"Selected Mental State"}, {"jsonKey": "mentalStateNotes", "label":"Mental State Notes"}]},
-            "sports_inclinations": {"fields": [{"jsonKey": "chosenSportInclination", "label":"Sport Inclination"}, {"jsonKey": "sportOtherDetails", "label":"Sport Other Details"}]},
-
-        }
-        return mock_section_type_data_for_labels.get(section_id_to_find)
-
+                    display_label_for_field = field_label(section_id, json_key_from_item, english=True)
+                    rows.append(DisplayRow("field", display_label_for_field, value_from_item,
+                                           edit_key=(section_id, item_index, json_key_from_item), # Pass English JSON key
+                                           multiline=self._is_multiline_value(value_from_item),
+                                           in_item_card=len(items_to_display) > 1))
+        return rows
 
     def export_as_formatted_text(self):
         if not self.loaded_ucp_data or not self.ucp_profile_loader: # <--- السطر الصحيح
@@ -404,16 +496,9 @@ class UCPManagerApp:
             for item_index, item_data_dict in enumerate(items_to_export):
                 if len(items_to_export) > 1:
                     output_lines.append(f"  #### Item ({item_index + 1}):")
-                
-                # To get display labels for text export, refer to HTML definition
-                html_section_def = self.get_html_section_definition(section_id)
 
                 for json_key, value in item_data_dict.items():
-                    display_label_for_text = json_key # Default to jsonKey
-                    if html_section_def:
-                        field_def = next((f for f in html_section_def.get("fields", []) if f.get("jsonKey") == json_key), None)
-                        if field_def:
-                            display_label_for_text = field_def.get("label", json_key) # Use HTML label
+                    display_label_for_text = field_label(section_id, json_key, english=True) # Defaults to jsonKey
 
                     value_str = str(value)
                     if "\n" in value_str: # Handle multiline values nicely
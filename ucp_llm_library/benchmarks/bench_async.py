@@ -0,0 +1,108 @@
+# bench_async.py
+# Request latency of an asyncio service that loads and renders a protocol per
+# request, calling the blocking UCPProfile(path) + render() inline vs.
+# awaiting UCPProfile.aload() + ProtocolRenderer.arender() on a bounded thread
+# pool. Requests arrive open-loop (Poisson) at a fixed share of the measured
+# capacity; one in ten is for a large protocol. A 5 ms heartbeat task records
+# how long the event loop was unable to run anything else.
+#
+# --storage-ms adds a blocking delay to every file read, modelling a network
+# volume or a cold disk; files written by this benchmark are otherwise always
+# in the page cache. With --storage-ms 0 the work is pure CPU, which threads
+# cannot overlap under the GIL, so aload() only adds hand-off overhead there.
+#
+# Usage: python bench_async.py [--requests 400] [--load 0.6] [--threads 8] [--storage-ms 2]
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ucp_llm import ProtocolRenderer, UCPProfile, jsonio
+
+from profile_factory import make_profile, write_profile
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1e3
+
+
+async def serve(mode: str, paths, arrivals, executor) -> tuple:
+    renderer = ProtocolRenderer()
+    latencies, lags = [], []
+    stop = asyncio.Event()
+
+    async def handle(path: str, arrived: float) -> None:
+        if mode == "blocking":
+            profile = UCPProfile(path)
+            renderer.render(profile, for_preview=False)
+        else:
+            profile = await UCPProfile.aload(path, executor)
+            await renderer.arender(profile, for_preview=False, executor=executor)
+        latencies.append(time.perf_counter() - arrived)
+
+    async def heartbeat() -> None:
+        while not stop.is_set():
+            due = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+            lags.append(max(0.0, time.perf_counter() - due))
+
+    beat = asyncio.ensure_future(heartbeat())
+    start = time.perf_counter()
+    tasks = []
+    for path, offset in zip(paths, arrivals):
+        delay = start + offset - time.perf_counter()
+        if delay > 0: await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(handle(path, start + offset)))  # Latency counts from the scheduled arrival
+    await asyncio.gather(*tasks)
+    stop.set()
+    await beat
+    return latencies, lags
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="asyncio load + render latency under concurrent requests.")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--load", type=float, default=0.6, help="Offered load as a fraction of single-thread capacity.")
+    parser.add_argument("--threads", type=int, default=8, help="Thread pool size bounding loads and renders in flight.")
+    parser.add_argument("--storage-ms", type=float, default=2.0, help="Simulated latency of each file read.")
+    args = parser.parse_args()
+
+    load_file = jsonio.load_file
+    def slow_load_file(file_path: str):
+        time.sleep(args.storage_ms / 1e3)
+        return load_file(file_path)
+    jsonio.load_file = slow_load_file
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        small, large = os.path.join(tmp, "small.json"), os.path.join(tmp, "large.json")
+        write_profile(small, make_profile(items_per_section=3, words_per_field=12, seed=1))
+        write_profile(large, make_profile(items_per_section=8, words_per_field=200, seed=2))
+        paths = [large if rng.random() < 0.1 else small for _ in range(args.requests)]
+
+        renderer = ProtocolRenderer()
+        start = time.perf_counter()
+        for path in paths[:100]: renderer.render(UCPProfile(path), for_preview=False)
+        service = (time.perf_counter() - start) / min(100, len(paths))
+        rate = args.load / service
+        arrivals, t = [], 0.0
+        for _ in paths:
+            t += rng.expovariate(rate)
+            arrivals.append(t)
+        print(f"{args.requests} requests, mean service {service * 1e3:.2f} ms incl. {args.storage_ms:g} ms storage, "
+              f"{rate:.0f} req/s offered ({args.load:.0%} of single-thread capacity)")
+        print(f"{'mode':>9} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} {'loop lag p99 ms':>16} {'max lag ms':>11}")
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            for mode in ("blocking", "async"):
+                latencies, lags = asyncio.run(serve(mode, paths, arrivals, executor))
+                print(f"{mode:>9} {percentile(latencies, 0.5):>7.2f} {percentile(latencies, 0.99):>7.2f} {max(latencies) * 1e3:>7.2f} "
+                      f"{percentile(lags, 0.99):>16.2f} {max(lags) * 1e3:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# bench_client_reuse.py
+# Connections opened and wall time for N chat completions against a local
+# OpenAI-compatible stub server: a new client per request (what the Eve manager
+# used to do with Groq(api_key=...)) vs. one shared ucp_llm.llm.HTTPChatProvider
+# used by several worker threads. --handshake-ms delays every new connection on
+# the server side to stand in for TCP + TLS setup to a remote API.
+#
+# Usage: python bench_client_reuse.py [--requests 60] [--threads 4] [--handshake-ms 60]
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from ucp_llm.llm import HTTPChatProvider
+
+ANSWER = "تحليل موجز للبروتوكول. " * 20
+
+
+def make_handler(handshake_s: float, counter: dict):
+    class StubChatHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            with counter["lock"]: counter["connections"] += 1
+            time.sleep(handshake_s)
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if request.get("stream"):
+                events = [json.dumps({"choices": [{"delta": {"content": ANSWER[i:i + 16]}}]}, ensure_ascii=False) for i in range(0, len(ANSWER), 16)]
+                body = "".join(f"data: {e}\n\n" for e in events + ["[DONE]"]).encode("utf-8")
+                content_type = "text/event-stream"
+            else:
+                body = json.dumps({"choices": [{"message": {"content": ANSWER}}]}, ensure_ascii=False).encode("utf-8")
+                content_type = "application/json"
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return StubChatHandler
+
+
+def run(base_url: str, requests: int, threads: int, shared: bool, stream: bool) -> tuple:
+    provider = HTTPChatProvider(base_url, api_key="stub", max_connections=threads) if shared else None
+    messages = [{"role": "user", "content": "protocol"}]
+
+    def one(_):
+        client = provider or HTTPChatProvider(base_url, api_key="stub")
+        text = "".join(client.stream_text(messages, model="stub", stream=stream))
+        if provider is None: client.close()
+        assert text == ANSWER
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool: list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+    if provider is not None: provider.close()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LLM client reuse benchmark against a local stub server.")
+    parser.add_argument("--requests", type=int, default=60)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--handshake-ms", type=float, default=60.0)
+    args = parser.parse_args()
+
+    counter = {"connections": 0, "lock": threading.Lock()}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.handshake_ms / 1e3, counter))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/openai/v1"
+
+    print(f"{args.requests} requests, {args.threads} threads, {args.handshake_ms:.0f} ms per new connection")
+    print(f"{'client':>16} {'mode':>9} {'connections':>12} {'total s':>8} {'ms/request':>11}")
+    for shared in (False, True):
+        for stream in (False, True):
+            before = counter["connections"]
+            elapsed = run(base_url, args.requests, args.threads, shared, stream)
+            print(f"{'shared provider' if shared else 'new per request':>16} {'stream' if stream else 'blocking':>9} "
+                  f"{counter['connections'] - before:>12} {elapsed:>8.2f} {elapsed / args.requests * 1e3:>11.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# bench_columnar.py
+# Corpus analytics (distribution of chosenInterventionLevel, ethical_values item
+# counts, profiles whose cognitivePassionName mentions "philosophy") by parsing
+# every JSON through UCPProfile vs. reading one ucp_llm.columnar corpus file.
+#
+# Usage: python bench_columnar.py [--profiles 2000] [--items 3] [--words 40]
+
+import argparse
+import os
+import tempfile
+import time
+from collections import Counter
+
+from ucp_llm import UCPProfile
+from ucp_llm.columnar import build_corpus, read_corpus
+
+from profile_factory import make_profile, write_profile
+
+
+def scan_json(paths):
+    levels, ethical_counts, philosophy = Counter(), [], []
+    for path in paths:
+        profile = UCPProfile(path)
+        levels.update(item.get("chosenInterventionLevel") for item in profile.get_section_items("intervention_level"))
+        ethical_counts.append(len(profile.get_section_items("ethical_values")))
+        if any("philosophy" in (item.get("cognitivePassionName") or "") for item in profile.get_section_items("cognitive_passion")): philosophy.append(path)
+    return dict(levels), ethical_counts, philosophy
+
+
+def scan_corpus(corpus_path):
+    with read_corpus(corpus_path) as corpus:
+        levels = corpus.value_counts("intervention_level", "chosenInterventionLevel")
+        ethical_counts = corpus.item_counts("ethical_values")
+        philosophy = corpus.match_paths("cognitive_passion", "cognitivePassionName", lambda value: "philosophy" in value)
+    return levels, ethical_counts, philosophy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Columnar corpus analytics benchmark.")
+    parser.add_argument("--profiles", type=int, default=2000, help="Number of profile files.")
+    parser.add_argument("--items", type=int, default=3, help="Items per multi-item section.")
+    parser.add_argument("--words", type=int, default=40, help="Words per text field.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for n in range(args.profiles):
+            path = os.path.join(tmp, f"profile_{n:06d}.json")
+            write_profile(path, make_profile(items_per_section=1 + n % args.items, words_per_field=args.words, seed=n))
+            paths.append(path)
+        corpus_path = os.path.join(tmp, "corpus.ucpc")
+
+        start = time.perf_counter()
+        build_corpus(paths).write(corpus_path)
+        build_s = time.perf_counter() - start
+        json_bytes = sum(os.path.getsize(p) for p in paths)
+        corpus_bytes = os.path.getsize(corpus_path)
+
+        start = time.perf_counter()
+        expected = scan_json(paths)
+        json_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        result = scan_corpus(corpus_path)
+        corpus_ms = (time.perf_counter() - start) * 1000
+        assert result == expected, "columnar results differ from the JSON scan"
+
+    print(f"{args.profiles} profiles: {json_bytes / 1e6:.1f} MB JSON -> {corpus_bytes / 1e6:.1f} MB corpus (built in {build_s:.2f} s)")
+    print(f"analytics over JSON files (UCPProfile each): {json_ms:8.1f} ms")
+    print(f"analytics over the columnar corpus:          {corpus_ms:8.1f} ms ({json_ms / corpus_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# bench_context.py
+# Prompt size and compile time of ContextCompiler (ucp_llm.context) at several
+# token budgets vs. the full ProtocolRenderer export that is sent today.
+#
+# Usage: python bench_context.py [--items 4] [--words 150] [--budgets 2000,4000,8000,16000]
+
+import argparse
+import time
+
+from ucp_llm.context import ContextCompiler, estimate_tokens
+from ucp_llm.render import ProtocolRenderer
+
+from profile_factory import make_profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Token-budgeted context compiler benchmark.")
+    parser.add_argument("--items", type=int, default=4, help="Items per multi-item section.")
+    parser.add_argument("--words", type=int, default=150, help="Words per text field.")
+    parser.add_argument("--budgets", default="2000,4000,8000,16000", help="Comma-separated token budgets.")
+    args = parser.parse_args()
+
+    data = make_profile(items_per_section=args.items, words_per_field=args.words, seed=1)
+    renderer = ProtocolRenderer()
+    start = time.perf_counter()
+    full = renderer.render(data, for_preview=False)
+    render_ms = (time.perf_counter() - start) * 1000
+    full_tokens = estimate_tokens(full)
+    print(f"full export: {full_tokens:,} tokens (estimated), {len(full):,} chars, rendered in {render_ms:.1f} ms")
+    print(f"{'budget':>8} {'tokens':>8} {'of full':>8} {'whole':>6} {'reduced':>8} {'omitted':>8} {'ms':>7}")
+    for budget in (int(b) for b in args.budgets.split(",")):
+        compiler = ContextCompiler(budget, renderer=renderer)
+        start = time.perf_counter()
+        compiled = compiler.compile(data)
+        compile_ms = (time.perf_counter() - start) * 1000
+        assert compiled.tokens <= budget
+        print(f"{budget:>8,} {compiled.tokens:>8,} {compiled.tokens / full_tokens:>8.0%} {len(compiled.included):>6} "
+              f"{len(compiled.reduced):>8} {len(compiled.omitted):>8} {compile_ms:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
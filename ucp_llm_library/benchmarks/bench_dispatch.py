@@ -0,0 +1,74 @@
+# bench_dispatch.py
+# Time to a complete analysis from local stub providers whose response times
+# vary from call to call (log-normal, with occasional slow outliers and
+# failures): one provider alone vs. AnalysisDispatcher over several of them in
+# first-wins mode (the fastest success) and in collect-all mode (the slowest).
+# The timeout, cancellation and failover behaviour is tested in
+# tests/test_dispatch.py.
+#
+# Usage: python bench_dispatch.py [--requests 40] [--providers 3] [--median-ms 300]
+
+import argparse
+import random
+import threading
+import time
+
+from ucp_llm.dispatch import MODE_ALL, MODE_FIRST, AnalysisDispatcher, AnalysisTarget
+from ucp_llm.llm import LLMProvider
+
+ANSWER = "تحليل موجز للبروتوكول. " * 20
+MESSAGES = [{"role": "user", "content": "حلل البروتوكول."}]
+
+
+class StubProvider(LLMProvider):
+    """Answers ANSWER in 16-character pieces after a random delay; fails with probability `failure_rate`."""
+
+    name = "stub"
+
+    def __init__(self, seed: int, median_s: float, failure_rate: float = 0.0):
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.median_s = median_s
+        self.failure_rate = failure_rate
+
+    def stream_text(self, messages, model, stream=True, **create_kwargs):
+        with self._lock:
+            delay = self.median_s * self._rng.lognormvariate(0.0, 0.5) * (4 if self._rng.random() < 0.05 else 1)
+            fails = self._rng.random() < self.failure_rate
+        time.sleep(delay * 0.3)  # Time to first token
+        if fails: raise ConnectionError("stub provider failed")
+        for start in range(0, len(ANSWER), 16):
+            time.sleep(delay * 0.7 * 16 / len(ANSWER))
+            yield ANSWER[start:start + 16]
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AnalysisDispatcher latency over stub providers.")
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--providers", type=int, default=3)
+    parser.add_argument("--median-ms", type=float, default=300.0, help="Median response time of each stub provider.")
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    providers = [StubProvider(seed, args.median_ms / 1e3, args.failure_rate) for seed in range(args.providers)]
+    targets = [AnalysisTarget(provider, f"model-{n}") for n, provider in enumerate(providers)]
+    setups = (("single", AnalysisDispatcher(targets[:1])), (f"first of {args.providers}", AnalysisDispatcher(targets, MODE_FIRST)),
+              (f"all of {args.providers}", AnalysisDispatcher(targets, MODE_ALL)))
+    print(f"{args.requests} requests, stub median {args.median_ms:g} ms, {args.failure_rate:.0%} failures per call")
+    print(f"{'dispatch':>12} {'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} {'failed':>7}")
+    for label, dispatcher in setups:
+        seconds, failed = [], 0
+        for _ in range(args.requests):
+            result = dispatcher.dispatch(MESSAGES)
+            seconds.append(result.seconds)
+            if not result.ok: failed += 1
+        print(f"{label:>12} {percentile(seconds, 0.5):>7.0f} {percentile(seconds, 0.95):>7.0f} {max(seconds) * 1e3:>7.0f} {failed:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# bench_getters.py
+# Getter throughput of UCPProfile (indexed lookups) vs. the former linear section scan.
+#
+# Usage: python bench_getters.py [--sections 25 100 400] [--rounds 2000]
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from ucp_llm import UCPProfile
+
+from profile_factory import make_profile, write_profile
+
+GETTERS = [
+    "get_personal_preferred_name", "get_personal_languages", "get_social_details",
+    "get_edu_prof_education", "get_thinking_ref_description", "get_all_cognitive_passions",
+    "get_all_ethical_values", "get_all_projects_objectives", "get_all_pivotal_examples",
+    "get_llm_persona_primary_role", "get_all_conceptual_tunings", "get_interaction_preferred_style",
+    "get_intervention_chosen_level", "get_alignment_desired_level", "get_critique_preferences",
+    "get_all_constraints_warnings", "get_memory_context_directive", "get_mental_state_selected",
+    "get_sports_chosen_inclination", "get_additional_general_notes",
+]
+
+
+class LinearScanProfile(UCPProfile):
+    """Reference implementation of the pre-index lookups, kept here for comparison only."""
+
+    def get_section_by_id(self, section_id: str) -> Optional[Dict[str, Any]]:
+        if not self.is_valid(): return None
+        for section in self.get_sections():
+            if isinstance(section, dict) and section.get("id") == section_id:
+                return section
+        return None
+
+    def get_section_items(self, section_id: str) -> List[Dict[str, Any]]:
+        section = self.get_section_by_id(section_id)
+        items_data = section.get("items", []) if section else []
+        return [item for item in items_data if isinstance(item, dict)] if isinstance(items_data, list) else []
+
+    def get_first_item_from_section(self, section_id: str) -> Optional[Dict[str, Any]]:
+        items = self.get_section_items(section_id)
+        return items[0] if items else None
+
+
+def calls_per_second(profile: UCPProfile, rounds: int) -> float:
+    bound = [getattr(profile, name) for name in GETTERS]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for getter in bound: getter()
+    return rounds * len(bound) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="UCPProfile getter throughput benchmark.")
+    parser.add_argument("--sections", type=int, nargs="+", default=[25, 100, 400, 1000], help="Total section counts to test.")
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'sections':>8} {'linear calls/s':>16} {'indexed calls/s':>16} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for total in args.sections:
+            path = os.path.join(tmp, f"profile_{total}.json")
+            write_profile(path, make_profile(extra_sections=max(0, total - 25)))
+            linear = calls_per_second(LinearScanProfile(path), args.rounds)
+            indexed = calls_per_second(UCPProfile(path), args.rounds)
+            print(f"{total:>8} {linear:>16,.0f} {indexed:>16,.0f} {indexed / linear:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# bench_job_latency.py
+# Delay between a background job finishing and its callback running on the
+# "GUI" thread, and how often that thread wakes up, for a 200 ms polling loop
+# (the old Eve _check_api_queue) vs. ucp_llm.jobs.JobRunner's wake-on-post.
+# The GUI loop is modelled with a threading.Event instead of Tk so it runs headless.
+#
+# Usage: python bench_job_latency.py [--jobs 20] [--poll-ms 200]
+
+import argparse
+import queue
+import random
+import statistics
+import threading
+import time
+
+from ucp_llm.jobs import JobRunner
+
+
+def job_body(job, delay: float) -> float:
+    time.sleep(delay)
+    return time.perf_counter()
+
+
+def polling(delays, poll_s: float) -> tuple:
+    results: "queue.Queue[float]" = queue.Queue(); latencies = []; wakeups = 0
+    for d in delays: threading.Thread(target=lambda d=d: results.put(job_body(None, d)), daemon=True).start()
+    while len(latencies) < len(delays):
+        time.sleep(poll_s); wakeups += 1
+        while True:
+            try: finished = results.get_nowait()
+            except queue.Empty: break
+            latencies.append(time.perf_counter() - finished)
+    return latencies, wakeups
+
+
+def event_driven(delays) -> tuple:
+    wake = threading.Event(); runner = JobRunner(notify=wake.set); latencies = []; wakeups = 0
+    for d in delays: runner.submit(job_body, d, on_done=lambda finished: latencies.append(time.perf_counter() - finished))
+    while len(latencies) < len(delays):
+        wake.wait(); wake.clear(); wakeups += 1
+        runner.dispatch()
+    return latencies, wakeups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Background job result delivery latency.")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--poll-ms", type=float, default=200.0)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    delays = [rng.uniform(0.05, 1.5) for _ in range(args.jobs)]
+    print(f"{args.jobs} concurrent jobs finishing within {max(delays):.1f} s")
+    print(f"{'delivery':>10} {'mean ms':>8} {'p95 ms':>7} {'wakeups':>8}")
+    for label, (latencies, wakeups) in (("polling", polling(delays, args.poll_ms / 1e3)), ("event", event_driven(delays))):
+        latencies.sort()
+        print(f"{label:>10} {statistics.mean(latencies) * 1e3:>8.1f} {latencies[int(0.95 * (len(latencies) - 1))] * 1e3:>7.1f} {wakeups:>8}")
+
+
+if __name__ == "__main__":
+    main()
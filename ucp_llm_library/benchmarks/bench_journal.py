@@ -0,0 +1,63 @@
+# bench_journal.py
+# Cost of journaling an Eve session (one appended line per answer) and of
+# replaying the journal on startup after a crash, vs. rewriting the whole
+# protocol JSON after every answer.
+#
+# Usage: python bench_journal.py [--items 20] [--words 400] [--entries 1000]
+
+import argparse
+import os
+import tempfile
+import time
+
+from ucp_llm import UCPProfile, jsonio
+from ucp_llm.journal import SessionJournal
+
+from profile_factory import KNOWN_SECTIONS, make_profile, write_profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Session journal append and replay benchmark.")
+    parser.add_argument("--items", type=int, default=20, help="Items per multi-item section.")
+    parser.add_argument("--words", type=int, default=400, help="Words per text field.")
+    parser.add_argument("--entries", type=int, default=1000, help="Edits journaled before the simulated crash.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "profile.json")
+        journal_path = os.path.join(tmp, "session.jsonl")
+        write_profile(path, make_profile(items_per_section=args.items, words_per_field=args.words, seed=1))
+        overlay = UCPProfile(path).edit()
+        journal = SessionJournal(journal_path)
+        journal.start(path, overlay)
+
+        fields = [(section_id, key) for section_id, keys in KNOWN_SECTIONS.items() for key in keys]
+        start = time.perf_counter()
+        for n in range(args.entries):
+            section_id, key = fields[n % len(fields)]
+            overlay.set_value(section_id, n % 3, key, f"answer {n}")
+            journal.record_state({"current_field_index": n})
+        append_ms = (time.perf_counter() - start) * 1000
+        journal.close()
+        with open(journal_path, "ab") as f: f.write(b'{"op": "set", "a": ["pers')  # Torn final write
+
+        start = time.perf_counter()
+        replay = SessionJournal.replay(journal_path)
+        replay_ms = (time.perf_counter() - start) * 1000
+        assert replay.error_message is None and replay.state == {"current_field_index": args.entries - 1}
+        assert replay.overlay.materialize() == overlay.materialize()
+
+        data = overlay.materialize()
+        start = time.perf_counter()
+        jsonio.dump_file(data, path)
+        rewrite_ms = (time.perf_counter() - start) * 1000
+        journal_size = os.path.getsize(journal_path)
+        size = os.path.getsize(path)
+
+    print(f"profile JSON: {size / 1e6:.2f} MB, journal: {journal_size / 1e3:.0f} KB ({replay.entries} entries)")
+    print(f"journaling: {append_ms / args.entries * 1000:.0f} us per answer; rewriting the JSON: {rewrite_ms:.1f} ms per answer")
+    print(f"replay after crash (load base + {replay.entries} entries, torn tail dropped): {replay_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
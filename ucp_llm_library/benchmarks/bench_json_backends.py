@@ -0,0 +1,44 @@
+# bench_json_backends.py
+# Parse/serialize times of each installed ucp_llm.jsonio backend on large profiles.
+#
+# Usage: python bench_json_backends.py [--items 10 100 400] [--repeat 20]
+
+import argparse
+import time
+
+from ucp_llm import jsonio
+
+from profile_factory import make_profile
+
+
+def best_of(repeat: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter(); fn(); best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ucp_llm.jsonio backend benchmark.")
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 100, 400], help="Items per multi-item section.")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    original = jsonio.get_backend()
+    print(f"{'items':>6} {'size':>9} {'backend':>8} {'parse ms':>9} {'pretty ms':>10} {'compact ms':>11} {'compact size':>13}")
+    for items in args.items:
+        profile = make_profile(extra_sections=50, items_per_section=items, words_per_field=40)
+        for backend in jsonio.available_backends():
+            jsonio.set_backend(backend)
+            pretty = jsonio.dumps_bytes(profile)
+            compact = jsonio.dumps_bytes(profile, compact=True)
+            parse = best_of(args.repeat, lambda: jsonio.loads(pretty))
+            dump_pretty = best_of(args.repeat, lambda: jsonio.dumps_bytes(profile))
+            dump_compact = best_of(args.repeat, lambda: jsonio.dumps_bytes(profile, compact=True))
+            print(f"{items:>6} {len(pretty) / 1e6:>7.2f}MB {backend:>8} {parse * 1e3:>9.2f} {dump_pretty * 1e3:>10.2f} "
+                  f"{dump_compact * 1e3:>11.2f} {len(compact) / 1e6:>11.2f}MB")
+    jsonio.set_backend(original)
+
+
+if __name__ == "__main__":
+    main()
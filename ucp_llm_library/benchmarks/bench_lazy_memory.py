@@ -0,0 +1,66 @@
+# bench_lazy_memory.py
+# Peak resident memory of a single-field lookup (get_personal_preferred_name) with
+# UCPProfile vs. LazyUCPProfile as the protocol file grows. Unix only (uses resource).
+#
+# Usage: python bench_lazy_memory.py [--sizes-mb 1 10 50 200]
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from profile_factory import make_profile, write_profile
+
+MEASURE = r"""
+import resource, sys, time
+from ucp_llm import UCPProfile
+from ucp_llm.lazy import LazyUCPProfile
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+profile = (LazyUCPProfile if sys.argv[1] == "lazy" else UCPProfile)(sys.argv[2])
+name = profile.get_personal_preferred_name()
+elapsed = time.perf_counter() - start
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+assert name, profile.get_error()
+print((after - before) * (1 if sys.platform == "darwin" else 1024), elapsed)
+"""
+
+
+def grown_profile(target_mb: float) -> dict:
+    """Grows a profile the way long-lived ones do: external analyses and many pivotal examples."""
+    profile = make_profile(items_per_section=3)
+    sections = {s["id"]: s for s in profile["sections"]}
+    chunk = "تحليل خارجي مفصل للشخصية والأنماط الفكرية. " * 200
+    example = {"pivotalExampleName": "Allegory of the cave", "pivotalExampleSignificance": "Shows the gap between appearance and reality. " * 20}
+    per_example = len(str(example).encode("utf-8"))
+    examples_needed = int(target_mb * 1024 * 1024 * 0.5 / per_example)
+    sections["pivotal_examples"]["items"] = [dict(example) for _ in range(examples_needed)]
+    repeats = max(1, int(target_mb * 1024 * 1024 * 0.5 / len(chunk.encode("utf-8"))))
+    sections["additional_notes"]["items"][0]["externalAnalysisSummary"] = chunk * repeats
+    return profile
+
+
+def measure(mode: str, path: str) -> tuple:
+    out = subprocess.run([sys.executable, "-c", MEASURE, mode, path], check=True, capture_output=True, text=True).stdout.split()
+    return int(out[0]), float(out[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LazyUCPProfile resident memory benchmark.")
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 10, 50, 200])
+    args = parser.parse_args()
+
+    print(f"{'file MB':>8} {'eager +RSS MB':>14} {'eager ms':>9} {'lazy +RSS MB':>13} {'lazy ms':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes_mb:
+            path = os.path.join(tmp, f"grown_{size}.json")
+            write_profile(path, grown_profile(size))
+            actual_mb = os.path.getsize(path) / 1e6
+            eager_rss, eager_s = measure("eager", path)
+            lazy_rss, lazy_s = measure("lazy", path)
+            print(f"{actual_mb:>8.1f} {eager_rss / 1e6:>14.1f} {eager_s * 1e3:>9.1f} {lazy_rss / 1e6:>13.1f} {lazy_s * 1e3:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
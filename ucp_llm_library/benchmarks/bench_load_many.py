@@ -0,0 +1,50 @@
+# bench_load_many.py
+# Warm-up throughput of UCPProfile.load_many() vs. constructing UCPProfile one file at a time.
+#
+# Usage: python bench_load_many.py [--files 5000] [--workers 1 2 4 8] [--bad-every 500]
+
+import argparse
+import os
+import tempfile
+import time
+
+from ucp_llm import UCPProfile
+
+from profile_factory import make_profile, write_profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="UCPProfile.load_many() throughput benchmark.")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--bad-every", type=int, default=500, help="Write a corrupt file every N profiles.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for n in range(args.files):
+            path = os.path.join(tmp, f"user_{n}.json")
+            if args.bad_every and n % args.bad_every == args.bad_every - 1:
+                with open(path, "w", encoding="utf-8") as f: f.write('{"protocolVersion": "broken", "sections": [')
+            else:
+                write_profile(path, make_profile(items_per_section=2, seed=n))
+            paths.append(path)
+
+        start = time.perf_counter()
+        sequential_ok = sum(1 for p in paths if UCPProfile(p).is_valid())
+        elapsed = time.perf_counter() - start
+        print(f"sequential UCPProfile():   {args.files / elapsed:>10,.0f} files/s  ({sequential_ok} valid)")
+
+        for workers in args.workers:
+            batch = UCPProfile.load_many(paths, workers=workers)
+            start = time.perf_counter()
+            first_result_at = None
+            for _ in batch:
+                if first_result_at is None: first_result_at = time.perf_counter() - start
+            elapsed = time.perf_counter() - start
+            print(f"load_many(workers={workers:<2}):    {args.files / elapsed:>10,.0f} files/s  "
+                  f"({batch.loaded} valid, {batch.failed} errors, first result after {first_result_at * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
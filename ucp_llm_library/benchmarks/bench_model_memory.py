@@ -0,0 +1,51 @@
+# bench_model_memory.py
+# Retained heap (tracemalloc) of N loaded profiles held as plain dicts vs. as
+# ucp_llm.model.CompactProfile objects. Every profile is parsed from its own JSON
+# text, as it would be when loaded from separate files.
+#
+# Usage: python bench_model_memory.py [--profiles 1000] [--items 3]
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from ucp_llm import jsonio
+from ucp_llm.model import CompactProfile
+
+from profile_factory import make_profile
+
+
+def retained(build) -> tuple:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    held = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, elapsed, held
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compact data model memory benchmark.")
+    parser.add_argument("--profiles", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=3, help="Items per multi-item section.")
+    args = parser.parse_args()
+
+    texts = [jsonio.dumps_bytes(make_profile(items_per_section=args.items, seed=i)) for i in range(args.profiles)]
+
+    dict_size, dict_s, dicts = retained(lambda: [jsonio.loads(t) for t in texts])
+    compact_size, compact_s, compacts = retained(lambda: [CompactProfile.from_dict(jsonio.loads(t)) for t in texts])
+    assert all(c.to_dict() == CompactProfile.from_dict(d).to_dict() for c, d in zip(compacts[:20], dicts[:20]))
+
+    print(f"{args.profiles} profiles, {len(texts[0]) / 1e3:.1f} KB JSON each ({jsonio.get_backend()} backend)")
+    print(f"{'model':>8} {'retained MB':>12} {'KB/profile':>11} {'load s':>8}")
+    print(f"{'dict':>8} {dict_size / 1e6:>12.1f} {dict_size / args.profiles / 1e3:>11.1f} {dict_s:>8.2f}")
+    print(f"{'compact':>8} {compact_size / 1e6:>12.1f} {compact_size / args.profiles / 1e3:>11.1f} {compact_s:>8.2f}")
+    print(f"compact uses {compact_size / dict_size:.0%} of the dict footprint")
+
+
+if __name__ == "__main__":
+    main()
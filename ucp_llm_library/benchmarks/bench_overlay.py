@@ -0,0 +1,72 @@
+# bench_overlay.py
+# Getting an editable copy of a loaded profile: json.loads(json.dumps(...)) deep copy
+# vs. UCPProfile.edit() (copy-on-write ProfileOverlay), plus the cost of editing,
+# materializing and diffing the overlay during an Eve-like session.
+#
+# Usage: python bench_overlay.py [--items 20] [--words 400] [--edits 100]
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from ucp_llm import UCPProfile
+
+from profile_factory import KNOWN_SECTIONS, make_profile, write_profile
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed * 1000, peak, result
+
+
+def editable_view(profile: UCPProfile):
+    overlay = profile.edit()
+    overlay.materialize()  # What Eve reads from right after loading
+    return overlay
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Copy-on-write profile overlay benchmark.")
+    parser.add_argument("--items", type=int, default=20, help="Items per multi-item section.")
+    parser.add_argument("--words", type=int, default=400, help="Words per text field.")
+    parser.add_argument("--edits", type=int, default=100, help="Field edits in the simulated session.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "profile.json")
+        write_profile(path, make_profile(items_per_section=args.items, words_per_field=args.words, seed=1))
+        profile = UCPProfile(path)
+        size = os.path.getsize(path)
+
+    copy_ms, copy_peak, _ = measure(lambda: json.loads(json.dumps(profile.get_raw_data())))
+    edit_ms, edit_peak, overlay = measure(lambda: editable_view(profile))
+
+    fields = [(section_id, key) for section_id, keys in KNOWN_SECTIONS.items() for key in keys]
+    start = time.perf_counter()
+    for n in range(args.edits):
+        section_id, key = fields[n % len(fields)]
+        overlay.set_value(section_id, 0, key, f"answer {n}")
+        overlay.materialize()  # Eve refreshes its view after every answer
+    session_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    changes = list(overlay.diff())
+    diff_ms = (time.perf_counter() - start) * 1000
+
+    print(f"profile JSON: {size / 1e6:.2f} MB")
+    print(f"{'editable copy':<28} {'ms':>8} {'peak MB':>9}")
+    print(f"{'json round trip':<28} {copy_ms:>8.1f} {copy_peak / 1e6:>9.2f}")
+    print(f"{'UCPProfile.edit()':<28} {edit_ms:>8.3f} {edit_peak / 1e6:>9.3f}")
+    print(f"{args.edits} edits + materialize: {session_ms:.1f} ms ({session_ms / args.edits * 1000:.0f} us each); "
+          f"diff of {len(changes)} changes: {diff_ms:.2f} ms; dirty={overlay.is_dirty()}")
+
+
+if __name__ == "__main__":
+    main()
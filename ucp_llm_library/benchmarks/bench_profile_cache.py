@@ -0,0 +1,56 @@
+# bench_profile_cache.py
+# Cost of getting a profile per request: constructing UCPProfile(path) every
+# time vs. ProfileCache.get() with stat and hash revalidation. Requests follow
+# a Zipf-like distribution over the profiles, so a few hot users dominate,
+# and the cache holds only a fraction of them.
+#
+# Usage: python bench_profile_cache.py [--profiles 500] [--requests 20000] [--capacity 100] [--words 40]
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from ucp_llm import UCPProfile
+from ucp_llm.cache import ProfileCache
+
+from profile_factory import make_profile, write_profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ProfileCache lookup benchmark.")
+    parser.add_argument("--profiles", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--capacity", type=int, default=100, help="max_entries of the cache.")
+    parser.add_argument("--words", type=int, default=40, help="Words per text field.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for n in range(args.profiles):
+            path = os.path.join(tmp, f"user_{n}.json")
+            write_profile(path, make_profile(items_per_section=3, words_per_field=args.words, seed=n))
+            paths.append(path)
+        weights = [1 / (rank + 1) for rank in range(args.profiles)]
+        requests = rng.choices(paths, weights, k=args.requests)
+        print(f"{args.requests:,} requests over {args.profiles} profiles "
+              f"(mean {sum(os.path.getsize(p) for p in paths) / len(paths) / 1024:.0f} KiB), cache of {args.capacity}")
+        print(f"{'lookup':>14} {'us/request':>11} {'hit ratio':>10} {'evictions':>10} {'cached MiB':>11}")
+
+        start = time.perf_counter()
+        for path in requests: UCPProfile(path)
+        print(f"{'UCPProfile()':>14} {(time.perf_counter() - start) / len(requests) * 1e6:>11.1f}")
+        for validate in ("stat", "hash"):
+            cache = ProfileCache(max_entries=args.capacity, max_bytes=None, validate=validate)
+            start = time.perf_counter()
+            for path in requests: cache.get(path)
+            elapsed = time.perf_counter() - start
+            stats = cache.stats()
+            print(f"{'cache ' + validate:>14} {elapsed / len(requests) * 1e6:>11.1f} {stats['hit_ratio']:>10.1%} "
+                  f"{stats['evictions']:>10,} {stats['bytes'] / 2**20:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
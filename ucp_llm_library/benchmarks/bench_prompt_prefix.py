@@ -0,0 +1,53 @@
+# bench_prompt_prefix.py
+# How much of an external-analysis request (built as Eve builds it: the fixed
+# analysis prompt, then the compiled protocol) is a byte-identical prefix that
+# an LLM provider's prompt cache can reuse, for the document layout vs.
+# ContextCompiler's LAYOUT_PREFIX_STABLE. Requests are built for several
+# profiles, export times and preferred names. The guarantees behind the
+# prefix-stable numbers are tested in tests/test_prompt_prefix.py.
+#
+# Usage: python bench_prompt_prefix.py [--profiles 5] [--budget 24000]
+
+import argparse
+import datetime
+import os
+
+from ucp_llm.context import LAYOUT_DOCUMENT, LAYOUT_PREFIX_STABLE, ContextCompiler, estimate_tokens
+from ucp_llm.protocol_texts import EXTERNAL_ANALYSIS_PROMPT
+from ucp_llm.render import ProtocolRenderer
+
+from profile_factory import make_profile
+
+TIMES = (datetime.datetime(2024, 6, 1, 9, 0, 0), datetime.datetime(2024, 6, 2, 17, 30, 5))
+NAMES = ("", "Sam")
+
+
+def request(compiler: ContextCompiler, data, preferred_name: str, now: datetime.datetime) -> bytes:
+    return (EXTERNAL_ANALYSIS_PROMPT + "\n\n" + compiler.compile(data, preferred_name, now).text).encode("utf-8")
+
+
+def common_prefix(texts) -> bytes:
+    return os.path.commonprefix(list(texts))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prompt-cache prefix stability of analysis requests.")
+    parser.add_argument("--profiles", type=int, default=5)
+    parser.add_argument("--budget", type=int, default=24000, help="Token budget of the whole request, as in Eve.")
+    args = parser.parse_args()
+    budget = args.budget - estimate_tokens(EXTERNAL_ANALYSIS_PROMPT)
+
+    profiles = [make_profile(items_per_section=2, words_per_field=30, seed=seed) for seed in range(args.profiles)]
+    print(f"{args.profiles} profiles x {len(TIMES)} export times x {len(NAMES)} names, {args.budget:,}-token requests")
+    print(f"{'layout':>14} {'shared by all KiB':>18} {'~tokens':>8} {'same profile KiB':>17} {'~tokens':>8}")
+    for layout in (LAYOUT_DOCUMENT, LAYOUT_PREFIX_STABLE):
+        compiler = ContextCompiler(budget, renderer=ProtocolRenderer(), layout=layout)
+        per_profile = [[request(compiler, data, name, now) for now in TIMES for name in NAMES] for data in profiles]
+        shared = common_prefix(text for texts in per_profile for text in texts)
+        same_profile = min((common_prefix(texts) for texts in per_profile), key=len)
+        print(f"{layout:>14} {len(shared) / 1024:>18.1f} {estimate_tokens(shared.decode('utf-8', 'ignore')):>8,} "
+              f"{len(same_profile) / 1024:>17.1f} {estimate_tokens(same_profile.decode('utf-8', 'ignore')):>8,}")
+
+
+if __name__ == "__main__":
+    main()
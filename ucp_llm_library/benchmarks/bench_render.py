@@ -0,0 +1,55 @@
+# bench_render.py
+# Protocol text rendering throughput (profiles/sec) of ucp_llm.render.ProtocolRenderer,
+# for the preview and the full export/LLM-context form, and the cost of re-rendering
+# the preview after a single-field edit with and without a SectionRenderCache.
+#
+# Usage: python bench_render.py [--profiles 200] [--items 1 3 10] [--repeat 3]
+
+import argparse
+import time
+
+from ucp_llm.render import ProtocolRenderer, SectionRenderCache
+
+from profile_factory import make_profile
+
+
+def edit_rerender_ms(renderer: ProtocolRenderer, profile: dict, cache, edits: int) -> float:
+    item = next(s for s in profile["sections"] if s["id"] == "projects")["items"][0]
+    if cache is not None: cache.render(profile)
+    start = time.perf_counter()
+    for i in range(edits):
+        item["projectDetailedGoals"] = f"goal revision {i}"
+        if cache is not None: cache.invalidate("projects"); cache.render(profile)
+        else: renderer.render(profile)
+    return (time.perf_counter() - start) / edits * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ProtocolRenderer throughput benchmark.")
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--items", type=int, nargs="+", default=[1, 3, 10], help="Items per multi-item section.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    renderer = ProtocolRenderer()
+    print(f"compile: {(time.perf_counter() - start) * 1e3:.2f} ms")
+    print(f"{'items':>6} {'text KB':>8} {'preview/s':>10} {'export/s':>10} {'edit+full ms':>13} {'edit+cached ms':>15}")
+    for items in args.items:
+        profiles = [make_profile(items_per_section=items, seed=i) for i in range(args.profiles)]
+        rates = []
+        for for_preview in (True, False):
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                for profile in profiles: renderer.render(profile, for_preview=for_preview)
+                best = min(best, time.perf_counter() - start)
+            rates.append(len(profiles) / best)
+        size_kb = len(renderer.render(profiles[0], for_preview=False).encode("utf-8")) / 1e3
+        full_ms = edit_rerender_ms(renderer, profiles[0], None, 200)
+        cached_ms = edit_rerender_ms(renderer, profiles[0], SectionRenderCache(renderer), 200)
+        print(f"{items:>6} {size_kb:>8.1f} {rates[0]:>10.0f} {rates[1]:>10.0f} {full_ms:>13.3f} {cached_ms:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
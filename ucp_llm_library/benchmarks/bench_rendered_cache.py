@@ -0,0 +1,52 @@
+# bench_rendered_cache.py
+# Cost of producing the export text (render(for_preview=False)) of an unchanged
+# profile: rendering every time vs. RenderedTextCache hits from memory, keyed
+# by a hash of the document or by a ProfileOverlay revision, and from its disk
+# tier (a fresh cache over the same directory, as after a restart, including
+# its prune pass over the directory).
+#
+# Usage: python bench_rendered_cache.py [--repeat 200]
+
+import argparse
+import datetime
+import tempfile
+import time
+
+from ucp_llm.overlay import ProfileOverlay
+from ucp_llm.render import ProtocolRenderer, RenderedTextCache
+
+from profile_factory import make_profile
+
+
+def per_call_us(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat): fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="RenderedTextCache benchmark.")
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    renderer = ProtocolRenderer()
+    now = datetime.datetime(2024, 6, 1, 12, 0, 0)
+    print(f"{'profile':>24} {'render us':>10} {'hash hit us':>12} {'revision hit us':>16} {'disk hit us':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for items, words in ((1, 8), (3, 40), (8, 200)):
+            data = make_profile(items_per_section=items, words_per_field=words, seed=items)
+            cache = RenderedTextCache(renderer, disk_dir=tmp)
+            expected = renderer.render(data, False, now=now)
+            assert cache.render(data, False, now=now) == expected  # Miss: renders and stores
+            render_us = per_call_us(lambda: renderer.render(data, False, now=now), args.repeat)
+            memory_us = per_call_us(lambda: cache.render(data, False, now=now), args.repeat)
+            revision = ProfileOverlay(data).revision
+            assert cache.render(data, False, now=now, revision=revision) == expected
+            revision_us = per_call_us(lambda: cache.render(data, False, now=now, revision=revision), args.repeat)
+            disk_us = per_call_us(lambda: RenderedTextCache(renderer, disk_dir=tmp).render(data, False, now=now), args.repeat)
+            label = f"{items} items x {words} words ({len(expected) // 1024} KiB)"
+            print(f"{label:>24} {render_us:>10.0f} {memory_us:>12.0f} {revision_us:>16.1f} {disk_us:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# bench_save.py
+# Time the calling (GUI) thread is blocked by one save: jsonio.dump_file() vs.
+# AtomicSaver.save(), which only snapshots the data and writes in the background.
+# Also shows how a burst of saves is merged into a few durable writes.
+#
+# Usage: python bench_save.py [--items 20] [--words 400] [--burst 50]
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from ucp_llm import jsonio
+from ucp_llm.jobs import JobRunner
+from ucp_llm.saving import AtomicSaver
+
+from profile_factory import make_profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Background atomic save benchmark.")
+    parser.add_argument("--items", type=int, default=20, help="Items per multi-item section.")
+    parser.add_argument("--words", type=int, default=400, help="Words per text field.")
+    parser.add_argument("--burst", type=int, default=50, help="Saves issued back to back.")
+    args = parser.parse_args()
+
+    data = make_profile(items_per_section=args.items, words_per_field=args.words, seed=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "profile.json")
+        start = time.perf_counter()
+        jsonio.dump_file(data, path)
+        sync_ms = (time.perf_counter() - start) * 1000
+        size = os.path.getsize(path)
+
+        wake = threading.Event()
+        runner = JobRunner(notify=wake.set)
+        saver = AtomicSaver(runner)
+        durable = []
+        start = time.perf_counter()
+        saver.save(data, path, on_saved=durable.append)
+        async_ms = (time.perf_counter() - start) * 1000
+        saver.flush()
+        runner.dispatch()
+
+        start = time.perf_counter()
+        for n in range(args.burst):
+            data["burst"] = n
+            saver.save(data, path, on_saved=durable.append)
+        burst_ms = (time.perf_counter() - start) * 1000
+        saver.flush()
+        runner.dispatch()
+        assert jsonio.load_file(path)["burst"] == args.burst - 1
+
+    print(f"profile JSON: {size / 1e6:.2f} MB ({jsonio.get_backend()} backend)")
+    print(f"GUI thread blocked by jsonio.dump_file():  {sync_ms:8.1f} ms (not fsynced, not atomic)")
+    print(f"GUI thread blocked by AtomicSaver.save():  {async_ms:8.1f} ms (write + fsync: {durable[0].seconds * 1000:.1f} ms in background)")
+    print(f"burst of {args.burst} saves: {burst_ms:.1f} ms on the GUI thread, {saver.writes - 1} durable writes, {saver.merged} merged")
+
+
+if __name__ == "__main__":
+    main()
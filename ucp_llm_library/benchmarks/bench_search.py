@@ -0,0 +1,80 @@
+# bench_search.py
+# Finding profiles by content: loading every file through UCPProfile and scanning
+# strings vs. querying a ucp_llm.search ProfileIndex, for a rare word (1% of
+# profiles) and a common one. Also times the incremental re-index after a save.
+#
+# Usage: python bench_search.py [--profiles 5000] [--words 12]
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from ucp_llm import UCPProfile
+from ucp_llm.jobs import JobRunner
+from ucp_llm.saving import AtomicSaver
+from ucp_llm.search import ProfileIndex
+
+from profile_factory import make_profile, write_profile
+
+SECTION, KEY = "cognitive_passion", "cognitivePassionName"
+
+
+def scan(paths, word):
+    found = []
+    for path in paths:
+        items = UCPProfile(path).get_section_items(SECTION)
+        if any(word in (item.get(KEY) or "").lower().split() for item in items): found.append(os.path.abspath(path))
+    return sorted(found)
+
+
+def timed(fn, *args, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat): result = fn(*args)
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Full-text profile index benchmark.")
+    parser.add_argument("--profiles", type=int, default=5000, help="Number of profile files.")
+    parser.add_argument("--words", type=int, default=12, help="Words per text field.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for n in range(args.profiles):
+            data = make_profile(words_per_field=args.words, seed=n)
+            if n % 100 == 0: next(s for s in data["sections"] if s["id"] == SECTION)["items"][0][KEY] += " epistemology"
+            path = os.path.join(tmp, f"profile_{n:06d}.json")
+            write_profile(path, data)
+            paths.append(path)
+
+        index = ProfileIndex(os.path.join(tmp, "profiles.idx"))
+        build_ms, _ = timed(index.update_many, paths)
+        rescan_ms, _ = timed(index.update_many, paths)
+
+        print(f"{args.profiles} profiles; index built in {build_ms / 1000:.1f} s, "
+              f"up-to-date check of all files {rescan_ms:.0f} ms, index file {os.path.getsize(index.db_path) / 1e6:.1f} MB")
+        for word in ("epistemology", "philosophy"):
+            scan_ms, expected = timed(scan, paths, word)
+            query_ms, found = timed(index.search_paths, word, SECTION, KEY, repeat=5)
+            assert found == expected
+            print(f"'{word}' ({len(found)} profiles): scan {scan_ms:8.1f} ms   index {query_ms:7.2f} ms")
+
+        wake = threading.Event()
+        runner = JobRunner(notify=wake.set)
+        saver = AtomicSaver(runner)
+        saver.add_listener(index.on_saved)
+        data = make_profile(words_per_field=args.words, seed=0)
+        next(s for s in data["sections"] if s["id"] == SECTION)["items"][0][KEY] = "hermeneutics"
+        saver.save(data, paths[1])
+        saver.flush()
+        reindex_ms, _ = timed(runner.dispatch)
+        assert index.search_paths("hermeneutics") == [os.path.abspath(paths[1])]
+        print(f"re-index after saving one profile: {reindex_ms:.1f} ms")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# bench_streaming.py
+# Time until the first visible text and until the full answer, blocking vs. streaming,
+# using the FakeStreamingClient of tests/fakes.py to model a slow remote model.
+#
+# Usage: python bench_streaming.py [--chars 12000] [--first-token 0.4] [--tokens-per-sec 150]
+
+import argparse
+import os
+import sys
+import time
+
+from ucp_llm.llm import iter_completion_text
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "tests"))  # The test doubles in tests/fakes.py
+from fakes import FakeStreamingClient
+
+
+def measure(client: FakeStreamingClient, stream: bool) -> tuple:
+    start = time.perf_counter(); first = None; received = []
+    for piece in iter_completion_text(client, messages=[{"role": "user", "content": "protocol"}], model="fake", stream=stream):
+        if first is None: first = time.perf_counter() - start
+        received.append(piece)
+    assert "".join(received) == client.text
+    return first, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Streaming vs. blocking completion latency.")
+    parser.add_argument("--chars", type=int, default=12000, help="Answer length (about 3000 tokens by default).")
+    parser.add_argument("--first-token", type=float, default=0.4, help="Seconds before the model emits anything.")
+    parser.add_argument("--tokens-per-sec", type=float, default=150.0)
+    args = parser.parse_args()
+
+    chunk_chars = 4  # roughly one token
+    client = FakeStreamingClient(text="x" * args.chars, chunk_size=chunk_chars,
+                                 first_token_delay=args.first_token, chunk_delay=1.0 / args.tokens_per_sec)
+    print(f"{'mode':>10} {'first text s':>13} {'complete s':>11}")
+    for stream in (False, True):
+        first, total = measure(client, stream)
+        print(f"{'streaming' if stream else 'blocking':>10} {first:>13.2f} {total:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# bench_validate.py
+# Throughput of whole-profile schema validation (ucp_llm.validation) for gating
+# ingestion: validate_files() in one process and across worker processes, plus
+# the cost of ProfileValidator.validate() on an already parsed profile.
+#
+# Usage: python bench_validate.py [--profiles 5000] [--words 12] [--workers 4]
+
+import argparse
+import os
+import tempfile
+import time
+
+from ucp_llm.validation import ProfileValidator, validate_files
+
+from profile_factory import make_profile, write_profile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Schema validation throughput benchmark.")
+    parser.add_argument("--profiles", type=int, default=5000, help="Number of profile files.")
+    parser.add_argument("--words", type=int, default=12, help="Words per text field.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes for the parallel run.")
+    args = parser.parse_args()
+
+    validator = ProfileValidator()
+    data = make_profile(items_per_section=1, words_per_field=args.words, seed=0)
+    assert validator.validate(data) == [], validator.validate(data)
+    start = time.perf_counter()
+    for _ in range(1000): validator.validate(data)
+    in_memory_us = (time.perf_counter() - start) * 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for n in range(args.profiles):
+            data = make_profile(items_per_section=1, words_per_field=args.words, seed=n)
+            if n % 50 == 0: data["sections"][16]["items"][0]["chosenInterventionLevel"] = "extreme"  # 2% invalid
+            path = os.path.join(tmp, f"profile_{n:06d}.json")
+            write_profile(path, data)
+            paths.append(path)
+        serial = validate_files(paths, workers=1)
+        parallel = validate_files(paths, workers=args.workers)
+        assert serial["invalid"] == parallel["invalid"] == len(range(0, args.profiles, 50))
+
+    print(f"ProfileValidator.validate() on a parsed profile: {in_memory_us:.0f} us")
+    print(f"validate_files(), 1 process:   {serial['files_per_sec']:8,.0f} files/s ({serial['invalid']} invalid of {serial['checked']})")
+    print(f"validate_files(), {args.workers} workers:   {parallel['files_per_sec']:8,.0f} files/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# profile_factory.py
+# Synthetic UCP-LLM profiles shared by the benchmark scripts in this directory.
+
+import json
+import random
+from typing import Any, Dict, List
+
+KNOWN_SECTIONS = {
+    "personal": ["preferredName", "dateOfBirth", "nationalityCulturalBackground", "languagesProficiency"],
+    "social": ["socialFamilyDetails"],
+    "educational_professional": ["educationalBackground", "professionalExperience"],
+    "thinking_reference": ["coreThinkingReferenceDescription", "thinkingReferenceApplication"],
+    "cognitive_passion": ["cognitivePassionName", "passionResearchMethodology"],
+    "ethical_values": ["ethicalValueName", "ethicalValueExplanation"],
+    "concepts_perspective": ["coreConceptName", "coreConceptPerspective"],
+    "cognitive_tools_methodology": ["cognitiveToolName", "cognitiveToolMethodology"],
+    "inspiring_figures": ["inspiringFigureName", "derivedValueAndImpact"],
+    "intellectual_sins": ["intellectualSinName", "reasonConsideredHarmful"],
+    "projects": ["projectOrObjectiveTitle", "projectDetailedGoals", "projectAssociatedConcepts", "projectLLMRole"],
+    "pivotal_examples": ["pivotalExampleName", "pivotalExampleSignificance"],
+    "causal_relations": ["causeConcept", "effectConcept", "causalRelationDescription"],
+    "role": ["llmPrimaryRole", "llmRoleAttributes"],
+    "conceptual_tuning": ["userSpecificTerm", "userTermDefinition"],
+    "interaction_style": ["preferredResponseStyle", "stylesToAvoid"],
+    "intervention_level": ["chosenInterventionLevel", "interventionClarifications"],
+    "alignment_level": ["desiredAlignmentLevel", "alignmentLevelNotes"],
+    "critique_mechanism": ["critiquePreferences", "critiqueConditions"],
+    "constraints_warnings": ["constraintItem", "constraintReason"],
+    "memory_management_directives": ["contextMaintenanceDirective", "protocolRecallMechanism"],
+    "cognitive_preferences": ["cognitiveBehavioralPreference"],
+    "mental_state": ["selectedMentalState", "mentalStateNotes"],
+    "sports_inclinations": ["chosenSportInclination", "sportOtherDetails"],
+    "additional_notes": ["additionalGeneralNotes"],
+}
+
+SELECT_VALUES = {
+    "chosenInterventionLevel": ["high", "medium", "low"],
+    "desiredAlignmentLevel": ["1", "2", "3", "4", "5"],
+    "selectedMentalState": ["good", "average", "bad", "not_specified"],
+    "chosenSportInclination": ["none", "football", "tennis", "other"],
+}
+
+WORDS = ("philosophy logic ethics context protocol research method value project example "
+         "concept analysis model memory critique style insight pattern system theory").split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def make_profile(extra_sections: int = 0, items_per_section: int = 3, words_per_field: int = 12,
+                 seed: int = 0) -> Dict[str, Any]:
+    """Builds a profile with all 25 known sections plus `extra_sections` synthetic ones."""
+    rng = random.Random(seed)
+    sections: List[Dict[str, Any]] = []
+    for section_id, keys in KNOWN_SECTIONS.items():
+        item_count = 1 if len(keys) <= 2 and section_id in ("personal", "social", "role", "mental_state") else items_per_section
+        items = []
+        for _ in range(item_count):
+            items.append({k: rng.choice(SELECT_VALUES[k]) if k in SELECT_VALUES else _text(rng, words_per_field) for k in keys})
+        sections.append({"id": section_id, "title": section_id.replace("_", " ").title(), "items": items})
+    for n in range(extra_sections):
+        items = [{"extraField": _text(rng, words_per_field)} for _ in range(items_per_section)]
+        sections.insert(rng.randrange(len(sections) + 1), {"id": f"extra_{n}", "title": f"Extra {n}", "items": items})
+    return {"protocolVersion": "UCP-LLM Benchmark Factory", "generationDate": "2025-01-01T00:00:00Z", "sections": sections}
+
+
+def write_profile(path: str, data: Dict[str, Any], indent: int = 2) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
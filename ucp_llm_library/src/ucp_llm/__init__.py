@@ -0,0 +1,7 @@
+from .ucp_llm import UCPProfile, ProfileBatch
+from .overlay import ProfileOverlay
+from .lazy import LazyUCPProfile
+from .model import CompactProfile, Section, Item
+from .render import ProtocolRenderer, SectionRenderCache
+
+__all__ = ["UCPProfile", "ProfileBatch", "ProfileOverlay", "LazyUCPProfile", "CompactProfile", "Section", "Item", "ProtocolRenderer", "SectionRenderCache"]
@@ -0,0 +1,133 @@
+# cache.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+In-process LRU cache of loaded profiles.
+
+ProfileCache.get(path) returns the cached UCPProfile for a file as long as
+the file is unchanged, so repeated lookups of the same protocols skip reading
+and parsing. Each lookup revalidates the entry: validate="stat" (the default)
+compares size, mtime and inode from one os.stat() call; validate="hash"
+re-reads the file and compares a SHA-256 digest of its bytes, which also
+catches rewrites that keep size and mtime (coarse-mtime filesystems, copies
+that preserve timestamps), and still saves the parse.
+
+The cache is bounded by entry count and by bytes, counted as the files'
+sizes on disk (the parsed form takes several times that); the least recently
+used entries are evicted first. Files that fail to load are returned but not
+cached. Cached profiles are shared between callers: edit through
+UCPProfile.edit() rather than changing get_raw_data() in place. Pass
+ProfileCache.on_saved to AtomicSaver.add_listener() to drop entries as soon
+as protocols are saved.
+
+    cache = ProfileCache(max_entries=256, max_bytes=64 * 1024 * 1024)
+    profile = cache.get(path)
+    cache.stats()   # {"hits": ..., "misses": ..., "stale": ..., "evictions": ..., ...}
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .ucp_llm import UCPProfile
+
+VALIDATE_STAT = "stat"
+VALIDATE_HASH = "hash"
+
+
+def _stat_signature(file_path: str) -> Optional[Tuple[int, int, int]]:
+    try: st = os.stat(file_path)
+    except OSError: return None
+    return (st.st_size, st.st_mtime_ns, st.st_ino)  # A replace by AtomicSaver always changes the inode
+
+
+def _hash_signature(file_path: str) -> Optional[Tuple[int, bytes]]:
+    try:
+        with open(file_path, "rb") as f: data = f.read()
+    except OSError: return None
+    return (len(data), hashlib.sha256(data).digest())
+
+
+class ProfileCache:
+    """Bounded LRU cache of UCPProfile objects keyed by absolute path (see the module docstring)."""
+
+    def __init__(self, max_entries: int = 128, max_bytes: Optional[int] = 64 * 1024 * 1024, validate: str = VALIDATE_STAT):
+        if validate not in (VALIDATE_STAT, VALIDATE_HASH): raise ValueError(f"validate must be '{VALIDATE_STAT}' or '{VALIDATE_HASH}', not {validate!r}")
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes  # None: no byte limit
+        self.validate = validate
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0  # Misses because the cached file had changed
+        self.evictions = 0
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[Tuple[Any, ...], UCPProfile]]" = OrderedDict()  # Oldest first
+        self._lock = threading.Lock()
+
+    def _signature(self, file_path: str) -> Optional[Tuple[Any, ...]]:
+        return _hash_signature(file_path) if self.validate == VALIDATE_HASH else _stat_signature(file_path)
+
+    def get(self, file_path: str) -> UCPProfile:
+        """The profile of `file_path`, loaded only if it is not cached or the file changed since."""
+        path = os.path.abspath(file_path)
+        signature = self._signature(path)  # Taken before loading: a write racing the load makes the entry stale, never wrong
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None:
+                if signature is not None and entry[0] == signature:
+                    self._entries.move_to_end(path)
+                    self.hits += 1
+                    return entry[1]
+                self._remove(path)
+                self.stale += 1
+            self.misses += 1
+        profile = UCPProfile(file_path)
+        if signature is not None and profile.is_valid(): self._insert(path, signature, profile)
+        return profile
+
+    def _insert(self, path: str, signature: Tuple[Any, ...], profile: UCPProfile) -> None:
+        size = signature[0]
+        if self.max_bytes is not None and size > self.max_bytes: return  # Would evict everything else and still not fit
+        with self._lock:
+            if path in self._entries: self._remove(path)  # Loaded concurrently by another thread
+            self._entries[path] = (signature, profile)
+            self.current_bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.current_bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, path: str) -> None:
+        signature, _ = self._entries.pop(path)
+        self.current_bytes -= signature[0]
+
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """Drops the entry of `file_path`, or every entry when it is None."""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+                self.current_bytes = 0
+                return
+            path = os.path.abspath(file_path)
+            if path in self._entries: self._remove(path)
+
+    def on_saved(self, result: Any) -> None:
+        """AtomicSaver listener: drops the entry of the file a SaveResult reports as written."""
+        self.invalidate(result.file_path)
+
+    def __contains__(self, file_path: str) -> bool:
+        with self._lock: return os.path.abspath(file_path) in self._entries
+
+    def __len__(self) -> int:
+        with self._lock: return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and sizes: hits, misses, stale, evictions, hit_ratio, entries, bytes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "stale": self.stale, "evictions": self.evictions,
+                    "hit_ratio": self.hits / lookups if lookups else 0.0, "entries": len(self._entries), "bytes": self.current_bytes}
@@ -0,0 +1,264 @@
+# cli.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Command line interface (installed as `ucp-llm`).
+
+    ucp-llm export PROFILES... [-o OUT_DIR] [--format text|markdown] [--workers N] [--force]
+    ucp-llm columnar PROFILES... -o CORPUS_FILE [--workers N]
+    ucp-llm index INDEX_FILE PROFILES... [--workers N] [--force]
+    ucp-llm search INDEX_FILE QUERY [--section ID] [--key JSON_KEY] [--limit N]
+    ucp-llm validate PROFILES... [--workers N] [--warnings]
+
+`export` renders protocol JSON files to the same text the GUI exports
+(ProtocolRenderer with for_preview=False). PROFILES may be files,
+directories (their *.json files) or glob patterns ("data/**/*.json").
+Files are rendered in parallel worker processes; an output that is already
+newer than its input is skipped unless --force is given. With -o, outputs
+mirror the inputs' paths relative to their common parent directory, so
+data/a/p.json and data/b/p.json go to OUT_DIR/a/p.txt and OUT_DIR/b/p.txt;
+inputs that would still share an output are reported as failed. Outputs are
+written to a temporary file and renamed into place, so an interrupted export
+never leaves a partial file that looks up to date. The rendered text
+is already Markdown, so --format only picks the extension (.txt or .md).
+
+`columnar` converts profiles to one ucp_llm.columnar corpus file for
+analytics (Parquet if CORPUS_FILE ends in .parquet and pyarrow is installed).
+
+`index` adds new and changed profiles to a ucp_llm.search full-text index;
+`search` prints the matching items as "path<TAB>section.jsonKey[item]".
+
+`validate` checks profiles against the section definitions
+(ucp_llm.validation) and exits with 1 if any file has errors.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .columnar import build_corpus
+from .render import ProtocolRenderer
+from .saving import atomic_write_bytes
+from .search import ProfileIndex
+from .validation import ERROR, validate_files
+from .ucp_llm import UCPProfile
+
+DEFAULT_GENERATOR_NAME = "UCP-LLM CLI"
+FORMAT_EXTENSIONS = {"text": ".txt", "markdown": ".md"}
+
+_renderers: Dict[str, ProtocolRenderer] = {}  # One compiled renderer per worker process
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[str]:
+    """Files, directories (non-recursive *.json) and glob patterns to a sorted list of unique paths."""
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern): found.update(glob.glob(os.path.join(pattern, "*.json")))
+        elif os.path.isfile(pattern): found.add(pattern)
+        else: found.update(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p))
+    return sorted(found)
+
+
+def output_path_for(input_path: str, out_dir: Optional[str], extension: str, base_dir: Optional[str] = None) -> str:
+    """Next to the input, or in `out_dir` at the input's path relative to `base_dir` (directly in it if base_dir is None)."""
+    directory, name = os.path.split(input_path)
+    stem = os.path.splitext(name)[0]
+    if not out_dir: return os.path.join(directory, stem + extension)
+    relative = os.path.relpath(os.path.abspath(directory), base_dir) if base_dir else os.curdir
+    return os.path.normpath(os.path.join(out_dir, relative, stem + extension))
+
+
+def common_input_dir(input_paths: Sequence[str]) -> Optional[str]:
+    """Deepest directory containing all of `input_paths`, or None if they have none in common (e.g. different drives)."""
+    if not input_paths: return None
+    try: return os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in input_paths])
+    except ValueError: return None
+
+
+def is_up_to_date(input_path: str, output_path: str) -> bool:
+    try: return os.stat(output_path).st_mtime >= os.stat(input_path).st_mtime
+    except OSError: return False
+
+
+def export_file(input_path: str, output_path: str, generator_name: str = DEFAULT_GENERATOR_NAME) -> Optional[str]:
+    """Renders one profile to `output_path`. Returns an error message, or None on success."""
+    profile = UCPProfile(input_path)
+    if not profile.is_valid(): return profile.get_error() or "Unknown error"
+    renderer = _renderers.get(generator_name)
+    if renderer is None: renderer = _renderers[generator_name] = ProtocolRenderer(generator_name=generator_name)
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        atomic_write_bytes(output_path, renderer.render(profile, for_preview=False).encode("utf-8"), durable=False)
+    except OSError as e:
+        return f"Could not write '{output_path}': {e}"
+    return None
+
+
+def _export_chunk(tasks: List[Tuple[str, str]], generator_name: str) -> List[Tuple[str, Optional[str]]]:
+    # Runs in a worker process; only paths and error strings cross the process boundary.
+    return [(input_path, export_file(input_path, output_path, generator_name)) for input_path, output_path in tasks]
+
+
+def export_profiles(input_paths: Sequence[str], out_dir: Optional[str] = None, fmt: str = "text", workers: Optional[int] = None,
+                    force: bool = False, chunk_size: int = 16, generator_name: str = DEFAULT_GENERATOR_NAME) -> Dict[str, object]:
+    """
+    Exports `input_paths` and returns a summary dict: exported, skipped,
+    failed, errors ({input_path: error_message}), seconds and files_per_sec.
+    workers=None uses os.cpu_count(); workers<=1 exports in this process.
+    """
+    extension = FORMAT_EXTENSIONS[fmt]
+    if out_dir: os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    base_dir = common_input_dir(input_paths) if out_dir else None
+    tasks, skipped = [], 0
+    errors: Dict[str, str] = {}
+    claimed: Dict[str, str] = {}  # Normalized output path -> the input that writes it
+    for input_path in input_paths:
+        output_path = output_path_for(input_path, out_dir, extension, base_dir)
+        key = os.path.normcase(os.path.abspath(output_path))
+        if key in claimed:
+            errors[input_path] = f"Output '{output_path}' is also the output of '{claimed[key]}'"
+            continue
+        claimed[key] = input_path
+        if not force and is_up_to_date(input_path, output_path): skipped += 1
+        else: tasks.append((input_path, output_path))
+    chunk_size = max(1, chunk_size)
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers <= 1 or len(chunks) <= 1:
+        results = (_export_chunk(chunk, generator_name) for chunk in chunks)
+        for chunk_results in results: errors.update((p, e) for p, e in chunk_results if e)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            for chunk_results in pool.map(_export_chunk, chunks, [generator_name] * len(chunks)):
+                errors.update((p, e) for p, e in chunk_results if e)
+    seconds = time.perf_counter() - start
+    exported = len(tasks) - sum(1 for input_path, _ in tasks if input_path in errors)
+    return {"exported": exported, "skipped": skipped, "failed": len(errors), "errors": errors,
+            "seconds": seconds, "files_per_sec": len(tasks) / seconds if seconds > 0 else 0.0}
+
+
+def _cmd_export(args: argparse.Namespace) -> int:
+    input_paths = expand_inputs(args.profiles)
+    if not input_paths:
+        print("No profile files matched.", file=sys.stderr)
+        return 2
+    summary = export_profiles(input_paths, out_dir=args.out_dir, fmt=args.format, workers=args.workers,
+                              force=args.force, generator_name=args.generator_name)
+    for input_path, error in sorted(summary["errors"].items()): print(f"FAILED {input_path}: {error}", file=sys.stderr)
+    print(f"Exported {summary['exported']}, skipped {summary['skipped']} up to date, failed {summary['failed']} "
+          f"in {summary['seconds']:.2f} s ({summary['files_per_sec']:,.0f} files/s)")
+    return 1 if summary["failed"] else 0
+
+
+def _cmd_columnar(args: argparse.Namespace) -> int:
+    input_paths = expand_inputs(args.profiles)
+    if not input_paths:
+        print("No profile files matched.", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    errors: Dict[str, str] = {}
+    corpus = build_corpus(input_paths, workers=args.workers, errors=errors)
+    try: corpus.write(args.out)
+    except (OSError, RuntimeError) as e:
+        print(f"Could not write '{args.out}': {e}", file=sys.stderr)
+        return 1
+    for input_path, error in sorted(errors.items()): print(f"FAILED {input_path}: {error}", file=sys.stderr)
+    print(f"Wrote {len(corpus)} profiles to {args.out}, failed {len(errors)} in {time.perf_counter() - start:.2f} s")
+    return 1 if errors else 0
+
+
+def _cmd_index(args: argparse.Namespace) -> int:
+    input_paths = expand_inputs(args.profiles)
+    if not input_paths:
+        print("No profile files matched.", file=sys.stderr)
+        return 2
+    start = time.perf_counter()
+    index = ProfileIndex(args.index)
+    try: summary = index.update_many(input_paths, workers=args.workers, force=args.force)
+    finally: index.close()
+    for input_path, error in sorted(summary["errors"].items()): print(f"FAILED {input_path}: {error}", file=sys.stderr)
+    print(f"Indexed {summary['indexed']}, unchanged {summary['unchanged']}, failed {summary['failed']} in {time.perf_counter() - start:.2f} s")
+    return 1 if summary["failed"] else 0
+
+
+def _cmd_search(args: argparse.Namespace) -> int:
+    if not os.path.isfile(args.index):
+        print(f"No index at '{args.index}'.", file=sys.stderr)
+        return 2
+    index = ProfileIndex(args.index)
+    try: hits = index.search(args.query, section_id=args.section, json_key=args.key, limit=args.limit)
+    finally: index.close()
+    for hit in hits: print(f"{hit.path}\t{hit.section_id}.{hit.json_key}[{hit.item_index}]")
+    return 0 if hits else 1
+
+
+def _cmd_validate(args: argparse.Namespace) -> int:
+    input_paths = expand_inputs(args.profiles)
+    if not input_paths:
+        print("No profile files matched.", file=sys.stderr)
+        return 2
+    summary = validate_files(input_paths, workers=args.workers)
+    for input_path, issues in sorted(summary["issues"].items()):
+        for issue in issues:
+            if issue.severity == ERROR or args.warnings: print(f"{input_path}: {issue.severity} {issue.code} at {issue.path}: {issue.message}")
+    print(f"Checked {summary['checked']}, valid {summary['valid']}, invalid {summary['invalid']} "
+          f"in {summary['seconds']:.2f} s ({summary['files_per_sec']:,.0f} files/s)")
+    return 1 if summary["invalid"] else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ucp-llm", description="UCP-LLM protocol tools.")
+    commands = parser.add_subparsers(dest="command")
+    export = commands.add_parser("export", help="Render profile JSON files to protocol text.")
+    export.add_argument("profiles", nargs="+", help="Profile files, directories or glob patterns.")
+    export.add_argument("-o", "--out-dir", help="Output directory, mirroring the inputs' subdirectories (default: next to each input).")
+    export.add_argument("--format", choices=sorted(FORMAT_EXTENSIONS), default="text")
+    export.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count; 1 = no pool).")
+    export.add_argument("--force", action="store_true", help="Re-export even when the output is newer than the input.")
+    export.add_argument("--generator-name", default=DEFAULT_GENERATOR_NAME, help="Name shown in the exported text.")
+    export.set_defaults(handler=_cmd_export)
+    columnar = commands.add_parser("columnar", help="Convert profile JSON files to one columnar corpus file.")
+    columnar.add_argument("profiles", nargs="+", help="Profile files, directories or glob patterns.")
+    columnar.add_argument("-o", "--out", required=True, help="Corpus file (.parquet needs pyarrow; anything else uses the built-in format).")
+    columnar.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count; 1 = no pool).")
+    columnar.set_defaults(handler=_cmd_columnar)
+    index = commands.add_parser("index", help="Add new and changed profiles to a full-text index.")
+    index.add_argument("index", help="Index file (created if missing).")
+    index.add_argument("profiles", nargs="+", help="Profile files, directories or glob patterns.")
+    index.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count; 1 = no pool).")
+    index.add_argument("--force", action="store_true", help="Re-index files even if they did not change.")
+    index.set_defaults(handler=_cmd_index)
+    search = commands.add_parser("search", help="Find profile items containing every word of a query.")
+    search.add_argument("index", help="Index file built with `ucp-llm index`.")
+    search.add_argument("query", help='Words to find; "word*" matches by prefix.')
+    search.add_argument("--section", help="Only search this section id.")
+    search.add_argument("--key", help="Only search this jsonKey.")
+    search.add_argument("--limit", type=int, default=None, help="Print at most this many hits.")
+    search.set_defaults(handler=_cmd_search)
+    validate = commands.add_parser("validate", help="Check profile files against the section definitions.")
+    validate.add_argument("profiles", nargs="+", help="Profile files, directories or glob patterns.")
+    validate.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count; 1 = no pool).")
+    validate.add_argument("--warnings", action="store_true", help="Also print warnings (unknown or duplicate sections).")
+    validate.set_defaults(handler=_cmd_validate)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, "handler", None):
+        parser.print_help()
+        return 2
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,345 @@
+# columnar.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Columnar export of a profile corpus for analytics.
+
+A ColumnarCorpus stores many profiles as one column per (section_id,
+jsonKey) of the section registry, in the layout Arrow uses for list
+columns: per section, an offsets array gives each profile's range of item
+rows, and each field column holds one dictionary code per item row (-1 for
+a missing value) plus the dictionary of distinct strings. Filters evaluate
+their predicate once per distinct value and group-bys count codes, so
+neither touches a dict per profile. Keys that are not in the registry are
+not exported.
+
+build_corpus() parses the JSON files once (in parallel, via
+UCPProfile.load_many). write() and read_corpus() use Parquet when pyarrow
+is installed and the path ends in ".parquet"; otherwise they use a compact
+built-in format of raw little-endian arrays behind a JSON header; that file
+is memory-mapped and each column is decoded only when first used, so a query
+never reads the text columns it does not touch. The map stays open until the
+corpus is closed: use it as a context manager or call close().
+
+    corpus = build_corpus(paths)
+    corpus.write("profiles.ucpc")
+    with read_corpus("profiles.ucpc") as corpus:
+        corpus.value_counts("intervention_level", "chosenInterventionLevel")   # {"high": 812, ...}
+        corpus.item_counts("ethical_values")                                     # items per profile
+        corpus.match("cognitive_passion", "cognitivePassionName", lambda v: "philosophy" in v.lower())
+"""
+
+import mmap
+import sys
+from array import array
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import jsonio
+from .sections import SECTIONS
+from .ucp_llm import UCPProfile
+
+try:
+    import pyarrow  # type: ignore
+    import pyarrow.parquet  # type: ignore
+except ImportError:
+    pyarrow = None
+
+FORMAT_MAGIC = b"UCPC1\n"
+# 32-bit array type codes; "i"/"I" are 4 bytes on every mainstream platform, but C only guarantees 2.
+_INT32 = "i" if array("i").itemsize == 4 else "l"
+_UINT32 = "I" if array("I").itemsize == 4 else "L"
+
+
+def column_name(section_id: str, json_key: str) -> str:
+    return f"{section_id}.{json_key}"
+
+
+def _to_le_bytes(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(typecode: str, data: memoryview) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big": values.byteswap()
+    return values
+
+
+class Column:
+    """One (section_id, jsonKey) column: dictionary codes per item row, the dictionary, and the section's offsets."""
+
+    __slots__ = ("section_id", "json_key", "codes", "dictionary", "offsets")
+
+    def __init__(self, section_id: str, json_key: str, codes: array, dictionary: Tuple[str, ...], offsets: array):
+        self.section_id = section_id
+        self.json_key = json_key
+        self.codes = codes
+        self.dictionary = dictionary
+        self.offsets = offsets
+
+    def value_counts(self) -> Dict[Optional[str], int]:
+        """Occurrences of each value over all item rows; items without the field count under None."""
+        dictionary = self.dictionary
+        return {dictionary[code] if code >= 0 else None: count for code, count in Counter(self.codes).most_common()}
+
+    def matching_codes(self, predicate: Callable[[str], bool]) -> List[bool]:
+        return [bool(predicate(value)) for value in self.dictionary]
+
+    def match_rows(self, predicate: Callable[[str], bool]) -> List[int]:
+        """Item rows whose value satisfies `predicate`, evaluated once per distinct value."""
+        hits = self.matching_codes(predicate)
+        return [row for row, code in enumerate(self.codes) if code >= 0 and hits[code]]
+
+    def values(self) -> List[Optional[str]]:
+        """Decoded value per item row (materializes the column; prefer the coded methods for large corpora)."""
+        dictionary = self.dictionary
+        return [dictionary[code] if code >= 0 else None for code in self.codes]
+
+
+class ColumnarCorpus:
+    """
+    A profile corpus in columnar form (see the module docstring). Profiles are
+    addressed by index into `paths`; item rows by index into a section's rows.
+    After close(), columns already used stay readable; the others raise
+    ValueError.
+    """
+
+    def __init__(self, paths: Sequence[str], offsets: Dict[str, array], columns: Dict[str, Column], loader: Optional[Callable[[str], Column]] = None,
+                 on_close: Optional[Callable[[], None]] = None):
+        self.paths = tuple(paths)
+        self._offsets = offsets
+        self._columns = columns
+        self._loader = loader  # Decodes columns of a read file on first use
+        self._on_close = on_close  # Releases what the loader reads from, e.g. the memory map of read_corpus()
+        self._closed = False
+        self._parents: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def close(self) -> None:
+        """Releases the file behind a corpus from read_corpus(). Calling it again does nothing."""
+        if self._closed: return
+        self._closed = True
+        self._loader = None
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None: on_close()
+
+    def __enter__(self) -> "ColumnarCorpus":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def column_names() -> List[str]:
+        return [column_name(section.id, field.json_key) for section in SECTIONS.values() for field in section.fields]
+
+    def column(self, section_id: str, json_key: str) -> Column:
+        name = column_name(section_id, json_key)
+        column = self._columns.get(name)
+        if column is None:
+            if self._closed: raise ValueError(f"Cannot load column '{name}': the corpus is closed.")
+            if self._loader is None: raise KeyError(f"No column '{name}'.")
+            column = self._columns[name] = self._loader(name)
+        return column
+
+    def offsets(self, section_id: str) -> array:
+        if section_id not in self._offsets: raise KeyError(f"No section '{section_id}'.")
+        return self._offsets[section_id]
+
+    def item_counts(self, section_id: str) -> List[int]:
+        """Number of items in `section_id` per profile."""
+        offsets = self.offsets(section_id)
+        return [offsets[i + 1] - offsets[i] for i in range(len(self.paths))]
+
+    def row_profiles(self, section_id: str) -> array:
+        """Profile index of every item row of `section_id`."""
+        parents = self._parents.get(section_id)
+        if parents is None:
+            offsets = self.offsets(section_id)
+            parents = array(_UINT32)
+            for profile_index in range(len(self.paths)): parents.extend([profile_index] * (offsets[profile_index + 1] - offsets[profile_index]))
+            self._parents[section_id] = parents
+        return parents
+
+    def value_counts(self, section_id: str, json_key: str) -> Dict[Optional[str], int]:
+        return self.column(section_id, json_key).value_counts()
+
+    def match(self, section_id: str, json_key: str, predicate: Callable[[str], bool]) -> List[int]:
+        """Sorted indices of profiles with at least one item whose value satisfies `predicate`."""
+        parents = self.row_profiles(section_id)
+        return sorted({parents[row] for row in self.column(section_id, json_key).match_rows(predicate)})
+
+    def match_paths(self, section_id: str, json_key: str, predicate: Callable[[str], bool]) -> List[str]:
+        return [self.paths[i] for i in self.match(section_id, json_key, predicate)]
+
+    def group_by(self, section_id: str, json_key: str) -> Dict[Optional[str], List[int]]:
+        """Profile indices per value; a profile with several items may appear under several values."""
+        column = self.column(section_id, json_key)
+        parents = self.row_profiles(section_id)
+        groups: Dict[int, set] = {}
+        for row, code in enumerate(column.codes): groups.setdefault(code, set()).add(parents[row])
+        return {column.dictionary[code] if code >= 0 else None: sorted(members) for code, members in groups.items()}
+
+    # --- Writing ---
+
+    def write(self, file_path: str) -> None:
+        """Writes Parquet if the path ends in .parquet (requires pyarrow), else the built-in format."""
+        if file_path.lower().endswith(".parquet"):
+            if pyarrow is None: raise RuntimeError("Writing Parquet requires pyarrow: pip install pyarrow")
+            pyarrow.parquet.write_table(self.to_arrow(), file_path)
+            return
+        header: Dict[str, Any] = {"v": 1, "paths": list(self.paths), "offsets": {}, "columns": {}}
+        blocks: List[bytes] = []
+        position = 0
+
+        def add(data: bytes) -> List[int]:
+            nonlocal position
+            blocks.append(data)
+            position += len(data)
+            return [position - len(data), len(data)]
+
+        for section_id, offsets in self._offsets.items(): header["offsets"][section_id] = add(_to_le_bytes(offsets))
+        for name in self.column_names():
+            section_id, json_key = name.split(".", 1)
+            column = self.column(section_id, json_key)
+            encoded = [value.encode("utf-8") for value in column.dictionary]
+            string_offsets = array(_UINT32, [0])
+            for value in encoded: string_offsets.append(string_offsets[-1] + len(value))
+            header["columns"][name] = {"codes": add(_to_le_bytes(column.codes)), "strings": add(b"".join(encoded)),
+                                       "string_offsets": add(_to_le_bytes(string_offsets))}
+        header_bytes = jsonio.dumps_bytes(header, compact=True)
+        with open(file_path, "wb") as f:
+            f.write(FORMAT_MAGIC)
+            f.write(len(header_bytes).to_bytes(4, "little"))
+            f.write(header_bytes)
+            for block in blocks: f.write(block)
+
+    def to_arrow(self) -> Any:
+        """pyarrow.Table with one list<dictionary<string>> column per field and one row per profile."""
+        if pyarrow is None: raise RuntimeError("to_arrow() requires pyarrow: pip install pyarrow")
+        arrays, names = [pyarrow.array(self.paths, type=pyarrow.string())], ["path"]
+        for name in self.column_names():
+            column = self.column(*name.split(".", 1))
+            indices = pyarrow.array([code if code >= 0 else None for code in column.codes], type=pyarrow.int32())
+            values = pyarrow.DictionaryArray.from_arrays(indices, pyarrow.array(column.dictionary, type=pyarrow.string()))
+            arrays.append(pyarrow.ListArray.from_arrays(pyarrow.array(column.offsets, type=pyarrow.int32()), values))
+            names.append(name)
+        return pyarrow.Table.from_arrays(arrays, names=names)
+
+    @classmethod
+    def from_arrow(cls, table: Any) -> "ColumnarCorpus":
+        """Inverse of to_arrow(); also accepts plain (non-dictionary) string list columns."""
+        paths = table.column("path").to_pylist()
+        offsets: Dict[str, array] = {}
+        columns: Dict[str, Column] = {}
+        for name in cls.column_names():
+            if name not in table.column_names: continue
+            section_id, json_key = name.split(".", 1)
+            lists = table.column(name).combine_chunks()
+            section_offsets = offsets.setdefault(section_id, array(_UINT32, lists.offsets.to_pylist()))
+            values = lists.flatten()
+            if pyarrow.types.is_dictionary(values.type):
+                dictionary = tuple(values.dictionary.to_pylist())
+                codes = array(_INT32, (-1 if code is None else code for code in values.indices.to_pylist()))
+            else:
+                builder = _ColumnBuilder()
+                for value in values.to_pylist(): builder.append(value)
+                dictionary, codes = builder.finish()
+            columns[name] = Column(section_id, json_key, codes, dictionary, section_offsets)
+        return cls(paths, offsets, columns)
+
+
+class _ColumnBuilder:
+    __slots__ = ("codes", "lookup")
+
+    def __init__(self):
+        self.codes = array(_INT32)
+        self.lookup: Dict[str, int] = {}
+
+    def append(self, value: Any) -> None:
+        if value is None: self.codes.append(-1); return
+        if not isinstance(value, str): value = str(value)
+        code = self.lookup.get(value)
+        if code is None: code = self.lookup[value] = len(self.lookup)
+        self.codes.append(code)
+
+    def finish(self) -> Tuple[Tuple[str, ...], array]:
+        return tuple(self.lookup), self.codes
+
+
+def build_corpus(file_paths: Iterable[str], workers: Optional[int] = None, chunk_size: int = 32,
+                 errors: Optional[Dict[str, str]] = None) -> ColumnarCorpus:
+    """
+    Parses `file_paths` (in parallel worker processes, see UCPProfile.load_many)
+    into a ColumnarCorpus with profiles in path order. Invalid files are left
+    out and reported in `errors` ({file_path: error_message}) if given.
+    """
+    batch = UCPProfile.load_many(file_paths, workers=workers, chunk_size=chunk_size)
+    profiles = sorted(batch, key=lambda profile: profile.file_path)
+    if errors is not None: errors.update(batch.errors)
+    offsets: Dict[str, array] = {}
+    columns: Dict[str, Column] = {}
+    for section in SECTIONS.values():
+        section_offsets = offsets[section.id] = array(_UINT32, [0])
+        builders = [_ColumnBuilder() for _ in section.fields]
+        keys = [field.json_key for field in section.fields]
+        for profile in profiles:
+            count = 0
+            for item in profile.iter_section_items(section.id):
+                for builder, key in zip(builders, keys): builder.append(item.get(key))
+                count += 1
+            section_offsets.append(section_offsets[-1] + count)
+        for builder, key in zip(builders, keys):
+            dictionary, codes = builder.finish()
+            columns[column_name(section.id, key)] = Column(section.id, key, codes, dictionary, section_offsets)
+    return ColumnarCorpus([profile.file_path for profile in profiles], offsets, columns)
+
+
+def read_corpus(file_path: str) -> ColumnarCorpus:
+    """Opens a corpus written by ColumnarCorpus.write(). Raises ValueError for files in another format."""
+    if file_path.lower().endswith(".parquet"):
+        if pyarrow is None: raise RuntimeError("Reading Parquet requires pyarrow: pip install pyarrow")
+        return ColumnarCorpus.from_arrow(pyarrow.parquet.read_table(file_path))
+    with open(file_path, "rb") as f:
+        try: mapping: Optional[mmap.mmap] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: mapping = None  # Empty file
+    data = memoryview(mapping if mapping is not None else b"")
+
+    def release() -> None:
+        data.release()  # Slices of it are only used while a column is decoded, so the map has no other views left
+        if mapping is not None: mapping.close()
+
+    try:
+        if bytes(data[:len(FORMAT_MAGIC)]) != FORMAT_MAGIC: raise ValueError(f"'{file_path}' is not a UCP-LLM columnar file.")
+        header_start = len(FORMAT_MAGIC) + 4
+        header_end = header_start + int.from_bytes(data[len(FORMAT_MAGIC):header_start], "little")
+        header = jsonio.loads(bytes(data[header_start:header_end]))
+
+        def block(span: List[int]) -> memoryview:
+            start = header_end + span[0]
+            return data[start:start + span[1]]
+
+        offsets = {section_id: _from_le_bytes(_UINT32, block(span)) for section_id, span in header["offsets"].items()}
+    except BaseException:
+        release()
+        raise
+
+    def load_column(name: str) -> Column:
+        entry = header["columns"].get(name)
+        if entry is None: raise KeyError(f"No column '{name}'.")
+        section_id, json_key = name.split(".", 1)
+        strings = bytes(block(entry["strings"]))
+        string_offsets = _from_le_bytes(_UINT32, block(entry["string_offsets"]))
+        dictionary = tuple(strings[string_offsets[i]:string_offsets[i + 1]].decode("utf-8") for i in range(len(string_offsets) - 1))
+        return Column(section_id, json_key, _from_le_bytes(_INT32, block(entry["codes"])), dictionary, offsets[section_id])
+
+    return ColumnarCorpus(header["paths"], offsets, {}, load_column, release)
@@ -0,0 +1,239 @@
+# context.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Token-budgeted protocol text for LLM calls.
+
+ContextCompiler emits the same text as ProtocolRenderer.render(for_preview=
+False), but only as much of it as fits a token budget. Parts are admitted in
+priority order: the sections (by id), the external analysis summary
+("external_analysis"), the preamble ("preamble") and the postamble
+("postamble"). A part that does not fit whole is first retried with its long
+fields shortened by a reducer, then, for repeatable sections, with as many
+items as fit; otherwise it is left out. The admitted parts are then laid out
+in the usual document order, so the text reads like a normal export.
+
+Tokens are counted by a pluggable callable (text -> count). The default,
+estimate_tokens(), is a dependency-free approximation of BPE tokenizers for
+mixed Arabic and English text; pass e.g. lambda s: len(enc.encode(s)) for
+an exact count with tiktoken. Reducers take (text, max_tokens, count_tokens)
+and return shorter text; the default truncates at a word boundary, and a
+summarizer can be plugged in per (section_id, jsonKey) or per jsonKey.
+
+layout=LAYOUT_PREFIX_STABLE reorders the text for provider-side prompt
+caching, which reuses work only for a byte-identical prefix: the title and
+the preamble and postamble, with their fields written as ⟨name⟩ references,
+come first and are the same bytes for every document and every call. The
+user's sections follow, and the values of the references (export date,
+names, data version and date, each cut to value_token_cap) close the text.
+The user's data keeps its priority over the fixed texts: the preamble and
+postamble are admitted together, and only when the whole document fits with
+them. Otherwise both are left out, every section gets their room, and the
+text starts with the title and the sections; it is then no longer shared
+with other documents, but still stable between runs for the same document.
+
+    compiled = ContextCompiler(budget=4000).compile(profile)
+    compiled.text, compiled.tokens, compiled.omitted
+"""
+
+import datetime
+import re
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from .render import ProtocolRenderer
+from .ucp_llm import UCPProfile
+
+TokenCounter = Callable[[str], int]
+FieldReducer = Callable[[str, int, TokenCounter], str]
+
+EXTERNAL_ANALYSIS = "external_analysis"
+PREAMBLE = "preamble"
+POSTAMBLE = "postamble"
+
+LAYOUT_DOCUMENT = "document"
+LAYOUT_PREFIX_STABLE = "prefix_stable"
+
+# What an LLM needs most to act on the protocol comes first; background and the
+# long fixed instruction texts last.
+DEFAULT_PRIORITY: Tuple[str, ...] = (
+    "personal", "role", "interaction_style", "intervention_level", "alignment_level", "critique_mechanism",
+    "constraints_warnings", "mental_state", "thinking_reference", "cognitive_passion", "ethical_values",
+    "concepts_perspective", "projects", "conceptual_tuning", "cognitive_preferences", "memory_management_directives",
+    "educational_professional", "social", "cognitive_tools_methodology", "inspiring_figures", "intellectual_sins",
+    "pivotal_examples", "causal_relations", "sports_inclinations", "additional_notes", EXTERNAL_ANALYSIS, POSTAMBLE, PREAMBLE,
+)
+
+_LATIN_WORDS = re.compile(r"[A-Za-z]+")
+_DIGIT_RUNS = re.compile(r"[0-9]+")
+_OTHER_WORDS = re.compile(r"[^\W\dA-Za-z_]+")
+_PUNCTUATION = re.compile(r"[^\w\s]|_")
+_TRUNCATION_MARK = " …"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate BPE token count: ~4 characters per token for Latin words,
+    ~2 for words in other scripts (e.g. Arabic), ~3 for digit runs and one
+    per punctuation mark. Usually within 20% of tiktoken's cl100k_base.
+    """
+    latin, digits, other = _LATIN_WORDS.findall(text), _DIGIT_RUNS.findall(text), _OTHER_WORDS.findall(text)
+    # Each run costs at least one token; sum(map(len)) keeps the per-character part out of Python loops.
+    return ((sum(map(len, latin)) + 3 * len(latin)) // 4 + (sum(map(len, digits)) + 2 * len(digits)) // 3
+            + (sum(map(len, other)) + len(other)) // 2 + len(_PUNCTUATION.findall(text)))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, count_tokens: TokenCounter = estimate_tokens) -> str:
+    """Longest word-boundary prefix of `text` that fits `max_tokens` including the " …" mark (the default reducer)."""
+    total = count_tokens(text)
+    if total <= max_tokens: return text
+    budget = max_tokens - count_tokens(_TRUNCATION_MARK)
+    low, high = 0, len(text) - 1
+    guess = len(text) * max(budget, 0) // total  # Token density is roughly even, so the cut is near here
+    while guess > low:  # Bracket the cut around the guess before bisecting, to keep the counted prefixes short
+        if count_tokens(text[:guess]) <= budget:
+            low = guess
+            break
+        high, guess = guess - 1, guess * 7 // 8
+    while low < high:  # Largest cut whose prefix fits
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle]) <= budget: low = middle
+        else: high = middle - 1
+    cut = text[:low]
+    if low < len(text) and not text[low].isspace() and " " in cut: cut = cut[:cut.rindex(" ")]
+    return cut.rstrip() + _TRUNCATION_MARK if cut.strip() else ""
+
+
+class CompiledContext(NamedTuple):
+    text: str
+    tokens: int  # count_tokens(text)
+    budget: int
+    included: Tuple[str, ...]  # Parts admitted whole
+    reduced: Tuple[str, ...]  # Parts admitted with shortened fields or fewer items
+    omitted: Tuple[str, ...]  # Parts with content that did not fit
+
+
+class ContextCompiler:
+    """Fits protocol text into a token budget (see the module docstring)."""
+
+    def __init__(self, budget: int, priority: Sequence[str] = DEFAULT_PRIORITY, count_tokens: TokenCounter = estimate_tokens,
+                 renderer: Optional[ProtocolRenderer] = None, field_token_cap: int = 160,
+                 reducers: Optional[Mapping[Union[str, Tuple[str, str]], FieldReducer]] = None,
+                 default_reducer: FieldReducer = truncate_to_tokens, layout: str = LAYOUT_DOCUMENT, value_token_cap: int = 64):
+        if layout not in (LAYOUT_DOCUMENT, LAYOUT_PREFIX_STABLE): raise ValueError(f"layout must be '{LAYOUT_DOCUMENT}' or '{LAYOUT_PREFIX_STABLE}', not {layout!r}")
+        self.budget = budget
+        self.layout = layout
+        self.value_token_cap = value_token_cap  # Per ⟨name⟩ value in the prefix-stable layout
+        self.renderer = renderer or ProtocolRenderer()
+        known = [compiled.section_id for compiled in self.renderer.sections] + [EXTERNAL_ANALYSIS, POSTAMBLE, PREAMBLE]
+        self.priority = tuple(dict.fromkeys([part for part in priority if part in known] + known))  # Unlisted parts go last
+        self.count_tokens = count_tokens
+        self.field_token_cap = field_token_cap  # Per-field limit when a section has to be shortened
+        self.reducers = dict(reducers or {})
+        self.default_reducer = default_reducer
+        self._compiled_sections = {compiled.section_id: compiled for compiled in self.renderer.sections}
+
+    def _tokens(self, lines: List[str]) -> int:
+        return self.count_tokens("\n".join(lines)) + 1 if lines else 0  # +1 for the newline joining it to the text
+
+    def _reducer_for(self, section_id: str, json_key: str) -> FieldReducer:
+        return self.reducers.get((section_id, json_key)) or self.reducers.get(json_key) or self.default_reducer
+
+    def _reduced_item(self, section_id: str, item: Any) -> Any:
+        if not isinstance(item, dict): return item
+        return {key: self._reducer_for(section_id, key)(value, self.field_token_cap, self.count_tokens)
+                if isinstance(value, str) and self.count_tokens(value) > self.field_token_cap else value
+                for key, value in item.items()}
+
+    def _fit_section(self, section_id: str, section: Dict[str, Any], remaining: int) -> Tuple[List[str], str]:
+        """(lines, outcome) for one section within `remaining` tokens; outcome is included, reduced or omitted."""
+        compiled = self._compiled_sections[section_id]
+        lines = self.renderer.render_section(compiled, section, False)
+        if not lines or self._tokens(lines) <= remaining: return lines, "included"
+        if self._tokens([compiled.heading, ""]) >= remaining: return [], "omitted"  # Not even room for the heading
+        # Shorten items one at a time and stop at the first that no longer fits: the first items are kept,
+        # as later ones tend to be the least important, and items past the budget are never reduced.
+        fitted: List[str] = []
+        items = []
+        for item in section.get("items", []):
+            items.append(self._reduced_item(section_id, item))
+            lines = self.renderer.render_section(compiled, {**section, "items": items}, False)
+            if self._tokens(lines) > remaining: break
+            fitted = lines
+        return (fitted, "reduced") if fitted else ([], "omitted")
+
+    def _admit(self, priority: Sequence[str], section_index: Dict[str, Dict[str, Any]], fixed: Dict[str, List[str]],
+               remaining: int) -> Tuple[Dict[str, List[str]], List[str], List[str], List[str]]:
+        """Admits the parts of `priority` in order; `fixed` holds the lines of the parts that are not sections."""
+        parts: Dict[str, List[str]] = {}
+        included: List[str] = []
+        reduced: List[str] = []
+        omitted: List[str] = []
+        for part in priority:
+            outcome = "included"
+            if part in fixed: lines = fixed[part]
+            else:
+                section = section_index.get(part)
+                if not section: continue
+                lines, outcome = self._fit_section(part, section, remaining)
+            if not lines:
+                if outcome == "omitted": omitted.append(part)
+                continue
+            cost = self._tokens(lines)
+            if cost > remaining:
+                omitted.append(part)
+                continue
+            parts[part] = lines
+            remaining -= cost
+            (reduced if outcome == "reduced" else included).append(part)
+        return parts, included, reduced, omitted
+
+    def compile(self, data: Union[Dict[str, Any], UCPProfile, None], preferred_name: str = "",
+                now: Optional[datetime.datetime] = None) -> CompiledContext:
+        if isinstance(data, UCPProfile): data = data.get_raw_data()
+        if not data: return CompiledContext("", 0, self.budget, (), (), ())
+        renderer = self.renderer
+        section_index = renderer.index_sections(data)
+        preferred_name = renderer.resolve_preferred_name(section_index, preferred_name)
+        footer = renderer.footer_lines(False)
+        if self.layout == LAYOUT_PREFIX_STABLE:
+            preamble_values = renderer.preamble_values(data, preferred_name, now)
+            postamble_values = renderer.postamble_values(data, section_index, preferred_name)
+            values = {"protocol_version": str(data.get("protocolVersion", "N/A")), "json_data_date": preamble_values["json_data_date"]}
+            all_values = {key: truncate_to_tokens(value, self.value_token_cap, self.count_tokens)
+                          for key, value in {**values, **preamble_values, **postamble_values}.items()}
+            for group in (values, preamble_values, postamble_values): group.update((key, all_values[key]) for key in group)
+            header = renderer.stable_header_lines()
+            static = {PREAMBLE: [renderer.stable_preamble_text(), "\n---\n"], POSTAMBLE: [renderer.stable_postamble_text(), "\n---\n"]}
+            data_priority = [part for part in self.priority if part not in static]
+            frame = self._tokens(header + renderer.variable_lines(all_values) + footer)
+            parts, included, reduced, omitted = self._admit(data_priority, section_index, {EXTERNAL_ANALYSIS: renderer.external_analysis_lines(section_index)},
+                                                            self.budget - frame - self._tokens(static[PREAMBLE]) - self._tokens(static[POSTAMBLE]))
+            if reduced or omitted:  # The document does not fit whole with the fixed texts: it goes first
+                frame = self._tokens(header + renderer.variable_lines(values) + footer)
+                parts, included, reduced, omitted = self._admit(data_priority, section_index, {EXTERNAL_ANALYSIS: renderer.external_analysis_lines(section_index)},
+                                                                self.budget - frame)
+                omitted += [part for part in self.priority if part in static]
+            else:
+                parts.update(static)
+                included = [part for part in self.priority if part in static] + included
+                values.update(preamble_values)
+                values.update(postamble_values)
+            # Static text first, in an order that does not depend on the document; then the user's data; then the values.
+            lines = header[:1] + parts.get(PREAMBLE, []) + parts.get(POSTAMBLE, []) + header[1:2]
+            for compiled in renderer.sections: lines.extend(parts.get(compiled.section_id, ()))
+            lines += parts.get(EXTERNAL_ANALYSIS, []) + renderer.variable_lines(values) + footer
+        else:
+            header = renderer.header_lines(data, False)
+            fixed = {PREAMBLE: [renderer.preamble_text(data, preferred_name, now), "\n---\n"],
+                     POSTAMBLE: ["\n---\n", renderer.postamble_text(data, section_index, preferred_name)],
+                     EXTERNAL_ANALYSIS: renderer.external_analysis_lines(section_index)}
+            # Title and footer are always emitted
+            parts, included, reduced, omitted = self._admit(self.priority, section_index, fixed, self.budget - self._tokens(header + footer))
+            lines = list(parts.get(PREAMBLE, ())) + header
+            for compiled in renderer.sections: lines.extend(parts.get(compiled.section_id, ()))
+            lines += parts.get(EXTERNAL_ANALYSIS, []) + parts.get(POSTAMBLE, []) + footer
+        text = "\n".join(lines)
+        return CompiledContext(text, self.count_tokens(text), self.budget, tuple(included), tuple(reduced), tuple(omitted))
@@ -0,0 +1,213 @@
+# dispatch.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Sends the same analysis request to several models or providers at once.
+
+An AnalysisDispatcher holds a list of AnalysisTargets (a provider from
+ucp_llm.llm, a model name and per-target settings) and runs one request on
+all of them in parallel, each on its own daemon thread:
+
+- MODE_FIRST: the first target to finish successfully wins and the others
+  are cancelled, so the answer comes from whichever model is fastest right
+  now and a failing or stalled provider does not hold it up.
+- MODE_ALL: waits for every target, for comparing their answers.
+
+Each target has a timeout, counted from the start of the dispatch. A target
+that times out, loses a first-wins race or is cancelled through
+`should_cancel` stops at its next text piece and its late output is
+dropped; this also closes an HTTPChatProvider stream and its connection. A
+call still waiting for its first byte cannot be interrupted: its thread
+finishes in the background and the result is discarded.
+
+Text pieces are passed to `on_text(target_name, piece)` on the dispatching
+thread as they arrive. The dispatch thread is usually a JobRunner job, whose
+report() forwards them to the GUI.
+
+    dispatcher = AnalysisDispatcher([AnalysisTarget(provider, "model-a"), AnalysisTarget(provider, "model-b")])
+    result = dispatcher.dispatch(messages, should_cancel=lambda: job.cancelled)
+    result.text   # The winner's answer, or "" when every target failed
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .llm import LLMProvider
+
+MODE_FIRST = "first"
+MODE_ALL = "all"
+
+STATUS_SUCCESS = "success"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+STATUS_CANCELLED = "cancelled"
+
+
+class AnalysisTarget:
+    """One model on one provider, with its own timeout (None: the dispatcher's) and create() arguments."""
+
+    def __init__(self, provider: LLMProvider, model: str, name: Optional[str] = None, timeout: Optional[float] = None,
+                 **create_kwargs: Any):
+        self.provider = provider
+        self.model = model
+        self.name = name or f"{provider.name}:{model}"
+        self.timeout = timeout
+        self.create_kwargs = create_kwargs
+
+    def __repr__(self) -> str:
+        return f"AnalysisTarget({self.name!r})"
+
+
+class TargetResult:
+    """
+    Outcome of one target: its status, the text received (complete only on
+    success), the exception of a failed call, and the seconds until the
+    first text piece and until the target finished or was given up on.
+    """
+
+    __slots__ = ("name", "model", "status", "text", "error", "first_text_seconds", "seconds")
+
+    def __init__(self, name: str, model: str, status: str, text: str = "", error: Optional[BaseException] = None,
+                 first_text_seconds: Optional[float] = None, seconds: float = 0.0):
+        self.name = name
+        self.model = model
+        self.status = status
+        self.text = text
+        self.error = error
+        self.first_text_seconds = first_text_seconds
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_SUCCESS
+
+    @property
+    def error_message(self) -> str:
+        if self.error is not None: return f"{type(self.error).__name__} - {self.error}"
+        return "" if self.ok else self.status
+
+    def __repr__(self) -> str:
+        return f"TargetResult({self.name!r}, {self.status}, {len(self.text)} chars, {self.seconds * 1000:.0f} ms)"
+
+
+class DispatchResult:
+    """Results of one dispatch, in target order; `winner` is the first target to succeed, if any."""
+
+    def __init__(self, mode: str, results: List[TargetResult], winner: Optional[TargetResult], seconds: float):
+        self.mode = mode
+        self.results = results
+        self.winner = winner
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.winner is not None
+
+    @property
+    def text(self) -> str:
+        return self.winner.text if self.winner is not None else ""
+
+    def successful(self) -> List[TargetResult]:
+        return [result for result in self.results if result.ok]
+
+    def merged_text(self, heading: str = "--- {name} ---") -> str:
+        """The answers of all successful targets, each under `heading` formatted with its name and model."""
+        return "\n\n".join(heading.format(name=result.name, model=result.model) + "\n" + result.text.strip() for result in self.successful())
+
+    def error_message(self) -> str:
+        """One line per unsuccessful target, for reporting a dispatch in which nothing succeeded."""
+        return "\n".join(f"{result.name}: {result.error_message}" for result in self.results if not result.ok)
+
+    def __repr__(self) -> str:
+        winner = self.winner.name if self.winner is not None else None
+        return f"DispatchResult({self.mode}, winner={winner!r}, {[result.status for result in self.results]})"
+
+
+class AnalysisDispatcher:
+    """Runs one request on several targets in parallel (see the module docstring). Reusable and thread-safe."""
+
+    def __init__(self, targets: Sequence[AnalysisTarget], mode: str = MODE_FIRST, timeout: float = 120.0,
+                 poll_interval: float = 0.05):
+        if not targets: raise ValueError("AnalysisDispatcher needs at least one target")
+        if mode not in (MODE_FIRST, MODE_ALL): raise ValueError(f"mode must be '{MODE_FIRST}' or '{MODE_ALL}', not {mode!r}")
+        self.targets = list(targets)
+        self.mode = mode
+        self.timeout = timeout
+        self.poll_interval = poll_interval  # How often should_cancel is checked while no target reports
+
+    def dispatch(self, messages: List[Dict[str, str]], stream: bool = True, on_text: Optional[Callable[[str, str], None]] = None,
+                 should_cancel: Optional[Callable[[], bool]] = None, **create_kwargs: Any) -> DispatchResult:
+        """
+        Sends `messages` to every target and waits per the mode. Keyword
+        arguments go to every create() call, under each target's own ones.
+        Returns once the outcome is decided; the targets it no longer waits
+        for are told to stop.
+        """
+        start = time.perf_counter()
+        events: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        stops = [threading.Event() for _ in self.targets]
+        deadlines = [start + (self.timeout if target.timeout is None else target.timeout) for target in self.targets]
+        pieces: List[List[str]] = [[] for _ in self.targets]
+        first_text: List[Optional[float]] = [None] * len(self.targets)
+        results: List[Optional[TargetResult]] = [None] * len(self.targets)
+        pending = set(range(len(self.targets)))
+        winner: Optional[TargetResult] = None
+
+        def finish(index: int, status: str, error: Optional[BaseException] = None) -> TargetResult:
+            target = self.targets[index]
+            stops[index].set()
+            pending.discard(index)
+            results[index] = TargetResult(target.name, target.model, status, "".join(pieces[index]), error,
+                                          first_text[index], time.perf_counter() - start)
+            return results[index]
+
+        for index, target in enumerate(self.targets):
+            kwargs = dict(create_kwargs, **target.create_kwargs)
+            threading.Thread(target=self._run, args=(index, target, messages, stream, kwargs, events, stops[index]),
+                             name=f"ucp-dispatch-{target.name}", daemon=True).start()
+
+        while pending:
+            now = time.perf_counter()
+            for index in [index for index in pending if deadlines[index] <= now]: finish(index, STATUS_TIMEOUT)
+            if not pending: break
+            if should_cancel is not None and should_cancel():
+                for index in list(pending): finish(index, STATUS_CANCELLED)
+                break
+            wait = min(deadlines[index] for index in pending) - now
+            if should_cancel is not None: wait = min(wait, self.poll_interval)
+            try: index, kind, data = events.get(timeout=max(0.0, wait))
+            except queue.Empty: continue
+            if index not in pending: continue  # Late output of a target already given up on
+            if kind == "text":
+                if first_text[index] is None: first_text[index] = time.perf_counter() - start
+                pieces[index].append(data)
+                if on_text is not None: on_text(self.targets[index].name, data)
+            elif kind == "error":
+                finish(index, STATUS_ERROR, data)
+            else:
+                result = finish(index, STATUS_SUCCESS)
+                if winner is None: winner = result
+                if self.mode == MODE_FIRST:
+                    for other in list(pending): finish(other, STATUS_CANCELLED)
+        return DispatchResult(self.mode, results, winner, time.perf_counter() - start)  # type: ignore[arg-type]
+
+    @staticmethod
+    def _run(index: int, target: AnalysisTarget, messages: List[Dict[str, str]], stream: bool, kwargs: Dict[str, Any],
+             events: "queue.SimpleQueue[tuple]", stop: threading.Event) -> None:
+        try:
+            iterator = target.provider.stream_text(messages, target.model, stream=stream, **kwargs)
+            try:
+                for piece in iterator:
+                    if stop.is_set(): return
+                    events.put((index, "text", piece))
+            finally:
+                close = getattr(iterator, "close", None)
+                if close is not None: close()  # Runs the provider's cleanup now when the loop was left early
+            events.put((index, "done", None))
+        except BaseException as e:
+            events.put((index, "error", e))
@@ -0,0 +1,140 @@
+# jobs.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Background jobs whose results are delivered on the GUI thread.
+
+JobRunner runs each job on its own daemon thread (jobs are few and long, such
+as an LLM request or an export, and must not keep the app alive on exit).
+Workers never touch the GUI: a finished job or a progress report is queued
+and the runner's `notify` callback is invoked once to wake the GUI thread,
+which then calls dispatch() to run the job's callbacks. Nothing runs while
+no job is in flight, so there is no polling loop. bind_tk() wires this to a
+Tk widget through a virtual event; any other loop can pass its own wake-up
+function as `notify`.
+
+A job that fails without an on_error callback is passed, with its name, to
+the runner's `on_unhandled_error` callback (e.g. to show it in a status bar)
+or, if that is not set, logged through the `logging` module.
+"""
+
+import logging
+import queue
+import threading
+from typing import Any, Callable, Optional, Set
+
+DEFAULT_VIRTUAL_EVENT = "<<UCPJobEvent>>"
+
+_log = logging.getLogger(__name__)
+
+
+class Job:
+    """Handle of one submitted job. The job function receives it as its first argument."""
+
+    def __init__(self, runner: "JobRunner", name: str,
+                 on_done: Optional[Callable[[Any], None]], on_error: Optional[Callable[[BaseException], None]],
+                 on_progress: Optional[Callable[[Any], None]]):
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.cancelled = False
+        self.finished = False
+        self._runner = runner
+
+    def report(self, data: Any) -> None:
+        """Called from the worker; `data` is passed to on_progress on the GUI thread."""
+        if not self.cancelled and self.on_progress is not None: self._runner._post(self, "progress", data)
+
+    def cancel(self) -> None:
+        """Drops all further callbacks. A running function is not interrupted; it can check `cancelled`."""
+        self.cancelled = True
+
+    def __repr__(self) -> str:
+        state = "cancelled" if self.cancelled else "finished" if self.finished else "running"
+        return f"Job({self.name!r}, {state})"
+
+
+class JobRunner:
+    """
+    Background job runner with callbacks delivered by dispatch(), which must
+    be called on the thread that owns the GUI. Several jobs may run at once;
+    each keeps its own callbacks.
+    """
+
+    def __init__(self, notify: Optional[Callable[[], None]] = None):
+        self.notify = notify
+        self.on_unhandled_error: Optional[Callable[[str, BaseException], None]] = None  # (job name, error); called on the GUI thread
+        self._events: "queue.SimpleQueue[tuple]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._wake_pending = False
+        self._active: Set[Job] = set()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, name: Optional[str] = None,
+               on_done: Optional[Callable[[Any], None]] = None, on_error: Optional[Callable[[BaseException], None]] = None,
+               on_progress: Optional[Callable[[Any], None]] = None, **kwargs: Any) -> Job:
+        """Runs fn(job, *args, **kwargs) in the background; its return value goes to on_done."""
+        job = Job(self, name or getattr(fn, "__name__", "job"), on_done, on_error, on_progress)
+        self._active.add(job)
+        threading.Thread(target=self._run, args=(job, fn, args, kwargs), name=f"ucp-job-{job.name}", daemon=True).start()
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        try:
+            result = fn(job, *args, **kwargs)
+        except BaseException as e:
+            self._post(job, "error", e)
+        else:
+            self._post(job, "done", result)
+
+    def _post(self, job: Job, kind: str, data: Any) -> None:
+        self._events.put((job, kind, data))
+        with self._lock:
+            if self._wake_pending: return  # one wake-up covers everything queued before dispatch() runs
+            self._wake_pending = True
+        if self.notify is not None:
+            try: self.notify()
+            except Exception:
+                # e.g. the window is being destroyed. Without a wake-up on its way, the next event must try again
+                with self._lock: self._wake_pending = False
+
+    def dispatch(self, event: Any = None) -> int:
+        """Delivers all queued results and progress reports. Returns how many were delivered."""
+        with self._lock: self._wake_pending = False
+        delivered = 0
+        while True:
+            try: job, kind, data = self._events.get_nowait()
+            except queue.Empty: return delivered
+            if kind != "progress":
+                job.finished = True
+                self._active.discard(job)
+            if job.cancelled: continue
+            callback = job.on_progress if kind == "progress" else job.on_done if kind == "done" else job.on_error
+            delivered += 1
+            if callback is not None: callback(data)
+            elif kind == "error": self.unhandled_error(job.name, data)
+
+    def unhandled_error(self, name: str, error: BaseException) -> None:
+        """Reports an error that no callback took: to on_unhandled_error if set, else to the log."""
+        if self.on_unhandled_error is not None: self.on_unhandled_error(name, error)
+        else: _log.error("Unhandled error in background job '%s'", name, exc_info=error)
+
+    def active_jobs(self) -> int:
+        return len(self._active)
+
+    def cancel_all(self) -> None:
+        for job in list(self._active): job.cancel()
+
+
+def bind_tk(widget: Any, runner: JobRunner, virtual_event: str = DEFAULT_VIRTUAL_EVENT) -> JobRunner:
+    """
+    Delivers `runner`'s results on the Tk main loop of `widget`: workers raise
+    `virtual_event` (event_generate with when="tail", safe from other threads),
+    and its binding runs dispatch().
+    """
+    widget.bind(virtual_event, runner.dispatch)
+    runner.notify = lambda: widget.event_generate(virtual_event, when="tail")
+    return runner
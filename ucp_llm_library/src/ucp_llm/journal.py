@@ -0,0 +1,210 @@
+# journal.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Append-only session journal for crash recovery.
+
+A SessionJournal attached to a ProfileOverlay appends one JSON line per
+effective edit (the overlay's observer ops) and per change of the caller's
+session state, so recording an answer costs one small write instead of
+rewriting the whole protocol. The file starts with a header naming the
+protocol file the edits apply to (or embedding the document when it was
+never saved).
+
+start() rewrites the journal as a header plus the overlay's remaining delta;
+calling it after a durable save compacts the journal down to the edits made
+since. SessionJournal.replay() rebuilds the overlay and the last recorded
+state from a journal left behind by a crash. It stops at the first line that
+is not valid JSON, i.e. a write torn by the crash; resume() cuts that tail
+off before appending again. A journal that cannot be replayed because its
+base file is missing or unreadable still holds the edits: set_aside() moves
+it out of the way of the next start() instead of deleting it.
+
+    {"op": "start", "v": 1, "file": "/path/profile.json", "size": 1234, "mtime": 1700000000.0}
+    {"op": "set", "a": ["personal", 0, "preferredName", "Sam", "👤 Personal"]}
+    {"op": "state", "v": {"current_section_key_index": 1}}
+"""
+
+import os
+import time
+from typing import Any, Dict, Optional
+
+from . import jsonio
+from .overlay import ProfileOverlay
+from .saving import atomic_write_bytes
+
+JOURNAL_VERSION = 1
+
+
+def _file_signature(file_path: str) -> Optional[Dict[str, Any]]:
+    try: st = os.stat(file_path)
+    except OSError: return None
+    return {"size": st.st_size, "mtime": st.st_mtime}
+
+
+class JournalReplay:
+    """
+    Result of SessionJournal.replay(): the rebuilt overlay, the base file it
+    applies to (None for a never-saved protocol), the last recorded state,
+    the number of entries replayed and the byte length of the valid prefix.
+    base_changed is True when the base file was modified after the journal
+    started; the edits are still applied on top of its current contents.
+    invalid is True when the file is not a usable journal at all, so there
+    is nothing to recover; an unreadable journal or base file is not invalid.
+    """
+
+    def __init__(self):
+        self.base_file: Optional[str] = None
+        self.overlay: Optional[ProfileOverlay] = None
+        self.state: Optional[Dict[str, Any]] = None
+        self.entries = 0
+        self.valid_bytes = 0
+        self.base_changed = False
+        self.error_message: Optional[str] = None
+        self.invalid = False
+
+
+class SessionJournal:
+    """Append-only JSON Lines log of overlay edits and session state (see the module docstring)."""
+
+    def __init__(self, file_path: str, fsync: bool = False):
+        self.file_path = file_path
+        self.fsync = fsync  # True also survives power loss, at the cost of a disk flush per entry
+        self.entries = 0
+        self._file = None
+        self._last_state: Optional[Dict[str, Any]] = None
+
+    # --- Writing ---
+
+    def start(self, base_file: Optional[str], overlay: ProfileOverlay, state: Optional[Dict[str, Any]] = None) -> None:
+        """
+        (Re)writes the journal for `overlay`, whose base is `base_file` as it
+        is on disk now (or is embedded if base_file is None), keeping its
+        current delta, and attaches to it.
+        """
+        self.close()
+        header: Dict[str, Any] = {"op": "start", "v": JOURNAL_VERSION, "file": base_file}
+        if base_file is None: header["base"] = overlay.base
+        else: header.update(_file_signature(base_file) or {})
+        records = [header] + [{"op": op, "a": args} for op, args in overlay.delta_ops()]
+        if state is not None: records.append({"op": "state", "v": state})
+        os.makedirs(os.path.dirname(os.path.abspath(self.file_path)), exist_ok=True)
+        atomic_write_bytes(self.file_path, b"".join(jsonio.dumps_bytes(record, compact=True) + b"\n" for record in records))
+        self.entries = len(records) - 1
+        self._last_state = state
+        self._open()
+        self.attach(overlay)
+
+    def resume(self, replay: JournalReplay) -> None:
+        """Continues the journal that `replay` was read from, dropping any torn tail, and attaches to its overlay."""
+        self.close()
+        with open(self.file_path, "r+b") as f: f.truncate(replay.valid_bytes)
+        self.entries = replay.entries
+        self._last_state = replay.state
+        self._open()
+        if replay.overlay is not None: self.attach(replay.overlay)
+
+    def _open(self) -> None:
+        self._file = open(self.file_path, "ab")
+
+    def attach(self, overlay: ProfileOverlay) -> None:
+        overlay.observer = self._record_edit
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        if self._file is None: return
+        self._file.write(jsonio.dumps_bytes(record, compact=True) + b"\n")
+        self._file.flush()
+        if self.fsync: os.fsync(self._file.fileno())
+        self.entries += 1
+
+    def _record_edit(self, op: str, args: tuple) -> None:
+        self._append({"op": op, "a": args})
+
+    def record_state(self, state: Dict[str, Any]) -> None:
+        """Logs the caller's session state; a state equal to the last one logged is not written again."""
+        if state == self._last_state: return
+        self._last_state = dict(state)
+        self._append({"op": "state", "v": self._last_state})
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Closes and deletes the journal, e.g. after a clean exit."""
+        self.close()
+        self.entries = 0
+        self._last_state = None
+        try: os.remove(self.file_path)
+        except OSError: pass
+
+    def set_aside(self) -> Optional[str]:
+        """Closes the journal and renames it with a timestamp suffix. Returns the new path, or None if it could not be moved."""
+        self.close()
+        kept_path = f"{self.file_path}.{time.strftime('%Y%m%d-%H%M%S')}"
+        try: os.replace(self.file_path, kept_path)
+        except OSError: return None
+        return kept_path
+
+    # --- Replaying ---
+
+    @staticmethod
+    def replay(file_path: str) -> Optional[JournalReplay]:
+        """Rebuilds a session from the journal at `file_path`. Returns None if there is no journal."""
+        try:
+            with open(file_path, "rb") as f: data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            result = JournalReplay()
+            result.error_message = f"Could not read session journal: {e}"
+            return result
+        result = JournalReplay()
+        overlay = None
+        position = 0
+        while True:
+            end = data.find(b"\n", position)
+            if end < 0: break  # No newline: the last write was cut short
+            try: record = jsonio.loads(data[position:end])
+            except ValueError: break
+            if not isinstance(record, dict): break
+            op = record.get("op")
+            if overlay is None:
+                if op != "start" or record.get("v") != JOURNAL_VERSION:
+                    result.error_message = "Not a UCP-LLM session journal, or written by another version."
+                    result.invalid = op != "start"  # Another version's journal is kept for that version to replay
+                    return result
+                result.base_file = record.get("file")
+                if result.base_file is None:
+                    base = record.get("base")
+                else:
+                    try: base = jsonio.load_file(result.base_file)
+                    except (OSError, ValueError) as e:
+                        result.error_message = f"Could not load the journal's base file '{result.base_file}': {e}"
+                        return result
+                    signature = _file_signature(result.base_file)
+                    result.base_changed = signature is not None and (signature["size"] != record.get("size") or signature["mtime"] != record.get("mtime"))
+                if not isinstance(base, dict):
+                    result.error_message = "The journal's base document is missing or malformed."
+                    result.invalid = result.base_file is None  # A base file that is not a protocol may be fixed; an embedded one cannot
+                    return result
+                overlay = ProfileOverlay(base)
+            elif op == "state":
+                result.state = record.get("v")
+                result.entries += 1
+            else:
+                try: overlay.apply(op, tuple(record.get("a", ())))
+                except (TypeError, ValueError): break
+                result.entries += 1
+            position = end + 1
+        if overlay is None:
+            result.error_message = "The session journal is empty or its header is damaged."
+            result.invalid = True
+            return result
+        result.overlay = overlay
+        result.valid_bytes = position
+        return result
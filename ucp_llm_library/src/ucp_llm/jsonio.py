@@ -0,0 +1,126 @@
+# jsonio.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Pluggable JSON backend used for reading and writing UCP-LLM protocol files.
+
+orjson is preferred, then ujson, then the standard library json module. The
+selection can be forced with the UCP_LLM_JSON_BACKEND environment variable
+("orjson", "ujson" or "json") or at runtime with set_backend().
+Pretty output matches json.dump(..., ensure_ascii=False, indent=2), which is
+what the Profile Managers have always written; compact=True drops all
+whitespace for machine-to-machine use.
+"""
+
+import codecs
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+try:
+    import ujson  # type: ignore
+except ImportError:
+    ujson = None
+
+JSONDecodeError = json.JSONDecodeError
+# Every exception a backend may raise for malformed input (ujson raises plain ValueError).
+DECODE_ERRORS: Tuple[type, ...] = (json.JSONDecodeError, ValueError)
+
+_PREFERENCE = ("orjson", "ujson", "json")
+
+
+def _orjson_loads(data: Union[bytes, str]) -> Any:
+    return orjson.loads(data)
+
+
+def _orjson_dumps(obj: Any, compact: bool) -> bytes:
+    try:
+        return orjson.dumps(obj) if compact else orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    except TypeError:  # e.g. non-str dict keys or ints above 64 bits; stdlib handles those.
+        return _json_dumps(obj, compact)
+
+
+def _ujson_loads(data: Union[bytes, str]) -> Any:
+    return ujson.loads(data)
+
+
+def _ujson_dumps(obj: Any, compact: bool) -> bytes:
+    text = ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, indent=0 if compact else 2)
+    return text.encode("utf-8")
+
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, compact: bool) -> bytes:
+    if compact: text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    else: text = json.dumps(obj, ensure_ascii=False, indent=2)
+    return text.encode("utf-8")
+
+
+_BACKENDS: Dict[str, Tuple[Optional[Any], Callable[[Union[bytes, str]], Any], Callable[[Any, bool], bytes]]] = {
+    "orjson": (orjson, _orjson_loads, _orjson_dumps),
+    "ujson": (ujson, _ujson_loads, _ujson_dumps),
+    "json": (json, _json_loads, _json_dumps),
+}
+
+
+def available_backends() -> Tuple[str, ...]:
+    return tuple(name for name in _PREFERENCE if _BACKENDS[name][0] is not None)
+
+
+def set_backend(name: Optional[str] = None) -> str:
+    """Selects the backend by name, or the fastest installed one when name is None. Returns the active name."""
+    global BACKEND_NAME, _loads, _dumps
+    if name is None:
+        name = available_backends()[0]
+    if name not in _BACKENDS or _BACKENDS[name][0] is None:
+        raise ValueError(f"JSON backend '{name}' is not installed. Available: {', '.join(available_backends())}")
+    BACKEND_NAME = name
+    _, _loads, _dumps = _BACKENDS[name]
+    return name
+
+
+def get_backend() -> str:
+    return BACKEND_NAME
+
+
+BACKEND_NAME = ""
+_loads: Callable[[Union[bytes, str]], Any] = _json_loads
+_dumps: Callable[[Any, bool], bytes] = _json_dumps
+_requested = os.environ.get("UCP_LLM_JSON_BACKEND", "").strip().lower() or None
+set_backend(_requested if _requested in available_backends() else None)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if isinstance(data, (bytes, bytearray)) and data[:3] == codecs.BOM_UTF8:
+        data = data[3:]
+    return _loads(data)
+
+
+def dumps_bytes(obj: Any, compact: bool = False) -> bytes:
+    return _dumps(obj, compact)
+
+
+def dumps(obj: Any, compact: bool = False) -> str:
+    return _dumps(obj, compact).decode("utf-8")
+
+
+def load_file(file_path: str) -> Any:
+    with open(file_path, "rb") as f:
+        return loads(f.read())
+
+
+def dump_file(obj: Any, file_path: str, compact: bool = False) -> None:
+    data = _dumps(obj, compact)
+    with open(file_path, "wb") as f:
+        f.write(data)
@@ -0,0 +1,293 @@
+# lazy.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Lazy, memory-mapped access to large UCP-LLM protocol files.
+
+LazyUCPProfile maps the file instead of reading it and walks its JSON
+structure with a resumable byte-level scanner. Only the top-level header
+values (protocolVersion, generationDate, ...) and the sections a caller
+actually asks for are decoded; everything else stays on disk. The scanner
+stops as soon as it has found what was requested, and pages it has already
+walked past are released back to the OS where madvise() is available.
+"""
+
+import mmap
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import jsonio
+from .ucp_llm import UCPProfile
+
+# Strings (with escapes) and structural characters; scalars between them are skipped.
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]:,]')
+# Release walked-past pages every this many bytes while scanning (file-backed pages are re-read on demand).
+_RELEASE_EVERY = 8 * 1024 * 1024
+
+
+class _StructureScanner:
+    """
+    Incrementally records the byte spans of top-level values and of each element
+    of the top-level "sections" array, together with the element's "id".
+    """
+
+    def __init__(self, mm: mmap.mmap):
+        self._mm = mm
+        self._tokens: Iterator[Any] = _TOKEN.finditer(mm)
+        self.header_spans: Dict[str, Tuple[int, int]] = {}
+        self.section_spans: List[Tuple[Optional[str], int, int]] = []
+        self.sections_started = False
+        self.sections_closed = False
+        self.root_is_object: Optional[bool] = None
+        self.done = False
+        self.balanced = False
+        # Parser state
+        self._depth = 0
+        self._key: Optional[str] = None
+        self._value_start = -1
+        self._expect_key = False
+        self._in_sections = False
+        self._element_start = -1
+        self._element_key: Optional[str] = None
+        self._element_expect_key = False
+        self._element_id: Optional[str] = None
+        self._released_to = 0
+
+    def _release_pages(self, upto: int) -> None:
+        if not hasattr(mmap, "MADV_DONTNEED") or upto - self._released_to < _RELEASE_EVERY: return
+        start = self._released_to - self._released_to % mmap.PAGESIZE
+        end = upto - upto % mmap.PAGESIZE
+        if end > start:
+            try: self._mm.madvise(mmap.MADV_DONTNEED, start, end - start)
+            except (OSError, ValueError): pass
+        self._released_to = end
+
+    def step(self) -> bool:
+        """Consumes one token. Returns False once the document has been fully scanned."""
+        if self.done: return False
+        match = next(self._tokens, None)
+        if match is None:
+            self.done = True
+            return False
+        start = match.start()
+        first = self._mm[start:start + 1]  # never copy whole (possibly huge) string tokens
+        depth = self._depth
+
+        if depth == 0:
+            if self.root_is_object is None: self.root_is_object = first == b"{"
+            if first in (b"{", b"["): self._depth = 1; self._expect_key = first == b"{"
+            return True
+
+        if first in (b"{", b"["):
+            if depth == 1 and self._key == "sections" and first == b"[": self._in_sections = True; self.sections_started = True
+            elif depth == 2 and self._in_sections and first == b"{":
+                self._element_start = start; self._element_expect_key = True
+                self._element_key = None; self._element_id = None
+            self._depth = depth + 1
+            return True
+
+        if first in (b"}", b"]"):
+            self._depth = depth - 1
+            if depth == 3 and self._element_start >= 0 and first == b"}":
+                self.section_spans.append((self._element_id, self._element_start, match.end()))
+                self._element_start = -1
+                self._release_pages(match.end())
+            elif depth == 2 and self._in_sections and first == b"]":
+                self._in_sections = False; self.sections_closed = True
+            elif depth == 1:
+                self._close_top_level_value(start)
+                self.done = True; self.balanced = True
+            return True
+
+        if depth == 1:
+            if first == b'"' and self._expect_key:
+                self._key = jsonio.loads(match.group()); self._expect_key = False
+            elif first == b":": self._value_start = match.end()
+            elif first == b",": self._close_top_level_value(start); self._expect_key = True
+        elif depth == 3 and self._element_start >= 0:
+            if first == b'"':
+                if self._element_expect_key:
+                    self._element_key = jsonio.loads(match.group()); self._element_expect_key = False
+                elif self._element_key == "id" and self._element_id is None:
+                    value = jsonio.loads(match.group())
+                    self._element_id = value if isinstance(value, str) else None
+            elif first == b",": self._element_expect_key = True
+        return True
+
+    def _close_top_level_value(self, end: int) -> None:
+        if self._key is not None and self._value_start >= 0 and self._key not in self.header_spans:
+            self.header_spans[self._key] = (self._value_start, end)
+        self._key = None; self._value_start = -1
+
+    def scan_until(self, condition) -> bool:
+        while not condition():
+            if not self.step(): return condition()
+        return True
+
+    def scan_all(self) -> None:
+        while self.step(): pass
+
+    def release(self) -> None:
+        # The regex iterator holds a buffer export on the mmap, which would block mmap.close().
+        self._tokens = iter(()); self.done = True
+
+
+class LazyUCPProfile(UCPProfile):
+    """
+    Memory-mapped, on-demand variant of UCPProfile with the same getter API.
+    Header keys are decoded when the file is opened; a section is decoded the
+    first time any getter touches it and is then cached. get_raw_data() and
+    get_sections() need the whole document and therefore decode everything.
+    Content that is never reached is never validated, so a truncated tail only
+    shows up as missing sections; get_raw_data() then holds the header values
+    and the complete sections found before the cut. Call close() (or use it as a context manager)
+    to release the mapping; sections decoded before closing stay available.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.raw_data: Optional[Dict[str, Any]] = None
+        self.error_message: Optional[str] = None
+        self._section_index: Dict[str, Dict[str, Any]] = {}
+        self._items_index: Dict[str, Tuple[Dict[str, Any], ...]] = {}
+        self._header: Dict[str, Any] = {}
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        self._scanner: Optional[_StructureScanner] = None
+        self._missing_ids: set = set()
+        self._opened = False
+        try:
+            self._file = open(file_path, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._scanner = _StructureScanner(self._mm)
+            scanner = self._scanner
+            scanner.scan_until(lambda: scanner.sections_started and "protocolVersion" in scanner.header_spans)
+            if not scanner.root_is_object or not scanner.sections_started or "protocolVersion" not in scanner.header_spans:
+                self.error_message = "Invalid UCP-LLM JSON structure: Core keys like 'protocolVersion' or 'sections' list are missing or malformed."
+            else:
+                self._decode_header("protocolVersion")
+                self._opened = True
+        except FileNotFoundError:
+            self.error_message = f"Error: File not found at {file_path}"
+        except jsonio.DECODE_ERRORS as e:
+            self.error_message = f"Error: Could not decode JSON. Details: {e}"
+        except Exception as e:
+            self.error_message = f"An unexpected error occurred: {e}"
+        if self.error_message: self.close()
+
+    def close(self) -> None:
+        if self._scanner is not None: self._scanner.release(); self._scanner = None
+        if self._mm is not None: self._mm.close(); self._mm = None
+        if self._file is not None: self._file.close(); self._file = None
+
+    def __enter__(self) -> "LazyUCPProfile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def is_valid(self) -> bool:
+        return self.error_message is None and self._opened
+
+    def reindex(self) -> None:
+        # Sections are indexed as they are decoded; nothing to rebuild eagerly.
+        pass
+
+    def _slice(self, start: int, end: int) -> bytes:
+        return self._mm[start:end] if self._mm is not None else b""
+
+    def _decode_header(self, key: str) -> Any:
+        if key in self._header: return self._header[key]
+        scanner = self._scanner
+        if scanner is None: return None
+        scanner.scan_until(lambda: key in scanner.header_spans)
+        span = scanner.header_spans.get(key)
+        value = jsonio.loads(self._slice(*span)) if span else None
+        self._header[key] = value
+        return value
+
+    def _decode_section_at(self, position: int) -> Optional[Dict[str, Any]]:
+        section_id, start, end = self._scanner.section_spans[position]
+        if section_id is None or section_id in self._section_index: return self._section_index.get(section_id) if section_id else None
+        try:
+            section = jsonio.loads(self._slice(start, end))
+        except jsonio.DECODE_ERRORS:
+            return None
+        if not isinstance(section, dict): return None
+        self._section_index[section_id] = section
+        items_data = section.get("items", [])
+        self._items_index[section_id] = tuple(item for item in items_data if isinstance(item, dict)) if isinstance(items_data, list) else ()
+        return section
+
+    def _ensure_section(self, section_id: str) -> Optional[Dict[str, Any]]:
+        if section_id in self._section_index: return self._section_index[section_id]
+        scanner = self._scanner
+        if scanner is None or self.raw_data is not None or section_id in self._missing_ids or not self.is_valid(): return None
+        checked = 0
+        while True:
+            spans = scanner.section_spans
+            for position in range(checked, len(spans)):
+                if spans[position][0] == section_id:
+                    return self._decode_section_at(position)
+            checked = len(spans)
+            if scanner.sections_closed or not scanner.scan_until(lambda: len(scanner.section_spans) > checked or scanner.sections_closed):
+                if len(scanner.section_spans) == checked: break
+        self._missing_ids.add(section_id)
+        return None
+
+    # --- UCPProfile API, resolved lazily ---
+
+    def get_raw_data(self) -> Optional[Dict[str, Any]]:
+        if not self.is_valid(): return None
+        if self.raw_data is None and self._mm is not None:
+            try: self.raw_data = jsonio.loads(self._slice(0, len(self._mm)))
+            except jsonio.DECODE_ERRORS: self.raw_data = self._assemble_scanned()  # Truncated or damaged after the header
+            UCPProfile.reindex(self)
+        return self.raw_data
+
+    def _assemble_scanned(self) -> Dict[str, Any]:
+        # The document as far as the scanner could follow it; values that do not decode are left out
+        scanner = self._scanner
+        if scanner is None: return {"sections": []}
+        scanner.scan_all()
+        sections = []
+        for _, start, end in scanner.section_spans:
+            try: sections.append(jsonio.loads(self._slice(start, end)))
+            except jsonio.DECODE_ERRORS: pass
+        data: Dict[str, Any] = {}
+        for key in scanner.header_spans:
+            if key == "sections": data[key] = sections; continue
+            try: data[key] = self._decode_header(key)
+            except jsonio.DECODE_ERRORS: pass
+        data.setdefault("sections", sections)
+        return data
+
+    def get_generator_tool_version(self) -> Optional[str]:
+        return self._decode_header("protocolVersion") if self.is_valid() else None
+
+    def get_generation_date(self) -> Optional[str]:
+        return self._decode_header("generationDate") if self.is_valid() else None
+
+    def get_sections(self) -> List[Dict[str, Any]]:
+        raw_data = self.get_raw_data()
+        sections_data = raw_data.get("sections", []) if raw_data else []
+        return sections_data if isinstance(sections_data, list) else []
+
+    def get_section_ids(self) -> List[str]:
+        if not self.is_valid(): return []
+        if self.raw_data is not None or self._scanner is None: return list(self._section_index)
+        self._scanner.scan_all()
+        seen: Dict[str, None] = {}
+        for section_id, _, _ in self._scanner.section_spans:
+            if section_id is not None: seen.setdefault(section_id, None)
+        return list(seen)
+
+    def get_section_by_id(self, section_id: str) -> Optional[Dict[str, Any]]:
+        return self._ensure_section(section_id)
+
+    def _section_items(self, section_id: str) -> Tuple[Dict[str, Any], ...]:
+        self._ensure_section(section_id)
+        return self._items_index.get(section_id, ())
@@ -0,0 +1,251 @@
+# llm.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Helpers for sending a rendered protocol to an OpenAI-style chat completion
+client (groq.Groq and compatible SDKs).
+
+iter_completion_text() yields the answer as text pieces: with stream=True
+they arrive as the model produces them, so a caller can show the first words
+long before the full answer is done; with stream=False the whole answer is
+yielded once.
+
+Providers put one long-lived client behind a small interface (stream_text()
+and close()), so its HTTP connection pool and TLS sessions are reused across
+requests and shared by worker threads. GroqProvider wraps the groq SDK;
+HTTPChatProvider talks to any OpenAI-compatible endpoint with the standard
+library alone and keeps a pool of keep-alive connections. ClientManager
+hands out one provider per (kind, key, endpoint) for the life of an app.
+"""
+
+import http.client
+import json
+import queue
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+def iter_completion_text(client: Any, messages: List[Dict[str, str]], model: str, stream: bool = True,
+                         **create_kwargs: Any) -> Iterator[str]:
+    """Calls client.chat.completions.create() and yields the non-empty text pieces of the answer."""
+    response = client.chat.completions.create(messages=messages, model=model, stream=stream, **create_kwargs)
+    if not stream:
+        content = response.choices[0].message.content
+        if content: yield content
+        return
+    for chunk in response:
+        if not chunk.choices: continue
+        content = getattr(chunk.choices[0].delta, "content", None)
+        if content: yield content
+
+
+class LLMProviderError(Exception):
+    """Non-success HTTP status from an LLM endpoint."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"{status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+
+class LLMProvider:
+    """Interface of a chat completion backend. Implementations must be safe to share between threads."""
+
+    name = "provider"
+
+    def stream_text(self, messages: List[Dict[str, str]], model: str, stream: bool = True, **create_kwargs: Any) -> Iterator[str]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "LLMProvider":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class ClientProvider(LLMProvider):
+    """Provider around one OpenAI-style SDK client, created on first use and then reused."""
+
+    name = "client"
+
+    def __init__(self, client_factory: Callable[[], Any]):
+        self._client_factory = client_factory
+        self._client: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None: self._client = self._client_factory()
+        return self._client
+
+    def stream_text(self, messages: List[Dict[str, str]], model: str, stream: bool = True, **create_kwargs: Any) -> Iterator[str]:
+        return iter_completion_text(self.client, messages, model, stream=stream, **create_kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None and hasattr(client, "close"): client.close()
+
+
+class GroqProvider(ClientProvider):
+    """One groq.Groq client (and so one httpx connection pool) for every request made through it."""
+
+    name = "groq"
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, client_factory: Optional[Callable[..., Any]] = None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self._groq_factory = client_factory
+        super().__init__(self._make_client)
+
+    def _make_client(self) -> Any:
+        factory = self._groq_factory
+        if factory is None:
+            try:
+                from groq import Groq  # type: ignore
+            except ImportError:
+                raise ImportError("GroqProvider needs the 'groq' package. Install it with: pip install groq") from None
+            factory = Groq
+        kwargs: Dict[str, Any] = {"api_key": self.api_key}
+        if self.base_url: kwargs["base_url"] = self.base_url
+        return factory(**kwargs)
+
+
+class HTTPChatProvider(LLMProvider):
+    """
+    Dependency-free client for OpenAI-compatible /chat/completions endpoints
+    (e.g. https://api.groq.com/openai/v1). Idle keep-alive connections are kept
+    in a pool of up to `max_connections` and reused by whichever thread asks
+    next. `connections_opened` counts the TCP/TLS connections created so far.
+    """
+
+    name = "http"
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, timeout: float = 120.0, max_connections: int = 4):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported base_url '{base_url}'. Expected http(s)://host[:port]/path")
+        self.base_url = base_url
+        self.api_key = api_key
+        self.timeout = timeout
+        self._https = parts.scheme == "https"
+        self._host = parts.hostname
+        self._port = parts.port
+        self._path = parts.path.rstrip("/") + "/chat/completions"
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=max(1, max_connections))
+        self._lock = threading.Lock()
+        self._closed = False
+        self.connections_opened = 0
+
+    def _connect(self) -> http.client.HTTPConnection:
+        with self._lock: self.connections_opened += 1
+        connection_class = http.client.HTTPSConnection if self._https else http.client.HTTPConnection
+        return connection_class(self._host, self._port, timeout=self.timeout)
+
+    def _release(self, connection: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable and not self._closed:
+            try:
+                self._idle.put_nowait(connection)
+                return
+            except queue.Full:
+                pass
+        connection.close()
+
+    def _request(self, body: bytes) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        headers = {"Content-Type": "application/json", "Accept": "application/json, text/event-stream"}
+        if self.api_key: headers["Authorization"] = f"Bearer {self.api_key}"
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = None
+        if connection is not None:
+            try:
+                connection.request("POST", self._path, body=body, headers=headers)
+                return connection, connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()  # the server dropped the idle keep-alive connection; use a fresh one
+        connection = self._connect()
+        try:
+            connection.request("POST", self._path, body=body, headers=headers)
+            return connection, connection.getresponse()
+        except Exception:
+            connection.close()
+            raise
+
+    def stream_text(self, messages: List[Dict[str, str]], model: str, stream: bool = True, **create_kwargs: Any) -> Iterator[str]:
+        body = json.dumps(dict(create_kwargs, messages=messages, model=model, stream=stream), ensure_ascii=False).encode("utf-8")
+        connection, response = self._request(body)
+        finished = False
+        try:
+            if response.status >= 400:
+                detail = response.read().decode("utf-8", "replace")
+                finished = True
+                raise LLMProviderError(response.status, detail)
+            if not stream:
+                payload = json.loads(response.read())
+                finished = True
+                content = payload["choices"][0]["message"].get("content")
+                if content: yield content
+                return
+            while True:
+                line = response.readline()
+                if not line:
+                    finished = True
+                    break
+                line = line.strip()
+                if not line.startswith(b"data:"): continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    response.read()
+                    finished = True
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                content = (choices[0].get("delta") or {}).get("content")
+                if content: yield content
+        finally:
+            self._release(connection, finished and not response.will_close)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try: self._idle.get_nowait().close()
+            except queue.Empty: break
+
+
+class ClientManager:
+    """
+    Keeps one provider per key for the life of an application, so every
+    analysis reuses the same client and its open connections. Thread-safe.
+    """
+
+    def __init__(self):
+        self._providers: Dict[Hashable, LLMProvider] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, factory: Callable[[], LLMProvider]) -> LLMProvider:
+        provider = self._providers.get(key)
+        if provider is None:
+            with self._lock:
+                provider = self._providers.get(key)
+                if provider is None: provider = self._providers[key] = factory()
+        return provider
+
+    def groq(self, api_key: str, base_url: Optional[str] = None, client_factory: Optional[Callable[..., Any]] = None) -> LLMProvider:
+        return self.get(("groq", api_key, base_url, client_factory), lambda: GroqProvider(api_key, base_url, client_factory))
+
+    def http(self, base_url: str, api_key: Optional[str] = None) -> LLMProvider:
+        return self.get(("http", api_key, base_url), lambda: HTTPChatProvider(base_url, api_key))
+
+    def close_all(self) -> None:
+        with self._lock:
+            providers, self._providers = list(self._providers.values()), {}
+        for provider in providers: provider.close()
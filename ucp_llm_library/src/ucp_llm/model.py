@@ -0,0 +1,181 @@
+# model.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Compact, __slots__-based data model for UCP-LLM protocols.
+
+One Item subclass is generated per section in SECTION_TYPE_DATA, with a slot
+for every jsonKey of that section, so an item costs a fixed-size object
+instead of a dict. Keys outside the definition (e.g. externalAnalysisSummary)
+are kept in a per-item overflow dict that is only allocated when needed.
+Values of select fields are interned, so the handful of option values is
+shared across all loaded profiles.
+
+Converting with to_dict() yields the usual JSON form; item keys come out in
+the section definition's field order followed by any overflow keys.
+"""
+
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from .sections import SECTION_TYPE_DATA
+from .ucp_llm import UCPProfile
+
+
+class Item:
+    """Base item: holds only keys that are not declared for its section."""
+
+    __slots__ = ("_extra",)
+    SECTION_ID: Optional[str] = None
+    FIELDS: Tuple[str, ...] = ()
+    INTERNED_FIELDS: frozenset = frozenset()
+
+    def __init__(self, **values: Any):
+        self._extra: Optional[Dict[str, Any]] = None
+        for key, value in values.items(): self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            try: return getattr(self, key)
+            except AttributeError: raise KeyError(key) from None
+        if self._extra is not None and key in self._extra: return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self.FIELDS:
+            if key in self.INTERNED_FIELDS and type(value) is str: value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None: self._extra = {}
+            self._extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        try: self[key]
+        except KeyError: return False
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try: return self[key]
+        except KeyError: return default
+
+    def keys(self) -> Iterator[str]:
+        for key in self.FIELDS:
+            if hasattr(self, key): yield key
+        if self._extra: yield from self._extra
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self.keys()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Item":
+        item = cls.__new__(cls)
+        item._extra = None
+        for key, value in data.items(): item[key] = value
+        return item
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Item): return self.SECTION_ID == other.SECTION_ID and self.to_dict() == other.to_dict()
+        if isinstance(other, dict): return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def _make_item_class(section_id: str, section_def: Dict[str, Any]) -> Type[Item]:
+    fields = tuple(f["jsonKey"] for f in section_def.get("fields", []) if f.get("jsonKey", "").isidentifier())
+    interned = frozenset(f["jsonKey"] for f in section_def.get("fields", []) if f.get("type") == "select" and f.get("jsonKey") in fields)
+    class_name = "".join(part.capitalize() for part in section_id.split("_")) + "Item"
+    return type(class_name, (Item,), {"__slots__": fields, "SECTION_ID": section_id, "FIELDS": fields, "INTERNED_FIELDS": interned})
+
+
+ITEM_CLASSES: Dict[str, Type[Item]] = {section_id: _make_item_class(section_id, section_def) for section_id, section_def in SECTION_TYPE_DATA.items()}
+
+
+def item_class_for(section_id: Optional[str]) -> Type[Item]:
+    return ITEM_CLASSES.get(section_id, Item) if section_id else Item
+
+
+class Section:
+    """A protocol section: id, title and a tuple of typed items."""
+
+    __slots__ = ("id", "title", "items", "_extra")
+
+    def __init__(self, id: Optional[str], title: Optional[str] = None, items: Tuple[Item, ...] = (), extra: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.title = title
+        self.items = tuple(items)
+        self._extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Section":
+        section_id = data.get("id")
+        item_cls = item_class_for(section_id if isinstance(section_id, str) else None)
+        items_data = data.get("items", [])
+        items = tuple(item_cls.from_dict(item) for item in items_data if isinstance(item, dict)) if isinstance(items_data, list) else ()
+        extra = {k: v for k, v in data.items() if k not in ("id", "title", "items")}
+        return cls(section_id, data.get("title"), items, extra)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"id": self.id}
+        if self.title is not None: data["title"] = self.title
+        data["items"] = [item.to_dict() for item in self.items]
+        if self._extra: data.update(self._extra)
+        return data
+
+    def __repr__(self) -> str:
+        return f"Section(id={self.id!r}, items={len(self.items)})"
+
+
+class CompactProfile:
+    """
+    Slot-based counterpart of a parsed protocol document. Sections are kept in
+    file order in a tuple; get_section() scans it, which for the 25 defined
+    sections is cheaper than carrying a per-profile dict.
+    """
+
+    __slots__ = ("protocol_version", "generation_date", "sections", "_extra")
+
+    def __init__(self, protocol_version: Any, generation_date: Any = None, sections: Tuple[Section, ...] = (), extra: Optional[Dict[str, Any]] = None):
+        self.protocol_version = protocol_version
+        self.generation_date = generation_date
+        self.sections = tuple(sections)
+        self._extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactProfile":
+        sections_data = data.get("sections", [])
+        sections = tuple(Section.from_dict(s) for s in sections_data if isinstance(s, dict)) if isinstance(sections_data, list) else ()
+        extra = {k: v for k, v in data.items() if k not in ("protocolVersion", "generationDate", "sections")}
+        return cls(data.get("protocolVersion"), data.get("generationDate"), sections, extra)
+
+    @classmethod
+    def from_profile(cls, profile: UCPProfile) -> Optional["CompactProfile"]:
+        raw_data = profile.get_raw_data()
+        return cls.from_dict(raw_data) if raw_data is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"protocolVersion": self.protocol_version}
+        if self.generation_date is not None: data["generationDate"] = self.generation_date
+        data["sections"] = [section.to_dict() for section in self.sections]
+        if self._extra: data.update(self._extra)
+        return data
+
+    def get_section(self, section_id: str) -> Optional[Section]:
+        for section in self.sections:
+            if section.id == section_id: return section
+        return None
+
+    def get_section_items(self, section_id: str) -> Tuple[Item, ...]:
+        section = self.get_section(section_id)
+        return section.items if section else ()
+
+    def get_value_from_first_item(self, section_id: str, json_key: str, default: Any = None) -> Any:
+        items = self.get_section_items(section_id)
+        return items[0].get(json_key, default) if items else default
+
+    def section_ids(self) -> List[str]:
+        return [section.id for section in self.sections if section.id is not None]
@@ -0,0 +1,248 @@
+# overlay.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Copy-on-write editing of a loaded protocol.
+
+A ProfileOverlay never modifies the document it was created from (its
+`base`). Edits are recorded as a delta: top-level key overrides and, per
+section, the field values set on each item plus any items or sections
+added. Setting a field back to its loaded value removes it from the delta,
+so is_dirty() tells whether the document really differs from the base.
+
+materialize() returns the edited document as plain dicts and lists,
+sharing every untouched section and item with the base, so its cost grows
+with the number of edited items, not with the size of the profile. An
+edited section is rebuilt once per edit and then returned as the same
+object until it changes again, which lets SectionRenderCache notice edits
+by identity. Treat materialized data as read-only; write through the overlay.
+`revision` is a string that changes whenever the materialized document may
+change and is never reused, across overlays and processes, so caches such
+as RenderedTextCache can key on it instead of hashing the document.
+
+An `observer` callable, if set, is told about every effective edit as
+(op, args), with the same ops that apply() accepts and delta_ops() yields;
+ucp_llm.journal uses this to log a session.
+"""
+
+import itertools
+import secrets
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+_MISSING = object()
+_REVISION_PREFIX = secrets.token_hex(8)  # Tells this process's revisions apart from another's
+_revision_numbers = itertools.count(1)
+
+
+class _SectionDelta:
+    __slots__ = ("title", "is_new", "item_count", "fields", "view")
+
+    def __init__(self, title: Optional[str], is_new: bool, item_count: int):
+        self.title = title
+        self.is_new = is_new
+        self.item_count = item_count
+        self.fields: Dict[int, Dict[str, Any]] = {}
+        self.view: Optional[Dict[str, Any]] = None  # Materialized section, until the next edit
+
+
+class ProfileOverlay:
+    """Delta of edits over an immutable protocol dict (see the module docstring)."""
+
+    def __init__(self, base: Optional[Dict[str, Any]] = None):
+        self._forced_dirty = False
+        self.observer: Optional[Callable[[str, tuple], None]] = None
+        self._reset(base if base is not None else {"sections": []})
+
+    def _reset(self, base: Dict[str, Any]) -> None:
+        self.base = base
+        self._meta: Dict[str, Any] = {}
+        self._deltas: Dict[str, _SectionDelta] = {}
+        self._new_section_ids: List[str] = []
+        self._changed()
+        self._base_sections: Dict[str, Dict[str, Any]] = {}
+        sections = base.get("sections", [])
+        for section in sections if isinstance(sections, list) else ():
+            section_id = section.get("id") if isinstance(section, dict) else None
+            if isinstance(section_id, str) and section_id not in self._base_sections: self._base_sections[section_id] = section  # First one wins
+
+    # --- Reading ---
+
+    def _base_items(self, section_id: str) -> list:
+        items = self._base_sections.get(section_id, {}).get("items")
+        return items if isinstance(items, list) else []
+
+    def _base_value(self, section_id: str, item_index: int, json_key: str) -> Any:
+        items = self._base_items(section_id)
+        item = items[item_index] if 0 <= item_index < len(items) else None
+        return item.get(json_key, _MISSING) if isinstance(item, dict) else _MISSING
+
+    def has_section(self, section_id: str) -> bool:
+        return section_id in self._base_sections or section_id in self._deltas
+
+    def item_count(self, section_id: str) -> int:
+        delta = self._deltas.get(section_id)
+        base_count = len(self._base_items(section_id))
+        return max(base_count, delta.item_count) if delta else base_count
+
+    def get_value(self, section_id: str, item_index: int, json_key: str, default: Any = None) -> Any:
+        delta = self._deltas.get(section_id)
+        if delta is not None:
+            fields = delta.fields.get(item_index)
+            if fields is not None and json_key in fields: return fields[json_key]
+        value = self._base_value(section_id, item_index, json_key)
+        return default if value is _MISSING else value
+
+    # --- Editing ---
+
+    def _delta_for(self, section_id: str, title: Optional[str]) -> _SectionDelta:
+        delta = self._deltas.get(section_id)
+        if delta is None:
+            is_new = section_id not in self._base_sections
+            delta = self._deltas[section_id] = _SectionDelta(title if is_new else None, is_new, 0)
+            if is_new:
+                self._new_section_ids.append(section_id)
+                self._changed()
+        return delta
+
+    def _changed(self) -> None:
+        self._materialized: Optional[Dict[str, Any]] = None
+        self._revision = next(_revision_numbers)
+
+    def _touch(self, delta: _SectionDelta) -> None:
+        delta.view = None
+        self._changed()
+
+    def ensure_items(self, section_id: str, count: int, title: Optional[str] = None) -> None:
+        """Makes the section exist (created with `title` if new) with at least `count` items."""
+        delta = self._delta_for(section_id, title)
+        if count > self.item_count(section_id):
+            delta.item_count = count
+            self._touch(delta)
+            if self.observer is not None: self.observer("items", (section_id, count, title))
+
+    def set_value(self, section_id: str, item_index: int, json_key: str, value: Any, title: Optional[str] = None) -> bool:
+        """Sets one field, creating the section and items up to item_index as needed. Returns True if the value changed."""
+        self.ensure_items(section_id, item_index + 1, title)
+        current = self.get_value(section_id, item_index, json_key, _MISSING)
+        if current is not _MISSING and current == value: return False
+        delta = self._deltas[section_id]
+        if self._base_value(section_id, item_index, json_key) == value:
+            fields = delta.fields.get(item_index)
+            if fields is not None:
+                fields.pop(json_key, None)
+                if not fields: del delta.fields[item_index]
+        else:
+            delta.fields.setdefault(item_index, {})[json_key] = value
+        self._touch(delta)
+        if self.observer is not None: self.observer("set", (section_id, item_index, json_key, value, title))
+        return True
+
+    def set_default(self, section_id: str, item_index: int, json_key: str, value: Any, title: Optional[str] = None) -> Any:
+        """Like dict.setdefault() for one field."""
+        current = self.get_value(section_id, item_index, json_key, _MISSING)
+        if current is not _MISSING: return current
+        self.set_value(section_id, item_index, json_key, value, title)
+        return value
+
+    def set_meta(self, key: str, value: Any) -> None:
+        """Overrides a top-level key such as protocolVersion or generationDate."""
+        if key == "sections": raise ValueError("Edit sections through set_value()/ensure_items().")
+        if key in self.base and self.base[key] == value: self._meta.pop(key, None)
+        else: self._meta[key] = value
+        self._changed()
+        if self.observer is not None: self.observer("meta", (key, value))
+
+    def mark_dirty(self) -> None:
+        """Forces is_dirty() to True until the next rebase(), e.g. for a new document or after a failed save."""
+        self._forced_dirty = True
+        if self.observer is not None: self.observer("dirty", ())
+
+    def apply(self, op: str, args: tuple) -> None:
+        """Re-applies one (op, args) edit as reported to the observer."""
+        if op == "set": self.set_value(*args)
+        elif op == "items": self.ensure_items(*args)
+        elif op == "meta": self.set_meta(*args)
+        elif op == "dirty": self.mark_dirty()
+        else: raise ValueError(f"Unknown overlay edit '{op}'.")
+
+    # --- Delta ---
+
+    def is_dirty(self) -> bool:
+        if self._forced_dirty or self._meta: return True
+        return any(delta.fields or delta.is_new or delta.item_count > len(self._base_items(section_id)) for section_id, delta in self._deltas.items())
+
+    def diff(self) -> Iterator[Tuple[Optional[str], Optional[int], str, Any, Any]]:
+        """
+        Yields (section_id, item_index, json_key, old_value, new_value) for every
+        changed field; top-level keys come first with section_id and item_index
+        None. Missing old values are reported as None. Added empty items and
+        sections show up in is_dirty() only.
+        """
+        for key, value in self._meta.items(): yield None, None, key, self.base.get(key), value
+        for section_id, delta in self._deltas.items():
+            for item_index in sorted(delta.fields):
+                for json_key, value in delta.fields[item_index].items():
+                    old = self._base_value(section_id, item_index, json_key)
+                    yield section_id, item_index, json_key, None if old is _MISSING else old, value
+
+    def delta_ops(self) -> Iterator[Tuple[str, tuple]]:
+        """(op, args) edits that rebuild the current delta when applied to a fresh overlay over the same base."""
+        if self._forced_dirty: yield "dirty", ()
+        for key, value in self._meta.items(): yield "meta", (key, value)
+        for section_id, delta in self._deltas.items():
+            if delta.is_new or delta.item_count: yield "items", (section_id, delta.item_count, delta.title)
+            for item_index, fields in delta.fields.items():
+                for json_key, value in fields.items(): yield "set", (section_id, item_index, json_key, value, delta.title)
+
+    def changed_section_ids(self) -> List[str]:
+        return [section_id for section_id, delta in self._deltas.items()
+                if delta.fields or delta.is_new or delta.item_count > len(self._base_items(section_id))]
+
+    # --- Materializing ---
+
+    @property
+    def revision(self) -> str:
+        return f"{_REVISION_PREFIX}-{self._revision}"
+
+    def _section_view(self, section_id: str, delta: _SectionDelta) -> Dict[str, Any]:
+        if delta.view is not None: return delta.view
+        base_section = self._base_sections.get(section_id)
+        base_items = self._base_items(section_id)
+        items = list(base_items)
+        items.extend({} for _ in range(delta.item_count - len(items)))
+        for item_index, fields in delta.fields.items():
+            item = items[item_index]
+            items[item_index] = {**item, **fields} if isinstance(item, dict) else dict(fields)
+        if base_section is None: view = {"id": section_id, "title": delta.title if delta.title is not None else section_id, "items": items}
+        else: view = {**base_section, "items": items}
+        delta.view = view
+        return view
+
+    def materialize(self) -> Dict[str, Any]:
+        """The edited document; unchanged sections and items are the base's own objects."""
+        if self._materialized is not None: return self._materialized
+        data = {**self.base, **self._meta}
+        if self._deltas:
+            sections = self.base.get("sections", [])
+            sections = list(sections) if isinstance(sections, list) else []
+            for index, section in enumerate(sections):
+                section_id = section.get("id") if isinstance(section, dict) else None
+                delta = self._deltas.get(section_id) if isinstance(section_id, str) else None
+                if delta is not None and self._base_sections.get(section_id) is section: sections[index] = self._section_view(section_id, delta)
+            sections.extend(self._section_view(section_id, self._deltas[section_id]) for section_id in self._new_section_ids)
+            data["sections"] = sections
+        self._materialized = data
+        return data
+
+    def rebase(self) -> Dict[str, Any]:
+        """Makes the current document the new base (e.g. once it was saved) and clears the delta. Returns it."""
+        data = self.materialize()
+        revision = self._revision
+        self._forced_dirty = False
+        self._reset(data)
+        self._materialized = data
+        self._revision = revision  # Same document, so the same revision
+        return data
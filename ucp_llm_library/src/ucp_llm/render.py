@@ -0,0 +1,499 @@
+# render.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Renders a UCP-LLM protocol into the text handed to an LLM (and shown in the
+Profile Managers' preview).
+
+ProtocolRenderer compiles the section definitions once: headings, labels,
+item prefixes and a value -> text map for every select field, plus the
+preamble/postamble split into literal and placeholder pieces. render() then
+indexes the document's sections in one pass and emits each defined section
+from the compiled form, so no definition or option list is scanned per call.
+
+SectionRenderCache keeps each section's rendered lines between calls; after
+an edit only the sections invalidated since the last render are rebuilt.
+arender() is the awaitable form of render() for asyncio code.
+
+RenderedTextCache keeps whole rendered texts keyed by the document's
+revision (e.g. ProfileOverlay.revision) or else a hash of its content, plus
+the renderer's template_version, so an unchanged profile is never rendered
+twice, across processes too with its optional, size-bounded disk tier. Only
+the export date in the preamble varies between calls; it is spliced into the
+cached text on every hit.
+"""
+
+import asyncio
+import datetime
+import hashlib
+import json
+import os
+import string
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from . import jsonio
+from .protocol_texts import FIXED_POSTAMBLE_TEXT_TEMPLATE, FIXED_PREAMBLE_TEXT
+from .saving import atomic_write_bytes
+from .sections import SECTION_TYPE_DATA
+from .ucp_llm import UCPProfile
+
+_MISSING = object()
+_SECTIONS_DIVIDER = "\n--- أقسام بيانات المستخدم التفصيلية ---\n"
+
+# Bump when render() output changes for the same definitions and texts, so
+# RenderedTextCache entries written by older code are not served.
+RENDER_FORMAT_VERSION = 1
+
+
+class _CompiledTemplate:
+    """A str.format template pre-split into (literal, field_name, format_spec, conversion) pieces."""
+
+    __slots__ = ("text", "pieces")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pieces: Tuple[Tuple[str, Optional[str], str, Optional[str]], ...] = tuple(string.Formatter().parse(text))
+
+    def format(self, **values: Any) -> str:
+        """Same result and KeyError behaviour as text.format(**values) for plain named fields."""
+        out: List[str] = []
+        for literal, field_name, format_spec, conversion in self.pieces:
+            out.append(literal)
+            if field_name is None: continue
+            value = values[field_name]
+            if conversion == "r": value = repr(value)
+            elif conversion == "s": value = str(value)
+            elif conversion == "a": value = ascii(value)
+            out.append(format(value, format_spec or ""))
+        return "".join(out)
+
+
+class _CompiledField:
+    __slots__ = ("json_key", "label", "options", "is_textarea")
+
+    def __init__(self, field_def: Dict[str, Any]):
+        self.json_key: str = field_def.get("jsonKey")
+        self.label: str = field_def.get("label", self.json_key)
+        self.is_textarea = field_def.get("type") == "textarea"
+        self.options: Optional[Dict[Any, str]] = None
+        if field_def.get("type") == "select" and field_def.get("options"):
+            self.options = {}
+            for opt in field_def["options"]:
+                try: self.options.setdefault(opt.get("value"), opt.get("text", _MISSING))
+                except TypeError: continue  # unhashable option value; can never match a JSON scalar anyway
+
+    def option_text(self, value: Any, value_str: str) -> str:
+        try: text = self.options.get(value, None)
+        except TypeError: return value_str
+        if text is None: return value_str
+        return value_str if text is _MISSING else text
+
+
+class _CompiledSection:
+    __slots__ = ("section_id", "heading", "is_multi_item", "fields")
+
+    def __init__(self, number: int, section_id: str, section_def: Dict[str, Any]):
+        self.section_id = section_id
+        self.heading = f"### {number}. القسم: {section_def.get('title', section_id)}"
+        max_items = section_def.get("maxItems")  # no limit declared means a repeatable section
+        self.is_multi_item = max_items is None or max_items > 1
+        self.fields = tuple(_CompiledField(f) for f in section_def.get("fields", []) if f.get("jsonKey"))
+
+
+class ProtocolRenderer:
+    """
+    Precompiled renderer for protocol text. Build one per set of section
+    definitions and reuse it; render() is safe to call from any thread.
+    """
+
+    def __init__(self, section_definitions: Optional[Dict[str, Dict[str, Any]]] = None,
+                 preamble: str = FIXED_PREAMBLE_TEXT, postamble: str = FIXED_POSTAMBLE_TEXT_TEMPLATE,
+                 generator_name: str = "UCP-LLM"):
+        definitions = SECTION_TYPE_DATA if section_definitions is None else section_definitions
+        self.generator_name = generator_name
+        self.sections: Tuple[_CompiledSection, ...] = tuple(
+            _CompiledSection(number, section_id, section_def) for number, (section_id, section_def) in enumerate(definitions.items(), start=1))
+        self.preamble = _CompiledTemplate(preamble)
+        self.postamble = _CompiledTemplate(postamble)
+        self._title_export = f"## بروتوكول سياق المستخدم (UCP-LLM) - بيانات جُمعت بواسطة {generator_name}"
+        self._footer_export = f"تم تصدير هذا النص بواسطة {generator_name}."
+        # Identifies everything besides the document that the output depends on.
+        template = json.dumps([RENDER_FORMAT_VERSION, definitions, preamble, postamble, generator_name],
+                              sort_keys=True, ensure_ascii=False, default=lambda obj: dict(obj) if hasattr(obj, "keys") else repr(obj))
+        self.template_version = hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+    # --- Helpers ---
+
+    @staticmethod
+    def format_data_date(generation_date: Any) -> str:
+        if not generation_date: return "N/A"
+        try:
+            if isinstance(generation_date, str) and generation_date.endswith("Z"): generation_date = generation_date[:-1] + "+00:00"
+            dt_obj = datetime.datetime.fromisoformat(generation_date) if isinstance(generation_date, str) else generation_date
+            return dt_obj.strftime("%Y-%m-%d %H:%M:%S UTC") if isinstance(dt_obj, datetime.datetime) else str(generation_date)
+        except ValueError:
+            return str(generation_date)
+
+    @staticmethod
+    def _first_item(section: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        items = section.get("items") if section else None
+        if items and isinstance(items, list) and isinstance(items[0], dict): return items[0]
+        return None
+
+    @staticmethod
+    def _summarize_names(sections: List[Dict[str, Any]], json_key: str, empty_text: str) -> str:
+        names = [item.get(json_key, "") for section in sections for item in section.get("items", [])
+                 if isinstance(item, dict) and isinstance(item.get(json_key, ""), str) and item.get(json_key, "").strip()]
+        if not names: return empty_text
+        return ", ".join(names[:2]) + ("..." if len(names) > 2 else "")
+
+    # --- Rendering ---
+
+    def render_section(self, compiled: _CompiledSection, section_data: Optional[Dict[str, Any]], for_preview: bool) -> List[str]:
+        """Lines for one defined section (without the trailing join); empty when the section is omitted."""
+        if not section_data or not section_data.get("items") and not for_preview: return []
+        lines = [compiled.heading]
+        items = section_data.get("items", [])
+        if not items and for_preview: lines.append("    (لا توجد عناصر محددة لهذا القسم في JSON أو أنها فارغة)")
+        numbered = len(items) > 1 and compiled.is_multi_item
+        prefix = "      - " if numbered else "    - "
+        for item_index, item in enumerate(items):
+            if not isinstance(item, dict) or not item:
+                if for_preview: lines.append(f"    (العنصر {item_index+1} فارغ أو غير صالح)")
+                continue
+            if numbered: lines.append(f"  #### العنصر ({item_index + 1}):")
+            item_lines: List[str] = []
+            for field in compiled.fields:
+                if field.json_key not in item: continue
+                value = item[field.json_key]
+                if value is not None:
+                    value_str = str(value)
+                    if value_str.strip():
+                        if field.options is not None: value_str = field.option_text(value, value_str)
+                        if field.is_textarea or "\n" in value_str:
+                            item_lines.append(f"{prefix}**{field.label}:**")
+                            item_lines.extend(f"{prefix}  {line.strip()}" for line in value_str.splitlines())
+                        else:
+                            item_lines.append(f"{prefix}**{field.label}:** {value_str}")
+                        continue
+                if for_preview: item_lines.append(f"    - **{field.label}:** (فارغ)")
+            if item_lines: lines.extend(item_lines)
+            elif for_preview: lines.append("    (جميع الحقول في هذا العنصر فارغة)")
+        if for_preview or any(isinstance(item, dict) and item for item in items): lines.append("")
+        return lines
+
+    def render(self, data: Union[Dict[str, Any], UCPProfile, None], for_preview: bool = True,
+               preferred_name: str = "", now: Optional[datetime.datetime] = None,
+               cache: Optional["SectionRenderCache"] = None, current_date: Optional[str] = None) -> str:
+        """
+        Renders the protocol text. `preferred_name` is used when the personal
+        section has no preferredName; `now` defaults to the current local time.
+        With a `cache`, section bodies are reused until invalidated.
+        `current_date` replaces the formatted `now` in the preamble verbatim.
+        """
+        if isinstance(data, UCPProfile): data = data.get_raw_data()
+        if not data: return "لم يتم تحميل أي بيانات لإنشاء النص."
+        section_index = self.index_sections(data)
+        lines: List[str] = []
+        preferred_name = self.resolve_preferred_name(section_index, preferred_name)
+        if not for_preview:
+            lines.append(self.preamble_text(data, preferred_name, now, current_date))
+            lines.append("\n---\n")
+        lines.extend(self.header_lines(data, for_preview))
+        for compiled in self.sections:
+            section_data = section_index.get(compiled.section_id)
+            lines.extend(cache.section_lines(compiled, section_data, for_preview) if cache is not None else self.render_section(compiled, section_data, for_preview))
+        lines.extend(self.external_analysis_lines(section_index))
+        if not for_preview:
+            lines.append("\n---\n"); lines.append(self.postamble_text(data, section_index, preferred_name))
+        lines.extend(self.footer_lines(for_preview))
+        return "\n".join(lines)
+
+    async def arender(self, data: Union[Dict[str, Any], UCPProfile, None], for_preview: bool = True,
+                      preferred_name: str = "", now: Optional[datetime.datetime] = None,
+                      executor: Optional[Executor] = None) -> str:
+        """
+        Awaitable render() on `executor` (the event loop's default thread pool
+        if None), for event-loop services rendering large protocols. There is
+        no `cache` argument: a SectionRenderCache is not safe to share between threads.
+        """
+        return await asyncio.get_running_loop().run_in_executor(executor, lambda: self.render(data, for_preview, preferred_name, now))
+
+    # --- Parts of render(), shared with ucp_llm.context ---
+
+    @staticmethod
+    def index_sections(data: Dict[str, Any]) -> Dict[Any, Dict[str, Any]]:
+        """Section id -> first section with that id."""
+        section_index: Dict[Any, Dict[str, Any]] = {}
+        for section in data.get("sections", []):
+            section_id = section.get("id") if isinstance(section, dict) else None
+            if section_id not in section_index: section_index[section_id] = section
+        return section_index
+
+    def resolve_preferred_name(self, section_index: Dict[Any, Dict[str, Any]], preferred_name: str) -> str:
+        personal_item = self._first_item(section_index.get("personal"))
+        return personal_item.get("preferredName", preferred_name) if personal_item is not None else preferred_name
+
+    @staticmethod
+    def current_date_text(now: Optional[datetime.datetime] = None) -> str:
+        return (now or datetime.datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+
+    def preamble_values(self, data: Dict[str, Any], preferred_name: str, now: Optional[datetime.datetime] = None,
+                        current_date: Optional[str] = None) -> Dict[str, str]:
+        return {"current_date": self.current_date_text(now) if current_date is None else current_date,
+                "json_data_date": self.format_data_date(data.get("generationDate")), "preferred_name": preferred_name}
+
+    def preamble_text(self, data: Dict[str, Any], preferred_name: str, now: Optional[datetime.datetime] = None,
+                      current_date: Optional[str] = None) -> str:
+        try: return self.preamble.format(**self.preamble_values(data, preferred_name, now, current_date))
+        except KeyError as e: print(f"Warning: Preamble format error - missing key {e}. Using raw preamble."); return self.preamble.text
+
+    def header_lines(self, data: Dict[str, Any], for_preview: bool) -> List[str]:
+        return ["📜 بروتوكول سياق المستخدم (معاينة)" if for_preview else self._title_export,
+                f"**إصدار البيانات (من JSON):** {data.get('protocolVersion', 'N/A')}", f"**تاريخ البيانات (من JSON):** {self.format_data_date(data.get('generationDate'))}",
+                _SECTIONS_DIVIDER]
+
+    def external_analysis_lines(self, section_index: Dict[Any, Dict[str, Any]]) -> List[str]:
+        notes_item = self._first_item(section_index.get("additional_notes"))
+        if notes_item is not None:
+            external_analysis_summary = notes_item.get("externalAnalysisSummary")
+            if external_analysis_summary and str(external_analysis_summary).strip(): return ["\n--- 📜 ملخص التحليل الخارجي ---", str(external_analysis_summary).strip(), "\n--- نهاية ملخص التحليل الخارجي ---\n"]
+        return []
+
+    def postamble_values(self, data: Dict[str, Any], section_index: Dict[Any, Dict[str, Any]], preferred_name: str) -> Dict[str, str]:
+        all_sections = [s for s in data.get("sections", []) if isinstance(s, dict)]
+        project_titles_str = self._summarize_names([s for s in all_sections if s.get("id") == "projects"], "projectOrObjectiveTitle", "(لا توجد مشاريع مدرجة)")
+        passion_names_str = self._summarize_names([s for s in all_sections if s.get("id") == "cognitive_passion"], "cognitivePassionName", "(لا توجد اهتمامات مدرجة)")
+        llm_role_str = "(غير محدد)"
+        role_item = self._first_item(section_index.get("role"))
+        if role_item is not None:
+            llm_role_val = role_item.get("llmPrimaryRole")
+            if llm_role_val and str(llm_role_val).strip(): llm_role_str = str(llm_role_val)
+        return {"preferred_name": preferred_name, "project_titles": project_titles_str, "passion_names": passion_names_str, "llm_role": llm_role_str}
+
+    def postamble_text(self, data: Dict[str, Any], section_index: Dict[Any, Dict[str, Any]], preferred_name: str) -> str:
+        try: return self.postamble.format(**self.postamble_values(data, section_index, preferred_name))
+        except KeyError as e: print(f"Warning: Postamble format error - missing key {e}. Using raw."); return self.postamble.text + f"\n[Formatter Warning: Missing key {e}]"
+
+    def footer_lines(self, for_preview: bool) -> List[str]:
+        return ["\n---\n"] if for_preview else ["\n---\n", self._footer_export]
+
+    # --- Prefix-stable parts (ucp_llm.context LAYOUT_PREFIX_STABLE) ---
+
+    @staticmethod
+    def _references(template: _CompiledTemplate) -> Dict[str, str]:
+        return {field_name: f"⟨{field_name}⟩" for _, field_name, _, _ in template.pieces if field_name is not None}
+
+    def stable_preamble_text(self) -> str:
+        """The preamble with every field written as ⟨name⟩; the same text for every document and call."""
+        return self.preamble.format(**self._references(self.preamble))
+
+    def stable_postamble_text(self) -> str:
+        """The postamble with every field written as ⟨name⟩, like stable_preamble_text()."""
+        return self.postamble.format(**self._references(self.postamble))
+
+    def stable_header_lines(self) -> List[str]:
+        """header_lines() without the document's version and date, which go into variable_lines()."""
+        return [self._title_export, _SECTIONS_DIVIDER]
+
+    def variable_lines(self, values: Dict[str, str]) -> List[str]:
+        """The values of the ⟨name⟩ references, e.g. from preamble_values(), as a closing block."""
+        return ["\n--- قيم الحقول المشار إليها بـ ⟨...⟩ ---"] + [f"⟨{name}⟩: {value}" for name, value in values.items()]
+
+
+class SectionRenderCache:
+    """
+    Per-section cache of rendered lines for one document being edited.
+
+    An entry is reused while it has not been invalidated and the document still
+    holds the very same section object, so loading another document or
+    replacing a section can never serve stale text. In-place edits are not
+    detected: call invalidate(section_id) after changing a section, or
+    invalidate() after changes that may touch several sections.
+    """
+
+    def __init__(self, renderer: ProtocolRenderer):
+        self.renderer = renderer
+        self._entries: Dict[Tuple[str, bool], Tuple[Dict[str, Any], List[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, section_id: Optional[str] = None) -> None:
+        if section_id is None:
+            self._entries.clear()
+            return
+        self._entries.pop((section_id, True), None)
+        self._entries.pop((section_id, False), None)
+
+    def section_lines(self, compiled: _CompiledSection, section_data: Optional[Dict[str, Any]], for_preview: bool) -> List[str]:
+        key = (compiled.section_id, for_preview)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is section_data:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        lines = self.renderer.render_section(compiled, section_data, for_preview)
+        if section_data is None: self._entries.pop(key, None)
+        else: self._entries[key] = (section_data, lines)
+        return lines
+
+    def render(self, data: Union[Dict[str, Any], UCPProfile, None], for_preview: bool = True,
+               preferred_name: str = "", now: Optional[datetime.datetime] = None) -> str:
+        return self.renderer.render(data, for_preview=for_preview, preferred_name=preferred_name, now=now, cache=self)
+
+
+class RenderedTextCache:
+    """
+    Cache of whole rendered protocol texts, keyed by the render arguments,
+    the renderer's template_version and the document: its `revision` when
+    the caller passes one, otherwise a SHA-256 of its JSON. A revision is
+    any string that changes whenever the content does and is never reused,
+    such as ProfileOverlay.revision; it makes a hit cost a dictionary
+    lookup instead of serializing and hashing the whole document. Texts are
+    stored with a marker where the preamble's {current_date} goes and
+    completed on each hit. Content changes simply produce a new key, so
+    there is nothing to invalidate; old entries age out of the in-memory LRU
+    of `max_entries`. Safe to share between threads.
+
+    With `disk_dir`, entries are also written there as <key>.txt (a line with
+    the piece count and byte size, then the UTF-8 text with the date markers)
+    and read back on memory misses, e.g. after a restart. Only keys that
+    can recur in another process are worth it there: content hashes, or
+    revisions that name a file version. Reading a large text back costs
+    about as much as rendering it, so the tier pays off mainly for small
+    texts and slower renderers. Entries older than `disk_max_age` seconds
+    are deleted, then the least recently used ones while the directory
+    holds more than `disk_max_bytes`; pruning runs when the cache is
+    created and whenever the stores since the last pass could have gone
+    over the limit.
+    """
+
+    _DATE_MARKER = "\x00current_date\x00"
+    _DISK_SUFFIX = ".txt"
+
+    def __init__(self, renderer: ProtocolRenderer, max_entries: int = 256, disk_dir: Optional[str] = None,
+                 disk_max_bytes: Optional[int] = 256 * 1024 * 1024, disk_max_age: Optional[float] = 30 * 24 * 3600):
+        self.renderer = renderer
+        self.max_entries = max(1, max_entries)
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes  # None: no size limit
+        self.disk_max_age = disk_max_age  # None: no age limit
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()  # key -> text pieces between date markers
+        self._date_fields = sum(1 for piece in renderer.preamble.pieces if piece[1] == "current_date")
+        self._lock = threading.Lock()
+        self._disk_bytes = 0  # Size of the disk tier at the last prune plus everything stored since
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+            self.prune_disk()
+
+    def key(self, data: Dict[str, Any], for_preview: bool, preferred_name: str, revision: Optional[str] = None) -> str:
+        digest = hashlib.sha256(f"{self.renderer.template_version}\x00{int(for_preview)}\x00{preferred_name}\x00".encode("utf-8"))
+        if revision is not None: digest.update(b"revision\x00" + revision.encode("utf-8"))
+        else: digest.update(jsonio.dumps_bytes(data, compact=True))  # Key order counts: a reordered document is a (harmless) miss
+        return digest.hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + self._DISK_SUFFIX)
+
+    def _lookup(self, key: str) -> Optional[Tuple[str, ...]]:
+        with self._lock:
+            pieces = self._entries.get(key)
+            if pieces is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return pieces
+        if self.disk_dir is None: return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                count, size = (int(field) for field in f.readline().split())
+                data = f.read()
+            if len(data) != size: return None  # Torn or foreign file
+            pieces = tuple(data.decode("utf-8").split(self._DATE_MARKER))
+            if len(pieces) != count: return None
+            os.utime(path)  # Recently used: pruned last
+        except (OSError, ValueError): return None
+        with self._lock: self.disk_hits += 1
+        self._store(key, pieces)
+        return pieces
+
+    def _store(self, key: str, pieces: Tuple[str, ...]) -> None:
+        with self._lock:
+            self._entries[key] = pieces
+            while len(self._entries) > self.max_entries: self._entries.popitem(last=False)
+
+    def _store_on_disk(self, key: str, pieces: Tuple[str, ...]) -> None:
+        data = self._DATE_MARKER.join(pieces).encode("utf-8")
+        try: atomic_write_bytes(self._disk_path(key), f"{len(pieces)} {len(data)}\n".encode("ascii") + data, durable=False)
+        except OSError: return  # The disk tier is best effort
+        with self._lock:
+            self._disk_bytes += len(data)
+            over = self.disk_max_bytes is not None and self._disk_bytes > self.disk_max_bytes
+        if over: self.prune_disk()
+
+    def prune_disk(self) -> int:
+        """Applies disk_max_age and disk_max_bytes to the disk tier. Returns the number of entries deleted."""
+        if self.disk_dir is None: return 0
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if not entry.name.endswith(self._DISK_SUFFIX): continue
+            try: st = entry.stat()
+            except OSError: continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()  # Least recently used first
+        total = sum(size for _, size, _ in entries)
+        oldest_kept = time.time() - self.disk_max_age if self.disk_max_age is not None else None
+        deleted = 0
+        for mtime, size, path in entries:
+            expired = oldest_kept is not None and mtime < oldest_kept
+            if not expired and (self.disk_max_bytes is None or total <= self.disk_max_bytes): break
+            try: os.remove(path)
+            except OSError: continue
+            total -= size
+            deleted += 1
+        with self._lock: self._disk_bytes = total
+        return deleted
+
+    def render(self, data: Union[Dict[str, Any], UCPProfile, None], for_preview: bool = True,
+               preferred_name: str = "", now: Optional[datetime.datetime] = None,
+               cache: Optional[SectionRenderCache] = None, revision: Optional[str] = None) -> str:
+        """Same text as renderer.render(); a miss is rendered through `cache` when given. See the class docstring for `revision`."""
+        if isinstance(data, UCPProfile): data = data.get_raw_data()
+        if not data: return self.renderer.render(data, for_preview)
+        key = self.key(data, for_preview, preferred_name, revision)
+        current_date = self.renderer.current_date_text(now)
+        pieces = self._lookup(key)
+        if pieces is not None: return current_date.join(pieces)
+        with self._lock: self.misses += 1
+        text = self.renderer.render(data, for_preview, preferred_name, cache=cache, current_date=self._DATE_MARKER)
+        pieces = tuple(text.split(self._DATE_MARKER))
+        if len(pieces) - 1 != (0 if for_preview else self._date_fields):  # The marker also occurs in the data; leave it uncached
+            return self.renderer.render(data, for_preview, preferred_name, now, cache)
+        self._store(key, pieces)
+        if self.disk_dir is not None: self._store_on_disk(key, pieces)
+        return current_date.join(pieces)
+
+    def clear(self, disk: bool = False) -> None:
+        """Empties the memory tier and, with disk=True, deletes the disk tier's entries."""
+        with self._lock: self._entries.clear()
+        if not disk or self.disk_dir is None: return
+        for name in os.listdir(self.disk_dir):
+            if name.endswith(self._DISK_SUFFIX):
+                try: os.remove(os.path.join(self.disk_dir, name))
+                except OSError: pass
+        with self._lock: self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "hit_ratio": (self.hits + self.disk_hits) / lookups if lookups else 0.0, "entries": len(self._entries)}
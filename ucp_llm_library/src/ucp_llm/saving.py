@@ -0,0 +1,184 @@
+# saving.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Crash-safe protocol saving off the GUI thread.
+
+atomic_write_bytes() writes to a temporary file in the target's directory,
+flushes and fsyncs it, renames it over the target with os.replace() and
+fsyncs the directory, so the target always holds either the old or the new
+complete file, even if the process or machine dies mid-write. With
+durable=False the fsyncs are skipped: the replace is still atomic if the
+process dies, but not if the machine does.
+
+AtomicSaver.save() takes a cheap snapshot of the data on the calling thread
+(containers are copied, strings are shared) and leaves serialization and the
+write to a background job. Saves to a path that arrive while a write to it
+is in flight are merged: only the latest snapshot is written next, and
+every merged save's callbacks fire once that write is durable. Callbacks are
+delivered through the JobRunner, i.e. on the GUI thread. Listeners added
+with add_listener() are told about every completed write, whoever saved it.
+"""
+
+import os
+import secrets
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from . import jsonio
+from .jobs import Job, JobRunner
+
+SavedCallback = Callable[["SaveResult"], None]
+ErrorCallback = Callable[[BaseException], None]
+
+
+def atomic_write_bytes(file_path: str, data: bytes, durable: bool = True) -> None:
+    """Replaces `file_path` with `data` atomically and, unless durable=False, durably."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = _create_temp_file(directory, os.path.basename(file_path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            if durable: os.fsync(f.fileno())
+        try: mode = os.stat(file_path).st_mode & 0o7777  # Keep the permissions of the file being replaced
+        except OSError: mode = None  # A new file keeps the mode it was created with
+        if mode is not None: os.chmod(temp_path, mode)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try: os.unlink(temp_path)
+        except OSError: pass
+        raise
+    if durable: _fsync_directory(directory)
+
+
+def _create_temp_file(directory: str, name: str) -> Tuple[int, str]:
+    # Created with mode 0o666 like open() creates files, so the OS applies the process umask
+    # (tempfile.mkstemp() uses 0o600, and reading the umask means briefly changing it for every thread)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for _ in range(100):
+        temp_path = os.path.join(directory, f".{name}.{secrets.token_hex(4)}.tmp")
+        try: return os.open(temp_path, flags, 0o666), temp_path
+        except FileExistsError: continue
+    raise FileExistsError(f"No free temporary file name for '{name}' in '{directory}'")
+
+
+def _fsync_directory(directory: str) -> None:
+    # Makes the rename itself durable. Not possible (nor needed) on Windows.
+    if not hasattr(os, "O_DIRECTORY"): return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try: os.fsync(fd)
+    except OSError: pass  # Some filesystems refuse fsync on directories
+    finally: os.close(fd)
+
+
+def snapshot_data(obj: Any) -> Any:
+    """Copy of the dict/list structure of `obj`; leaf values are shared, as they are immutable in a protocol."""
+    if isinstance(obj, dict): return {key: snapshot_data(value) for key, value in obj.items()}
+    if isinstance(obj, list): return [snapshot_data(value) for value in obj]
+    return obj
+
+
+class SaveResult:
+    """
+    A completed, durable write: the path, its size in bytes, how long it took,
+    how many saves it merged and the ticket of the newest save it contains.
+    """
+
+    __slots__ = ("file_path", "size", "seconds", "merged_saves", "ticket")
+
+    def __init__(self, file_path: str, size: int, seconds: float, merged_saves: int, ticket: int = 0):
+        self.file_path = file_path
+        self.size = size
+        self.seconds = seconds
+        self.merged_saves = merged_saves
+        self.ticket = ticket
+
+    def __repr__(self) -> str:
+        return f"SaveResult({self.file_path!r}, {self.size} bytes, {self.seconds * 1000:.1f} ms, merged={self.merged_saves})"
+
+
+class AtomicSaver:
+    """
+    Background, coalescing JSON saver. save() returns immediately; on_saved
+    receives a SaveResult once the file is on disk, on_error the exception.
+    flush() blocks until every pending write has finished (e.g. on exit).
+    """
+
+    def __init__(self, runner: JobRunner, compact: bool = False):
+        self.runner = runner
+        self.compact = compact
+        self.writes = 0
+        self.merged = 0
+        self._tickets = 0
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Tuple[Any, int, List[Tuple[Optional[SavedCallback], Optional[ErrorCallback]]]]] = {}
+        self._busy: Set[str] = set()
+        self._listeners: List[SavedCallback] = []
+
+    def add_listener(self, listener: SavedCallback) -> None:
+        """Calls `listener` with the SaveResult of every durable write, once per write (e.g. ProfileIndex.on_saved)."""
+        self._listeners.append(listener)
+
+    def save(self, data: Any, file_path: str, on_saved: Optional[SavedCallback] = None,
+             on_error: Optional[ErrorCallback] = None, snapshot: bool = True) -> int:
+        """
+        Queues a write of `data` and returns its ticket, a number that grows
+        with every save. Pass snapshot=False for data that is never modified
+        in place afterwards, such as ProfileOverlay.materialize().
+        """
+        if hasattr(data, "to_dict"): data = data.to_dict()
+        if snapshot: data = snapshot_data(data)
+        path = os.path.abspath(file_path)
+        with self._cond:
+            self._tickets += 1
+            ticket = self._tickets
+            previous = self._pending.get(path)
+            if previous is not None: self.merged += 1
+            callbacks = (previous[2] if previous is not None else []) + [(on_saved, on_error)]
+            self._pending[path] = (data, ticket, callbacks)
+            if path in self._busy: return ticket  # The running writer picks up the newest snapshot when it is done
+            self._busy.add(path)
+        self.runner.submit(self._write_pending, path, name="save", on_progress=self._deliver)
+        return ticket
+
+    def _write_pending(self, job: Job, path: str) -> None:
+        while True:
+            with self._cond:
+                entry = self._pending.pop(path, None)
+                if entry is None:
+                    self._busy.discard(path)
+                    self._cond.notify_all()
+                    return
+            snapshot, ticket, callbacks = entry
+            start = time.perf_counter()
+            try:
+                data = jsonio.dumps_bytes(snapshot, self.compact)
+                atomic_write_bytes(path, data)
+            except Exception as e:
+                job.report((callbacks, None, e))
+            else:
+                with self._cond: self.writes += 1
+                job.report((callbacks, SaveResult(path, len(data), time.perf_counter() - start, len(callbacks), ticket), None))
+
+    def _deliver(self, report: Tuple[list, Optional[SaveResult], Optional[BaseException]]) -> None:
+        callbacks, result, error = report
+        if error is None:
+            for listener in self._listeners: listener(result)
+        for on_saved, on_error in callbacks:
+            if error is None:
+                if on_saved is not None: on_saved(result)
+            elif on_error is not None: on_error(error)
+            else: self.runner.unhandled_error("save", error)
+
+    def pending(self) -> int:
+        """Number of paths with a write queued or in progress."""
+        with self._cond: return len(self._busy)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until all writes are done. Returns False if `timeout` expired first."""
+        with self._cond: return self._cond.wait_for(lambda: not self._busy, timeout)
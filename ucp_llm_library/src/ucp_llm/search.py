@@ -0,0 +1,227 @@
+# search.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+On-disk inverted index over the text of a profile corpus.
+
+ProfileIndex keeps, in one SQLite file, a posting (token, field, profile,
+item) for every word of every string field value, clustered by token (words
+are stored once and postings hold only integers), so a
+query reads only the postings of its words instead of loading and scanning
+every profile. Each profile row lists its token ids, which is how its old
+postings are found when it is re-indexed or removed. Fields are (section_id, jsonKey) pairs; a query can be limited
+to one field or one section.
+
+Words are Unicode \\w+ runs, lowercased; a query term ending in "*" matches
+by prefix, and all terms of a query must occur in the same item, in any of
+its fields; each hit names one field of that item that holds a query term.
+Section and key filters are resolved in SQL, so an index open for a long
+time also finds fields first indexed by another process. Files are
+re-indexed only when their size or mtime changed; pass
+ProfileIndex.on_saved to AtomicSaver.add_listener() to keep the index
+current as protocols are saved.
+
+    index = ProfileIndex("profiles.idx")
+    index.update_many(paths)
+    index.search_paths("philosoph*", section_id="cognitive_passion", json_key="cognitivePassionName")
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .ucp_llm import UCPProfile
+
+_WORD = re.compile(r"\w+")
+_UINT32 = "I" if array("I").itemsize == 4 else "L"  # Token id lists are stored in the index file's native byte order
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, size INTEGER, mtime REAL, token_ids BLOB);
+CREATE TABLE IF NOT EXISTS fields (id INTEGER PRIMARY KEY, section_id TEXT NOT NULL, json_key TEXT NOT NULL, UNIQUE (section_id, json_key));
+CREATE TABLE IF NOT EXISTS tokens (id INTEGER PRIMARY KEY, token TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS postings (
+    token_id INTEGER NOT NULL, field_id INTEGER NOT NULL, profile_id INTEGER NOT NULL, item INTEGER NOT NULL,
+    PRIMARY KEY (token_id, profile_id, field_id, item)) WITHOUT ROWID;
+"""
+
+
+def tokenize(text: str) -> Set[str]:
+    return set(_WORD.findall(text.lower()))
+
+
+class SearchHit(NamedTuple):
+    path: str
+    section_id: str
+    json_key: str
+    item_index: int
+
+
+class ProfileIndex:
+    """Inverted index of profile text in the SQLite file `db_path` (see the module docstring)."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()  # on_saved() may arrive on another thread than the one that opened the index
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._load_ids()
+
+    def _load_ids(self) -> None:
+        # Filled as fields and tokens are indexed; ids never change once assigned, and queries look both up in SQL
+        self._field_ids: Dict[Tuple[str, str], int] = {}
+        self._token_ids: Dict[str, int] = {}
+
+    def close(self) -> None:
+        with self._lock: self._db.close()
+
+    # --- Indexing ---
+
+    def _field_id(self, section_id: str, json_key: str) -> int:
+        key = (section_id, json_key)
+        field_id = self._field_ids.get(key)
+        if field_id is None:
+            row = self._db.execute("SELECT id FROM fields WHERE section_id = ? AND json_key = ?", key).fetchone()  # May have been added by another process
+            field_id = row[0] if row else self._db.execute("INSERT INTO fields (section_id, json_key) VALUES (?, ?)", key).lastrowid
+            self._field_ids[key] = field_id
+        return field_id
+
+    def _token_id(self, token: str) -> int:
+        token_id = self._token_ids.get(token)
+        if token_id is None:
+            row = self._db.execute("SELECT id FROM tokens WHERE token = ?", (token,)).fetchone()
+            token_id = row[0] if row else self._db.execute("INSERT INTO tokens (token) VALUES (?)", (token,)).lastrowid
+            self._token_ids[token] = token_id
+        return token_id
+
+    def _postings(self, profile: UCPProfile, profile_id: int) -> Iterable[Tuple[int, int, int, int]]:
+        for section_id in profile.get_section_ids():
+            for item_index, item in enumerate(profile.iter_section_items(section_id)):
+                for json_key, value in item.items():
+                    if not isinstance(value, str) or not value: continue
+                    field_id = self._field_id(section_id, json_key)
+                    for token in tokenize(value): yield self._token_id(token), field_id, profile_id, item_index
+
+    def _delete_postings(self, profile_id: int, token_ids: Optional[bytes]) -> None:
+        if token_ids: self._db.executemany("DELETE FROM postings WHERE token_id = ? AND profile_id = ?", ((token_id, profile_id) for token_id in array(_UINT32, token_ids)))
+
+    def _store(self, profile: UCPProfile, signature: Tuple[int, float]) -> None:
+        path = os.path.abspath(profile.file_path)
+        row = self._db.execute("SELECT id, token_ids FROM profiles WHERE path = ?", (path,)).fetchone()
+        if row is None: profile_id = self._db.execute("INSERT INTO profiles (path) VALUES (?)", (path,)).lastrowid
+        else:
+            profile_id = row[0]
+            self._delete_postings(profile_id, row[1])
+        postings = sorted(self._postings(profile, profile_id))  # Key order makes the inserts B-tree friendly
+        self._db.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)", postings)
+        token_ids = array(_UINT32, sorted({posting[0] for posting in postings}))
+        self._db.execute("UPDATE profiles SET size = ?, mtime = ?, token_ids = ? WHERE id = ?", (*signature, token_ids.tobytes(), profile_id))
+
+    def _stale(self, paths: Iterable[str], force: bool) -> Dict[str, Tuple[int, float]]:
+        stale = {}
+        for path in paths:
+            try: st = os.stat(path)
+            except OSError: continue
+            signature = (st.st_size, st.st_mtime)
+            row = None if force else self._db.execute("SELECT size, mtime FROM profiles WHERE path = ?", (path,)).fetchone()
+            if row is None or tuple(row) != signature: stale[path] = signature
+        return stale
+
+    def update_many(self, paths: Iterable[str], workers: Optional[int] = None, force: bool = False) -> Dict[str, Any]:
+        """
+        (Re)indexes the files among `paths` that are new or changed since they
+        were indexed (all of them with force=True), parsing in parallel worker
+        processes. Returns a summary dict: indexed, unchanged, failed, errors.
+        """
+        paths = [os.path.abspath(path) for path in paths]
+        with self._lock:
+            stale = self._stale(paths, force)
+            batch = UCPProfile.load_many(list(stale), workers=workers)
+            try:
+                with self._db:
+                    for profile in batch: self._store(profile, stale[profile.file_path])
+            except BaseException:
+                self._load_ids()  # Fields and tokens added in the rolled back transaction are gone again
+                raise
+        return {"indexed": batch.loaded, "unchanged": len(paths) - len(stale), "failed": batch.failed, "errors": batch.errors}
+
+    def update(self, path: str) -> bool:
+        """Re-indexes one file if it changed. Returns False if it could not be loaded."""
+        return not self.update_many([path], workers=1)["failed"]
+
+    def on_saved(self, result: Any) -> None:
+        """AtomicSaver listener: re-indexes the file a SaveResult reports as written."""
+        self.update(result.file_path)
+
+    def remove(self, path: str) -> None:
+        path = os.path.abspath(path)
+        with self._lock, self._db:
+            row = self._db.execute("SELECT id, token_ids FROM profiles WHERE path = ?", (path,)).fetchone()
+            if row is None: return
+            self._delete_postings(*row)
+            self._db.execute("DELETE FROM profiles WHERE id = ?", (row[0],))
+
+    def __len__(self) -> int:
+        with self._lock: return self._db.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    # --- Querying ---
+
+    def search(self, query: str, section_id: Optional[str] = None, json_key: Optional[str] = None, limit: Optional[int] = None) -> List[SearchHit]:
+        """
+        Items containing every term of `query` across their fields, optionally
+        within one section and/or jsonKey: one hit per field of a matching
+        item that holds at least one of the terms.
+        """
+        terms = [term.lower() for term in query.split()]
+        if not terms: return []
+        field_where, field_params = "", []
+        if section_id is not None:
+            field_where += " AND f.section_id = ?"
+            field_params.append(section_id)
+        if json_key is not None:
+            field_where += " AND f.json_key = ?"
+            field_params.append(json_key)
+        token_wheres, token_params = [], []
+        for term in terms:
+            words = _WORD.findall(term.rstrip("*"))
+            if len(words) != 1: return []  # Terms are single words, as they were indexed
+            if term.endswith("*"):
+                token_wheres.append("p.token_id IN (SELECT id FROM tokens WHERE token >= ? AND token < ?)")
+                token_params.append([words[0], words[0] + "\U0010ffff"])
+            else:
+                token_wheres.append("p.token_id = (SELECT id FROM tokens WHERE token = ?)")
+                token_params.append([words[0]])
+        if len(terms) == 1:  # Nothing to intersect: the term's postings are the hits
+            sql = ("SELECT DISTINCT pr.path, f.section_id, f.json_key, p.item FROM postings p JOIN fields f ON f.id = p.field_id "
+                   f"JOIN profiles pr ON pr.id = p.profile_id WHERE {token_wheres[0]}{field_where} ORDER BY pr.path, f.id, p.item")
+            return self._query(sql, token_params[0] + field_params, limit)
+        # An item is (profile, section, item index); its fields are intersected together
+        selects, params = [], []
+        for where, term_params in zip(token_wheres, token_params):
+            selects.append(f"SELECT p.profile_id, f.section_id, p.item FROM postings p JOIN fields f ON f.id = p.field_id WHERE {where}{field_where}")
+            params += term_params + field_params
+        sql = (f"WITH m AS ({' INTERSECT '.join(selects)}) "
+               "SELECT DISTINCT pr.path, f.section_id, f.json_key, p.item FROM m "
+               "JOIN postings p ON p.profile_id = m.profile_id AND p.item = m.item "
+               "JOIN fields f ON f.id = p.field_id AND f.section_id = m.section_id "
+               f"JOIN profiles pr ON pr.id = m.profile_id WHERE ({' OR '.join(token_wheres)}){field_where} "
+               "ORDER BY pr.path, f.id, p.item")
+        params += [param for term_params in token_params for param in term_params] + field_params
+        return self._query(sql, params, limit)
+
+    def _query(self, sql: str, params: List[Any], limit: Optional[int]) -> List[SearchHit]:
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = params + [limit]
+        with self._lock: return [SearchHit(*row) for row in self._db.execute(sql, params)]
+
+    def search_paths(self, query: str, section_id: Optional[str] = None, json_key: Optional[str] = None) -> List[str]:
+        """Sorted paths of profiles with at least one matching item."""
+        return sorted({hit.path for hit in self.search(query, section_id, json_key)})
+
@@ -0,0 +1,171 @@
+# sections.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Section and field definitions of the UCP-LLM protocol (the HTML generator's
+sectionTypeData). Each section lists its fields with their jsonKey, input
+type, display label and, for selects, the allowed option values.
+
+The definitions form one read-only registry, built once at import:
+SECTION_TYPE_DATA keeps the original nested layout (as read-only mappings
+and tuples), while SECTIONS and FIELDS hold SectionDef/FieldDef records for
+O(1) lookups by section id or by (section id, jsonKey), including English
+labels and option value/text maps. Both GUIs and the library read from here.
+"""
+
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+_SECTION_TYPE_DATA_SOURCE: Dict[str, Dict[str, Any]] = {
+    "personal": { "title": '👤 بيانات شخصية', "maxItems": 1, "fields": [ {"label": 'الاسم المفضل للتفاعل', "type": 'text', "name": 'preferredName', "jsonKey": 'preferredName'}, {"label": 'تاريخ الميلاد (اختياري)', "type": 'text', "name": 'dob', "jsonKey": 'dateOfBirth'}, {"label": 'الجنسية أو الخلفية الثقافية (اختياري)', "type": 'text', "name": 'nationality', "jsonKey": 'nationalityCulturalBackground'}, {"label": 'اللغات ومستويات الإتقان', "type": 'textarea', "name": 'languages', "jsonKey": 'languagesProficiency', "templates": ["العربية (لغة أم)، الإنجليزية (بطلاقة)", "الإنجليزية (احترافية)، الإسبانية (مبتدئ)", "مثال: الألمانية (محادثة)، الفرنسية (قراءة أساسية)"]}, ] },
+    "social": { "title": '🏠 الحالة الاجتماعية والأسرية', "maxItems": 1, "fields": [ {"label": 'التفاصيل', "type": 'textarea', "name": 'social_details', "jsonKey": 'socialFamilyDetails', "templates": ["أعزب، أعيش مستقلاً.", "متزوج ولدي طفلان، أركز على الأسرة.", "أعيش مع والديّ، أساهم في شؤون المنزل.", "في علاقة طويلة الأمد وملتزمة.", "مطلق، أشارك في تربية الأبناء."]} ] },
+    "educational_professional": { "title": '🎓 الخلفية التعليمية والمهنية', "maxItems": 1, "fields": [ {"label": 'الخلفية التعليمية', "type": 'textarea', "name": 'education_background', "jsonKey": 'educationalBackground', "templates": ["بكالوريوس في علوم الحاسب، جامعة القاهرة، 2000.", "ماجستير في الفلسفة، تخصص أخلاق، جامعة ستانفورد، 2010.", "دكتوراه في فيزياء الكم، تركز على نظرية الأوتار، معهد ماساتشوستس للتكنولوجيا، 2015.", "مبرمج علم نفسه ذاتيًا مع شهادات متعددة عبر الإنترنت."]}, {"label": 'الخبرات المهنية الرئيسية', "type": 'textarea', "name": 'professional_experience', "jsonKey": 'professionalExperience', "templates": ["مهندس برمجيات في شركة حلول تقنية (5 سنوات): قمت بقيادة تطوير ميزات المنتج الرئيسية.", "مصمم جرافيك مستقل (3 سنوات): تخصصت في العلامات التجارية وواجهة المستخدم/تجربة المستخدم للشركات الناشئة.", "مؤسس ورئيس تنفيذي لشركة إيديو بلاي المحدودة (سنتان): ركزت على تطوير الألعاب التعليمية.", "محلل مالي أول في بنك عالمي (7 سنوات): أدرت محافظ استثمارية وتقييم المخاطر."]} ] },
+    "thinking_reference": { "title": '🧠 مرجعية التفكير الأساسية', "maxItems": 1, "fields": [ {"label": 'وصف مرجعية التفكير الأساسية', "type": 'textarea', "name": 'thinking_reference_desc', "jsonKey": 'coreThinkingReferenceDescription', "templates": ["العقلانية الصارمة والمنطق", "الأفلاطونية الموسعة مع التركيز على 'الخورا'", "التجريبية وحل المشكلات العملي", "الظاهراتية الوجودية التي تركز على التجربة المعاشة", "توليفة من الأخلاق الرواقية والمنهجية العلمية"]}, {"label": 'التطبيق والأهمية', "type": 'textarea', "name": 'thinking_reference_application', "jsonKey": 'thinkingReferenceApplication', "templates": ["تُطبق على جميع عمليات اتخاذ القرار واكتساب المعرفة.", "توجه بشكل أساسي بحثي الفلسفي ونظرتي للعالم.", "ضرورية لعملي المهني ومساعيي الإبداعية.", "تشكل أساس إطاري الأخلاقي وقيمي الشخصية."]} ] },
+    "cognitive_passion": { "title": '💡 الشغف المعرفي وأنماط البحث', "fields": [ {"label": 'اسم الشغف المعرفي', "type": 'text', "name": 'passion_name', "jsonKey": 'cognitivePassionName', "templates": ["علم الأعداد", "تاريخ الفلسفة", "فيزياء الكم", "الحضارات القديمة", "أخلاقيات الذكاء الاصطناعي", "الرياضيات النظرية"]}, {"label": 'منهجية البحث', "type": 'textarea', "name": 'passion_methodology', "jsonKey": 'passionResearchMethodology', "templates": ["قراءة مكثفة، مراجع متقاطعة، وتوليف.", "تصميم تجريبي، جمع بيانات، وتحليل إحصائي.", "استقصاء فلسفي، تفكير نقدي، وحوار سقراطي.", "نمذجة رياضية ومحاكاة."]} ] },
+    "ethical_values": { "title": '⚖️ القيم الأخلاقية الموجهة', "fields": [ {"label": 'اسم القيمة الأخلاقية', "type": 'text', "name": 'value_name', "jsonKey": 'ethicalValueName', "templates": ["الصدق", "العدل", "النزاهة", "الرحمة", "الشجاعة", "الاحترام", "المسؤولية", "الإيثار", "التواضع", "الحكمة", "الولاء", "التعاون", "التسامح", "الامتنان", "الصبر", "الحقيقة", "الإنصاف"] }, {"label": 'الشرح والأولوية', "type": 'textarea', "name": 'value_description', "jsonKey": 'ethicalValueExplanation', "templates": ["هذه القيمة أساسية وتوجه جميع أفعالي.", "تتجلى في [سلوك مثال]، مهمة جداً بالنسبة لي.", "تحتل مرتبة بين أهم 3 قيم لدي، وتؤثر على [مجال معين].", "أولويتها عالية، خاصة في السياقات المهنية/الشخصية."]} ] },
+    "concepts_perspective": { "title": '👁️ المنظور تجاه مفاهيم جوهرية', "fields": [ {"label": 'اسم المفهوم الجوهري', "type": 'text', "name": 'core_concept_name', "jsonKey": 'coreConceptName', "templates": ["الجمال", "القبح", "الفوضى", "النظام", "الحقيقة", "الغموض", "الحرية", "الضرورة", "الوعي"]}, {"label": 'منظورك الخاص', "type": 'textarea', "name": 'core_concept_perspective', "jsonKey": 'coreConceptPerspective', "templates": ["أرى هذا المفهوم كـ [تعريف موجز]، متأثرًا بـ [فيلسوف/مدرسة فكرية].", "فهمي هو أنه يمثل [فكرة أساسية] ويتجلى في [أمثلة].", "أفسر هذا من خلال عدسة [مرجعيتي الفكرية]، ويعني [شرح]."]} ] },
+    "cognitive_tools_methodology": { "title": '🛠️ منهجية استخدام الأدوات المعرفية', "fields": [ {"label": 'اسم الأداة المعرفية', "type": 'text', "name": 'cognitive_tool_name', "jsonKey": 'cognitiveToolName', "templates": ["الشك", "الحدس", "المنطق (الاستنباطي/الاستقرائي)", "القياس", "التأمل", "رسم الخرائط الذهنية", "التحليل النقدي"]}, {"label": 'الرؤية، البناء، درجة الاعتماد', "type": 'textarea', "name": 'cognitive_tool_usage', "jsonKey": 'cognitiveToolMethodology', "templates": ["أراها ضرورية لـ [الغرض]، بناءة عندما [الشروط]. أعتمد عليها بشدة.", "تُستخدم بحذر، بناءة لتوليد الفرضيات، اعتماد متوسط.", "أساس تفكيري، دائمًا بناءة، اعتماد مطلق."]} ] },
+    "inspiring_figures": { "title": '🌟 نماذج/شخصيات إنسانية ملهمة', "fields": [ {"label": 'اسم الشخصية الملهمة', "type": 'text', "name": 'figure_name', "jsonKey": 'inspiringFigureName'}, {"label": 'القيمة المستمدة والتأثير', "type": 'textarea', "name": 'figure_value_impact', "jsonKey": 'derivedValueAndImpact', "templates": ["[صفتهم، مثل النزاهة، الشجاعة] أثرت بعمق في [جانب من حياتي/تفكيري].", "أستمد قيمة [مثل المثابرة، الصدق الفكري] من حياتهم/أعمالهم.", "يمثلون نموذجًا لـ [مثل السلوك الأخلاقي، السعي الإبداعي]."]} ] },
+    "intellectual_sins": { "title": '🧐 خطايا/تحيزات فكرية يجب تجنبها', "fields": [ {"label": 'اسم الخطيئة الفكرية أو التحيز', "type": 'text', "name": 'intellectual_sin_name', "jsonKey": 'intellectualSinName', "templates": ["الدوغماتية", "التعميم المتسرع", "تحيز التأكيد", "مغالطة الشخصنة", "مغالطة رجل القش", "الاحتكام إلى الجهل"]}, {"label": 'السبب لاعتباره ضارًا', "type": 'textarea', "name": 'intellectual_sin_reason', "jsonKey": 'reasonConsideredHarmful', "templates": ["يعيق البحث عن الحقيقة.", "يؤدي إلى استنتاجات خاطئة وقرارات سيئة.", "يعيق الانفتاح الذهني والتفكير النقدي.", "يقوض الحوار المثمر."]} ] },
+    "projects": { "title": '📌 مشاريع وأهداف حالية', "fields": [ {"label": 'عنوان المشروع/الهدف', "type": 'text', "name": 'project_name', "jsonKey": 'projectOrObjectiveTitle'}, {"label": 'الأهداف/الوصف التفصيلي', "type": 'textarea', "name": 'project_goals', "jsonKey": 'projectDetailedGoals', "templates": [ "الهدف الرئيسي هو [س]، بهدف الوصول إلى [ص] بحلول [ع].", "يسعى هذا المشروع إلى [فعل] [موضوع] من أجل [غرض].", "الاستعداد لعام/دورة دراسية جديدة.", "تطوير المهارات المهنية في [مجال محدد].", "إطلاق مشروع شخصي/تجاري جديد في [نطاق].", "التحضير لرحلة مهمة (سياحة/عمل/دراسة).", "تأليف كتاب أو ورقة بحثية عن [موضوع].", "تحسين الصحة واللياقة البدنية من خلال [خطة/نشاط].", "تعلم لغة جديدة أو إتقان لغة حالية.", "تخصيص المزيد من الوقت لهوايات مثل [اسم الهواية].", "العمل على تحسين العلاقات الاجتماعية أو الأسرية.", "المساهمة في عمل تطوعي أو خدمة مجتمعية.", "تحقيق هدف معين للاستقرار المالي أو الاستثمار." ] }, {"label": 'المفاهيم/الأدوات المرتبطة', "type": 'textarea', "name": 'project_concepts_tools', "jsonKey": 'projectAssociatedConcepts'}, {"label": 'الدور المحدد للنموذج اللغوي', "type": 'textarea', "name": 'project_llm_role', "jsonKey": 'projectLLMRole', "templates": ["مساعد بحث", "شريك في العصف الذهني", "مراجع نقدي", "مولد محتوى", "مستشار تقني", "مصحح أخطاء (للكود)", "مدقق لغوي/محرر"]} ] },
+    "pivotal_examples": { "title": '🧪 أمثلة محورية', "fields": [ {"label": 'اسم/وصف المثال', "type": 'text', "name": 'example_name', "jsonKey": 'pivotalExampleName', "templates": ["قصة يوسف", "حدسية كولاتز", "تأثير الفراشة", "أسطورة الكهف", "قطة شرودنجر", "معضلة السجين"]}, {"label": 'الأهمية والأفكار الموضحة', "type": 'textarea', "name": 'example_significance', "jsonKey": 'pivotalExampleSignificance', "templates": ["يوضح مفهوم [مفهوم] وتداعياته على [مجال].", "يمثل بالنسبة لي أهمية [قيمة/فكرة].", "يسلط الضوء على التوتر بين [س] و [ص]."]} ] },
+    "causal_relations": { "title": '🔗 علاقات سببية بين المفاهيم', "fields": [ {"label": 'المفهوم الأول (السبب)', "type": 'text', "name": 'cause_concept', "jsonKey": 'causeConcept'}, {"label": 'المفهوم الثاني (النتيجة)', "type": 'text', "name": 'effect_concept', "jsonKey": 'effectConcept'}, {"label": 'طبيعة العلاقة السببية', "type": 'textarea', "name": 'relation_description', "jsonKey": 'causalRelationDescription', "templates": ["[السبب] يؤدي مباشرة إلى/يؤثر على [النتيجة] لأن...", "[السبب] شرط ضروري ولكنه غير كاف لـ [النتيجة].", "هناك علاقة سببية معقدة وغير مباشرة بين [السبب] و [النتيجة] تتوسطها..."]} ] },
+    "role": { "title": '🎭 الشخصية الوظيفية للنموذج اللغوي', "maxItems": 1, "fields": [ {"label": 'الدور الأساسي المطلوب من النموذج', "type": 'text', "name": 'llm_role_primary', "jsonKey": 'llmPrimaryRole', "templates": ["مساعد بحث متقدم", "ناقد بناء", "متعاون إبداعي", "محاور سقراطي", "مدرس شخصي", "مستشار تقني"]}, {"label": 'السمات أو السلوكيات المطلوبة للدور', "type": 'textarea', "name": 'llm_role_attributes', "jsonKey": 'llmRoleAttributes', "templates": ["استباقي، ثاقب، ومهتم بالتفاصيل.", "موضوعي، تحليلي، ومحترم في النقد.", "منفتح الذهن، خيالي، ومتعاون في توليد الأفكار.", "محفز للتفكير، فضولي، ويركز على الفهم العميق."]} ] },
+    "conceptual_tuning": { "title": '📚 توليف مفاهيمي (مصطلحات خاصة بالمستخدم)', "fields": [ {"label": 'مصطلحك الخاص', "type": 'text', "name": 'user_concept_term', "jsonKey": 'userSpecificTerm'}, {"label": 'التعريف وأمثلة الاستخدام', "type": 'textarea', "name": 'user_concept_definition', "jsonKey": 'userTermDefinition', "templates": ["بالنسبة لي، '[مصطلح]' يعني [تعريفك]. أستخدمه عند مناقشة [سياق]، مثال: '[مثال استخدام]'.", "'[مصطلح]' هو اختصار لـ [مفهوم/فكرة أطول]. مثال على ذلك: ..."]} ] },
+    "interaction_style": { "title": '💬 أسلوب التفاعل المفضل', "maxItems": 1, "fields": [ {"label": 'أسلوب الاستجابة المفضل للنموذج', "type": 'textarea', "name": 'preferred_style', "jsonKey": 'preferredResponseStyle', "templates": ["تحليلي وعميق، مع اقتباسات وأمثلة.", "موجز ومباشر، يركز على النقاط الرئيسية.", "إبداعي وملهم، يقترح أفكارًا جديدة.", "متوازن، يقدم التفاصيل عند الحاجة والإيجاز عند الاقتضاء.", "تعليمي، يشرح المفاهيم المعقدة بوضوح.", "ناقد بناء، يطرح أسئلة ويتحدى الافتراضات بلطف."]}, {"label": 'الأساليب التي يجب على النموذج تجنبها', "type": 'textarea', "name": 'avoid_style', "jsonKey": 'stylesToAvoid', "templates": ["التبسيط المفرط للمواضيع المعقدة.", "الاستجابات العاطفية غير المبررة أو الشخصنة.", "التعميمات غير الدقيقة أو الادعاءات غير المدعومة.", "تقديم الآراء الشخصية كحقائق مطلقة.", "الاستخدام المفرط للمصطلحات التقنية دون تفسير.", "تكرار المعلومات التي قدمتها بالفعل دون إضافة قيمة."]} ] },
+    "intervention_level": {  "title": '⚙️ مستوى تدخل النموذج', "maxItems": 1, "fields": [ {"label": 'مستوى التدخل المختار', "type": 'select', "name": 'intervention_select', "jsonKey": 'chosenInterventionLevel', "options": [ {"value": '', "text": '-- اختر المستوى --'}, {"value": 'high', "text": 'عالٍ (استباقي)'}, {"value": 'medium', "text": 'متوسط (متوازن)'}, {"value": 'low', "text": 'منخفض (ينتظر التوجيه)'} ] }, {"label": 'توضيحات حول المبادرة', "type": 'textarea', "name": 'intervention_details', "jsonKey": 'interventionClarifications', "templates": ["لا تتردد في اقتراح مواضيع ذات صلة أو طرح أسئلة توضيحية.", "أفضل أن تنتظر توجيهاتي الصريحة قبل تقديم نصيحة غير مطلوبة.", "التوازن جيد؛ تدخل إذا رأيت فرصة واضحة لتعزيز مناقشتنا."]} ] },
+    "alignment_level": {  "title": '🧭 مستوى التوافق المنشود', "maxItems": 1, "fields": [  {"label": 'مستوى التوافق المنشود (1-5)', "type": 'select', "name": 'alignment_select', "jsonKey": 'desiredAlignmentLevel', "options": [ {"value": '', "text": '-- اختر --'}, {"value": '5', "text": '5 (عالٍ جداً - محاكاة)'}, {"value": '4', "text": '4 (عالٍ - متسق)'}, {"value": '3', "text": '3 (متوسط - واعٍ)'}, {"value": '2', "text": '2 (منخفض - يفهم)'}, {"value": '1', "text": '1 (أساسي - يتبع)'} ] }, {"label": 'ملاحظات على مستوى التوافق', "type": 'textarea', "name": 'alignment_notes', "jsonKey": 'alignmentLevelNotes', "templates": ["المستوى 5 يعني السعي لمحاكاة عميقة لأنماط تفكيري.", "التوافق العالي يعني تطبيق قيمي ومنهجياتي المعلنة باستمرار.", "المستوى المتوسط يعني إدراك سياقي وتكييف الاستجابات وفقًا لذلك."]} ] },
+    "critique_mechanism": { "title": '🗣️ آلية طلب/استقبال النقد', "maxItems": 1, "fields": [ {"label": 'تفضيلات النقد (متى/كيف)', "type": 'textarea', "name": 'critique_preference', "jsonKey": 'critiquePreferences', "templates": ["أرحب بالنقد البناء في أي وقت، خاصة إذا ساعد في صقل أفكاري.", "أفضل أن يُقدم النقد بلطف وبتعليل واضح.", "اسألني أولاً إذا كنت منفتحًا على النقد في موضوع معين."]}, {"label": 'شروط النقد', "type": 'textarea', "name": 'critique_conditions', "jsonKey": 'critiqueConditions', "templates": ["يجب أن يكون النقد محترمًا، قائمًا على الأدلة، ويهدف إلى الفهم المتبادل.", "تجنب الحجج الشخصية؛ ركز على الأفكار.", "يجب أن يتماشى مع المبادئ الأساسية لهذا البروتوكول."]} ] },
+    "constraints_warnings": { "title": '🚫 محظورات وتحذيرات للنموذج', "fields": [ {"label": 'بند الحظر/التحذير', "type": 'text', "name": 'constraint_item', "jsonKey": 'constraintItem', "templates": ["لا تقدم نصائح طبية.", "تجنب التعليقات السياسية.", "لا تولد محتوى ضارًا.", "لا تخمن في أمور شخصية لم يتم الكشف عنها."]}, {"label": 'التوضيح/السبب', "type": 'textarea', "name": 'constraint_reason', "jsonKey": 'constraintReason', "templates": ["هذا خارج نطاق خبرتك.", "للحفاظ على تفاعل مركز وموضوعي.", "لأسباب تتعلق بالسلامة والأخلاق."]} ] },
+    "memory_management_directives": {  "title": '💾 توجيهات إدارة الذاكرة', "maxItems": 1, "fields": [ {"label": 'توجيه الحفاظ على السياق', "type": 'textarea', "name": 'memory_directive', "jsonKey": 'contextMaintenanceDirective', "templates": ["ركز على آخر 5-10 رسائل للسياق الفوري.", "عند الحاجة، راجع الأقسام ذات الصلة من هذا البروتوكول لتحديث الفهم.", "اطلب مني تلخيص النقاط الرئيسية إذا بدا أن السياق ينجرف.", "استخدم الكلمات المفتاحية من هذا البروتوكول كمراسي لتفاعلاتنا.", "تذكر أن هذا البروتوكول هو المصدر الأساسي للمعلومات عني."]}, {"label": 'آلية استدعاء البروتوكول', "type": 'textarea', "name": 'memory_protocol_recall', "jsonKey": 'protocolRecallMechanism', "templates": ["يمكنك أن تسألني: 'هل هناك أي شيء في بروتوكولك يتعلق بـ [موضوع محدد]؟'", "أشر إلى القسم أو المفهوم المحدد الذي تعتقد أنه ذو صلة الآن.", "إذا ذكرت شيئًا يبدو أنه يتعارض مع البروتوكول، فيرجى الإشارة إليه.", "لخص لي النقاط الرئيسية من قسم [اسم القسم] إذا لزم الأمر."]} ] },
+    "cognitive_preferences": {  "title": '🤔 تفضيلات معرفية/سلوكية', "maxItems": 1,  "fields": [ {"label": 'صف تفضيلًا معرفيًا أو سلوكيًا مهمًا', "type": 'textarea', "name": 'preference_description', "jsonKey": 'cognitiveBehavioralPreference', "templates": ["أفضل فهم الصورة الكبيرة قبل الغوص في التفاصيل.", "أميل للتركيز على التفاصيل الملموسة والبيانات أولاً.", "أتعلم بشكل أفضل من خلال الخبرة العملية وحل المشكلات.", "أفضل البيئات جيدة التنظيم والمخطط لها.", "أجد الإلهام في المناقشات المفتوحة والتبادل الحر للأفكار.", "أحتاج إلى وقت للتفكير والتأمل بمفردي لمعالجة المعلومات."]} ] },
+    "mental_state": {  "title": '🧠 الحالة الذهنية (اختياري وقابل للتحديث)', "maxItems": 1, "fields": [ {"label": 'الحالة الذهنية المختارة', "type": 'select', "name": 'mental_state_select', "jsonKey": 'selectedMentalState', "options": [ {"value": '', "text": '-- اختر --'}, {"value": 'good', "text": 'جيدة / مركز'}, {"value": 'average', "text": 'متوسطة / مشتت'}, {"value": 'bad', "text": 'سيئة / غير مركز'}, {"value": 'not_specified', "text": 'غير محددة'} ] }, {"label": 'ملاحظات على الحالة الذهنية', "type": 'textarea', "name": 'mental_state_notes', "jsonKey": 'mentalStateNotes', "templates": ["أشعر بالنشاط الذهني وجاهز للمهام المعقدة.", "متعب قليلاً، أفضل التفاعلات الأبسط في الوقت الحالي.", "منفتح على المناقشات العميقة، أشعر بالتأمل."]} ] },
+    "sports_inclinations": { "title": '🏅 ميول رياضية', "maxItems": 1, "fields": [ {"label": 'الميل الرياضي المختار', "type": 'select', "name": 'sport_select', "jsonKey": 'chosenSportInclination', "options": [ {"value": '', "text": '-- اختر --'}, {"value": 'none', "text": 'لا يوجد'}, {"value": 'equestrian', "text": 'فروسية'}, {"value": 'football', "text": 'كرة قدم'}, {"value": 'basketball', "text": 'كرة سلة'}, {"value": 'tennis', "text": 'تنس'}, {"value": 'esports_pc', "text": 'ألعاب كمبيوتر (تنافسية)'}, {"value": 'mobile_games', "text": 'ألعاب محمولة'}, {"value": 'console_games', "text": 'ألعاب كونسول'}, {"value": 'other', "text": 'أخرى'} ] }, {"label": 'تفاصيل أخرى (إذا "أخرى")', "type": 'text', "name": 'sport_other_details', "jsonKey": 'sportOtherDetails'} ] },
+    "additional_notes": { "title": '📝 ملاحظات إضافية عامة (وأسئلة إيفي)', "maxItems": 1, "fields": [ {"label": 'ملاحظات عامة / أسئلة إيفي الإبداعية', "type": 'textarea', "name": 'general_notes', "jsonKey": 'additionalGeneralNotes'} ] }
+}
+
+
+# English display labels (used by the English Profile Manager); keys missing here fall back to the jsonKey.
+_ENGLISH_TITLES: Dict[str, str] = {
+    "personal": "Personal Information", "social": "Social & Family Status",
+    "educational_professional": "Educational & Professional Background", "thinking_reference": "Core Thinking Reference",
+    "cognitive_passion": "Cognitive Passions & Research Patterns", "ethical_values": "Guiding Ethical Values",
+    "concepts_perspective": "Perspective on Core Concepts", "cognitive_tools_methodology": "Cognitive Tools Methodology",
+    "inspiring_figures": "Inspiring Figures", "intellectual_sins": "Intellectual Sins/Biases to Avoid",
+    "projects": "Current Projects & Objectives", "pivotal_examples": "Pivotal Examples",
+    "causal_relations": "Causal Relations Between Concepts", "role": "LLM Functional Role",
+    "conceptual_tuning": "Conceptual Tuning (User Terms)", "interaction_style": "Preferred Interaction Style",
+    "intervention_level": "LLM Intervention Level", "alignment_level": "Desired Alignment Level",
+    "critique_mechanism": "Critique Mechanism", "constraints_warnings": "Constraints & Warnings for the LLM",
+    "memory_management_directives": "Memory Management Directives", "cognitive_preferences": "Cognitive/Behavioral Preferences",
+    "mental_state": "Mental State", "sports_inclinations": "Sports Inclinations", "additional_notes": "Additional General Notes",
+}
+
+_ENGLISH_LABELS: Dict[str, str] = {
+    "preferredName": "Preferred Name", "dateOfBirth": "Date of Birth",
+    "nationalityCulturalBackground": "Nationality/Cultural Background", "languagesProficiency": "Languages Proficiency",
+    "socialFamilyDetails": "Social & Family Details",
+    "educationalBackground": "Educational Background", "professionalExperience": "Professional Experience",
+    "coreThinkingReferenceDescription": "Core Thinking Reference Description", "thinkingReferenceApplication": "Thinking Reference Application",
+    "cognitivePassionName": "Cognitive Passion", "passionResearchMethodology": "Research Methodology",
+    "ethicalValueName": "Ethical Value Name", "ethicalValueExplanation": "Ethical Value Explanation",
+    "coreConceptName": "Core Concept", "coreConceptPerspective": "Perspective on the Concept",
+    "cognitiveToolName": "Cognitive Tool", "cognitiveToolMethodology": "Tool Methodology",
+    "inspiringFigureName": "Inspiring Figure", "derivedValueAndImpact": "Derived Value & Impact",
+    "intellectualSinName": "Intellectual Sin/Bias", "reasonConsideredHarmful": "Why It Is Harmful",
+    "projectOrObjectiveTitle": "Project/Objective Title", "projectDetailedGoals": "Project Goals",
+    "projectAssociatedConcepts": "Associated Concepts/Tools", "projectLLMRole": "LLM Role in Project",
+    "pivotalExampleName": "Pivotal Example", "pivotalExampleSignificance": "Example Significance",
+    "causeConcept": "Cause Concept", "effectConcept": "Effect Concept", "causalRelationDescription": "Causal Relation",
+    "llmPrimaryRole": "LLM Primary Role", "llmRoleAttributes": "LLM Role Attributes",
+    "userSpecificTerm": "User Specific Term", "userTermDefinition": "User Term Definition",
+    "preferredResponseStyle": "Preferred Response Style", "stylesToAvoid": "Styles to Avoid",
+    "chosenInterventionLevel": "Chosen Intervention Level", "interventionClarifications": "Intervention Clarifications",
+    "desiredAlignmentLevel": "Desired Alignment Level", "alignmentLevelNotes": "Alignment Notes",
+    "critiquePreferences": "Critique Preferences", "critiqueConditions": "Critique Conditions",
+    "constraintItem": "Constraint/Warning", "constraintReason": "Constraint Reason",
+    "contextMaintenanceDirective": "Context Maintenance Directive", "protocolRecallMechanism": "Protocol Recall Mechanism",
+    "cognitiveBehavioralPreference": "Cognitive/Behavioral Preference",
+    "selectedMentalState": "Selected Mental State", "mentalStateNotes": "Mental State Notes",
+    "chosenSportInclination": "Sport Inclination", "sportOtherDetails": "Sport Other Details",
+    "additionalGeneralNotes": "Additional General Notes",
+}
+
+
+class FieldDef(NamedTuple):
+    """One field of a section. `option_texts` maps option values to their display text."""
+    section_id: str
+    json_key: str
+    type: str
+    label: str
+    label_en: str
+    templates: Tuple[str, ...]
+    option_texts: Mapping[str, str]
+    option_values: Mapping[str, str]
+
+    def option_text(self, value: Any, default: Optional[str] = None) -> Optional[str]:
+        return self.option_texts.get(value, default)
+
+    def option_value(self, text: Any, default: Optional[str] = None) -> Optional[str]:
+        return self.option_values.get(text, default)
+
+
+class SectionDef(NamedTuple):
+    """One protocol section. max_items is None for repeatable sections."""
+    id: str
+    title: str
+    title_en: str
+    max_items: Optional[int]
+    fields: Tuple[FieldDef, ...]
+    fields_by_key: Mapping[str, FieldDef]
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict): return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list): return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _build_section(section_id: str, section_def: Mapping[str, Any]) -> SectionDef:
+    fields = []
+    for f in section_def.get("fields", ()):
+        options = f.get("options", ())
+        fields.append(FieldDef(
+            section_id, f["jsonKey"], f.get("type", "text"), f.get("label", f["jsonKey"]), _ENGLISH_LABELS.get(f["jsonKey"], f["jsonKey"]),
+            tuple(f.get("templates", ())),
+            MappingProxyType({o.get("value"): o.get("text", o.get("value")) for o in options}),
+            MappingProxyType({o.get("text", o.get("value")): o.get("value") for o in options})))
+    return SectionDef(section_id, section_def.get("title", section_id), _ENGLISH_TITLES.get(section_id, section_id),
+                      section_def.get("maxItems"), tuple(fields), MappingProxyType({f.json_key: f for f in fields}))
+
+
+SECTION_TYPE_DATA: Mapping[str, Mapping[str, Any]] = _freeze(_SECTION_TYPE_DATA_SOURCE)
+del _SECTION_TYPE_DATA_SOURCE
+
+SECTIONS: Mapping[str, SectionDef] = MappingProxyType({sid: _build_section(sid, d) for sid, d in SECTION_TYPE_DATA.items()})
+FIELDS: Mapping[Tuple[str, str], FieldDef] = MappingProxyType({(f.section_id, f.json_key): f for s in SECTIONS.values() for f in s.fields})
+_SECTION_ID_BY_TITLE: Mapping[str, str] = MappingProxyType(
+    {**{s.title_en: s.id for s in SECTIONS.values()}, **{s.title: s.id for s in SECTIONS.values()}})
+
+
+def get_section(section_id: Optional[str]) -> Optional[SectionDef]:
+    return SECTIONS.get(section_id) if section_id else None
+
+
+def get_field(section_id: Optional[str], json_key: Optional[str]) -> Optional[FieldDef]:
+    return FIELDS.get((section_id, json_key))
+
+
+def field_label(section_id: Optional[str], json_key: str, english: bool = False) -> str:
+    """Display label of a field, or the jsonKey itself for keys outside the definitions."""
+    field = FIELDS.get((section_id, json_key))
+    if field is None: return json_key
+    return field.label_en if english else field.label
+
+
+def section_id_for_title(title: Optional[str]) -> Optional[str]:
+    """Section id for an Arabic or English section title."""
+    return _SECTION_ID_BY_TITLE.get(title) if title else None
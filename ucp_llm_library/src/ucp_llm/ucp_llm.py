@@ -8,23 +8,39 @@
 #
 # Version: 1.0.0
 
+import asyncio
 import json
-from typing import List, Dict, Any, Optional
+import os
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from . import jsonio
+from .overlay import ProfileOverlay
+from .validation import ProfileValidator, ValidationIssue
+
+_validator: Optional[ProfileValidator] = None
 
 class UCPProfile:
     """
     Loads, parses, and provides access to a User Context Protocol (UCP-LLM)
     JSON file, generated by the UCP-LLM Generator HTML tool (v1.0.0 English version).
     This library expects JSON keys within item objects to be English (jsonKey from HTML).
+    Files are parsed through ucp_llm.jsonio (orjson/ujson when installed, else json).
+    In asyncio code, use `await UCPProfile.aload(path)` instead of the blocking constructor.
+
+    Sections and their validated items are indexed once at load time, so every
+    getter is a dictionary lookup instead of a scan over the 'sections' list.
+    Call reindex() after adding or removing sections/items in get_raw_data().
     """
 
     def __init__(self, file_path: str):
         self.file_path = file_path
         self.raw_data: Optional[Dict[str, Any]] = None
         self.error_message: Optional[str] = None
+        self._section_index: Dict[str, Dict[str, Any]] = {}
+        self._items_index: Dict[str, Tuple[Dict[str, Any], ...]] = {}
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.raw_data = json.load(f)
+            self.raw_data = jsonio.load_file(file_path)
             if not isinstance(self.raw_data, dict) or \
                "sections" not in self.raw_data or \
                not isinstance(self.raw_data.get("sections"), list) or \
@@ -33,10 +49,70 @@ class UCPProfile:
                 self.raw_data = None
         except FileNotFoundError:
             self.error_message = f"Error: File not found at {file_path}"
-        except json.JSONDecodeError as e:
+        except jsonio.DECODE_ERRORS as e:
             self.error_message = f"Error: Could not decode JSON. Details: {e}"
         except Exception as e:
             self.error_message = f"An unexpected error occurred: {e}"
+        self.reindex()
+
+    def reindex(self) -> None:
+        """
+        Rebuilds the section-id -> section and section-id -> items lookups.
+        The first section with a given id wins, matching the previous linear scan.
+        """
+        self._section_index = {}
+        self._items_index = {}
+        if not self.is_valid() or self.raw_data is None: return
+        for section in self.get_sections():
+            if not isinstance(section, dict): continue
+            section_id = section.get("id")
+            if not isinstance(section_id, str) or section_id in self._section_index: continue
+            self._section_index[section_id] = section
+            items_data = section.get("items", [])
+            self._items_index[section_id] = tuple(item for item in items_data if isinstance(item, dict)) if isinstance(items_data, list) else ()
+
+    @classmethod
+    def load_many(cls, file_paths: Iterable[str], workers: Optional[int] = None, chunk_size: int = 32) -> "ProfileBatch":
+        """
+        Parses and validates many protocol files in parallel worker processes.
+        Returns a single-use ProfileBatch that yields valid profiles as their
+        chunk finishes and records per-file errors in ProfileBatch.errors
+        instead of stopping. A path given more than once is loaded once.
+        workers=None uses os.cpu_count(); workers<=1 loads in the calling process.
+        """
+        return ProfileBatch(file_paths, workers=workers, chunk_size=chunk_size)
+
+    @classmethod
+    async def aload(cls, file_path: str, executor: Optional[Executor] = None) -> "UCPProfile":
+        """
+        Awaitable UCPProfile(file_path): the file is read and parsed on
+        `executor` (the event loop's default thread pool if None) so the loop
+        keeps serving other tasks. Errors are reported through get_error(), as
+        with the constructor. Share one executor with max_workers=N between
+        callers to bound the loads in flight across a whole service.
+        """
+        return await asyncio.get_running_loop().run_in_executor(executor, cls, file_path)
+
+    @classmethod
+    async def aload_many(cls, file_paths: Iterable[str], concurrency: int = 8, executor: Optional[Executor] = None) -> List["UCPProfile"]:
+        """
+        Loads many files with aload(), at most `concurrency` at a time, and
+        returns one profile per path in input order, invalid ones included
+        (check is_valid()).
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def load_one(file_path: str) -> "UCPProfile":
+            async with semaphore: return await cls.aload(file_path, executor)
+
+        return list(await asyncio.gather(*(load_one(file_path) for file_path in file_paths)))
+
+    def edit(self) -> ProfileOverlay:
+        """
+        Copy-on-write editor over the loaded data, which it never modifies;
+        replaces deep-copying get_raw_data() before editing it.
+        """
+        return ProfileOverlay(self.get_raw_data())
 
     def is_valid(self) -> bool:
         return self.raw_data is not None and self.error_message is None
@@ -44,6 +120,16 @@ class UCPProfile:
     def get_error(self) -> Optional[str]:
         return self.error_message
 
+    def validate(self) -> List[ValidationIssue]:
+        """
+        Full schema check of the loaded data against the section registry
+        (see ucp_llm.validation); the getters skip malformed items silently.
+        """
+        global _validator
+        if self.raw_data is None: return [ValidationIssue("$", "not_loaded", self.error_message or "No data loaded.")]
+        if _validator is None: _validator = ProfileValidator()
+        return _validator.validate(self.raw_data)
+
     def get_raw_data(self) -> Optional[Dict[str, Any]]:
         return self.raw_data if self.is_valid() else None
 
@@ -60,24 +146,30 @@ class UCPProfile:
         sections_data = self.raw_data.get("sections", [])
         return sections_data if isinstance(sections_data, list) else []
 
+    def get_section_ids(self) -> List[str]:
+        return list(self._section_index)
+
     def get_section_by_id(self, section_id: str) -> Optional[Dict[str, Any]]:
-        if not self.is_valid(): return None
-        for section in self.get_sections():
-            if isinstance(section, dict) and section.get("id") == section_id:
-                return section
-        return None
+        return self._section_index.get(section_id)
 
     def get_section_title(self, section_id: str) -> Optional[str]:
         section = self.get_section_by_id(section_id)
         return section.get("title") if section else None
 
+    def _section_items(self, section_id: str) -> Tuple[Dict[str, Any], ...]:
+        # The indexed tuple itself; backs iter_section_items() and the getters without the copy get_section_items() makes
+        return self._items_index.get(section_id, ())
+
     def get_section_items(self, section_id: str) -> List[Dict[str, Any]]:
-        section = self.get_section_by_id(section_id)
-        items_data = section.get("items", []) if section else []
-        return [item for item in items_data if isinstance(item, dict)] if isinstance(items_data, list) else []
+        """Returns the dict items of a section in a new list."""
+        return list(self._section_items(section_id))
+
+    def iter_section_items(self, section_id: str) -> Iterator[Dict[str, Any]]:
+        """Iterates over the dict items of a section without copying them; treat the items as read-only."""
+        return iter(self._section_items(section_id))
 
     def get_first_item_from_section(self, section_id: str) -> Optional[Dict[str, Any]]:
-        items = self.get_section_items(section_id)
+        items = self._section_items(section_id)
         return items[0] if items else None
 
     def get_value_from_item(self, item: Optional[Dict[str, Any]], json_key: str, default: Any = None) -> Any:
@@ -179,6 +271,91 @@ class UCPProfile:
     def get_additional_general_notes(self) -> Optional[str]: return self.get_value_from_first_item("additional_notes", "additionalGeneralNotes")
 
 
+def _load_profile_chunk(file_paths: List[str]) -> List[UCPProfile]:
+    # Runs in a worker process; profiles (with their indexes) are pickled back to the parent.
+    return [UCPProfile(file_path) for file_path in file_paths]
+
+
+class ProfileBatch:
+    """
+    Iterable result of UCPProfile.load_many(). Iterating streams valid profiles
+    in completion order; invalid files are collected in `errors` as
+    {file_path: error_message} and counted in `failed`, so `failed` always
+    equals len(errors). The batch can be iterated only once, as it does not
+    keep the profiles it streams: a second iteration raises RuntimeError. A
+    path that occurs again in `file_paths` (also as a different spelling of
+    the same absolute path) is skipped; the first spelling is the one used.
+    """
+
+    def __init__(self, file_paths: Iterable[str], workers: Optional[int] = None, chunk_size: int = 32):
+        self.file_paths = file_paths
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.errors: Dict[str, str] = {}
+        self.loaded = 0
+        self.failed = 0
+        self._started = False
+
+    def _chunks(self) -> Iterator[List[str]]:
+        chunk: List[str] = []
+        seen = set()
+        for file_path in self.file_paths:
+            key = os.path.normcase(os.path.abspath(file_path))
+            if key in seen: continue
+            seen.add(key)
+            chunk.append(file_path)
+            if len(chunk) >= self.chunk_size:
+                yield chunk; chunk = []
+        if chunk: yield chunk
+
+    def _accept(self, profiles: List[UCPProfile]) -> Iterator[UCPProfile]:
+        for profile in profiles:
+            if profile.is_valid():
+                self.loaded += 1
+                yield profile
+            else:
+                self.failed += 1
+                self.errors[profile.file_path] = profile.get_error() or "Unknown error"
+
+    def __iter__(self) -> Iterator[UCPProfile]:
+        if self._started: raise RuntimeError("A ProfileBatch can be iterated only once; call UCPProfile.load_many() again.")
+        self._started = True
+        return self._load()
+
+    def _load(self) -> Iterator[UCPProfile]:
+        if self.workers <= 1:
+            for chunk in self._chunks():
+                yield from self._accept(_load_profile_chunk(chunk))
+            return
+        # Keep a bounded number of chunks in flight so huge path lists are not submitted up front.
+        max_in_flight = self.workers * 4
+        chunks = self._chunks()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            in_flight: Dict[Any, List[str]] = {}
+            for chunk in chunks:
+                in_flight[pool.submit(_load_profile_chunk, chunk)] = chunk
+                if len(in_flight) >= max_in_flight: break
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    chunk = in_flight.pop(future)
+                    try:
+                        profiles = future.result()
+                    except Exception as e:  # A crashed worker loses its whole chunk; report it per file.
+                        for file_path in chunk:
+                            self.failed += 1
+                            self.errors[file_path] = f"Worker failed while loading this file's chunk: {e}"
+                        continue
+                    yield from self._accept(profiles)
+                for chunk in chunks:
+                    in_flight[pool.submit(_load_profile_chunk, chunk)] = chunk
+                    if len(in_flight) >= max_in_flight: break
+
+    def load_all(self) -> List[UCPProfile]:
+        """Convenience wrapper that drains the batch into a list."""
+        return list(self)
+
+
 # --- Example Usage for testing the library ---
 if __name__ == "__main__":
     # Create a mock JSON file with a subset of sections and English keys
@@ -0,0 +1,156 @@
+# validation.py
+# Copyright (c) 2024 Sameh Yassin
+# All rights reserved.
+#
+# Part of the UCP-LLM Python library.
+
+"""
+Whole-profile schema validation compiled from the section registry.
+
+ProfileValidator turns ucp_llm.sections into per-section lookup tables once
+(allowed jsonKeys, maxItems, the option values of select fields) and then
+checks a protocol dict in a single pass, returning every problem as a
+ValidationIssue instead of stopping at the first one or, like UCPProfile,
+silently dropping malformed items. Issues are errors, or warnings for things
+readers tolerate (unknown and duplicate sections).
+
+validate_files() checks many files in parallel worker processes, each with
+its own compiled validator, for gating ingestion.
+
+    issues = ProfileValidator().validate(data)
+    summary = validate_files(paths)   # {"checked": ..., "invalid": ..., "issues": {path: [...]}, ...}
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from . import jsonio
+from .sections import SECTIONS
+
+# Keys the managers write that are not form fields of their section.
+EXTRA_FIELDS: Mapping[str, Tuple[str, ...]] = {"additional_notes": ("externalAnalysisSummary",)}
+
+ERROR = "error"
+WARNING = "warning"
+
+
+class ValidationIssue(NamedTuple):
+    path: str  # JSON path, e.g. "$.sections[16].items[0].chosenInterventionLevel"
+    code: str
+    message: str
+    severity: str = ERROR
+    section_id: Optional[str] = None
+    item_index: Optional[int] = None
+    json_key: Optional[str] = None
+
+
+class _CompiledSection:
+    __slots__ = ("max_items", "keys", "options")
+
+    def __init__(self, max_items: Optional[int], keys: FrozenSet[str], options: Dict[str, FrozenSet[str]]):
+        self.max_items = max_items
+        self.keys = keys
+        self.options = options  # jsonKey -> allowed values, for select fields
+
+
+class ProfileValidator:
+    """Validates protocol dicts against the section registry (see the module docstring)."""
+
+    def __init__(self, extra_fields: Mapping[str, Sequence[str]] = EXTRA_FIELDS):
+        self._sections: Dict[str, _CompiledSection] = {}
+        for section in SECTIONS.values():
+            keys = frozenset(field.json_key for field in section.fields) | frozenset(extra_fields.get(section.id, ()))
+            options = {field.json_key: frozenset(field.option_values.values()) for field in section.fields if field.option_values}
+            self._sections[section.id] = _CompiledSection(section.max_items, keys, options)
+
+    def validate(self, data: Any) -> List[ValidationIssue]:
+        """Every problem in `data`, in document order; an empty list means it is valid."""
+        issues: List[ValidationIssue] = []
+        if not isinstance(data, dict):
+            return [ValidationIssue("$", "not_object", "The protocol must be a JSON object.")]
+        if "protocolVersion" not in data: issues.append(ValidationIssue("$.protocolVersion", "missing_key", "'protocolVersion' is missing."))
+        sections = data.get("sections")
+        if not isinstance(sections, list):
+            issues.append(ValidationIssue("$.sections", "missing_key" if sections is None else "wrong_type", "'sections' must be a list."))
+            return issues
+        seen = set()
+        for index, section in enumerate(sections):
+            path = f"$.sections[{index}]"
+            if not isinstance(section, dict):
+                issues.append(ValidationIssue(path, "wrong_type", "A section must be an object."))
+                continue
+            section_id = section.get("id")
+            if not isinstance(section_id, str):
+                issues.append(ValidationIssue(path + ".id", "missing_key", "A section needs a string 'id'."))
+                continue
+            compiled = self._sections.get(section_id)
+            if compiled is None:
+                issues.append(ValidationIssue(path, "unknown_section", f"Unknown section '{section_id}'.", WARNING, section_id))
+                continue
+            if section_id in seen:
+                issues.append(ValidationIssue(path, "duplicate_section", f"Section '{section_id}' appears more than once; only the first is read.", WARNING, section_id))
+                continue
+            seen.add(section_id)
+            items = section.get("items", [])
+            if not isinstance(items, list):
+                issues.append(ValidationIssue(path + ".items", "wrong_type", "'items' must be a list.", ERROR, section_id))
+                continue
+            if compiled.max_items is not None and len(items) > compiled.max_items:
+                issues.append(ValidationIssue(path + ".items", "too_many_items", f"{len(items)} items, at most {compiled.max_items} allowed.", ERROR, section_id))
+            keys, options = compiled.keys, compiled.options
+            for item_index, item in enumerate(items):
+                if not isinstance(item, dict):
+                    issues.append(ValidationIssue(f"{path}.items[{item_index}]", "wrong_type", "An item must be an object.", ERROR, section_id, item_index))
+                    continue
+                for json_key, value in item.items():
+                    if json_key not in keys: code, message = "unknown_field", f"'{json_key}' is not a field of '{section_id}'."
+                    elif not isinstance(value, str): code, message = "wrong_type", f"'{json_key}' must be a string, not {type(value).__name__}."
+                    elif json_key in options and value not in options[json_key]: code, message = "invalid_option", f"'{value}' is not an option of '{json_key}'."
+                    else: continue
+                    issues.append(ValidationIssue(f"{path}.items[{item_index}].{json_key}", code, message, ERROR, section_id, item_index, json_key))
+        return issues
+
+    def is_valid(self, data: Any) -> bool:
+        return not any(issue.severity == ERROR for issue in self.validate(data))
+
+    def validate_file(self, file_path: str) -> List[ValidationIssue]:
+        """Like validate(), with unreadable or malformed JSON reported as an issue."""
+        try: data = jsonio.load_file(file_path)
+        except OSError as e: return [ValidationIssue("$", "unreadable", f"Could not read the file: {e}")]
+        except jsonio.DECODE_ERRORS as e: return [ValidationIssue("$", "invalid_json", f"Could not decode JSON: {e}")]
+        return self.validate(data)
+
+
+_validator: Optional[ProfileValidator] = None  # Compiled once per worker process
+
+
+def _validate_chunk(file_paths: List[str]) -> List[Tuple[str, List[ValidationIssue]]]:
+    global _validator
+    if _validator is None: _validator = ProfileValidator()
+    return [(file_path, _validator.validate_file(file_path)) for file_path in file_paths]
+
+
+def validate_files(file_paths: Iterable[str], workers: Optional[int] = None, chunk_size: int = 64) -> Dict[str, Any]:
+    """
+    Validates many files and returns a summary dict: checked, valid, invalid
+    (files with at least one error), issues ({file_path: [ValidationIssue]},
+    only for files with issues), seconds and files_per_sec. workers=None uses
+    os.cpu_count(); workers<=1 validates in this process.
+    """
+    start = time.perf_counter()
+    file_paths = list(file_paths)
+    chunk_size = max(1, chunk_size)
+    chunks = [file_paths[i:i + chunk_size] for i in range(0, len(file_paths), chunk_size)]
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers <= 1 or len(chunks) <= 1:
+        results = map(_validate_chunk, chunks)
+        issues = {path: found for chunk in results for path, found in chunk if found}
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            issues = {path: found for chunk in pool.map(_validate_chunk, chunks) for path, found in chunk if found}
+    invalid = sum(1 for found in issues.values() if any(issue.severity == ERROR for issue in found))
+    seconds = time.perf_counter() - start
+    return {"checked": len(file_paths), "valid": len(file_paths) - invalid, "invalid": invalid, "issues": issues,
+            "seconds": seconds, "files_per_sec": len(file_paths) / seconds if seconds > 0 else 0.0}
@@ -0,0 +1,46 @@
+# fakes.py
+# Test doubles shared by the tests and the benchmark scripts.
+
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class FakeStreamingClient:
+    """
+    Stand-in for groq.Groq: chat.completions.create() answers with `text`,
+    after `first_token_delay` seconds, in pieces of `chunk_size` characters
+    spaced `chunk_delay` seconds apart (or all at once when stream=False).
+    `error` is raised by create() itself; `error_after_chunks` raises it
+    while streaming, after that many pieces. Every request's keyword
+    arguments are recorded in `requests`. `api_key` is accepted and
+    ignored, so the class can replace groq.Groq directly.
+    """
+
+    def __init__(self, text: str = "تحليل تجريبي للبروتوكول.", chunk_size: int = 8,
+                 first_token_delay: float = 0.0, chunk_delay: float = 0.0, error: Optional[Exception] = None,
+                 error_after_chunks: Optional[int] = None, api_key: Optional[str] = None):
+        self.text = text
+        self.chunk_size = max(1, chunk_size)
+        self.first_token_delay = first_token_delay
+        self.chunk_delay = chunk_delay
+        self.error = error
+        self.error_after_chunks = error_after_chunks
+        self.requests: List[Dict[str, Any]] = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, stream: bool = False, **kwargs: Any) -> Any:
+        self.requests.append(dict(kwargs, stream=stream))
+        if self.error is not None and self.error_after_chunks is None: raise self.error
+        if stream: return self._chunks()
+        time.sleep(self.first_token_delay + self.chunk_delay * (len(self.text) // self.chunk_size))
+        if self.error is not None: raise self.error
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.text))])
+
+    def _chunks(self) -> Iterator[Any]:
+        time.sleep(self.first_token_delay)
+        for count, start in enumerate(range(0, len(self.text), self.chunk_size)):
+            if count == self.error_after_chunks: raise self.error  # type: ignore[misc]
+            if start: time.sleep(self.chunk_delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=self.text[start:start + self.chunk_size]))])
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None))])
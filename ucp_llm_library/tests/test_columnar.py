@@ -0,0 +1,47 @@
+# test_columnar.py
+# A corpus read from the built-in format answers like the one it was built
+# from, and closing it releases its memory map: columns already used stay
+# readable, the others raise ValueError.
+
+import pytest
+
+from ucp_llm.columnar import build_corpus, read_corpus
+
+from profile_factory import make_profile, write_profile
+
+
+@pytest.fixture
+def corpus_path(tmp_path):
+    paths = []
+    for n in range(6):
+        path = tmp_path / f"profile_{n}.json"
+        write_profile(str(path), make_profile(items_per_section=1 + n % 3, words_per_field=4, seed=n))
+        paths.append(str(path))
+    built = build_corpus(paths)
+    built.write(str(tmp_path / "corpus.ucpc"))
+    return str(tmp_path / "corpus.ucpc"), built
+
+
+def test_read_corpus_matches_the_built_one(corpus_path):
+    path, built = corpus_path
+    with read_corpus(path) as corpus:
+        assert corpus.paths == built.paths
+        assert corpus.item_counts("ethical_values") == built.item_counts("ethical_values")
+        assert corpus.value_counts("intervention_level", "chosenInterventionLevel") == built.value_counts("intervention_level", "chosenInterventionLevel")
+
+
+def test_close_releases_the_map(corpus_path):
+    path, built = corpus_path
+    corpus = read_corpus(path)
+    levels = corpus.value_counts("intervention_level", "chosenInterventionLevel")
+    corpus.close()
+    corpus.close()
+    assert corpus.value_counts("intervention_level", "chosenInterventionLevel") == levels
+    with pytest.raises(ValueError): corpus.value_counts("ethical_values", "ethicalValueName")
+
+
+def test_rejects_other_files(tmp_path):
+    (tmp_path / "empty.ucpc").write_bytes(b"")
+    (tmp_path / "other.ucpc").write_bytes(b"not a corpus")
+    for name in ("empty.ucpc", "other.ucpc"):
+        with pytest.raises(ValueError): read_corpus(str(tmp_path / name))
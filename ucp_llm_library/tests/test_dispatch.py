@@ -0,0 +1,60 @@
+# test_dispatch.py
+# AnalysisDispatcher over local fake clients: a stalled target is given up on
+# at its timeout, a cancelled dispatch returns within the poll interval,
+# failing targets do not hide a success, and collect-all mode returns every
+# answer.
+
+import time
+
+from ucp_llm.dispatch import (MODE_ALL, MODE_FIRST, STATUS_CANCELLED, STATUS_ERROR, STATUS_SUCCESS, STATUS_TIMEOUT,
+                              AnalysisDispatcher, AnalysisTarget)
+from ucp_llm.llm import ClientProvider
+
+from fakes import FakeStreamingClient
+
+ANSWER = "تحليل موجز للبروتوكول."
+MESSAGES = [{"role": "user", "content": "حلل البروتوكول."}]
+
+
+def provider(text: str = ANSWER, **options) -> ClientProvider:
+    return ClientProvider(lambda: FakeStreamingClient(text, **options))
+
+
+def test_stalled_target_times_out_without_holding_up_the_others():
+    targets = [AnalysisTarget(provider(first_token_delay=30.0), "stalled", timeout=0.2), AnalysisTarget(provider(first_token_delay=0.05), "quick")]
+    result = AnalysisDispatcher(targets, MODE_ALL).dispatch(MESSAGES)
+    assert [target.status for target in result.results] == [STATUS_TIMEOUT, STATUS_SUCCESS]
+    assert result.seconds < 1.0
+
+
+def test_cancelled_dispatch_returns_within_the_poll_interval():
+    cancel_at = time.perf_counter() + 0.2
+    result = AnalysisDispatcher([AnalysisTarget(provider(first_token_delay=30.0), "stalled")], poll_interval=0.05).dispatch(
+        MESSAGES, should_cancel=lambda: time.perf_counter() >= cancel_at)
+    assert result.results[0].status == STATUS_CANCELLED
+    assert result.seconds < 0.4
+
+
+def test_first_success_wins_over_a_failing_target():
+    targets = [AnalysisTarget(provider(error=ConnectionError("refused")), "broken"), AnalysisTarget(provider(first_token_delay=0.05), "quick")]
+    result = AnalysisDispatcher(targets, MODE_FIRST).dispatch(MESSAGES)
+    assert result.ok and result.text == ANSWER
+    assert result.winner.name == "client:quick"
+    assert result.results[0].status == STATUS_ERROR
+
+
+def test_all_failed_reports_every_error():
+    targets = [AnalysisTarget(provider(error=ConnectionError("refused")), "a"), AnalysisTarget(provider(error=TimeoutError("slow")), "b")]
+    result = AnalysisDispatcher(targets).dispatch(MESSAGES)
+    assert not result.ok and result.text == ""
+    assert "refused" in result.error_message() and "slow" in result.error_message()
+
+
+def test_collect_all_returns_every_answer_in_target_order():
+    targets = [AnalysisTarget(provider("الأول", first_token_delay=0.1), "slow", name="a"), AnalysisTarget(provider("الثاني"), "fast", name="b"),
+               AnalysisTarget(provider(error=ConnectionError("refused")), "broken", name="c")]
+    result = AnalysisDispatcher(targets, MODE_ALL).dispatch(MESSAGES)
+    assert [target.status for target in result.results] == [STATUS_SUCCESS, STATUS_SUCCESS, STATUS_ERROR]
+    assert result.winner.name == "b"
+    assert [target.text for target in result.successful()] == ["الأول", "الثاني"]
+    assert result.merged_text("== {name} ({model}) ==") == "== a (slow) ==\nالأول\n\n== b (fast) ==\nالثاني"
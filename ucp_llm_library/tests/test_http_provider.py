@@ -0,0 +1,124 @@
+# test_http_provider.py
+# HTTPChatProvider against a local OpenAI-compatible stub server: requests
+# reuse the pooled keep-alive connections, a connection the server dropped
+# while idle is replaced transparently, and ClientManager.close_all() closes
+# the idle connections.
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ucp_llm.llm import ClientManager, HTTPChatProvider
+
+ANSWER = "تحليل موجز للبروتوكول."
+MESSAGES = [{"role": "user", "content": "protocol"}]
+
+
+class StubChatHandler(BaseHTTPRequestHandler):
+    """Answers ANSWER, streamed in 8-character events or whole; counts the connections it serves."""
+
+    protocol_version = "HTTP/1.1"
+    server: "StubServer"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+            self.server.open_connections += 1
+
+    def finish(self):
+        super().finish()
+        with self.server.lock: self.server.open_connections -= 1
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if request.get("stream"):
+            events = [json.dumps({"choices": [{"delta": {"content": ANSWER[i:i + 8]}}]}, ensure_ascii=False) for i in range(0, len(ANSWER), 8)]
+            body = "".join(f"data: {event}\n\n" for event in events + ["[DONE]"]).encode("utf-8")
+        else:
+            body = json.dumps({"choices": [{"message": {"content": ANSWER}}]}, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if self.server.drop_after_response: self.close_connection = True  # Without "Connection: close", as an idle timeout would
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubChatHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.open_connections = 0
+        self.drop_after_response = False
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+@pytest.fixture
+def server():
+    server = StubServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline: return False
+        time.sleep(0.01)
+    return True
+
+
+def test_sequential_requests_reuse_one_connection(server):
+    provider = HTTPChatProvider(server.base_url, api_key="stub")
+    for stream in (True, False, True, True):
+        assert "".join(provider.stream_text(MESSAGES, "stub", stream=stream)) == ANSWER
+    assert provider.connections_opened == 1
+    assert server.connections == 1
+    provider.close()
+
+
+def test_concurrent_requests_stay_within_the_pool(server):
+    provider = HTTPChatProvider(server.base_url, max_connections=3)
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        for _ in range(5):  # Rounds of at most 3 requests in flight
+            texts = list(pool.map(lambda _: "".join(provider.stream_text(MESSAGES, "stub")), range(3)))
+            assert texts == [ANSWER] * 3
+    assert provider.connections_opened <= 3
+    assert server.connections == provider.connections_opened
+    provider.close()
+
+
+def test_dropped_idle_connection_is_replaced(server):
+    server.drop_after_response = True
+    provider = HTTPChatProvider(server.base_url)
+    assert "".join(provider.stream_text(MESSAGES, "stub")) == ANSWER
+    assert wait_for(lambda: server.open_connections == 0)  # The server has closed it; the pool still holds it
+    assert "".join(provider.stream_text(MESSAGES, "stub")) == ANSWER
+    assert provider.connections_opened == 2
+    provider.close()
+
+
+def test_close_all_closes_idle_connections(server):
+    clients = ClientManager()
+    provider = clients.http(server.base_url, api_key="stub")
+    assert clients.http(server.base_url, api_key="stub") is provider
+    assert "".join(provider.stream_text(MESSAGES, "stub")) == ANSWER
+    assert server.open_connections == 1
+    clients.close_all()
+    assert wait_for(lambda: server.open_connections == 0)
+    assert clients.http(server.base_url, api_key="stub") is not provider
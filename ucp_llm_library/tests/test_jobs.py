@@ -0,0 +1,52 @@
+# test_jobs.py
+# JobRunner keeps waking the GUI thread after a failed wake-up, and errors
+# that no on_error callback takes go to on_unhandled_error or the log.
+
+import logging
+import threading
+
+from ucp_llm.jobs import JobRunner
+
+
+def run_job(runner: JobRunner, fn) -> None:
+    """Runs fn() as a job and waits until its outcome is queued."""
+    queued = runner._events.qsize() + 1
+    runner.submit(lambda job: fn(), name="failing")
+    for _ in range(500):
+        if runner._events.qsize() >= queued: return
+        threading.Event().wait(0.01)
+    raise AssertionError("the job did not finish")
+
+
+def fail():
+    raise ValueError("broken")
+
+
+def test_failed_notify_does_not_block_later_wake_ups():
+    attempts = []
+
+    def notify():
+        attempts.append(1)
+        if len(attempts) == 1: raise RuntimeError("window is being destroyed")
+
+    runner = JobRunner(notify)
+    run_job(runner, lambda: None)
+    run_job(runner, lambda: None)
+    assert len(attempts) == 2
+    assert runner.dispatch() == 2
+
+
+def test_unhandled_errors_go_to_the_handler():
+    runner = JobRunner()
+    reported = []
+    runner.on_unhandled_error = lambda name, error: reported.append((name, str(error)))
+    run_job(runner, fail)
+    runner.dispatch()
+    assert reported == [("failing", "broken")]
+
+
+def test_unhandled_errors_are_logged_without_a_handler(caplog):
+    runner = JobRunner()
+    run_job(runner, fail)
+    with caplog.at_level(logging.ERROR, logger="ucp_llm.jobs"): runner.dispatch()
+    assert "failing" in caplog.text and "broken" in caplog.text
@@ -0,0 +1,50 @@
+# test_lazy.py
+# LazyUCPProfile answers like UCPProfile for a complete file, and a file cut
+# off inside its sections still loads: the getters never raise, and the
+# whole-document calls return the sections found before the cut.
+
+import pytest
+
+from ucp_llm import UCPProfile
+from ucp_llm.lazy import LazyUCPProfile
+from ucp_llm.render import ProtocolRenderer
+
+from profile_factory import make_profile, write_profile
+
+
+@pytest.fixture
+def profile_path(tmp_path):
+    path = tmp_path / "profile.json"
+    write_profile(str(path), make_profile(items_per_section=2, words_per_field=4, seed=1))
+    return path
+
+
+def test_matches_the_eager_profile(profile_path):
+    eager = UCPProfile(str(profile_path))
+    with LazyUCPProfile(str(profile_path)) as lazy:
+        assert lazy.get_section_ids() == eager.get_section_ids()
+        assert lazy.get_all_ethical_values() == eager.get_all_ethical_values()
+        assert lazy.get_raw_data() == eager.get_raw_data()
+
+
+def test_truncated_file_keeps_the_sections_before_the_cut(profile_path):
+    complete = UCPProfile(str(profile_path))
+    data = profile_path.read_bytes()
+    profile_path.write_bytes(data[:len(data) // 2])
+    with LazyUCPProfile(str(profile_path)) as lazy:
+        assert lazy.is_valid()
+        section_ids = lazy.get_section_ids()
+        assert 0 < len(section_ids) < len(complete.get_section_ids())
+        sections = lazy.get_sections()
+        assert [section["id"] for section in sections] == section_ids
+        assert sections == complete.get_sections()[:len(sections)]
+        assert lazy.get_raw_data()["protocolVersion"] == complete.get_generator_tool_version()
+        assert ProtocolRenderer().render(lazy)
+
+
+def test_iter_section_items_matches_the_copy(profile_path):
+    eager = UCPProfile(str(profile_path))
+    with LazyUCPProfile(str(profile_path)) as lazy:
+        for profile in (eager, lazy):
+            assert list(profile.iter_section_items("ethical_values")) == profile.get_section_items("ethical_values")
+            assert list(profile.iter_section_items("no_such_section")) == []
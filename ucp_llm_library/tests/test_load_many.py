@@ -0,0 +1,46 @@
+# test_load_many.py
+# UCPProfile.load_many() streams every valid profile once, collects one error
+# per invalid file, loads a repeated path once and refuses a second pass.
+
+import os
+
+import pytest
+
+from ucp_llm import UCPProfile
+
+from profile_factory import make_profile, write_profile
+
+
+@pytest.fixture
+def paths(tmp_path):
+    paths = []
+    for n in range(5):
+        path = str(tmp_path / f"profile_{n}.json")
+        write_profile(path, make_profile(items_per_section=1, words_per_field=3, seed=n))
+        paths.append(path)
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json", encoding="utf-8")
+    return paths + [str(bad)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_streams_valid_profiles_and_collects_errors(paths, workers):
+    batch = UCPProfile.load_many(paths, workers=workers, chunk_size=2)
+    loaded = sorted(profile.file_path for profile in batch)
+    assert loaded == sorted(paths[:-1])
+    assert (batch.loaded, batch.failed) == (5, 1)
+    assert list(batch.errors) == [paths[-1]]
+
+
+def test_repeated_paths_are_loaded_once(paths):
+    relative = os.path.relpath(paths[0])
+    batch = UCPProfile.load_many(paths + [paths[0], relative, paths[-1]], workers=1)
+    assert sorted(profile.file_path for profile in batch) == sorted(paths[:-1])
+    assert (batch.loaded, batch.failed, len(batch.errors)) == (5, 1, 1)
+
+
+def test_a_batch_is_single_use(paths):
+    batch = UCPProfile.load_many(iter(paths), workers=1)
+    assert len(batch.load_all()) == 5
+    with pytest.raises(RuntimeError): list(batch)
+    assert (batch.loaded, batch.failed) == (5, 1)
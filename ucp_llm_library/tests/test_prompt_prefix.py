@@ -0,0 +1,94 @@
+# test_prompt_prefix.py
+# The prefix-stable layout of ContextCompiler keeps the start of every
+# external-analysis request byte-identical, so a provider's prompt cache can
+# reuse it: the static block does not depend on the profile, the export time
+# or the preferred name, only the closing values block changes between runs
+# of one profile, and nothing depends on the interpreter's hash seed. Under
+# budget pressure the user's sections still come before the fixed texts.
+
+import datetime
+import hashlib
+import os
+import subprocess
+import sys
+
+import pytest
+
+import ucp_llm
+from ucp_llm.context import LAYOUT_DOCUMENT, LAYOUT_PREFIX_STABLE, POSTAMBLE, PREAMBLE, ContextCompiler, estimate_tokens
+from ucp_llm.protocol_texts import EXTERNAL_ANALYSIS_PROMPT
+
+from profile_factory import make_profile
+
+BUDGET = 24000 - estimate_tokens(EXTERNAL_ANALYSIS_PROMPT)  # As in the Eve manager
+TIMES = (datetime.datetime(2024, 6, 1, 9, 0, 0), datetime.datetime(2024, 6, 2, 17, 30, 5))
+NAMES = ("", "Sam")
+SECTIONS_HEADING = "\n--- أقسام بيانات المستخدم التفصيلية ---\n".encode("utf-8")
+VALUES_HEADING = "\n--- قيم الحقول المشار إليها بـ ⟨...⟩ ---".encode("utf-8")
+
+STATIC_DIGEST_SCRIPT = """
+import datetime, hashlib
+from ucp_llm.context import LAYOUT_PREFIX_STABLE, ContextCompiler
+from ucp_llm.protocol_texts import EXTERNAL_ANALYSIS_PROMPT
+compiler = ContextCompiler({budget}, layout=LAYOUT_PREFIX_STABLE)
+text = (EXTERNAL_ANALYSIS_PROMPT + "\\n\\n" + compiler.compile({{"protocolVersion": "x", "sections": []}}, "", datetime.datetime(2024, 6, 1, 9, 0, 0)).text).encode("utf-8")
+print(hashlib.sha256(text[:text.index({heading!r})]).hexdigest())
+"""
+
+
+def request(data, preferred_name: str, now: datetime.datetime) -> bytes:
+    compiler = ContextCompiler(BUDGET, layout=LAYOUT_PREFIX_STABLE)
+    return (EXTERNAL_ANALYSIS_PROMPT + "\n\n" + compiler.compile(data, preferred_name, now).text).encode("utf-8")
+
+
+def static_block() -> bytes:
+    # The request up to the user's data, for a profile whose sections are all empty
+    text = request({"protocolVersion": "x", "sections": []}, "", TIMES[0])
+    return text[:text.index(SECTIONS_HEADING)]
+
+
+@pytest.fixture(scope="module")
+def requests_by_profile():
+    profiles = [make_profile(items_per_section=2, words_per_field=30, seed=seed) for seed in range(3)]
+    return [[request(data, name, now) for now in TIMES for name in NAMES] for data in profiles]
+
+
+def test_static_block_is_shared_by_every_request(requests_by_profile):
+    static = static_block()
+    assert len(static) > len(EXTERNAL_ANALYSIS_PROMPT.encode("utf-8")) + 10000  # Preamble and postamble are in it
+    for texts in requests_by_profile:
+        for text in texts: assert text.startswith(static)
+
+
+def test_static_block_holds_no_profile_values():
+    assert b"Sam" not in static_block()
+    assert TIMES[0].strftime("%Y").encode("ascii") not in static_block()
+
+
+def test_only_the_values_block_changes_between_runs_of_a_profile(requests_by_profile):
+    for texts in requests_by_profile:
+        values_start = texts[0].index(VALUES_HEADING)
+        for text in texts[1:]:
+            assert text.index(VALUES_HEADING) == values_start
+            assert text[:values_start] == texts[0][:values_start]
+
+
+def test_static_block_is_identical_in_fresh_interpreters():
+    source_dir = os.path.dirname(os.path.dirname(os.path.abspath(ucp_llm.__file__)))
+    script = STATIC_DIGEST_SCRIPT.format(budget=BUDGET, heading=SECTIONS_HEADING)
+    digests = {hashlib.sha256(static_block()).hexdigest()}
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=os.pathsep.join(filter(None, [source_dir, os.environ.get("PYTHONPATH")])))
+        digests.add(subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True).stdout.strip())
+    assert len(digests) == 1
+
+
+@pytest.mark.parametrize("budget", [4000, 8000, 16000])
+def test_sections_keep_priority_over_the_static_block(budget):
+    data = make_profile(items_per_section=3, words_per_field=40, seed=1)
+    stable = ContextCompiler(budget, layout=LAYOUT_PREFIX_STABLE).compile(data)
+    document = ContextCompiler(budget, layout=LAYOUT_DOCUMENT).compile(data)
+    assert PREAMBLE in stable.omitted and POSTAMBLE in stable.omitted
+    sections = lambda parts: [part for part in parts if part not in (PREAMBLE, POSTAMBLE)]
+    assert len(sections(stable.included) + sections(stable.reduced)) >= len(sections(document.included) + sections(document.reduced))
+    assert stable.tokens <= budget
@@ -0,0 +1,79 @@
+# test_rendered_cache.py
+# RenderedTextCache returns the renderer's own text for every kind of hit:
+# keyed by content hash or by a ProfileOverlay revision, from memory or from
+# its UTF-8 disk tier, which ignores damaged files and stays within its size
+# and age limits.
+
+import datetime
+import os
+import time
+
+from ucp_llm.overlay import ProfileOverlay
+from ucp_llm.render import ProtocolRenderer, RenderedTextCache
+
+from profile_factory import make_profile
+
+NOW = datetime.datetime(2024, 6, 1, 12, 0, 0)
+LATER = datetime.datetime(2024, 6, 2, 8, 30, 0)
+
+
+def disk_entries(directory: str) -> list:
+    return sorted(name for name in os.listdir(directory) if name.endswith(".txt"))
+
+
+def test_revision_key_follows_overlay_edits():
+    renderer = ProtocolRenderer()
+    cache = RenderedTextCache(renderer)
+    overlay = ProfileOverlay(make_profile(items_per_section=2, words_per_field=5, seed=1))
+    data = overlay.materialize()
+    assert cache.render(data, False, now=NOW, revision=overlay.revision) == renderer.render(data, False, now=NOW)
+    assert cache.render(data, False, now=LATER, revision=overlay.revision) == renderer.render(data, False, now=LATER)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    section_id = data["sections"][0]["id"]
+    overlay.set_value(section_id, 0, "edited", "قيمة جديدة")
+    data = overlay.materialize()
+    assert cache.render(data, False, now=NOW, revision=overlay.revision) == renderer.render(data, False, now=NOW)
+    assert cache.misses == 2
+    saved = overlay.rebase()
+    assert cache.render(saved, False, now=NOW, revision=overlay.revision) == renderer.render(saved, False, now=NOW)
+    assert cache.misses == 2  # Saving does not change the document
+
+
+def test_disk_tier_round_trip_and_damaged_files(tmp_path):
+    renderer = ProtocolRenderer()
+    data = make_profile(items_per_section=2, words_per_field=5, seed=2)
+    expected = renderer.render(data, False, now=LATER)
+    RenderedTextCache(renderer, disk_dir=str(tmp_path)).render(data, False, now=NOW)
+    (name,) = disk_entries(str(tmp_path))
+    header, text = (tmp_path / name).read_bytes().split(b"\n", 1)
+    text.decode("utf-8")
+
+    fresh = RenderedTextCache(renderer, disk_dir=str(tmp_path))
+    assert fresh.render(data, False, now=LATER) == expected
+    assert fresh.disk_hits == 1
+
+    (tmp_path / name).write_bytes(header + b"\n" + text[:-1])
+    fresh = RenderedTextCache(renderer, disk_dir=str(tmp_path))
+    assert fresh.render(data, False, now=LATER) == expected
+    assert (fresh.disk_hits, fresh.misses) == (0, 1)
+
+
+def test_disk_tier_limits(tmp_path):
+    renderer = ProtocolRenderer()
+    profiles = [make_profile(items_per_section=1, words_per_field=5, seed=seed) for seed in range(4)]
+    cache = RenderedTextCache(renderer, disk_dir=str(tmp_path), disk_max_bytes=None, disk_max_age=None)
+    for data in profiles: cache.render(data, False, now=NOW)
+    names = disk_entries(str(tmp_path))
+    assert len(names) == 4
+    size = max(os.path.getsize(tmp_path / name) for name in names)
+
+    old = time.time() - 3600
+    os.utime(tmp_path / names[0], (old, old))
+    assert RenderedTextCache(renderer, disk_dir=str(tmp_path), disk_max_bytes=None, disk_max_age=60).prune_disk() == 0  # Pruned on creation
+    assert names[0] not in disk_entries(str(tmp_path))
+
+    cache = RenderedTextCache(renderer, disk_dir=str(tmp_path), disk_max_bytes=2 * size, disk_max_age=None)
+    assert len(disk_entries(str(tmp_path))) == 2
+    cache.render(make_profile(items_per_section=1, words_per_field=5, seed=9), False, now=NOW)
+    assert len(disk_entries(str(tmp_path))) <= 2
@@ -0,0 +1,153 @@
+# test_streaming.py
+# The streaming path of an external analysis: iter_completion_text() over an
+# OpenAI-style client, its pieces reported from a JobRunner worker and
+# delivered in order on the dispatching (GUI) thread, and the Eve manager's
+# handlers that append them to the analysis display.
+
+import importlib.util
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ucp_llm.dispatch import STATUS_ERROR, AnalysisDispatcher, AnalysisTarget
+from ucp_llm.jobs import JobRunner
+from ucp_llm.llm import ClientManager, ClientProvider, iter_completion_text
+
+from fakes import FakeStreamingClient
+
+TEXT = "تحليل البروتوكول: نقاط القوة والضعف."
+MESSAGES = [{"role": "user", "content": "protocol"}]
+EVE_PATH = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "ucp_llm_gui_manager", "ucp_llm_gui_manager_v2.0_eve_auto_analysis.py")
+
+
+def chunks(text: str, size: int):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+def run_jobs(runner: JobRunner, wake: threading.Event, timeout: float = 5.0) -> None:
+    # Plays the Tk main loop: dispatch() whenever notify() fired, until no job is left
+    deadline = time.monotonic() + timeout
+    while runner.active_jobs():
+        assert wake.wait(max(0.0, deadline - time.monotonic())), "job results were not delivered"
+        wake.clear()
+        runner.dispatch()
+
+
+def test_stream_yields_pieces_in_order():
+    client = FakeStreamingClient(TEXT, chunk_size=5)
+    assert list(iter_completion_text(client, MESSAGES, "model-a", temperature=0.3)) == chunks(TEXT, 5)  # The final empty delta is skipped
+    assert client.requests == [{"messages": MESSAGES, "model": "model-a", "temperature": 0.3, "stream": True}]
+
+
+def test_blocking_call_yields_the_whole_answer_once():
+    assert list(iter_completion_text(FakeStreamingClient(TEXT, chunk_size=5), MESSAGES, "model-a", stream=False)) == [TEXT]
+
+
+def test_error_before_the_first_piece():
+    pieces = iter_completion_text(FakeStreamingClient(TEXT, error=ConnectionError("refused")), MESSAGES, "model-a")
+    with pytest.raises(ConnectionError): next(pieces)
+
+
+def test_error_mid_stream_keeps_the_pieces_already_received():
+    received = []
+    with pytest.raises(ConnectionError):
+        for piece in iter_completion_text(FakeStreamingClient(TEXT, chunk_size=5, error=ConnectionError("reset"), error_after_chunks=3), MESSAGES, "model-a"):
+            received.append(piece)
+    assert received == chunks(TEXT, 5)[:3]
+
+
+def stream_job(job, provider):
+    parts = []
+    for piece in provider.stream_text(MESSAGES, "model-a"):
+        parts.append(piece)
+        job.report(piece)
+    return "".join(parts)
+
+
+def test_job_runner_delivers_pieces_in_order_on_the_dispatching_thread():
+    wake = threading.Event()
+    runner = JobRunner(notify=wake.set)
+    provider = ClientProvider(lambda: FakeStreamingClient(TEXT, chunk_size=4, chunk_delay=0.001))
+    delivered, threads, done = [], set(), []
+    runner.submit(stream_job, provider, on_progress=lambda piece: (delivered.append(piece), threads.add(threading.get_ident())), on_done=done.append)
+    run_jobs(runner, wake)
+    assert delivered == chunks(TEXT, 4)
+    assert done == [TEXT]
+    assert threads == {threading.get_ident()}
+
+
+def test_job_runner_reports_an_error_mid_stream_after_the_pieces():
+    wake = threading.Event()
+    runner = JobRunner(notify=wake.set)
+    provider = ClientProvider(lambda: FakeStreamingClient(TEXT, chunk_size=4, error=ConnectionError("reset"), error_after_chunks=2))
+    events = []
+    runner.submit(stream_job, provider, on_progress=lambda piece: events.append(("progress", piece)), on_error=lambda e: events.append(("error", type(e))))
+    run_jobs(runner, wake)
+    assert events == [("progress", TEXT[:4]), ("progress", TEXT[4:8]), ("error", ConnectionError)]
+
+
+def test_cancelled_job_delivers_nothing():
+    wake = threading.Event()
+    runner = JobRunner(notify=wake.set)
+    provider = ClientProvider(lambda: FakeStreamingClient(TEXT, chunk_size=4, first_token_delay=0.05))
+    delivered = []
+    job = runner.submit(stream_job, provider, on_progress=delivered.append, on_done=delivered.append)
+    job.cancel()
+    run_jobs(runner, wake)
+    assert delivered == []
+
+
+def test_dispatcher_keeps_the_partial_text_of_a_stream_that_failed():
+    provider = ClientProvider(lambda: FakeStreamingClient(TEXT, chunk_size=4, error=ConnectionError("reset"), error_after_chunks=2))
+    result = AnalysisDispatcher([AnalysisTarget(provider, "model-a")]).dispatch(MESSAGES)
+    assert not result.ok
+    assert result.results[0].status == STATUS_ERROR and result.results[0].text == TEXT[:8]
+
+
+class FakeTextWidget:
+    """The parts of a tk ScrolledText the analysis display uses."""
+
+    def __init__(self):
+        self.content = ""
+
+    def config(self, **options):
+        pass
+
+    def insert(self, index, text):
+        self.content += text
+
+    def delete(self, first, last=None):
+        self.content = ""
+
+    def see(self, index):
+        pass
+
+
+def test_eve_streams_the_analysis_into_its_display():
+    pytest.importorskip("tkinter")
+    pytest.importorskip("groq")  # The manager needs it at import
+    spec = importlib.util.spec_from_file_location("eve_manager", EVE_PATH)
+    eve = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(eve)
+    App = eve.UCPManagerApp
+
+    app = SimpleNamespace(
+        groq_api_key_cache="key", groq_model_name_cache="model-a", groq_extra_model_names=[], analysis_dispatch_mode=eve.MODE_FIRST,
+        groq_streaming_enabled=True, groq_client_factory=lambda api_key: FakeStreamingClient(TEXT, chunk_size=4),
+        llm_clients=ClientManager(), eve_state={"is_waiting_for_api_response": True, "api_stream_started": False},
+        eve_current_question_label=SimpleNamespace(config=lambda **options: None), eve_analysis_display_text=FakeTextWidget(),
+        _eve_manage_input_visibility=lambda **options: None)
+    app._describe_groq_error = lambda result, with_model=False: App._describe_groq_error(app, result, with_model)
+    wake = threading.Event()
+    runner = JobRunner(notify=wake.set)
+    results = []
+    runner.submit(lambda job, content: App._send_request_to_groq_api_threaded(app, job, content), "protocol",
+                  on_progress=lambda piece: App._append_streamed_analysis(app, piece), on_done=results.append)
+    run_jobs(runner, wake)
+    assert results == [{"status": "success", "data": TEXT}]
+    assert app.eve_analysis_display_text.content == TEXT
+    assert app.eve_state["api_analysis_result"] == TEXT
+    app.llm_clients.close_all()